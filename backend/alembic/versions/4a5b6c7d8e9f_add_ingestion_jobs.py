@@ -0,0 +1,51 @@
+"""Add the durable report and inbound email ingestion queue.
+
+Revision ID: 4a5b6c7d8e9f
+Revises: 3f4a5b6c7d8e
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "4a5b6c7d8e9f"
+down_revision = "3f4a5b6c7d8e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ingestion_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("workspace_id", sa.Integer(), nullable=True),
+        sa.Column("kind", sa.String(length=32), nullable=False),
+        sa.Column("source", sa.String(length=64), nullable=False, server_default="api"),
+        sa.Column("status", sa.String(length=24), nullable=False, server_default="queued"),
+        sa.Column("filename", sa.String(length=255), nullable=True),
+        sa.Column("content_sha256", sa.String(length=64), nullable=False),
+        sa.Column("payload_size", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("payload", sa.LargeBinary(), nullable=True),
+        sa.Column("options", sa.Text(), nullable=True),
+        sa.Column("attempt_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="5"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("result", sa.Text(), nullable=True),
+        sa.Column("next_retry_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["workspace_id"], ["workspaces.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    for column in ("id", "workspace_id", "kind", "status", "created_at"):
+        op.create_index(f"ix_ingestion_jobs_{column}", "ingestion_jobs", [column])
+    op.create_index("ix_ingestion_jobs_status_retry", "ingestion_jobs", ["status", "next_retry_at"])
+    op.create_index("ix_ingestion_jobs_kind_sha256", "ingestion_jobs", ["kind", "content_sha256"])
+    op.create_index(
+        "ix_ingestion_jobs_workspace_status", "ingestion_jobs", ["workspace_id", "status"]
+    )
+
+
+def downgrade():
+    op.drop_table("ingestion_jobs")
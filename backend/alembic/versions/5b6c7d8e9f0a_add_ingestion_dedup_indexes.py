@@ -0,0 +1,59 @@
+"""Add payload digest and connector message-ID indexes for ingestion dedup.
+
+Revision ID: 5b6c7d8e9f0a
+Revises: 4a5b6c7d8e9f
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "5b6c7d8e9f0a"
+down_revision = "4a5b6c7d8e9f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ingested_payload_digests",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("workspace_id", sa.Integer(), nullable=True),
+        sa.Column("kind", sa.String(length=24), nullable=False),
+        sa.Column("content_sha256", sa.String(length=64), nullable=False),
+        sa.Column("domain", sa.String(length=255), nullable=True),
+        sa.Column("report_id", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["workspace_id"], ["workspaces.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_ingested_payload_digests_id", "ingested_payload_digests", ["id"])
+    op.create_index(
+        "ix_ingested_payload_digests_lookup",
+        "ingested_payload_digests",
+        ["content_sha256", "kind", "workspace_id"],
+    )
+
+    # Legacy gmail_ingested_ids / m365_ingested_ids JSON lists are folded into
+    # this table by the connectors on their next poll.
+    op.create_table(
+        "mail_source_ingested_messages",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("mail_source_id", sa.Integer(), nullable=False),
+        sa.Column("connector", sa.String(length=16), nullable=False),
+        sa.Column("message_id", sa.String(length=512), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["mail_source_id"], ["mail_sources.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "mail_source_id",
+            "connector",
+            "message_id",
+            name="uq_mail_source_ingested_message",
+        ),
+    )
+    op.create_index("ix_mail_source_ingested_messages_id", "mail_source_ingested_messages", ["id"])
+
+
+def downgrade():
+    op.drop_table("mail_source_ingested_messages")
+    op.drop_table("ingested_payload_digests")
@@ -0,0 +1,57 @@
+"""Materialise forensic failure analysis on each stored sample.
+
+Revision ID: 6c7d8e9f0a1b
+Revises: 5b6c7d8e9f0a
+
+Existing rows keep NULL analysis columns. A background task materialises them
+in small batches after startup; until then the analysis endpoint parses them
+on read without writing.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "6c7d8e9f0a1b"
+down_revision = "5b6c7d8e9f0a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("forensic_reports") as batch_op:
+        batch_op.add_column(sa.Column("analysis_failure_kind", sa.String(length=16), nullable=True))
+        batch_op.add_column(sa.Column("analysis_priority", sa.String(length=16), nullable=True))
+        batch_op.add_column(sa.Column("analysis_priority_rank", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("analysis_auth_results", sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column("analysis_dkim_domain", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("analysis_mail_from_domain", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("analysis_group_key", sa.String(length=512), nullable=True))
+    op.create_index(
+        "ix_forensic_reports_analysis_failure_kind", "forensic_reports", ["analysis_failure_kind"]
+    )
+    op.create_index(
+        "ix_forensic_reports_analysis_priority", "forensic_reports", ["analysis_priority"]
+    )
+    op.create_index(
+        "ix_forensic_reports_analysis_group_key", "forensic_reports", ["analysis_group_key"]
+    )
+    op.create_index(
+        "ix_forensic_reports_domain_group",
+        "forensic_reports",
+        ["domain_id", "analysis_group_key", "analysis_priority_rank"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_forensic_reports_domain_group", table_name="forensic_reports")
+    op.drop_index("ix_forensic_reports_analysis_group_key", table_name="forensic_reports")
+    op.drop_index("ix_forensic_reports_analysis_priority", table_name="forensic_reports")
+    op.drop_index("ix_forensic_reports_analysis_failure_kind", table_name="forensic_reports")
+    with op.batch_alter_table("forensic_reports") as batch_op:
+        batch_op.drop_column("analysis_group_key")
+        batch_op.drop_column("analysis_mail_from_domain")
+        batch_op.drop_column("analysis_dkim_domain")
+        batch_op.drop_column("analysis_auth_results")
+        batch_op.drop_column("analysis_priority_rank")
+        batch_op.drop_column("analysis_priority")
+        batch_op.drop_column("analysis_failure_kind")
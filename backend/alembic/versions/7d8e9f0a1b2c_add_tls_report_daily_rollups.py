@@ -0,0 +1,115 @@
+"""Add TLS report observed days and daily session rollups.
+
+Revision ID: 7d8e9f0a1b2c
+Revises: 6c7d8e9f0a1b
+"""
+
+from collections import defaultdict
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "7d8e9f0a1b2c"
+down_revision = "6c7d8e9f0a1b"
+branch_labels = None
+depends_on = None
+
+tls_reports = sa.table(
+    "tls_reports",
+    sa.column("id", sa.Integer()),
+    sa.column("domain_id", sa.Integer()),
+    sa.column("policy_domain", sa.String()),
+    sa.column("begin_date", sa.DateTime()),
+    sa.column("end_date", sa.DateTime()),
+    sa.column("processed_at", sa.DateTime()),
+    sa.column("total_successful_sessions", sa.Integer()),
+    sa.column("total_failure_sessions", sa.Integer()),
+    sa.column("observed_day", sa.Date()),
+)
+
+
+def _backfill(rollups_table) -> None:
+    bind = op.get_bind()
+    rollups = defaultdict(lambda: [0, 0, 0])
+    now = datetime.utcnow()
+    for row in bind.execute(sa.select(tls_reports)).mappings():
+        dates = [row[name] for name in ("begin_date", "end_date", "processed_at") if row[name]]
+        if not dates:
+            continue
+        observed_day = max(dates).date()
+        report_day = (row["begin_date"] or row["end_date"] or row["processed_at"]).date()
+        bind.execute(
+            tls_reports.update()
+            .where(tls_reports.c.id == row["id"])
+            .values(observed_day=observed_day)
+        )
+        totals = rollups[(row["domain_id"], row["policy_domain"], observed_day, report_day)]
+        totals[0] += 1
+        totals[1] += row["total_successful_sessions"] or 0
+        totals[2] += row["total_failure_sessions"] or 0
+    if rollups:
+        op.bulk_insert(
+            rollups_table,
+            [
+                {
+                    "domain_id": domain_id,
+                    "policy_domain": policy_domain,
+                    "observed_day": observed_day,
+                    "report_day": report_day,
+                    "report_count": totals[0],
+                    "successful_sessions": totals[1],
+                    "failed_sessions": totals[2],
+                    "updated_at": now,
+                }
+                for (domain_id, policy_domain, observed_day, report_day), totals in rollups.items()
+            ],
+        )
+
+
+def upgrade():
+    with op.batch_alter_table("tls_reports") as batch_op:
+        batch_op.add_column(sa.Column("observed_day", sa.Date(), nullable=True))
+    op.create_index("ix_tls_reports_observed_day", "tls_reports", ["observed_day"])
+    op.create_index(
+        "ix_tls_reports_domain_observed_day", "tls_reports", ["domain_id", "observed_day"]
+    )
+    rollups_table = op.create_table(
+        "tls_report_daily_rollups",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("domain_id", sa.Integer(), nullable=False),
+        sa.Column("policy_domain", sa.String(), nullable=False),
+        sa.Column("observed_day", sa.Date(), nullable=False),
+        sa.Column("report_day", sa.Date(), nullable=False),
+        sa.Column("report_count", sa.Integer(), nullable=False),
+        sa.Column("successful_sessions", sa.Integer(), nullable=False),
+        sa.Column("failed_sessions", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["domain_id"], ["domains.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "domain_id",
+            "policy_domain",
+            "observed_day",
+            "report_day",
+            name="uq_tls_report_daily_rollup",
+        ),
+    )
+    op.create_index("ix_tls_report_daily_rollups_id", "tls_report_daily_rollups", ["id"])
+    op.create_index(
+        "ix_tls_report_daily_rollups_domain_id", "tls_report_daily_rollups", ["domain_id"]
+    )
+    op.create_index(
+        "ix_tls_report_daily_rollups_window",
+        "tls_report_daily_rollups",
+        ["domain_id", "observed_day"],
+    )
+    _backfill(rollups_table)
+
+
+def downgrade():
+    op.drop_table("tls_report_daily_rollups")
+    op.drop_index("ix_tls_reports_domain_observed_day", table_name="tls_reports")
+    op.drop_index("ix_tls_reports_observed_day", table_name="tls_reports")
+    with op.batch_alter_table("tls_reports") as batch_op:
+        batch_op.drop_column("observed_day")
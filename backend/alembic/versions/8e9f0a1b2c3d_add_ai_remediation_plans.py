@@ -0,0 +1,35 @@
+"""Share generated AI remediation plans across API processes.
+
+Revision ID: 8e9f0a1b2c3d
+Revises: 7d8e9f0a1b2c
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "8e9f0a1b2c3d"
+down_revision = "7d8e9f0a1b2c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ai_remediation_plans",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("domain", sa.String(), nullable=False),
+        sa.Column("plan_json", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_ai_remediation_plans_id", "ai_remediation_plans", ["id"])
+    op.create_index(
+        "ix_ai_remediation_plans_cache_key", "ai_remediation_plans", ["cache_key"], unique=True
+    )
+    op.create_index("ix_ai_remediation_plans_domain", "ai_remediation_plans", ["domain"])
+    op.create_index("ix_ai_remediation_plans_created_at", "ai_remediation_plans", ["created_at"])
+
+
+def downgrade():
+    op.drop_table("ai_remediation_plans")
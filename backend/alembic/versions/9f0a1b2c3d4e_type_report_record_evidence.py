@@ -0,0 +1,153 @@
+"""Store report record evidence as JSONB and source addresses as INET.
+
+Revision ID: 9f0a1b2c3d4e
+Revises: 8e9f0a1b2c3d
+
+On PostgreSQL the JSON text columns become JSONB (text that is not valid JSON
+is kept as a JSON string), a typed ``source_inet`` copy of ``source_ip`` is
+added, and GIN/GiST indexes, including a partial index over DMARC-failing
+records, are created. SQLite only gains the ``source_inet`` text column.
+"""
+
+import ipaddress
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "9f0a1b2c3d4e"
+down_revision = "8e9f0a1b2c3d"
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = (
+    "dkim_auth_details",
+    "spf_auth_details",
+    "policy_override_reasons",
+    "record_extensions",
+    "source_evidence",
+)
+FAILING_RECORD_SQL = "dkim IS DISTINCT FROM 'pass' AND spf IS DISTINCT FROM 'pass'"
+BACKFILL_BATCH_SIZE = 5000
+
+report_records = sa.table(
+    "report_records",
+    sa.column("id", sa.Integer()),
+    sa.column("source_ip", sa.String()),
+    sa.column("source_inet", sa.String()),
+)
+
+
+def _inet_or_none(value):
+    try:
+        return str(ipaddress.ip_address(str(value).strip()))
+    except ValueError:
+        return None
+
+
+def _upgrade_postgresql():
+    # Temporary helpers so one malformed historic row cannot abort the upgrade.
+    op.execute("""
+        CREATE FUNCTION dmarq_try_jsonb(value text) RETURNS jsonb LANGUAGE plpgsql AS $$
+        BEGIN
+            RETURN value::jsonb;
+        EXCEPTION WHEN others THEN
+            RETURN to_jsonb(value);
+        END $$
+        """)
+    op.execute("""
+        CREATE FUNCTION dmarq_try_inet(value text) RETURNS inet LANGUAGE plpgsql AS $$
+        BEGIN
+            RETURN value::inet;
+        EXCEPTION WHEN others THEN
+            RETURN NULL;
+        END $$
+        """)
+    # A single ALTER TABLE rewrites the table once for every column change.
+    changes = [
+        f"ALTER COLUMN {name} TYPE jsonb USING dmarq_try_jsonb({name})" for name in JSON_COLUMNS
+    ]
+    changes.append("ADD COLUMN source_inet inet")
+    op.execute(f"ALTER TABLE report_records {', '.join(changes)}")
+    op.execute(
+        "UPDATE report_records SET source_inet = dmarq_try_inet(source_ip) "
+        "WHERE source_ip IS NOT NULL AND source_ip <> 'unknown'"
+    )
+    op.execute("DROP FUNCTION dmarq_try_jsonb(text)")
+    op.execute("DROP FUNCTION dmarq_try_inet(text)")
+
+    op.create_index(
+        "ix_report_records_source_inet",
+        "report_records",
+        ["source_inet"],
+        postgresql_using="gist",
+        postgresql_ops={"source_inet": "inet_ops"},
+    )
+    op.create_index(
+        "ix_report_records_failing_source_inet",
+        "report_records",
+        ["source_inet"],
+        postgresql_using="gist",
+        postgresql_ops={"source_inet": "inet_ops"},
+        postgresql_where=sa.text(FAILING_RECORD_SQL),
+    )
+    for name in ("source_evidence", "dkim_auth_details"):
+        op.create_index(
+            f"ix_report_records_{name}",
+            "report_records",
+            [name],
+            postgresql_using="gin",
+            postgresql_ops={name: "jsonb_path_ops"},
+        )
+
+
+def _backfill_source_inet():
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(report_records.c.id, report_records.c.source_ip)
+            .where(report_records.c.id > last_id)
+            .order_by(report_records.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        updates = [
+            {"record_id": row.id, "source_inet": inet}
+            for row in rows
+            if (inet := _inet_or_none(row.source_ip)) is not None
+        ]
+        if updates:
+            bind.execute(
+                report_records.update()
+                .where(report_records.c.id == sa.bindparam("record_id"))
+                .values(source_inet=sa.bindparam("source_inet")),
+                updates,
+            )
+        last_id = rows[-1].id
+
+
+def upgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        _upgrade_postgresql()
+        return
+    with op.batch_alter_table("report_records") as batch_op:
+        batch_op.add_column(sa.Column("source_inet", sa.String(length=45), nullable=True))
+    _backfill_source_inet()
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        for name in (
+            "ix_report_records_dkim_auth_details",
+            "ix_report_records_source_evidence",
+            "ix_report_records_failing_source_inet",
+            "ix_report_records_source_inet",
+        ):
+            op.drop_index(name, table_name="report_records")
+        changes = [f"ALTER COLUMN {name} TYPE text USING {name}::text" for name in JSON_COLUMNS]
+        changes.append("DROP COLUMN source_inet")
+        op.execute(f"ALTER TABLE report_records {', '.join(changes)}")
+        return
+    with op.batch_alter_table("report_records") as batch_op:
+        batch_op.drop_column("source_inet")
@@ -0,0 +1,34 @@
+"""Copy the report begin date onto report records.
+
+Revision ID: a6b7c8d9e0f1
+Revises: 9f0a1b2c3d4e
+
+``report_records.report_begin_date`` repeats ``dmarc_reports.begin_date`` so
+records can be range-partitioned (and pruned) by the same month as their
+report. See ``app.services.report_partitions``.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "a6b7c8d9e0f1"
+down_revision = "9f0a1b2c3d4e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("report_records") as batch_op:
+        batch_op.add_column(sa.Column("report_begin_date", sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE report_records SET report_begin_date = ("
+        "SELECT dmarc_reports.begin_date FROM dmarc_reports "
+        "WHERE dmarc_reports.id = report_records.report_id)"
+    )
+    op.create_index("ix_report_records_report_begin_date", "report_records", ["report_begin_date"])
+
+
+def downgrade():
+    op.drop_index("ix_report_records_report_begin_date", table_name="report_records")
+    with op.batch_alter_table("report_records") as batch_op:
+        batch_op.drop_column("report_begin_date")
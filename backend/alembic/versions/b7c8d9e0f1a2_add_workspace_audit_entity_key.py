@@ -0,0 +1,38 @@
+"""Add a normalised entity key to workspace audit logs.
+
+Revision ID: b7c8d9e0f1a2
+Revises: a6b7c8d9e0f1
+
+``workspace_audit_logs.entity_key`` stores the lower-cased, trimmed entity name
+so remediation summaries can select every domain's recent activity through
+``ix_workspace_audit_entity_key`` instead of scanning ``lower(trim(entity_name))``.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "b7c8d9e0f1a2"
+down_revision = "a6b7c8d9e0f1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("workspace_audit_logs") as batch_op:
+        batch_op.add_column(sa.Column("entity_key", sa.String(length=255), nullable=True))
+    op.execute(
+        "UPDATE workspace_audit_logs SET entity_key = "
+        "NULLIF(lower(rtrim(ltrim(trim(entity_name), '.'), '.')), '') "
+        "WHERE entity_name IS NOT NULL"
+    )
+    op.create_index(
+        "ix_workspace_audit_entity_key",
+        "workspace_audit_logs",
+        ["workspace_id", "entity_type", "entity_key", "created_at"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_workspace_audit_entity_key", table_name="workspace_audit_logs")
+    with op.batch_alter_table("workspace_audit_logs") as batch_op:
+        batch_op.drop_column("entity_key")
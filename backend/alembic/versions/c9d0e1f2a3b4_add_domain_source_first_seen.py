@@ -0,0 +1,59 @@
+"""Add the first-seen sender index.
+
+Revision ID: c9d0e1f2a3b4
+Revises: b7c8d9e0f1a2
+
+``domain_source_first_seen`` keeps one row per domain sender with the begin
+date of its earliest report. Ingestion maintains it; this migration seeds it
+from the stored report records so new-source alerts stay correct on upgrade.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "c9d0e1f2a3b4"
+down_revision = "b7c8d9e0f1a2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "domain_source_first_seen",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("domain_id", sa.Integer(), nullable=False),
+        sa.Column("source_ip", sa.String(), nullable=False),
+        sa.Column("first_seen", sa.Integer(), nullable=False),
+        sa.Column("last_seen", sa.Integer(), nullable=False),
+        sa.Column("message_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["domain_id"], ["domains.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("domain_id", "source_ip", name="uq_domain_source_first_seen"),
+    )
+    op.create_index("ix_domain_source_first_seen_id", "domain_source_first_seen", ["id"])
+    op.create_index(
+        "ix_domain_source_first_seen_domain_id", "domain_source_first_seen", ["domain_id"]
+    )
+    op.create_index(
+        "ix_domain_source_first_seen_first_seen",
+        "domain_source_first_seen",
+        ["first_seen", "domain_id"],
+    )
+    op.execute(
+        "INSERT INTO domain_source_first_seen "
+        "(domain_id, source_ip, first_seen, last_seen, message_count) "
+        "SELECT dmarc_reports.domain_id, COALESCE(report_records.source_ip, 'unknown'), "
+        "MIN(dmarc_reports.begin_date), MAX(dmarc_reports.end_date), "
+        "SUM(COALESCE(report_records.count, 0)) "
+        "FROM report_records JOIN dmarc_reports "
+        "ON dmarc_reports.id = report_records.report_id "
+        "WHERE dmarc_reports.begin_date IS NOT NULL AND dmarc_reports.end_date IS NOT NULL "
+        "GROUP BY dmarc_reports.domain_id, COALESCE(report_records.source_ip, 'unknown')"
+    )
+
+
+def downgrade():
+    op.drop_index("ix_domain_source_first_seen_first_seen", table_name="domain_source_first_seen")
+    op.drop_index("ix_domain_source_first_seen_domain_id", table_name="domain_source_first_seen")
+    op.drop_index("ix_domain_source_first_seen_id", table_name="domain_source_first_seen")
+    op.drop_table("domain_source_first_seen")
@@ -0,0 +1,197 @@
+"""Add the daily DKIM selector observation index.
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+
+``domain_dkim_selector_observations`` keeps one row per domain, selector and
+report day with pass/fail message counts. Ingestion maintains it next to the
+source projections; this migration seeds it from the records of reports that
+were already projected. Reports still waiting for the projection backfill are
+indexed by that backfill.
+"""
+
+import json
+from collections import defaultdict
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "d0e1f2a3b4c5"
+down_revision = "c9d0e1f2a3b4"
+branch_labels = None
+depends_on = None
+
+_BATCH_SIZE = 5000
+# DNS names are at most 253 characters; longer selectors are not indexed.
+_MAX_SELECTOR_LENGTH = 253
+
+report_records = sa.table(
+    "report_records",
+    sa.column("id", sa.Integer()),
+    sa.column("report_id", sa.Integer()),
+    sa.column("count", sa.Integer()),
+    sa.column("dkim_auth_details", sa.Text()),
+)
+dmarc_reports = sa.table(
+    "dmarc_reports",
+    sa.column("id", sa.Integer()),
+    sa.column("domain_id", sa.Integer()),
+    sa.column("begin_date", sa.Integer()),
+    sa.column("end_date", sa.Integer()),
+    sa.column("source_projection_at", sa.DateTime()),
+)
+domains = sa.table("domains", sa.column("id", sa.Integer()), sa.column("name", sa.String()))
+
+
+def _aligned(entry_domain, monitored_domain: str) -> bool:
+    value = str(entry_domain or "").strip().strip(".").lower()
+    return not value or value == monitored_domain or value.endswith(f".{monitored_domain}")
+
+
+def _selector_results(raw_details, monitored_domain: str) -> dict:
+    details = raw_details
+    if isinstance(raw_details, (str, bytes)):
+        # JSONB columns arrive decoded on PostgreSQL; text columns do not.
+        try:
+            details = json.loads(raw_details)
+        except ValueError:
+            return {}
+    results: dict = {}
+    for auth in details if isinstance(details, list) else []:
+        if not isinstance(auth, dict) or not _aligned(auth.get("domain"), monitored_domain):
+            continue
+        selector = str(auth.get("selector") or "").strip()
+        if selector and len(selector) <= _MAX_SELECTOR_LENGTH:
+            results.setdefault(selector, set()).add(
+                str(auth.get("result") or "unknown").strip().lower()
+            )
+    return results
+
+
+def _record_batches(bind):
+    after = 0
+    while True:
+        rows = bind.execute(
+            sa.select(
+                report_records.c.id,
+                report_records.c.report_id,
+                report_records.c.count,
+                report_records.c.dkim_auth_details,
+                dmarc_reports.c.domain_id,
+                dmarc_reports.c.begin_date,
+                dmarc_reports.c.end_date,
+                domains.c.name,
+            )
+            .select_from(
+                report_records.join(
+                    dmarc_reports, dmarc_reports.c.id == report_records.c.report_id
+                ).join(domains, domains.c.id == dmarc_reports.c.domain_id)
+            )
+            .where(
+                dmarc_reports.c.source_projection_at.isnot(None),
+                report_records.c.dkim_auth_details.isnot(None),
+                report_records.c.id > after,
+            )
+            .order_by(report_records.c.id)
+            .limit(_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        after = rows[-1].id
+
+
+def _backfill(observations_table) -> None:
+    observations = defaultdict(
+        lambda: {"first_seen": None, "last_seen": 0, "counts": [0, 0, 0], "reports": set()}
+    )
+    for rows in _record_batches(op.get_bind()):
+        for row in rows:
+            begin, end = int(row.begin_date or 0), int(row.end_date or 0)
+            observed = end or begin
+            first_seen, last_seen = begin or observed, end or observed
+            count = max(0, int(row.count or 0))
+            monitored_domain = str(row.name or "").strip().strip(".").lower()
+            for selector, results in _selector_results(
+                row.dkim_auth_details, monitored_domain
+            ).items():
+                item = observations[(row.domain_id, selector, observed - observed % 86_400)]
+                item["first_seen"] = min(item["first_seen"] or first_seen, first_seen)
+                item["last_seen"] = max(item["last_seen"], last_seen)
+                item["reports"].add(row.report_id)
+                item["counts"][0] += count
+                if "fail" in results:
+                    item["counts"][2] += count
+                elif "pass" in results:
+                    item["counts"][1] += count
+    if observations:
+        op.bulk_insert(
+            observations_table,
+            [
+                {
+                    "domain_id": domain_id,
+                    "selector": selector,
+                    "observed_at": observed_at,
+                    "first_seen": item["first_seen"],
+                    "last_seen": item["last_seen"],
+                    "report_count": len(item["reports"]),
+                    "message_count": item["counts"][0],
+                    "pass_count": item["counts"][1],
+                    "fail_count": item["counts"][2],
+                }
+                for (domain_id, selector, observed_at), item in observations.items()
+            ],
+        )
+
+
+def upgrade():
+    observations_table = op.create_table(
+        "domain_dkim_selector_observations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("domain_id", sa.Integer(), nullable=False),
+        sa.Column("selector", sa.String(length=255), nullable=False),
+        sa.Column("observed_at", sa.Integer(), nullable=False),
+        sa.Column("first_seen", sa.Integer(), nullable=False),
+        sa.Column("last_seen", sa.Integer(), nullable=False),
+        sa.Column("report_count", sa.Integer(), nullable=False),
+        sa.Column("message_count", sa.Integer(), nullable=False),
+        sa.Column("pass_count", sa.Integer(), nullable=False),
+        sa.Column("fail_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["domain_id"], ["domains.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "domain_id",
+            "selector",
+            "observed_at",
+            name="uq_domain_dkim_selector_observation",
+        ),
+    )
+    op.create_index(
+        "ix_domain_dkim_selector_observations_id", "domain_dkim_selector_observations", ["id"]
+    )
+    op.create_index(
+        "ix_domain_dkim_selector_observations_domain_id",
+        "domain_dkim_selector_observations",
+        ["domain_id"],
+    )
+    op.create_index(
+        "ix_domain_dkim_selector_observations_last_seen",
+        "domain_dkim_selector_observations",
+        ["domain_id", "last_seen"],
+    )
+    _backfill(observations_table)
+
+
+def downgrade():
+    op.drop_index(
+        "ix_domain_dkim_selector_observations_last_seen",
+        table_name="domain_dkim_selector_observations",
+    )
+    op.drop_index(
+        "ix_domain_dkim_selector_observations_domain_id",
+        table_name="domain_dkim_selector_observations",
+    )
+    op.drop_index(
+        "ix_domain_dkim_selector_observations_id", table_name="domain_dkim_selector_observations"
+    )
+    op.drop_table("domain_dkim_selector_observations")
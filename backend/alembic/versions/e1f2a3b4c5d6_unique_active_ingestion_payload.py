@@ -0,0 +1,48 @@
+"""Allow one active ingestion job per payload.
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+
+A partial unique index on ``ingestion_jobs`` covers jobs that are queued,
+backing off or running, so two identical submissions racing each other queue
+the payload once. Jobs that already duplicate an active job are marked failed
+first; the newest one keeps the payload's place in the queue.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "e1f2a3b4c5d6"
+down_revision = "d0e1f2a3b4c5"
+branch_labels = None
+depends_on = None
+
+ACTIVE_INGESTION_JOB_SQL = "status IN ('queued', 'backoff', 'running')"
+
+
+def upgrade() -> None:
+    op.execute(
+        sa.text(
+            "UPDATE ingestion_jobs SET status = 'failed', payload = NULL, "
+            "last_error = 'Superseded by an identical queued job' "
+            f"WHERE {ACTIVE_INGESTION_JOB_SQL} AND EXISTS ("
+            "SELECT 1 FROM ingestion_jobs AS newer "
+            "WHERE newer.kind = ingestion_jobs.kind "
+            "AND newer.content_sha256 = ingestion_jobs.content_sha256 "
+            "AND coalesce(newer.workspace_id, 0) = coalesce(ingestion_jobs.workspace_id, 0) "
+            "AND newer.status IN ('queued', 'backoff', 'running') "
+            "AND newer.id > ingestion_jobs.id)"
+        )
+    )
+    op.create_index(
+        "uq_ingestion_jobs_active_payload",
+        "ingestion_jobs",
+        ["kind", sa.text("coalesce(workspace_id, 0)"), "content_sha256"],
+        unique=True,
+        postgresql_where=sa.text(ACTIVE_INGESTION_JOB_SQL),
+        sqlite_where=sa.text(ACTIVE_INGESTION_JOB_SQL),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_ingestion_jobs_active_payload", table_name="ingestion_jobs")
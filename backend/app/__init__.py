@@ -1,3 +1,8 @@
 """DMARQ - DMARC monitoring and analysis platform."""
 
+import time as _time
+
 __version__ = "1.195.9"
+
+# Reference point for the startup phase timings reported by ``/health``.
+IMPORT_STARTED_AT = _time.perf_counter()
@@ -42,8 +42,8 @@ from app.core.logto import (
     SESSION_COOKIE,
     CookieStorage,
     create_session_token,
-    decode_session_token,
     make_logto_client,
+    session_user_id_for_request,
     sync_logto_user,
 )
 from app.models.user import User
@@ -524,7 +524,7 @@ async def get_current_user(
             detail="Not authenticated",
         )
 
-    user_id = decode_session_token(token)
+    user_id = session_user_id_for_request(request)
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Uplo
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+from app.core.concurrency import run_blocking
 from app.core.database import get_db
 from app.core.security import require_admin_auth, require_api_token_scope
 from app.models.workspace import Workspace
@@ -17,6 +18,11 @@ from app.services.delivery_events import (
     list_delivery_events,
 )
 from app.services.dsn_parser import MAX_DSN_BYTES, DSNParseError
+from app.services.ingestion_queue import (
+    INGESTION_KIND_DSN,
+    accept_for_ingestion,
+    ingestion_queue_enabled,
+)
 from app.services.workspace_access import (
     PERMISSION_REPORTS_READ,
     PERMISSION_REPORTS_WRITE,
@@ -109,8 +115,18 @@ async def upload_delivery_status_notification(
         raise HTTPException(
             status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail="DSN exceeds 5 MiB"
         )
+    if ingestion_queue_enabled():
+        return await accept_for_ingestion(
+            db,
+            kind=INGESTION_KIND_DSN,
+            payload=raw,
+            workspace_id=workspace.id,
+            filename=file.filename,
+            options={"source_system": "manual_dsn_upload"},
+        )
     try:
-        return ingest_dsn_email(
+        return await run_blocking(
+            ingest_dsn_email,
             db,
             raw,
             workspace_id=workspace.id,
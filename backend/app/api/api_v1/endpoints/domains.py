@@ -17,17 +17,18 @@ import httpx
 from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Request, status
 from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings, uses_legacy_demo_fixtures
-from app.core.database import SessionLocal, get_db
+from app.core.database import SessionLocal, get_db, get_read_db
 from app.core.redaction import sanitize_for_log
 from app.core.security import require_admin_auth
 from app.models.dns_cache import DNSCache
 from app.models.dns_zone_baseline import DNSZoneBaseline
 from app.models.domain import Domain
-from app.models.report import DMARCReport, ReportRecord
+from app.models.report import DMARCReport, DomainDKIMSelectorObservation
 from app.models.setting import Setting
 from app.models.workspace import Workspace
 from app.services.akamai_edgedns import get_akamai_edgedns_credentials
@@ -125,9 +126,10 @@ from app.services.organizations import (
     OrganizationPlanLimitError,
     require_organization_plan_limit,
 )
-from app.services.provider_access import require_provider_operator_access
 from app.services.ovh_dns import get_ovh_dns_credentials
+from app.services.provider_access import require_provider_operator_access
 from app.services.ptr_lookup import PtrLookupResult, lookup_ptr_with_fallbacks
+from app.services.read_model_etags import conditional_read_model
 from app.services.remediation_dispatch import (
     attach_remediation_dispatch_previews,
     summarize_remediation_activity,
@@ -167,6 +169,7 @@ from app.services.source_network import (
 )
 from app.services.source_read_projection import (
     load_domain_source_read_projection,
+    observed_dkim_selectors,
 )
 from app.services.source_reputation import (
     SourceReputation,
@@ -3479,51 +3482,50 @@ def _get_domain_selectors_map_from_db(db: Session, domain_names: List[str]) -> D
     return selectors_by_domain
 
 
-def _selectors_from_dkim_auth_details(raw_details: str) -> List[str]:
-    try:
-        details = json.loads(raw_details or "[]")
-    except (TypeError, json.JSONDecodeError):
-        return []
-    if not isinstance(details, list):
-        return []
-    selectors: List[str] = []
-    for detail in details:
-        if not isinstance(detail, dict):
-            continue
-        selector = str(detail.get("selector") or "").strip()
-        if selector and selector not in selectors:
-            selectors.append(selector)
-    return selectors
-
-
 def _get_report_selectors_map_from_db(
     db: Session,
     domain_names: List[str],
     *,
     workspace_id: Optional[int] = None,
 ) -> Dict[str, List[str]]:
-    """Return DKIM selectors observed in persisted report records."""
+    """Return DKIM selectors observed in persisted reports, from the ingest-time index.
+
+    Domains with reports the projection backfill has not indexed yet, such as
+    after a report was deleted, read their selectors from the report records.
+    """
     if not domain_names:
         return {}
 
     unique_names = list(dict.fromkeys(domain_names))
     selectors_by_domain: Dict[str, List[str]] = {}
+    observation = DomainDKIMSelectorObservation
     for index in range(0, len(unique_names), DOMAIN_SELECTOR_LOOKUP_CHUNK_SIZE):
         chunk = unique_names[index : index + DOMAIN_SELECTOR_LOOKUP_CHUNK_SIZE]
         query = (
-            db.query(Domain.name, ReportRecord.dkim_auth_details)
-            .join(DMARCReport, DMARCReport.domain_id == Domain.id)
-            .join(ReportRecord, ReportRecord.report_id == DMARCReport.id)
+            db.query(Domain.name, observation.selector)
+            .join(observation, observation.domain_id == Domain.id)
             .filter(Domain.name.in_(chunk))
-            .filter(ReportRecord.dkim_auth_details.isnot(None))
         )
         if workspace_id is not None:
             query = query.filter(Domain.workspace_id == workspace_id)
-        for domain_name, raw_details in query.all():
-            domain_selectors = selectors_by_domain.setdefault(domain_name, [])
-            for selector in _selectors_from_dkim_auth_details(raw_details):
-                if selector and selector not in domain_selectors:
-                    domain_selectors.append(selector)
+        rows = query.group_by(Domain.name, observation.selector).order_by(
+            Domain.name, func.min(observation.first_seen), observation.selector
+        )
+        for domain_name, selector in rows:
+            selectors_by_domain.setdefault(domain_name, []).append(selector)
+        pending = (
+            db.query(Domain.id, Domain.name)
+            .join(DMARCReport, DMARCReport.domain_id == Domain.id)
+            .filter(Domain.name.in_(chunk), DMARCReport.source_projection_at.is_(None))
+        )
+        if workspace_id is not None:
+            pending = pending.filter(Domain.workspace_id == workspace_id)
+        for domain_id, domain_name in pending.distinct():
+            selectors = observed_dkim_selectors(db, domain_id, domain_name)
+            if selectors:
+                selectors_by_domain[domain_name] = selectors
+            else:
+                selectors_by_domain.pop(domain_name, None)
     return selectors_by_domain
 
 
@@ -5300,13 +5302,44 @@ def _filter_summary_domains(
 
 
 @router.get("/summary", response_model=DomainSummaryResponse)
+async def get_domains_summary_read_model(
+    request: Request,
+    response: Response,
+    refresh: bool = Query(False, title="Refresh cached DNS results"),
+    include_empty: bool = Query(
+        True,
+        title="Include domains with no reports or observed mail volume",
+    ),
+    db: Session = Depends(get_read_db),
+    _auth: dict = Depends(require_admin_auth),
+    selected_workspace: Optional[str] = Header(default=None, alias="X-DMARQ-Workspace-ID"),
+):
+    """Serve the domain summary, answering an unchanged poll with 304 Not Modified."""
+    if not refresh:
+        workspace = _authorized_domain_read_workspace(
+            _auth, db, parse_selected_workspace_id(selected_workspace)
+        )
+        not_modified = conditional_read_model(
+            db, request, response, workspace_id=workspace.id, auth_context=_auth
+        )
+        if not_modified is not None:
+            return not_modified
+    return await get_domains_summary(
+        refresh=refresh,
+        include_empty=include_empty,
+        db=db,
+        _auth=_auth,
+        selected_workspace=selected_workspace,
+    )
+
+
 async def get_domains_summary(
     refresh: bool = Query(False, title="Refresh cached DNS results"),
     include_empty: bool = Query(
         True,
         title="Include domains with no reports or observed mail volume",
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_admin_auth),
     selected_workspace: Optional[str] = Header(default=None, alias="X-DMARQ-Workspace-ID"),
 ):
@@ -5501,7 +5534,7 @@ async def get_workspace_health_score_history(
     end_date: Optional[date] = Query(None, title="End date for score history"),
     limit: int = Query(120, ge=1, le=400, title="Maximum history points"),
     selected_workspace: Optional[str] = Header(default=None, alias="X-DMARQ-Workspace-ID"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_admin_auth),
 ):
     """Return selected-workspace health score history aggregated across domains."""
@@ -5551,7 +5584,7 @@ async def export_workspace_health_evidence(
         title="Evidence export format",
     ),
     selected_workspace: Optional[str] = Header(default=None, alias="X-DMARQ-Workspace-ID"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_admin_auth),
 ):
     """Export sanitized selected-workspace health score evidence as CSV or JSON."""
@@ -5882,7 +5915,7 @@ async def export_all_domain_dns_lint(
     refresh: bool = Query(False, title="Refresh cached DNS results"),
     limit: int = Query(500, ge=1, le=1000, title="Maximum domains to export"),
     locale: Optional[str] = Query(None, title="Operator guidance locale"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_admin_auth),
 ):
     """Export typed DNS lint findings for monitored domains as CSV."""
@@ -7169,6 +7202,8 @@ async def _build_domain_posture_dashboard_for_workspace(
 
 @router.get("/{domain_id}/detail/cached")
 async def get_cached_domain_detail_read_model(  # pylint: disable=too-many-locals
+    request: Request,
+    response: Response,
     domain_id: str = Path(..., title="The domain ID or name"),
     db: Session = Depends(get_db),
     _auth: dict = Depends(require_admin_auth),
@@ -7181,6 +7216,11 @@ async def get_cached_domain_detail_read_model(  # pylint: disable=too-many-local
     domain-scoped store and forbids live DNS/provider/reputation enrichment.
     """
     workspace = _authorized_domain_read_workspace(_auth, db)
+    not_modified = conditional_read_model(
+        db, request, response, workspace_id=workspace.id, auth_context=_auth, domain=domain_id
+    )
+    if not_modified is not None:
+        return not_modified
     domain_name, store = _single_domain_report_store_for_read(db, domain_id, workspace)
 
     manual_selectors = _get_domain_selectors_from_db(db, domain_name)
@@ -7784,7 +7824,7 @@ async def export_domain_health_evidence(
         title="Evidence export format",
     ),
     selected_workspace: Optional[str] = Header(default=None, alias="X-DMARQ-Workspace-ID"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_admin_auth),
 ):
     """Export sanitized health score evidence for one domain as CSV or JSON."""
@@ -8278,7 +8318,7 @@ async def export_domain_reports(
     domain_id: str = Path(..., title="The domain ID or name"),
     start_date: Optional[date] = Query(None, title="Start date for exported reports"),
     end_date: Optional[date] = Query(None, title="End date for exported reports"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_admin_auth),
 ):
     """
@@ -9344,6 +9384,28 @@ async def _source_reputations_by_ip(
 
 
 @router.get("/{domain_id}/sources", response_model=DomainSourcesResponse)
+async def get_domain_sources_read_model(
+    request: Request,
+    response: Response,
+    domain_id: str = Path(..., title="The domain ID or name"),
+    days: Optional[int] = Query(None, ge=1, le=3650, title="Number of days to look back"),
+    refresh: bool = Query(False, title="Refresh cached source reputation evidence"),
+    db: Session = Depends(get_db),
+    _auth: dict = Depends(require_admin_auth),
+):
+    """Serve a domain's sending sources, answering an unchanged poll with 304."""
+    if not refresh:
+        workspace = _authorized_domain_read_workspace(_auth, db)
+        not_modified = conditional_read_model(
+            db, request, response, workspace_id=workspace.id, auth_context=_auth, domain=domain_id
+        )
+        if not_modified is not None:
+            return not_modified
+    return await get_domain_sources(
+        domain_id=domain_id, days=days, refresh=refresh, db=db, _auth=_auth
+    )
+
+
 async def get_domain_sources(
     domain_id: str = Path(..., title="The domain ID or name"),
     days: Optional[int] = Query(None, ge=1, le=3650, title="Number of days to look back"),
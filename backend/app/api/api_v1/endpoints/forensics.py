@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Uplo
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session, selectinload
 
+from app.core.concurrency import run_blocking
 from app.core.config import get_settings, uses_legacy_demo_fixtures
 from app.core.database import get_db
 from app.core.security import require_admin_auth
@@ -15,14 +16,19 @@ from app.services.demo_data import (
     get_demo_forensic_report,
     list_demo_forensic_reports,
 )
-from app.services.forensic_analysis import analyze_forensic_report, summarize_forensic_samples
-from app.services.forensic_parser import MAX_FORENSIC_REPORT_SIZE, ForensicParser
-from app.services.forensic_persistence import (
-    forensic_report_exists,
-    forensic_report_to_dict,
-    save_forensic_report,
+from app.services.forensic_analysis import (
+    analyze_forensic_report,
+    summarize_forensic_reports,
 )
+from app.services.forensic_parser import MAX_FORENSIC_REPORT_SIZE
+from app.services.forensic_persistence import forensic_report_to_dict
 from app.services.forensic_redaction import get_forensic_redaction_policy
+from app.services.ingestion_queue import (
+    INGESTION_KIND_FORENSIC,
+    accept_for_ingestion,
+    ingestion_queue_enabled,
+)
+from app.services.report_uploads import store_forensic_upload
 from app.services.workspace_access import (
     PERMISSION_REPORTS_READ,
     PERMISSION_REPORTS_WRITE,
@@ -191,7 +197,8 @@ async def upload_forensic_report(
     selected_workspace: Optional[str] = Header(default=None, alias="X-DMARQ-Workspace-ID"),
 ):
     """Upload and store a DMARC forensic/failure report email."""
-    workspace = _authorized_reports_workspace(
+    workspace = await run_blocking(
+        _authorized_reports_workspace,
         _auth,
         db,
         PERMISSION_REPORTS_WRITE,
@@ -200,28 +207,16 @@ async def upload_forensic_report(
     try:
         content = await file.read()
         _validate_upload(file, content)
-        redaction_policy = get_forensic_redaction_policy(db)
-        parsed = ForensicParser.parse_bytes(content, redaction_policy=redaction_policy)
-        if forensic_report_exists(db, parsed["report_id"], workspace_id=workspace.id):
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Forensic report has already been uploaded.",
-            )
-
-        row, created = save_forensic_report(db, parsed, workspace_id=workspace.id)
-        if not created:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Forensic report has already been uploaded.",
+        if ingestion_queue_enabled():
+            return await accept_for_ingestion(
+                db,
+                kind=INGESTION_KIND_FORENSIC,
+                payload=content,
+                workspace_id=workspace.id,
+                filename=file.filename,
             )
-        db.commit()
-        db.refresh(row)
-        return ForensicUploadResponse(
-            success=True,
-            report_id=row.report_id,
-            domain=row.reported_domain,
-            message="Forensic report processed successfully.",
-        )
+        result = await run_blocking(store_forensic_upload, db, content, workspace.id)
+        return ForensicUploadResponse(**result)
     except HTTPException:
         raise
     except ValueError as exc:
@@ -331,18 +326,13 @@ async def analyze_forensic_reports(
         delivery_result=delivery_result,
         workspace_id=workspace.id,
     )
-    total_available = query.count()
-    rows = (
-        query.order_by(ForensicReport.arrival_date.desc().nullslast(), ForensicReport.id.desc())
-        .limit(page_size)
-        .all()
-    )
     redaction_policy = get_forensic_redaction_policy(db)
     return ForensicAnalysisResponse(
-        **summarize_forensic_samples(
-            rows,
+        **summarize_forensic_reports(
+            db,
+            query,
+            sample_limit=page_size,
             redaction_policy=redaction_policy,
-            total_available=total_available,
         )
     )
 
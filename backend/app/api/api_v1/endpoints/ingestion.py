@@ -0,0 +1,114 @@
+"""Status and dead-letter controls for the durable ingestion queue."""
+
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from sqlalchemy import or_
+from sqlalchemy.orm import Query as SQLAlchemyQuery
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.security import require_admin_auth
+from app.models.ingestion_job import IngestionJob
+from app.models.workspace import Workspace
+from app.services.ingestion_queue import (
+    INGESTION_STATUSES,
+    ingestion_job_to_dict,
+    notify_ingestion_workers,
+    requeue_ingestion_job,
+)
+from app.services.workspace_access import (
+    PERMISSION_REPORTS_READ,
+    PERMISSION_REPORTS_WRITE,
+    parse_selected_workspace_id,
+    resolve_authorized_workspace,
+)
+from app.services.workspaces import DEFAULT_WORKSPACE_SLUG
+
+router = APIRouter()
+
+
+def _workspace_jobs(db: Session, workspace: Workspace) -> SQLAlchemyQuery:
+    """Scope jobs to one workspace; email-worker jobs belong to the default one."""
+    if workspace.slug == DEFAULT_WORKSPACE_SLUG:
+        scope = or_(
+            IngestionJob.workspace_id == workspace.id,
+            IngestionJob.workspace_id.is_(None),
+        )
+    else:
+        scope = IngestionJob.workspace_id == workspace.id
+    return db.query(IngestionJob).filter(scope)
+
+
+def _get_job_or_404(db: Session, workspace: Workspace, job_id: int) -> IngestionJob:
+    job = _workspace_jobs(db, workspace).filter(IngestionJob.id == job_id).first()
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingestion job not found")
+    return job
+
+
+@router.get("/jobs")
+async def list_ingestion_jobs(
+    job_status: Optional[str] = Query(default=None, alias="status"),
+    limit: int = Query(default=50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    _auth: dict = Depends(require_admin_auth),
+    selected_workspace: Optional[str] = Header(default=None, alias="X-DMARQ-Workspace-ID"),
+) -> List[Dict[str, Any]]:
+    """List recent ingestion jobs, optionally filtered to one status such as dead_letter."""
+    workspace = resolve_authorized_workspace(
+        db,
+        _auth,
+        PERMISSION_REPORTS_READ,
+        selected_workspace_id=parse_selected_workspace_id(selected_workspace),
+    )
+    if job_status is not None and job_status not in INGESTION_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"status must be one of: {', '.join(INGESTION_STATUSES)}",
+        )
+    query = _workspace_jobs(db, workspace)
+    if job_status is not None:
+        query = query.filter(IngestionJob.status == job_status)
+    rows = query.order_by(IngestionJob.created_at.desc(), IngestionJob.id.desc()).limit(limit)
+    return [ingestion_job_to_dict(row) for row in rows.all()]
+
+
+@router.get("/jobs/{job_id}")
+async def get_ingestion_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    _auth: dict = Depends(require_admin_auth),
+    selected_workspace: Optional[str] = Header(default=None, alias="X-DMARQ-Workspace-ID"),
+) -> Dict[str, Any]:
+    """Return the status, attempts, and result of one accepted upload or email."""
+    workspace = resolve_authorized_workspace(
+        db,
+        _auth,
+        PERMISSION_REPORTS_READ,
+        selected_workspace_id=parse_selected_workspace_id(selected_workspace),
+    )
+    return ingestion_job_to_dict(_get_job_or_404(db, workspace, job_id))
+
+
+@router.post("/jobs/{job_id}/retry")
+async def retry_ingestion_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    _auth: dict = Depends(require_admin_auth),
+    selected_workspace: Optional[str] = Header(default=None, alias="X-DMARQ-Workspace-ID"),
+) -> Dict[str, Any]:
+    """Re-queue a failed or dead-lettered job with its stored payload."""
+    workspace = resolve_authorized_workspace(
+        db,
+        _auth,
+        PERMISSION_REPORTS_WRITE,
+        selected_workspace_id=parse_selected_workspace_id(selected_workspace),
+    )
+    job = _get_job_or_404(db, workspace, job_id)
+    try:
+        job = requeue_ingestion_job(db, job)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    notify_ingestion_workers()
+    return ingestion_job_to_dict(job)
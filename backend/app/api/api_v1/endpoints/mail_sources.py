@@ -43,6 +43,12 @@ from app.services.demo_data import (
 from app.services.gmail_client import GmailClient
 from app.services.imap_client import IMAPClient
 from app.services.import_history import record_import_attempt
+from app.services.ingestion_dedup import (
+    CONNECTOR_GMAIL,
+    CONNECTOR_M365,
+    load_ingested_message_ids,
+    record_ingested_message_ids,
+)
 from app.services.mail_source_backfill_worker import run_mail_source_backfill_job_by_id
 from app.services.mailbox_recovery import (
     connection_diagnostic,
@@ -1100,7 +1106,7 @@ def _fetch_gmail_source(source: MailSource, db: Session) -> Dict[str, Any]:
             detail="Gmail account not yet authorised. Complete OAuth2 flow first.",
         )
 
-    already = GmailClient.load_ingested_ids(source.gmail_ingested_ids)
+    already = load_ingested_message_ids(db, source, CONNECTOR_GMAIL)
     client = GmailClient(
         client_id=source.gmail_client_id or "",
         client_secret=source.gmail_client_secret or "",
@@ -1114,9 +1120,7 @@ def _fetch_gmail_source(source: MailSource, db: Session) -> Dict[str, Any]:
     started_at = datetime.utcnow()
     results = client.fetch_reports()
 
-    if results.get("new_ingested_ids"):
-        all_ids = list(dict.fromkeys(already + results["new_ingested_ids"]))
-        source.gmail_ingested_ids = GmailClient.dump_ingested_ids(all_ids)
+    record_ingested_message_ids(db, source, CONNECTOR_GMAIL, results.get("new_ingested_ids") or [])
 
     refreshed = client.get_refreshed_tokens()
     if refreshed:
@@ -1141,7 +1145,7 @@ def _fetch_m365_source(source: MailSource, db: Session, days: int = 7) -> Dict[s
             ),
         )
 
-    already = MicrosoftGraphClient.load_ingested_ids(source.m365_ingested_ids)
+    already = load_ingested_message_ids(db, source, CONNECTOR_M365)
     client = MicrosoftGraphClient(
         tenant_id=source.m365_tenant_id or "common",
         client_id=source.m365_client_id or "",
@@ -1160,9 +1164,7 @@ def _fetch_m365_source(source: MailSource, db: Session, days: int = 7) -> Dict[s
     started_at = datetime.utcnow()
     results = client.fetch_reports(days=days)
 
-    if results.get("new_ingested_ids"):
-        all_ids = list(dict.fromkeys(already + results["new_ingested_ids"]))
-        source.m365_ingested_ids = MicrosoftGraphClient.dump_ingested_ids(all_ids)
+    record_ingested_message_ids(db, source, CONNECTOR_M365, results.get("new_ingested_ids") or [])
 
     refreshed = client.get_refreshed_tokens()
     if refreshed:
@@ -2587,7 +2589,7 @@ async def gmail_fetch_reports(
             detail="Gmail account not yet authorised. Complete OAuth2 flow first.",
         )
 
-    already = GmailClient.load_ingested_ids(source.gmail_ingested_ids)
+    already = load_ingested_message_ids(db, source, CONNECTOR_GMAIL)
     client = GmailClient(
         client_id=source.gmail_client_id or "",
         client_secret=source.gmail_client_secret or "",
@@ -2602,9 +2604,7 @@ async def gmail_fetch_reports(
     results = client.fetch_reports()
 
     # Persist updated ingested IDs and any refreshed tokens
-    if results.get("new_ingested_ids"):
-        all_ids = list(dict.fromkeys(already + results["new_ingested_ids"]))
-        source.gmail_ingested_ids = GmailClient.dump_ingested_ids(all_ids)
+    record_ingested_message_ids(db, source, CONNECTOR_GMAIL, results.get("new_ingested_ids") or [])
 
     refreshed = client.get_refreshed_tokens()
     if refreshed:
@@ -2,16 +2,18 @@
 
 from __future__ import annotations
 
+import json
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.encoders import jsonable_encoder
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
 from sqlalchemy.orm import Session
 
 from app.api.api_v1.endpoints import domains
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.core.security import require_api_token_scope
 from app.services.ai_assistance import (
     build_action_proposals,
@@ -31,6 +33,9 @@ from app.services.workspace_usage import build_workspace_usage_summary
 
 router = APIRouter()
 
+MCP_BATCH_MAX_REQUESTS = 50
+MCP_STREAM_CHUNK_SIZE = 64 * 1024
+
 
 class MCPRequest(BaseModel):
     """Minimal JSON-RPC request for MCP HTTP integrations."""
@@ -541,21 +546,56 @@ async def _call_read_only_tool(
     raise KeyError(name)
 
 
-@router.post("")
-async def mcp_jsonrpc(
-    payload: MCPRequest,
-    request: Request,
-    db: Session = Depends(get_db),
-    _auth: dict = Depends(require_api_token_scope(MCP_READ_SCOPE)),
+class _ToolBatch:
+    """Shared state for the tool calls of one JSON-RPC request or batch.
+
+    Calls share the request's database session, auth context and workspace, so
+    they run one at a time. Identical calls (same tool, same arguments) run
+    once and share the result, and the audit entries are written with a single
+    commit at the end.
+    """
+
+    def __init__(self, db: Session, auth_context: Dict[str, Any], workspace) -> None:
+        self.db = db
+        self.auth_context = auth_context
+        self.workspace = workspace
+        self.called: List[str] = []
+        self._results: Dict[Tuple[str, str], Any] = {}
+
+    async def call(self, name: str, arguments: Dict[str, Any]) -> Any:
+        key = (name, json.dumps(arguments, sort_keys=True, default=str))
+        if key not in self._results:
+            self._results[key] = await _call_read_only_tool(
+                name,
+                arguments,
+                db=self.db,
+                auth_context=self.auth_context,
+                workspace_id=self.workspace.id,
+            )
+        self.called.append(name)
+        return self._results[key]
+
+    def record(self, request: Request) -> None:
+        if not self.called:
+            return
+        for name in self.called:
+            record_workspace_audit_log(
+                self.db,
+                workspace=self.workspace,
+                action="mcp.tool_called",
+                entity_type="mcp_tool",
+                entity_id=name,
+                entity_name=name,
+                details={"tool": name, "read_only": True},
+                auth_context=self.auth_context,
+                request=request,
+            )
+        self.db.commit()
+
+
+async def _handle_request(
+    payload: MCPRequest, batch: _ToolBatch, *, in_batch: bool = False
 ) -> Dict[str, Any]:
-    """Handle a small read-only MCP tool surface over JSON-RPC."""
-    _require_mcp_enabled(db)
-    workspace = resolve_authorized_workspace(
-        db,
-        _auth,
-        PERMISSION_REPORTS_READ,
-    )
-    _require_advanced_integrations(db, workspace)
     if payload.method == "initialize":
         return _jsonrpc_response(
             payload.id,
@@ -574,15 +614,8 @@ async def mcp_jsonrpc(
         )
 
     name = payload.params.get("name")
-    arguments = payload.params.get("arguments") or {}
     try:
-        result = await _call_read_only_tool(
-            str(name),
-            arguments,
-            db=db,
-            auth_context=_auth,
-            workspace_id=workspace.id,
-        )
+        result = await batch.call(str(name), payload.params.get("arguments") or {})
     except KeyError:
         return _jsonrpc_response(
             payload.id,
@@ -590,19 +623,18 @@ async def mcp_jsonrpc(
         )
     except ValueError as exc:
         return _jsonrpc_response(payload.id, error={"code": -32004, "message": str(exc)})
-
-    record_workspace_audit_log(
-        db,
-        workspace=workspace,
-        action="mcp.tool_called",
-        entity_type="mcp_tool",
-        entity_id=name,
-        entity_name=name,
-        details={"tool": name, "read_only": True},
-        auth_context=_auth,
-        request=request,
-    )
-    db.commit()
+    except HTTPException as exc:
+        # A single request keeps its HTTP status; one failing batch member must
+        # not discard the results of the others.
+        if not in_batch:
+            raise
+        # The failed tool may have left the shared session's transaction
+        # aborted; later members and the audit commit need a clean one.
+        batch.db.rollback()
+        return _jsonrpc_response(
+            payload.id,
+            error={"code": -32004, "message": str(exc.detail), "data": {"status": exc.status_code}},
+        )
     return _jsonrpc_response(
         payload.id,
         {
@@ -610,3 +642,106 @@ async def mcp_jsonrpc(
             "isError": False,
         },
     )
+
+
+async def _handle_batch_item(item: Any, batch: _ToolBatch) -> Optional[Dict[str, Any]]:
+    try:
+        payload = MCPRequest.model_validate(item)
+    except ValidationError:
+        request_id = item.get("id") if isinstance(item, dict) else None
+        return _jsonrpc_response(request_id, error={"code": -32600, "message": "Invalid Request"})
+    response = await _handle_request(payload, batch, in_batch=True)
+    # A member without an id is a notification: it runs, but gets no response.
+    return response if "id" in item else None
+
+
+def _iter_json(value: Any) -> Iterator[str]:
+    """Encode *value* as JSON piece by piece, one list item at a time."""
+    if isinstance(value, dict):
+        yield "{"
+        for index, (key, item) in enumerate(value.items()):
+            yield ("," if index else "") + _dumps(str(key)) + ":"
+            yield from _iter_json(item)
+        yield "}"
+    elif isinstance(value, list):
+        yield "["
+        for index, item in enumerate(value):
+            yield ("," if index else "") + _dumps(item)
+        yield "]"
+    else:
+        yield _dumps(value)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def _json_chunks(value: Any) -> Iterator[bytes]:
+    buffer: List[str] = []
+    size = 0
+    for piece in _iter_json(value):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= MCP_STREAM_CHUNK_SIZE:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def _streaming_json(value: Any) -> StreamingResponse:
+    """Send an already built JSON-RPC response with chunked transfer encoding.
+
+    The tool results are complete in memory at this point; chunking only
+    avoids serializing a large result into one string before sending it.
+    """
+    return StreamingResponse(_json_chunks(value), media_type="application/json")
+
+
+@router.post("")
+async def mcp_jsonrpc(
+    payload: Union[MCPRequest, List[Any]],
+    request: Request,
+    db: Session = Depends(get_read_db),
+    _auth: dict = Depends(require_api_token_scope(MCP_READ_SCOPE)),
+) -> Any:
+    """Handle a small read-only MCP tool surface over JSON-RPC.
+
+    Accepts a single request or a JSON-RPC batch array. Batch members run in
+    order against one session and auth context, identical tool calls are
+    executed once, and the responses are sent back in request order as a
+    chunked body.
+    Notifications (members without an id) get no response.
+    """
+    _require_mcp_enabled(db)
+    workspace = resolve_authorized_workspace(
+        db,
+        _auth,
+        PERMISSION_REPORTS_READ,
+    )
+    _require_advanced_integrations(db, workspace)
+    batch = _ToolBatch(db, _auth, workspace)
+    if isinstance(payload, MCPRequest):
+        response = await _handle_request(payload, batch)
+        batch.record(request)
+        if payload.method != "tools/call" or "error" in response:
+            return response
+        return _streaming_json(response)
+
+    if not payload or len(payload) > MCP_BATCH_MAX_REQUESTS:
+        return _jsonrpc_response(
+            None,
+            error={
+                "code": -32600,
+                "message": f"Batch must contain 1 to {MCP_BATCH_MAX_REQUESTS} requests",
+            },
+        )
+    responses = []
+    for item in payload:
+        response = await _handle_batch_item(item, batch)
+        if response is not None:
+            responses.append(response)
+    batch.record(request)
+    if not responses:
+        return Response(status_code=status.HTTP_202_ACCEPTED)
+    return _streaming_json(responses)
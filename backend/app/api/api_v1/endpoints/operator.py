@@ -33,6 +33,7 @@ from app.services.workspace_access import (
     require_workspace_permission,
     user_for_auth_context,
 )
+from app.services.workspace_access_cache import bump_workspace_access_version
 from app.services.workspace_audit import record_workspace_audit_log
 from app.services.workspace_operator import (
     list_workspace_operator_summaries,
@@ -285,6 +286,7 @@ async def start_support_session(
         auth_context=_auth,
         commit=True,
     )
+    bump_workspace_access_version()
     response.set_cookie(
         SUPPORT_SESSION_COOKIE,
         token,
@@ -343,6 +345,7 @@ async def end_support_session(
                 auth_context=operator_auth,
                 commit=True,
             )
+    bump_workspace_access_version()
     response.delete_cookie(SUPPORT_SESSION_COOKIE, path="/")
     return {"active": False, "session": None, "audit_event": None}
 
@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.api_v1.endpoints import ai, domains, tls_reports
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.core.security import require_api_token_any_scope, require_api_token_scope
 from app.services.ai_assistance import build_action_proposals
 from app.services.alert_history import alert_history_summary, list_workspace_alert_history
@@ -28,7 +28,7 @@ router = APIRouter()
 @router.get("/mail-health/assessment")
 async def public_mail_health_assessment(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_api_token_scope(READ_REPORTS_SCOPE)),
 ):
     """Return one sanitized, deterministic assessment from stored evidence."""
@@ -48,7 +48,7 @@ async def public_mail_health_assessment(
 
 @router.get("/domains", response_model=domains.DomainSummaryResponse)
 async def public_domain_summary(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_api_token_scope(READ_REPORTS_SCOPE)),
 ):
     """List monitored domains with report and DNS posture summary fields."""
@@ -57,7 +57,7 @@ async def public_domain_summary(
 
 @router.get("/exports")
 async def public_export_catalog(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(
         require_api_token_any_scope(
             [READ_REPORTS_SCOPE, READ_POSTURE_SCOPE, READ_TLS_SCOPE, MCP_READ_SCOPE],
@@ -72,7 +72,7 @@ async def public_export_catalog(
 
 @router.get("/usage")
 async def public_workspace_usage(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(
         require_api_token_any_scope(
             [READ_REPORTS_SCOPE, READ_POSTURE_SCOPE, MCP_READ_SCOPE],
@@ -92,7 +92,7 @@ async def public_workspace_usage(
 async def public_domain_posture(
     domain_id: str = Path(..., title="The domain ID or name"),
     refresh: bool = Query(False, title="Refresh cached DNS posture"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_api_token_scope(READ_POSTURE_SCOPE)),
 ):
     """Return the stable evidence-first posture payload for one domain."""
@@ -113,7 +113,7 @@ async def public_domain_posture(
 async def public_domain_dns_lint(
     domain_id: str = Path(..., title="The domain ID or name"),
     refresh: bool = Query(False, title="Refresh cached DNS result"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_api_token_scope(READ_POSTURE_SCOPE)),
 ):
     """Return stable read-only DNS lint findings for one domain."""
@@ -132,7 +132,7 @@ async def public_domain_dns_lint(
 async def public_domain_dns_change_plan(
     domain_id: str = Path(..., title="The domain ID or name"),
     refresh: bool = Query(False, title="Refresh cached DNS result"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_api_token_scope(READ_POSTURE_SCOPE)),
 ):
     """Return public read-only DNS change plans without write affordances."""
@@ -151,7 +151,7 @@ async def public_domain_dns_change_plan(
 )
 async def public_domain_action_proposals(
     domain_id: str = Path(..., title="The domain ID or name"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_api_token_scope(READ_POSTURE_SCOPE)),
 ):
     """Return stable read-only remediation proposals for one domain."""
@@ -169,7 +169,7 @@ async def public_domain_action_proposals(
 async def public_domain_remediation_queue(
     domain_id: str = Path(..., title="The domain ID or name"),
     refresh: bool = Query(False, title="Refresh cached DNS posture"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_api_token_scope(READ_POSTURE_SCOPE)),
 ):
     """Return the prioritized remediation queue without write affordances."""
@@ -189,7 +189,7 @@ async def public_alert_history(
     active: Optional[bool] = Query(None, title="Filter active or resolved alerts"),
     domain: Optional[str] = Query(None, title="Limit alerts to one monitored domain"),
     limit: int = Query(50, ge=1, le=200, title="Maximum alert history rows"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_api_token_scope(READ_POSTURE_SCOPE)),
 ):
     """Return sanitized alert history for the API token workspace."""
@@ -220,7 +220,7 @@ async def public_domain_health_evidence_export(
         pattern="^(csv|json)$",
         title="Evidence export format",
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_api_token_scope(READ_POSTURE_SCOPE)),
 ):
     """Return sanitized domain health evidence without capturing a new snapshot."""
@@ -248,7 +248,7 @@ async def public_domain_health_evidence_export(
 async def public_domain_reports(
     domain_id: str = Path(..., title="The domain ID or name"),
     limit: int = Query(10, ge=1, le=200),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_api_token_scope(READ_REPORTS_SCOPE)),
 ):
     """Return recent DMARC aggregate report summaries for one domain."""
@@ -267,7 +267,7 @@ async def public_domain_reports(
 async def public_domain_sources(
     domain_id: str = Path(..., title="The domain ID or name"),
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_api_token_scope(READ_REPORTS_SCOPE)),
 ):
     """Return enriched DMARC sending sources for one domain."""
@@ -286,7 +286,7 @@ async def public_domain_sources(
 async def public_domain_source_intelligence(
     domain_id: str = Path(..., title="The domain ID or name"),
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_api_token_scope(READ_REPORTS_SCOPE)),
 ):
     """Return regional source summaries and anomaly hints for one domain."""
@@ -303,7 +303,7 @@ async def public_tls_report_summary(
     domain: Optional[str] = Query(default=None),
     days: int = Query(default=30, ge=1, le=365),
     limit: int = Query(default=10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_api_token_scope(READ_TLS_SCOPE)),
 ):
     """Return aggregate SMTP TLS reporting posture trends."""
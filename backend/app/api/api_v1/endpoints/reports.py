@@ -1,27 +1,36 @@
 import asyncio
 import logging
+import time
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, UploadFile, status
 from pydantic import BaseModel, Field
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.concurrency import run_blocking, run_cpu_bound
 from app.core.config import get_settings
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.security import require_admin_auth
-from app.models.domain import Domain
 from app.services.dmarc_parser import DMARCParser
 from app.services.dns_resolver import get_default_provider
-from app.services.organizations import OrganizationPlanLimitError
+from app.services.ingestion_dedup import payload_digest
+from app.services.ingestion_queue import (
+    INGESTION_KIND_AGGREGATE,
+    accept_for_ingestion,
+    ingestion_queue_enabled,
+)
 from app.services.ptr_lookup import PtrLookupResult, lookup_ptr_with_fallbacks
 from app.services.report_persistence import (
     delete_persisted_report,
     hydrate_report_store_from_db,
-    report_exists,
-    save_parsed_report,
+    network_sources_from_db,
+)
+from app.services.report_store import ReportStore, record_to_dict
+from app.services.report_uploads import (
+    raise_for_report_parse_error,
+    reject_known_aggregate_payload,
+    store_aggregate_report,
 )
-from app.services.report_store import ReportStore
 from app.services.sender_classifications import latest_sender_classifications
 from app.services.sender_intelligence import identify_sender, source_geo_for
 from app.services.source_evidence_prewarm import (
@@ -46,7 +55,6 @@ from app.services.workspace_access import (
     parse_selected_workspace_id,
     resolve_authorized_workspace,
 )
-from app.utils.domain_validator import DomainValidationError, normalize_domain_name, validate_domain
 
 logger = logging.getLogger(__name__)
 
@@ -95,51 +103,6 @@ def _selected_workspace_id(selected_workspace: Optional[str]) -> Optional[int]:
     return parse_selected_workspace_id(selected_workspace)
 
 
-def _domain_workspace_conflict(domain: str) -> HTTPException:
-    return HTTPException(
-        status_code=status.HTTP_409_CONFLICT,
-        detail=(
-            f"Domain '{domain}' already belongs to another workspace. "
-            "Move or rename the domain before uploading reports for this workspace."
-        ),
-    )
-
-
-def _raise_if_domain_owned_by_other_workspace(db: Session, domain: str, workspace_id: int) -> None:
-    existing_domain = db.query(Domain).filter(Domain.name == domain).first()
-    if existing_domain is not None and existing_domain.workspace_id != workspace_id:
-        raise _domain_workspace_conflict(domain)
-
-
-def _raise_plan_limit_payment_required(db: Session, exc: OrganizationPlanLimitError) -> None:
-    db.rollback()
-    raise HTTPException(
-        status_code=status.HTTP_402_PAYMENT_REQUIRED,
-        detail=exc.to_detail(),
-    ) from exc
-
-
-def _save_uploaded_report(
-    db: Session, report: Dict[str, Any], domain: str, workspace_id: int
-) -> None:
-    try:
-        save_parsed_report(db, report, workspace_id=workspace_id)
-        db.commit()
-    except OrganizationPlanLimitError as exc:
-        _raise_plan_limit_payment_required(db, exc)
-    except IntegrityError as exc:
-        db.rollback()
-        try:
-            _raise_if_domain_owned_by_other_workspace(db, domain, workspace_id)
-        except HTTPException as conflict:
-            raise conflict from exc
-        try:
-            save_parsed_report(db, report, workspace_id=workspace_id)
-            db.commit()
-        except OrganizationPlanLimitError as plan_exc:
-            _raise_plan_limit_payment_required(db, plan_exc)
-
-
 def _hydrated_report_store(db: Session, workspace) -> ReportStore:
     store = ReportStore()
     hydrate_report_store_from_db(db, store, workspace_id=workspace.id)
@@ -195,21 +158,6 @@ def _validate_upload_file(file: UploadFile, file_content: bytes) -> None:
     _validate_mime_type(file_content)
 
 
-def _handle_upload_value_error(filename: str, error_message: str) -> None:
-    """Translate a parser ValueError into a sanitized HTTPException.
-
-    Always raises — never returns.
-    """
-    logger.error("ValueError processing report %s: %s", filename, error_message)
-    if "too large" in error_message.lower():
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large"
-        )
-    if "zip bomb" in error_message.lower():
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid archive file")
-    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid report format")
-
-
 class UploadResponse(BaseModel):
     """Response model for report upload"""
 
@@ -282,7 +230,8 @@ async def upload_report(
     - Zip bomb protection
     - Sanitized error messages
     """
-    workspace = _authorized_reports_workspace(
+    workspace = await run_blocking(
+        _authorized_reports_workspace,
         _auth,
         db,
         PERMISSION_REPORTS_WRITE,
@@ -292,59 +241,26 @@ async def upload_report(
         # Read content first so validators can inspect it
         file_content = await file.read()
         _validate_upload_file(file, file_content)
-
-        # Parse the report
-        parser = DMARCParser()
-        report = parser.parse_file(file_content, file.filename)
-
-        # Security: Validate domain from report
-        domain = report.get("domain", "")
-        if not domain:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Report does not contain a valid domain",
-            )
-        domain = normalize_domain_name(domain)
-        report["domain"] = domain
-
-        # Validate domain format (not DNS resolution to avoid external calls)
-        is_valid, error_msg, error_code = validate_domain(domain, check_dns=False)
-        if not is_valid and error_code != DomainValidationError.DNS_RESOLUTION_FAILED:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid domain in report: {error_msg}",
-            )
-
-        # Check for duplicate report before storing
-        report_id = report.get("report_id", "")
-        if report_id and report_exists(db, domain, report_id, workspace_id=workspace.id):
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=(
-                    f"Report '{report_id}' for domain '{domain}' has already been uploaded. "
-                    "Duplicate reports are not stored to keep statistics accurate."
-                ),
+        if ingestion_queue_enabled():
+            return await accept_for_ingestion(
+                db,
+                kind=INGESTION_KIND_AGGREGATE,
+                payload=file_content,
+                workspace_id=workspace.id,
+                filename=file.filename,
             )
 
-        _raise_if_domain_owned_by_other_workspace(db, domain, workspace.id)
-
-        # Store the report
-        _save_uploaded_report(db, report, domain, workspace.id)
-
-        processed_records = report.get("summary", {}).get("total_count", 0)
-
-        return UploadResponse(
-            success=True,
-            domain=domain,
-            message=f"Report processed successfully for domain {domain}",
-            processed_records=processed_records,
-        )
-
+        # Parsing and persistence are synchronous; keep them off the event loop
+        digest = payload_digest(file_content)
+        await run_blocking(reject_known_aggregate_payload, db, digest, workspace.id)
+        report = await run_cpu_bound(DMARCParser.parse_file, file_content, file.filename)
+        result = await run_blocking(store_aggregate_report, db, report, workspace.id, digest=digest)
+        return UploadResponse(**result)
     except HTTPException:
         raise
     except ValueError as e:
         # Security: Sanitize error messages from parser
-        _handle_upload_value_error(file.filename, str(e))
+        raise_for_report_parse_error(file.filename, str(e))
     except Exception as e:  # pylint: disable=broad-exception-caught
         # Security: Don't expose internal errors to client
         logger.error("Unexpected error processing report %s: %s", file.filename, str(e))
@@ -578,6 +494,67 @@ async def get_domain_reports_paginated(
     )
 
 
+class NetworkSourceItem(BaseModel):
+    """Message totals for one source address inside a queried network"""
+
+    source_ip: str
+    message_count: int
+    passed_count: int
+    failed_count: int
+    report_count: int
+    first_seen: str
+    last_seen: str
+
+
+class NetworkSourcesResponse(BaseModel):
+    """Report sources inside a network over a date range"""
+
+    network: str
+    days: int
+    failing_only: bool
+    sources: List[NetworkSourceItem]
+
+
+@router.get("/sources/network", response_model=NetworkSourcesResponse)
+async def get_network_sources(
+    network: str = Query(..., title="IP address or CIDR block, e.g. 203.0.113.0/24"),
+    days: int = Query(30, ge=1, le=366, title="Look back this many days"),
+    failing_only: bool = Query(True, title="Only records where neither DKIM nor SPF passed"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+    _auth: dict = Depends(require_admin_auth),
+    selected_workspace: Optional[str] = Header(default=None, alias="X-DMARQ-Workspace-ID"),
+):
+    """
+    List report source addresses inside a network, e.g. all failing mail from a /24
+    """
+    workspace = _authorized_reports_workspace(
+        _auth,
+        db,
+        PERMISSION_REPORTS_READ,
+        _selected_workspace_id(selected_workspace),
+    )
+    end_ts = int(time.time())
+    try:
+        sources = await run_blocking(
+            network_sources_from_db,
+            db,
+            network,
+            start_ts=end_ts - days * 86400,
+            end_ts=end_ts,
+            workspace_id=workspace.id,
+            failing_only=failing_only,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid network"
+        ) from exc
+    return NetworkSourcesResponse(
+        network=network, days=days, failing_only=failing_only, sources=sources
+    )
+
+
 class DeleteReportResponse(BaseModel):
     """Response model for report deletion"""
 
@@ -1210,7 +1187,7 @@ async def get_report_by_id(
         pct=str(policy_val.get("pct", "100")),
     )
 
-    raw_records = list(report.get("records", []))
+    raw_records = [record_to_dict(record) for record in report.get("records", [])]
     source_rows = [_source_row_from_report_record(rec) for rec in raw_records]
     report_domain = str(report.get("domain") or "")
     classifications = latest_sender_classifications(
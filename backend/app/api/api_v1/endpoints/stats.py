@@ -2,17 +2,28 @@ from datetime import date, datetime, time, timedelta, timezone
 from math import ceil
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Request, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings, uses_legacy_demo_fixtures
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.core.localization import resolve_request_locale
 from app.core.security import require_admin_auth
 from app.services.demo_data import build_demo_dashboard_statistics
 from app.services.guidance_profile import resolve_guidance_profile
 from app.services.mail_health import build_workspace_mail_health_assessment
 from app.services.mail_health_guidance import render_mail_health_guidance
+from app.services.read_model_etags import conditional_read_model
 from app.services.workspace_access import (
     PERMISSION_REPORTS_READ,
     _auth_user,
@@ -182,7 +193,7 @@ def resolve_dashboard_date_range(
 @router.get("/mail-health/summary")
 async def get_mail_health_summary(
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_admin_auth),
     selected_workspace: Optional[str] = Header(default=None, alias="X-DMARQ-Workspace-ID"),
     interval: Optional[str] = Query(None, title="Named date interval"),
@@ -224,7 +235,9 @@ async def get_mail_health_summary(
 
 @router.get("/dashboard")
 async def get_dashboard_statistics(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_admin_auth),
     selected_workspace: Optional[str] = Header(default=None, alias="X-DMARQ-Workspace-ID"),
     force_refresh: bool = Query(False, title="Force refresh of statistics"),
@@ -261,6 +274,12 @@ async def get_dashboard_statistics(
         PERMISSION_REPORTS_READ,
         selected_workspace_id=selected_workspace_id,
     )
+    if not force_refresh:
+        not_modified = conditional_read_model(
+            db, request, response, workspace_id=workspace.id, auth_context=_auth
+        )
+        if not_modified is not None:
+            return not_modified
 
     if uses_legacy_demo_fixtures(get_settings()):
         stats = build_demo_dashboard_statistics(period_days=resolved_days)
@@ -297,7 +316,7 @@ async def get_dashboard_statistics(
 @router.get("/domain/{domain_id}")
 async def get_domain_statistics(
     domain_id: str = Path(..., title="The domain ID or name"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _auth: dict = Depends(require_admin_auth),
     selected_workspace: Optional[str] = Header(default=None, alias="X-DMARQ-Workspace-ID"),
     force_refresh: bool = Query(False, title="Force refresh of statistics"),
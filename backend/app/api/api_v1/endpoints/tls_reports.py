@@ -5,16 +5,22 @@ from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Uplo
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session, selectinload
 
+from app.core.concurrency import run_blocking
 from app.core.config import get_settings, uses_legacy_demo_fixtures
 from app.core.database import get_db
 from app.core.security import require_admin_auth
 from app.models.domain import Domain
 from app.models.report import TLSReport
 from app.services.demo_data import list_demo_tls_reports, summarize_demo_tls_reports
-from app.services.tls_report_parser import MAX_TLS_REPORT_SIZE, TLSReportParser
+from app.services.ingestion_queue import (
+    INGESTION_KIND_TLS,
+    accept_for_ingestion,
+    ingestion_queue_enabled,
+)
+from app.services.report_uploads import store_tls_upload
+from app.services.tls_report_parser import MAX_TLS_REPORT_SIZE
 from app.services.tls_report_persistence import (
     TLS_REPORT_PRIVACY_CONTROLS,
-    save_tls_report,
     summarize_tls_reports,
     tls_report_to_dict,
 )
@@ -146,7 +152,8 @@ async def upload_tls_report(
     selected_workspace: Optional[str] = Header(default=None, alias="X-DMARQ-Workspace-ID"),
 ):
     """Upload and store an SMTP TLS Reporting aggregate."""
-    workspace = _authorized_reports_workspace(
+    workspace = await run_blocking(
+        _authorized_reports_workspace,
         _auth,
         db,
         PERMISSION_REPORTS_WRITE,
@@ -155,22 +162,18 @@ async def upload_tls_report(
     try:
         content = await file.read()
         _validate_upload(file, content)
-        parsed = TLSReportParser.parse_file(content, file.filename or "")
-        result = save_tls_report(db, parsed, workspace_id=workspace.id)
-        db.commit()
-        return TLSReportUploadResponse(
-            success=True,
-            report_id=parsed["report_id"],
-            policies_created=result["created"],
-            policies_skipped=result["skipped"],
-            duplicate=result["created"] == 0 and result["skipped"] > 0,
-            message=(
-                "TLS report imported."
-                if result["created"]
-                else "TLS report had already been imported."
-            ),
-            privacy=TLS_REPORT_PRIVACY_CONTROLS,
+        if ingestion_queue_enabled():
+            return await accept_for_ingestion(
+                db,
+                kind=INGESTION_KIND_TLS,
+                payload=content,
+                workspace_id=workspace.id,
+                filename=file.filename,
+            )
+        result = await run_blocking(
+            store_tls_upload, db, content, file.filename or "", workspace.id
         )
+        return TLSReportUploadResponse(**result)
     except HTTPException:
         raise
     except ValueError as exc:
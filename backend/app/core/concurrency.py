@@ -0,0 +1,148 @@
+"""Execution helpers that keep blocking work off the application event loop.
+
+Request handlers and background loops are ``async`` so they can overlap DNS and
+HTTP lookups, but SQLAlchemy sessions, report parsing and SMTP/IMAP clients are
+synchronous. ``run_blocking`` moves that work onto a dedicated, bounded thread
+pool so one large upload cannot freeze every other request in the worker.
+``run_cpu_bound`` additionally supports a process pool for parser work when
+``PARSER_WORKER_PROCESSES`` is configured.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, TypeVar
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor_lock = threading.Lock()
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+_parser_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_blocking_executor() -> ThreadPoolExecutor:
+    global _blocking_executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _blocking_executor is None:
+            workers = max(1, int(get_settings().BLOCKING_WORKER_THREADS or 1))
+            _blocking_executor = ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix="dmarq-blocking",
+            )
+        return _blocking_executor
+
+
+def _get_parser_executor() -> Optional[ProcessPoolExecutor]:
+    global _parser_executor  # pylint: disable=global-statement
+    workers = max(0, int(get_settings().PARSER_WORKER_PROCESSES or 0))
+    if workers == 0:
+        return None
+    with _executor_lock:
+        if _parser_executor is None:
+            _parser_executor = ProcessPoolExecutor(max_workers=workers)
+        return _parser_executor
+
+
+async def _run_in_executor(executor: Executor, func: Callable[..., T], *args: Any) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, func, *args)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run synchronous DB or I/O work on the shared blocking thread pool.
+
+    Context variables are copied so request-scoped logging and tracing state
+    stays visible inside the worker thread.
+    """
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await _run_in_executor(_get_blocking_executor(), call)
+
+
+async def run_cpu_bound(func: Callable[..., T], *args: Any) -> T:
+    """Run CPU-heavy, picklable work such as report parsing off the event loop.
+
+    Uses the parser process pool when configured and falls back to the blocking
+    thread pool otherwise, or when the process pool has died.
+    """
+    global _parser_executor  # pylint: disable=global-statement
+    executor = _get_parser_executor()
+    if executor is None:
+        return await run_blocking(func, *args)
+    try:
+        return await _run_in_executor(executor, func, *args)
+    except BrokenProcessPool:
+        logger.warning("Parser process pool failed; retrying on the blocking thread pool")
+        with _executor_lock:
+            if _parser_executor is executor:
+                _parser_executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        return await run_blocking(func, *args)
+
+
+def shutdown_executors(*, wait: bool = True) -> None:
+    """Stop the blocking and parser pools; they are recreated on next use."""
+    global _blocking_executor, _parser_executor  # pylint: disable=global-statement
+    with _executor_lock:
+        executors: List[Executor] = [
+            item for item in (_blocking_executor, _parser_executor) if item is not None
+        ]
+        _blocking_executor = None
+        _parser_executor = None
+    for executor in executors:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class EventLoopStallMonitor:
+    """Record how late the running event loop wakes a periodic heartbeat.
+
+    Use it as an async context manager around work that should not block the
+    loop; every heartbeat delayed by more than ``threshold_ms`` is kept in
+    ``stalls`` (milliseconds of lag).
+    """
+
+    def __init__(self, *, threshold_ms: float = 100.0, interval_ms: float = 5.0) -> None:
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+        self.max_lag_ms = 0.0
+        self.stalls: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = self.interval_ms / 1000
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            lag_ms = max(0.0, (loop.time() - started - interval) * 1000)
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            if lag_ms > self.threshold_ms:
+                self.stalls.append(lag_ms)
+
+    async def __aenter__(self) -> "EventLoopStallMonitor":
+        self._task = asyncio.create_task(self._run())
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *_exc_info: Any) -> None:
+        if self._task is None:
+            return
+        # Give the heartbeat one more wake-up so a stall at the very end of the
+        # monitored block is still observed.
+        await asyncio.sleep(self.interval_ms / 1000)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -60,6 +60,34 @@ class Settings(BaseSettings):
     # Default to a sub-directory so the SQLite file lives in a location that
     # can be persisted via a Docker volume mount (e.g. /app/data).
     DATABASE_URL: str = "sqlite:///./data/dmarq.db"
+    # File-backed SQLite runs in WAL mode with one writer connection and a
+    # separate read pool. Disable to fall back to a single default pool.
+    SQLITE_TUNING_ENABLED: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 15000
+    SQLITE_CACHE_SIZE_KIB: int = 65536
+    SQLITE_MMAP_SIZE_BYTES: int = 268435456
+    SQLITE_READ_POOL_SIZE: int = 5
+    # Connection pool per process for PostgreSQL (and other server databases).
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_RECYCLE_SECONDS: int = 1800
+    DATABASE_POOL_TIMEOUT_SECONDS: int = 30
+    # PostgreSQL statement_timeout for every connection; 0 leaves the server default.
+    DATABASE_STATEMENT_TIMEOUT_MS: int = 0
+    # Optional read replica for dashboards, exports, the public API and MCP.
+    # Reads fall back to the primary while replication lag exceeds the limit.
+    DATABASE_READ_URL: Optional[str] = None
+    DATABASE_READ_MAX_LAG_SECONDS: int = 30
+    # Optional PostgreSQL monthly range partitioning of reports, report records,
+    # daily sender projections and delivery events. Convert existing tables once
+    # with ``python -m app.services.report_partitions convert``; the maintenance
+    # worker then pre-creates future months and drops (or only detaches) months
+    # that every workspace's retention window has passed.
+    REPORT_PARTITIONING_ENABLED: bool = False
+    REPORT_PARTITION_PREMAKE_MONTHS: int = 3
+    REPORT_PARTITION_DETACH_ONLY: bool = False
+    REPORT_PARTITION_MAINTENANCE_INTERVAL_SECONDS: int = 3600
+    REPORT_PARTITION_MAINTENANCE_STARTUP_DELAY_SECONDS: int = 60
 
     # JWT Authentication
     SECRET_KEY: Optional[str] = None
@@ -183,6 +211,17 @@ class Settings(BaseSettings):
     HEALTH_SNAPSHOT_REFRESH_INTERVAL_SECONDS: int = 300
     HEALTH_SNAPSHOT_REFRESH_STARTUP_DELAY_SECONDS: int = 20
     REMEDIATION_QUEUE_TIMEOUT_SECONDS: float = 8.0
+    # Synchronous database, parser and mailbox work runs on this bounded thread
+    # pool instead of the event loop. Set PARSER_WORKER_PROCESSES above zero to
+    # parse uploaded aggregate reports in separate processes as well.
+    BLOCKING_WORKER_THREADS: int = 16
+    PARSER_WORKER_PROCESSES: int = 0
+    # Durable intake queue: report uploads and email-worker deliveries are stored
+    # and answered with 202 plus a job ID, then parsed by background workers.
+    INGESTION_QUEUE_ENABLED: bool = False
+    INGESTION_QUEUE_WORKERS: int = 2
+    INGESTION_QUEUE_MAX_ATTEMPTS: int = 5
+    INGESTION_QUEUE_POLL_SECONDS: float = 5.0
 
     # Optional Stripe Billing integration. Self-hosted and provider-billed
     # deployments work without these values.
@@ -195,6 +234,29 @@ class Settings(BaseSettings):
     # If set, this key is used directly instead of generating a random one at startup.
     # Use: openssl rand -hex 32
     ADMIN_API_KEY: Optional[str] = None
+    # Verified public API tokens are cached in-process so repeated automation
+    # requests skip bcrypt. Revocation evicts the entry immediately; set the
+    # TTL to 0 to verify every request against the stored hash.
+    API_TOKEN_VERIFY_CACHE_SECONDS: int = 300
+    # Token usage counters are buffered in memory and a background task writes
+    # them in one batch this often, instead of committing on every request.
+    API_TOKEN_USAGE_FLUSH_SECONDS: int = 30
+    # Effective workspace roles are cached per process so a page's API calls do
+    # not repeat membership lookups. Access changes made through the ORM
+    # invalidate this process immediately; other workers converge within the TTL.
+    WORKSPACE_ACCESS_CACHE_SECONDS: int = 30
+    # Dashboard read models answer unchanged polls with 304 Not Modified. Their
+    # ETags cover report, domain, DNS and settings watermarks; the TTL bounds how
+    # long edits to other inputs can go unnoticed. 0 disables ETags.
+    READ_MODEL_ETAG_TTL_SECONDS: int = 60
+    # JSON, HTML and text responses at least this large are compressed with
+    # brotli or gzip, whichever the client accepts. 0 disables compression.
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 1024
+    # Prometheus/OpenMetrics scrape endpoint at /metrics. The endpoint is only
+    # served when METRICS_TOKEN is set, and scrapes must send
+    # "Authorization: Bearer <token>".
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None
 
     # ── Authentication mode ───────────────────────────────────────────────────
     # Set AUTH_DISABLED=true to run without any authentication.
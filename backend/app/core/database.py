@@ -1,13 +1,23 @@
+import logging
 import os
-from typing import Generator
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Generator, Optional
 from urllib.parse import urlparse, urlunparse
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import make_url
+from fastapi import Depends
+from sqlalchemy import Select, create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
 
 from app.core.config import get_settings
+from app.core.metrics import DB_REPLICA_LAG, instrument_engine
+
+logger = logging.getLogger(__name__)
 
 _ASYNC_TO_SYNC_SCHEMES = {
     "postgresql+asyncpg": "postgresql+psycopg2",
@@ -51,6 +61,140 @@ def _ensure_sqlite_dir(url: str) -> None:
         os.makedirs(parent, exist_ok=True)
 
 
+def _is_sqlite_file(url: str) -> bool:
+    sa_url = make_url(url)
+    return sa_url.drivername.startswith("sqlite") and sa_url.database not in (None, "", ":memory:")
+
+
+def _apply_sqlite_pragmas(dbapi_connection, settings) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KIB)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE_BYTES)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+def _create_sqlite_engines(url: str, settings) -> tuple[Engine, Engine]:
+    """Return ``(writer, reader)`` engines for a file-backed SQLite database.
+
+    SQLite allows one writer at a time. Instead of letting request handlers and
+    background loops race for the file lock (and fail with "database is
+    locked" when a read transaction cannot be upgraded), every write goes
+    through a single pooled writer connection that opens its transactions with
+    ``BEGIN IMMEDIATE``; other processes wait on ``busy_timeout``. Read-heavy
+    sessions use a separate pool and, thanks to WAL, never block on or behind
+    the writer.
+    """
+    timeout = max(1, int(settings.SQLITE_BUSY_TIMEOUT_MS)) / 1000
+    connect_args = {"check_same_thread": False, "timeout": timeout}
+    writer = create_engine(
+        url,
+        pool_pre_ping=True,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=timeout,
+        connect_args=connect_args,
+    )
+    reader = create_engine(
+        url,
+        pool_pre_ping=True,
+        pool_size=max(1, int(settings.SQLITE_READ_POOL_SIZE)),
+        connect_args=connect_args,
+    )
+
+    @event.listens_for(writer, "connect")
+    def _connect_writer(dbapi_connection, _record) -> None:
+        # Let SQLAlchemy emit BEGIN itself so writes start as IMMEDIATE.
+        dbapi_connection.isolation_level = None
+        _apply_sqlite_pragmas(dbapi_connection, settings)
+
+    @event.listens_for(writer, "begin")
+    def _begin_immediate(connection) -> None:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    @event.listens_for(reader, "connect")
+    def _connect_reader(dbapi_connection, _record) -> None:
+        _apply_sqlite_pragmas(dbapi_connection, settings)
+
+    return writer, reader
+
+
+def _create_server_engine(url: str, settings, *, read_only: bool = False) -> Engine:
+    """Return a pooled engine for a database server such as PostgreSQL.
+
+    Pool sizing applies per process, so the server must allow roughly
+    ``workers * (DATABASE_POOL_SIZE + DATABASE_MAX_OVERFLOW)`` connections.
+    On PostgreSQL the statement timeout and, for replicas, read-only
+    transactions are set as connection options so they hold for every
+    statement, including those issued by background loops.
+    """
+    kwargs: Dict[str, Any] = {
+        "pool_pre_ping": True,
+        "pool_size": max(1, int(settings.DATABASE_POOL_SIZE)),
+        "max_overflow": max(0, int(settings.DATABASE_MAX_OVERFLOW)),
+        "pool_recycle": int(settings.DATABASE_POOL_RECYCLE_SECONDS),
+        "pool_timeout": max(1, int(settings.DATABASE_POOL_TIMEOUT_SECONDS)),
+    }
+    if make_url(url).drivername.startswith("postgresql"):
+        options = []
+        if settings.DATABASE_STATEMENT_TIMEOUT_MS:
+            options.append(f"-c statement_timeout={int(settings.DATABASE_STATEMENT_TIMEOUT_MS)}")
+        if read_only:
+            options.append("-c default_transaction_read_only=on")
+        if options:
+            kwargs["connect_args"] = {"options": " ".join(options)}
+    return create_engine(url, **kwargs)
+
+
+_WRITE_SQL = re.compile(r"\s*(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER)\b", re.IGNORECASE)
+_LOCK_SQL = re.compile(r"\bpg_(try_)?advisory", re.IGNORECASE)
+_SESSION_WROTE = "routed_to_writer"
+
+
+def _is_write(clause) -> bool:
+    """Return whether *clause* writes or locks and therefore needs the writer."""
+    if isinstance(clause, UpdateBase):
+        return True
+    if isinstance(clause, Select):
+        return clause._for_update_arg is not None  # pylint: disable=protected-access
+    if isinstance(clause, TextClause):
+        return bool(_WRITE_SQL.match(clause.text) or _LOCK_SQL.search(clause.text))
+    return False
+
+
+class RoutingSession(Session):
+    """Session that sends reads to a reader engine and writes to its bind.
+
+    The reader is the SQLite read pool or a PostgreSQL replica. Writes, row
+    locks and advisory locks go to the bound writer engine; once a transaction
+    has used the writer, later statements in it stay there so the session
+    keeps reading its own uncommitted changes.
+    """
+
+    def __init__(self, *args, reader: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reader = reader
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if self.reader is None:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        if self.info.get(_SESSION_WROTE) or self._flushing or _is_write(clause):
+            self.info[_SESSION_WROTE] = True
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        return self.reader
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_writer_route(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_SESSION_WROTE, None)
+
+
 settings = get_settings()
 
 _sync_url = _make_sync_db_url(settings.DATABASE_URL)
@@ -59,13 +203,128 @@ _sync_url = _make_sync_db_url(settings.DATABASE_URL)
 _ensure_sqlite_dir(_sync_url)
 
 # Configure SQLAlchemy (normalise async driver schemes to their sync equivalents)
-engine = create_engine(_sync_url, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+read_engine: Optional[Engine] = None
+if settings.SQLITE_TUNING_ENABLED and _is_sqlite_file(_sync_url):
+    engine, read_engine = _create_sqlite_engines(_sync_url, settings)
+    instrument_engine(read_engine, pool="sqlite_reader")
+elif make_url(_sync_url).drivername.startswith("sqlite"):
+    engine = create_engine(_sync_url, pool_pre_ping=True)
+else:
+    engine = _create_server_engine(_sync_url, settings)
+instrument_engine(engine)
+# Default sessions stay on the writer so a read-modify-write sees the row it
+# updates; only sessions opened for read-heavy work use the SQLite read pool.
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+)
+SQLiteReadSessionLocal: Optional[sessionmaker] = None
+if read_engine is not None:
+    SQLiteReadSessionLocal = sessionmaker(
+        class_=RoutingSession,
+        autocommit=False,
+        autoflush=False,
+        bind=engine,
+        reader=read_engine,
+    )
 
 # Create base class for SQLAlchemy models
 Base = declarative_base()
 
 
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaLagGuard:
+    """Decide whether a read replica is fresh enough to serve reads.
+
+    Replication lag is measured at most once per ``check_interval`` seconds
+    and shared by all requests in the process. A replica that is behind by
+    more than ``max_lag_seconds``, that reports no replay position, or that
+    cannot be reached is treated as stale, and reads fall back to the primary
+    until a later check succeeds.
+    """
+
+    def __init__(
+        self,
+        replica: Engine,
+        max_lag_seconds: float,
+        check_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.replica = replica
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._fresh = False
+
+    def _measure_lag(self) -> Optional[float]:
+        with self.replica.connect() as conn:
+            lag = conn.execute(_REPLICA_LAG_SQL).scalar()
+        return None if lag is None else float(lag)
+
+    def is_fresh(self) -> bool:
+        with self._lock:
+            now = self._clock()
+            if self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return self._fresh
+            self._checked_at = now
+            try:
+                lag = self._measure_lag()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.warning("Read replica lag check failed; reading from primary: %s", exc)
+                self._fresh = False
+                return False
+            if lag is not None:
+                DB_REPLICA_LAG.set(lag)
+            self._fresh = lag is not None and lag <= self.max_lag_seconds
+            if not self._fresh:
+                logger.warning("Read replica lag %s s exceeds limit; reading from primary", lag)
+            return self._fresh
+
+
+replica_engine: Optional[Engine] = None
+replica_guard: Optional[ReplicaLagGuard] = None
+ReadSessionLocal: Optional[sessionmaker] = None
+if settings.DATABASE_READ_URL:
+    replica_engine = _create_server_engine(
+        _make_sync_db_url(settings.DATABASE_READ_URL), settings, read_only=True
+    )
+    instrument_engine(replica_engine, pool="replica")
+    replica_guard = ReplicaLagGuard(
+        replica_engine, max_lag_seconds=float(settings.DATABASE_READ_MAX_LAG_SECONDS)
+    )
+    ReadSessionLocal = sessionmaker(
+        class_=RoutingSession,
+        autocommit=False,
+        autoflush=False,
+        bind=engine,
+        reader=replica_engine,
+    )
+
+
+def read_session_factory() -> sessionmaker:
+    """Return the session factory for read-heavy work outside requests.
+
+    Sessions from the replica factory read from ``DATABASE_READ_URL`` and send
+    any writes to the primary; without a fresh replica, tuned SQLite sessions
+    read from the read pool, and otherwise this is ``SessionLocal``.
+    """
+    if ReadSessionLocal is not None and replica_guard is not None and replica_guard.is_fresh():
+        return ReadSessionLocal
+    if SQLiteReadSessionLocal is not None:
+        return SQLiteReadSessionLocal
+    return SessionLocal
+
+
 def get_db() -> Generator:
     """
     Dependency for getting DB sessions
@@ -75,3 +334,22 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+def get_read_db(db: Session = Depends(get_db)) -> Generator:
+    """
+    Dependency for read-heavy endpoints; reads from the replica when it is fresh.
+
+    Tuned SQLite reads from its read pool instead. Falls back to the regular
+    ``get_db`` session (which opens no connection until used) when neither is
+    available.
+    """
+    factory = read_session_factory()
+    if factory is SessionLocal:
+        yield db
+        return
+    read_db = factory()
+    try:
+        yield read_db
+    finally:
+        read_db.close()
@@ -6,6 +6,7 @@ Provides:
 - ``make_logto_client``   – Factory that builds a per-request LogtoClient.
 - ``create_session_token``/``decode_session_token`` – thin JWT helpers for the
   app-level session cookie (independent of Logto after the initial callback).
+- ``session_user_id_for_request`` – per-request memoised session cookie decode.
 - ``sync_logto_user``     – Upserts the local User shadow record from Logto claims.
 """
 
@@ -256,6 +257,25 @@ def decode_session_token(token: str) -> Optional[int]:
         return None
 
 
+_UNSET = object()
+
+
+def session_user_id_for_request(request: Request) -> Optional[int]:
+    """
+    Return the user id from the request's session cookie, decoding it once.
+
+    The result is memoised on ``request.state`` so the auth middleware, the
+    admin-auth dependency and endpoint helpers share a single JWT decode.
+    """
+    cached = getattr(request.state, "session_user_id", _UNSET)
+    if cached is not _UNSET:
+        return cached
+    token = request.cookies.get(SESSION_COOKIE)
+    user_id = decode_session_token(token) if token else None
+    request.state.session_user_id = user_id
+    return user_id
+
+
 # ── Local user sync ───────────────────────────────────────────────────────────
 
 
@@ -0,0 +1,276 @@
+"""
+Prometheus/OpenMetrics instrumentation for DMARQ.
+
+Metric objects are module-level singletons shared by every hot path:
+
+- HTTP request counts and latency per route template (``MetricsMiddleware``);
+- report ingestion, DNS cache outcomes, resolver fallbacks, PTR lookups,
+  webhook delivery outcomes and lag, mailbox poll duration per source and
+  scheduler cycle duration per background task;
+- SQLAlchemy pool usage and statement latency (``instrument_engine``).
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set before the process starts, values are
+written to per-process files in that directory and ``render_metrics``
+aggregates every worker, so one scrape covers all uvicorn/gunicorn workers.
+The directory must be emptied before the server starts (``entrypoint.sh``
+does this). Without the optional ``prometheus_client`` package the metric
+objects are no-ops and ``/metrics`` reports that metrics are unavailable.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:  # optional: the API runs without metrics when prometheus_client is absent
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+    from prometheus_client import multiprocess as prometheus_multiprocess
+    from prometheus_client.exposition import choose_encoder
+except ImportError:  # pragma: no cover - depends on the build environment
+    prometheus_client = None
+
+MULTIPROCESS_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+UNMATCHED_ROUTE = "unmatched"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+BACKGROUND_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 900.0)
+LAG_BUCKETS = (1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0, 14400.0, 86400.0)
+
+
+class _NoopMetric:
+    """Stand-in used when prometheus_client is not installed."""
+
+    def labels(self, *_args, **_kwargs) -> "_NoopMetric":
+        return self
+
+    def inc(self, *_args, **_kwargs) -> None:
+        return None
+
+    def dec(self, *_args, **_kwargs) -> None:
+        return None
+
+    def set(self, *_args, **_kwargs) -> None:
+        return None
+
+    def observe(self, *_args, **_kwargs) -> None:
+        return None
+
+
+def _counter(name: str, documentation: str, labels: Tuple[str, ...] = ()):
+    if prometheus_client is None:
+        return _NoopMetric()
+    return Counter(name, documentation, labels)
+
+
+def _histogram(name: str, documentation: str, labels: Tuple[str, ...], buckets):
+    if prometheus_client is None:
+        return _NoopMetric()
+    return Histogram(name, documentation, labels, buckets=buckets)
+
+
+def _gauge(name: str, documentation: str, labels: Tuple[str, ...], mode: str):
+    if prometheus_client is None:
+        return _NoopMetric()
+    return Gauge(name, documentation, labels, multiprocess_mode=mode)
+
+
+# ── HTTP ──────────────────────────────────────────────────────────────────────
+
+HTTP_REQUESTS = _counter(
+    "dmarq_http_requests", "HTTP requests handled", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = _histogram(
+    "dmarq_http_request_duration_seconds",
+    "HTTP request latency until the response completes",
+    ("method", "route"),
+    LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = _gauge(
+    "dmarq_http_requests_in_progress", "HTTP requests currently being handled", (), "livesum"
+)
+
+# ── Ingest pipeline ───────────────────────────────────────────────────────────
+
+REPORTS_INGESTED = _counter("dmarq_reports_ingested", "Aggregate reports persisted", ("outcome",))
+REPORT_RECORDS_INGESTED = _counter(
+    "dmarq_report_records_ingested", "Aggregate report records persisted"
+)
+REPORT_INGEST_DURATION = _histogram(
+    "dmarq_report_ingest_duration_seconds",
+    "Time to persist one parsed aggregate report",
+    (),
+    LATENCY_BUCKETS,
+)
+
+# ── DNS and PTR ───────────────────────────────────────────────────────────────
+
+DNS_CACHE_LOOKUPS = _counter(
+    "dmarq_dns_cache_lookups",
+    "Cached DNS resolutions by outcome (hit, miss, stale, failed)",
+    ("outcome",),
+)
+DNS_RESOLVE_DURATION = _histogram(
+    "dmarq_dns_resolve_duration_seconds",
+    "Network DNS resolution time on cache misses",
+    (),
+    LATENCY_BUCKETS,
+)
+RESOLVER_FALLBACKS = _counter(
+    "dmarq_resolver_fallbacks",
+    "Lookups answered by a fallback resolver instead of the primary one",
+    ("lookup",),
+)
+PTR_LOOKUPS = _counter("dmarq_ptr_lookups", "PTR lookups by outcome", ("outcome",))
+
+# ── Webhooks, mailboxes and schedulers ────────────────────────────────────────
+
+WEBHOOK_DELIVERIES = _counter(
+    "dmarq_webhook_deliveries", "Webhook delivery attempts by resulting status", ("status",)
+)
+WEBHOOK_DELIVERY_LAG = _histogram(
+    "dmarq_webhook_delivery_lag_seconds",
+    "Time from webhook event creation to each delivery attempt",
+    (),
+    LAG_BUCKETS,
+)
+MAILBOX_POLL_DURATION = _histogram(
+    "dmarq_mailbox_poll_duration_seconds",
+    "Time to poll one mail source",
+    ("method", "source"),
+    BACKGROUND_BUCKETS,
+)
+SCHEDULER_CYCLE_DURATION = _histogram(
+    "dmarq_scheduler_cycle_duration_seconds",
+    "Duration of one background scheduler cycle",
+    ("task",),
+    BACKGROUND_BUCKETS,
+)
+SCHEDULER_CYCLE_FAILURES = _counter(
+    "dmarq_scheduler_cycle_failures", "Background scheduler cycles that raised", ("task",)
+)
+SCHEDULER_LAST_SUCCESS = _gauge(
+    "dmarq_scheduler_last_success_timestamp_seconds",
+    "Unix time of the last successful scheduler cycle",
+    ("task",),
+    "max",
+)
+
+# ── Database ──────────────────────────────────────────────────────────────────
+
+DB_POOL_SIZE = _gauge(
+    "dmarq_db_pool_size", "Configured connection pool size per process", ("pool",), "liveall"
+)
+DB_POOL_CHECKED_OUT = _gauge(
+    "dmarq_db_pool_checked_out",
+    "Database connections currently checked out",
+    ("pool",),
+    "livesum",
+)
+DB_POOL_CHECKOUTS = _counter("dmarq_db_pool_checkouts", "Database connection checkouts", ("pool",))
+DB_REPLICA_LAG = _gauge(
+    "dmarq_db_replica_lag_seconds",
+    "Replication lag of the read replica at the last check",
+    (),
+    "max",
+)
+DB_QUERY_DURATION = _histogram(
+    "dmarq_db_query_duration_seconds",
+    "Database statement execution time",
+    ("statement",),
+    QUERY_BUCKETS,
+)
+
+_QUERY_START_KEY = "dmarq_query_start"
+_STATEMENT_KINDS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE"})
+
+
+@contextmanager
+def observe_duration(histogram, **labels) -> Iterator[None]:
+    """Observe the wall time of the enclosed block on *histogram*."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metric = histogram.labels(**labels) if labels else histogram
+        metric.observe(time.perf_counter() - started)
+
+
+@contextmanager
+def observe_scheduler_cycle(task: str) -> Iterator[None]:
+    """Time one background scheduler cycle and record its success or failure."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        SCHEDULER_CYCLE_FAILURES.labels(task=task).inc()
+        raise
+    else:
+        SCHEDULER_LAST_SUCCESS.labels(task=task).set(time.time())
+    finally:
+        SCHEDULER_CYCLE_DURATION.labels(task=task).observe(time.perf_counter() - started)
+
+
+def _statement_kind(statement: str) -> str:
+    kind = statement.lstrip()[:6].upper()
+    return kind if kind in _STATEMENT_KINDS else "OTHER"
+
+
+def instrument_engine(engine: Engine, *, pool: str = "primary") -> None:
+    """Track pool usage and statement latency for *engine*."""
+    if prometheus_client is None:
+        return
+    size = getattr(engine.pool, "size", None)
+    if callable(size):
+        DB_POOL_SIZE.labels(pool=pool).set(size())
+    checkouts = DB_POOL_CHECKOUTS.labels(pool=pool)
+    checked_out = DB_POOL_CHECKED_OUT.labels(pool=pool)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(_dbapi_connection, _record, _proxy) -> None:
+        checkouts.inc()
+        checked_out.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(_dbapi_connection, _record) -> None:
+        checked_out.dec()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+        conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, _cursor, statement, _parameters, _context, _executemany):
+        starts = conn.info.get(_QUERY_START_KEY)
+        if starts:
+            DB_QUERY_DURATION.labels(statement=_statement_kind(statement)).observe(
+                time.perf_counter() - starts.pop()
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context) -> None:
+        starts = context.connection.info.get(_QUERY_START_KEY) if context.connection else None
+        if starts:
+            starts.pop()
+
+
+def metrics_available() -> bool:
+    """Return whether prometheus_client is installed."""
+    return prometheus_client is not None
+
+
+def render_metrics(accept_header: Optional[str] = None) -> Tuple[bytes, str]:
+    """Return ``(body, content_type)`` for a scrape, honouring OpenMetrics negotiation."""
+    if os.environ.get(MULTIPROCESS_DIR_ENV):
+        registry = CollectorRegistry()
+        prometheus_multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    encoder, content_type = choose_encoder(accept_header or "")
+    return encoder(registry), content_type
@@ -199,13 +199,11 @@ async def _require_regular_admin_auth(
         return proxy_context
 
     # 2. Session cookie (external-IdP-backed app session)
-    from app.core.logto import SESSION_COOKIE, decode_session_token  # local import
+    from app.core.logto import session_user_id_for_request  # local import
 
-    session_token = request.cookies.get(SESSION_COOKIE)
-    if session_token:
-        user_id = decode_session_token(session_token)
-        if user_id is not None:
-            return {"auth_type": "session", "user_id": user_id}
+    user_id = session_user_id_for_request(request)
+    if user_id is not None:
+        return {"auth_type": "session", "user_id": user_id}
 
     # 3. Static admin API key
     if api_key and verify_api_key(api_key):
@@ -306,7 +304,7 @@ def require_api_token_any_scope(
             )
 
         client_host = request.client.host if request.client else None
-        record_api_token_use(db, token, ip_address=client_host)
+        record_api_token_use(token, ip_address=client_host)
         return {
             "auth_type": "api_token",
             "token_id": token.id,
@@ -346,7 +344,7 @@ def _api_token_context_for_scope(
         return None
 
     client_host = request.client.host if request.client else None
-    record_api_token_use(db, token, ip_address=client_host)
+    record_api_token_use(token, ip_address=client_host)
     return {
         "auth_type": auth_type,
         "token_id": token.id,
@@ -0,0 +1,69 @@
+"""
+Startup phase timings for cold-start diagnostics.
+
+``app/__init__.py`` stamps the moment the package starts importing. ``main``
+then records how long module imports, application construction and each
+startup step took, and ``/health`` reports them so slow cold starts on
+autoscaled pods can be attributed without attaching a profiler.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from app import IMPORT_STARTED_AT
+
+_phases: Dict[str, float] = {}
+_ready_at: Optional[float] = None
+_lock = threading.Lock()
+
+
+def record_startup_phase(name: str, seconds: float) -> None:
+    """Record the duration of one startup phase, replacing an earlier value."""
+    with _lock:
+        _phases[name] = seconds
+
+
+def mark_imports_complete() -> None:
+    """Record the time spent importing the application package and its modules."""
+    record_startup_phase("imports", time.perf_counter() - IMPORT_STARTED_AT)
+
+
+@contextmanager
+def startup_phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as startup phase *name*."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_startup_phase(name, time.perf_counter() - started)
+
+
+def mark_startup_complete() -> None:
+    """Record that the application finished its startup handlers."""
+    global _ready_at  # pylint: disable=global-statement
+    with _lock:
+        _ready_at = time.perf_counter()
+
+
+def clear_startup_timings() -> None:
+    """Forget recorded phases (used by tests)."""
+    global _ready_at  # pylint: disable=global-statement
+    with _lock:
+        _phases.clear()
+        _ready_at = None
+
+
+def startup_timings() -> Dict[str, Any]:
+    """Return recorded phase durations in milliseconds and the time to ready."""
+    with _lock:
+        phases = {name: round(seconds * 1000, 1) for name, seconds in _phases.items()}
+        ready_at = _ready_at
+    return {
+        "ready": ready_at is not None,
+        "total_ms": round((ready_at - IMPORT_STARTED_AT) * 1000, 1) if ready_at else None,
+        "phases_ms": phases,
+    }
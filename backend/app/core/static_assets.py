@@ -0,0 +1,217 @@
+"""
+Fingerprinted, precompressed static assets.
+
+Provides:
+- ``build_static_assets`` – copies every file under ``app/static`` to
+  ``app/static/dist`` with a content hash in its name, writes ``.br``/``.gz``
+  siblings for text assets, and records the mapping in ``dist/manifest.json``.
+  Run it as ``python -m app.core.static_assets`` after the CSS build.
+- ``static_url`` – template helper that resolves ``js/app.js`` to the hashed
+  ``/static/dist/js/app.<hash>.js`` when a manifest exists, and to the plain
+  ``/static/js/app.js`` otherwise (local development and tests).
+- ``PrecompressedStaticFiles`` – ``StaticFiles`` that serves the ``.br``/``.gz``
+  sibling the client accepts, marks hashed files as immutable, and asks
+  browsers to revalidate everything else.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+try:  # optional: images built without brotli still ship gzip variants
+    import brotli
+except ImportError:  # pragma: no cover - depends on the build environment
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parents[1] / "static"
+DIST_DIR_NAME = "dist"
+MANIFEST_NAME = "manifest.json"
+HASH_LENGTH = 12
+
+COMPRESSIBLE_SUFFIXES = frozenset({".css", ".js", ".map", ".json", ".svg", ".txt", ".ico"})
+# Only keep a compressed sibling when it saves at least this share of the bytes.
+MIN_COMPRESSION_SAVING = 0.1
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Preferred order when a client accepts several encodings.
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+_manifest: Optional[Dict[str, str]] = None
+
+
+# ── Build step ────────────────────────────────────────────────────────────────
+
+
+def _hashed_name(path: Path, digest: str) -> str:
+    return f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}"
+
+
+def _write_compressed_variants(path: Path) -> None:
+    data = path.read_bytes()
+    variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", brotli.compress(data, quality=11)))
+    for suffix, payload in variants:
+        if len(payload) <= len(data) * (1 - MIN_COMPRESSION_SAVING):
+            path.with_name(path.name + suffix).write_bytes(payload)
+
+
+def build_static_assets(static_dir: Path = STATIC_DIR) -> Dict[str, str]:
+    """
+    Fingerprint and precompress every static asset and write the manifest.
+
+    The ``dist`` directory is rebuilt from scratch so removed sources never
+    linger. Returns the manifest mapping source paths to hashed paths, both
+    relative to *static_dir*.
+    """
+    static_dir = Path(static_dir)
+    dist_dir = static_dir / DIST_DIR_NAME
+    if dist_dir.exists():
+        shutil.rmtree(dist_dir)
+
+    manifest: Dict[str, str] = {}
+    for source in sorted(static_dir.rglob("*")):
+        if not source.is_file() or dist_dir in source.parents:
+            continue
+        relative = source.relative_to(static_dir)
+        digest = hashlib.sha256(source.read_bytes()).hexdigest()
+        target = dist_dir / relative.parent / _hashed_name(source, digest)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
+        if source.suffix.lower() in COMPRESSIBLE_SUFFIXES:
+            _write_compressed_variants(target)
+        manifest[relative.as_posix()] = target.relative_to(static_dir).as_posix()
+
+    dist_dir.mkdir(parents=True, exist_ok=True)
+    (dist_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    clear_static_manifest_cache()
+    return manifest
+
+
+# ── Template helper ───────────────────────────────────────────────────────────
+
+
+def load_static_manifest(static_dir: Path = STATIC_DIR) -> Dict[str, str]:
+    """Return the asset manifest, or an empty mapping when assets are not built."""
+    manifest_path = Path(static_dir) / DIST_DIR_NAME / MANIFEST_NAME
+    try:
+        return json.loads(manifest_path.read_text())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable static asset manifest %s: %s", manifest_path, exc)
+        return {}
+
+
+def clear_static_manifest_cache() -> None:
+    """Forget the loaded manifest so the next lookup re-reads it."""
+    global _manifest  # pylint: disable=global-statement
+    _manifest = None
+
+
+def static_url(path: str) -> str:
+    """Return the public URL for a static asset, preferring its fingerprinted copy."""
+    global _manifest  # pylint: disable=global-statement
+    if _manifest is None:
+        _manifest = load_static_manifest()
+    relative = path.lstrip("/")
+    return f"/static/{_manifest.get(relative, relative)}"
+
+
+# ── Serving ───────────────────────────────────────────────────────────────────
+
+
+def accepted_encodings(headers: Headers) -> set[str]:
+    """Return the content codings a request accepts, ignoring ``q=0`` entries."""
+    accepted = set()
+    for item in headers.get("accept-encoding", "").split(","):
+        name, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in {"q=0", "q=0.0", "q=0.00", "q=0.000"}:
+            continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles with precompressed variants and fingerprint-aware caching."""
+
+    def _is_fingerprinted(self, full_path: str) -> bool:
+        if self.directory is None:
+            return False
+        dist_dir = os.path.join(os.path.realpath(self.directory), DIST_DIR_NAME)
+        return os.path.realpath(full_path).startswith(dist_dir + os.sep)
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = os.fspath(full_path)
+        compressible = Path(full_path).suffix.lower() in COMPRESSIBLE_SUFFIXES
+
+        response = None
+        if compressible:
+            accepted = accepted_encodings(request_headers)
+            for encoding, suffix in _ENCODINGS:
+                if encoding not in accepted:
+                    continue
+                try:
+                    variant_stat = os.stat(full_path + suffix)
+                except OSError:
+                    continue
+                response = FileResponse(
+                    full_path + suffix,
+                    status_code=status_code,
+                    stat_result=variant_stat,
+                    media_type=mimetypes.guess_type(full_path)[0] or "text/plain",
+                    headers={"Content-Encoding": encoding},
+                )
+                break
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+
+        response.headers["Cache-Control"] = (
+            IMMUTABLE_CACHE_CONTROL
+            if self._is_fingerprinted(full_path)
+            else REVALIDATE_CACHE_CONTROL
+        )
+        if compressible:
+            response.headers["Vary"] = "Accept-Encoding"
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fingerprint and precompress static assets.")
+    parser.add_argument("--static-dir", type=Path, default=STATIC_DIR)
+    args = parser.parse_args()
+    manifest = build_static_assets(args.static_dir)
+    print(f"Fingerprinted {len(manifest)} static assets into {args.static_dir / DIST_DIR_NAME}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
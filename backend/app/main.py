@@ -2,17 +2,18 @@ import asyncio
 import json
 import logging
 import os
+import secrets
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse, Response
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from starlette.concurrency import run_in_threadpool
 
+import app.models.ai_remediation_plan  # noqa: F401 – ensure shared AI plan cache is registered
 import app.models.alert  # noqa: F401 – ensure AlertHistory table is registered
 import app.models.api_token  # noqa: F401 – ensure APIToken table is registered
 import app.models.delivery_event  # noqa: F401 – ensure delivery evidence table is registered
@@ -20,7 +21,9 @@ import app.models.dns_cache  # noqa: F401 – ensure DNSCache table is registere
 import app.models.dns_posture_snapshot  # noqa: F401 – ensure DNS posture tables are registered
 import app.models.dns_zone_baseline  # noqa: F401 – ensure imported DNS evidence table is registered
 import app.models.domain  # noqa: F401 – ensure Domain/UserDomain tables are registered
+import app.models.ingestion_job  # noqa: F401 – ensure ingestion queue table is registered
 import app.models.mail_source_import  # noqa: F401 – ensure import history table is registered
+import app.models.mail_source_message  # noqa: F401 – ensure message ID table is registered
 import app.models.organization  # noqa: F401 – ensure commercial account tables are registered
 import app.models.report  # noqa: F401 – ensure DMARCReport/ReportRecord tables are registered
 import app.models.setting  # noqa: F401 – ensure Setting table is registered
@@ -31,6 +34,7 @@ import app.models.workspace_access  # noqa: F401 – ensure RBAC/audit tables ar
 from app.api.api_v1.api import api_router
 from app.core.app_timezone import present_datetime
 from app.core.auth_providers import auth_provider_registry
+from app.core.concurrency import shutdown_executors
 from app.core.config import get_settings, uses_legacy_demo_fixtures
 from app.core.database import Base, SessionLocal, engine, get_db
 from app.core.localization import (
@@ -38,24 +42,52 @@ from app.core.localization import (
     resolve_request_locale,
     template_locale_context,
 )
+from app.core.metrics import (
+    MAILBOX_POLL_DURATION,
+    metrics_available,
+    observe_duration,
+    observe_scheduler_cycle,
+    render_metrics,
+)
 from app.core.security import add_api_key, generate_api_key, require_admin_auth
 from app.core.startup_checks import run_startup_checks
+from app.core.startup_timing import (
+    mark_imports_complete,
+    mark_startup_complete,
+    startup_phase,
+    startup_timings,
+)
+from app.core.static_assets import PrecompressedStaticFiles, static_url
 from app.middleware.auth import AuthRedirectMiddleware
+from app.middleware.compression import CompressionMiddleware
 from app.middleware.demo import DemoReadOnlyMiddleware
+from app.middleware.metrics import MetricsMiddleware
 from app.middleware.security import SecurityHeadersMiddleware
 from app.models.domain import Domain
 from app.models.mail_source import MailSource  # noqa: F401 – ensure table is registered
 from app.models.mail_source_import import MailSourceImport
 from app.models.setting import Setting
+from app.services.api_tokens import (
+    flush_buffered_api_token_usage,
+    scheduled_api_token_usage_flush,
+)
 from app.services.calm_watch import evaluate_and_send_calm_watch
 from app.services.delivery_events import purge_expired_delivery_events
 from app.services.demo_data import build_demo_mail_sources
 from app.services.dns_posture_refresh import scheduled_dns_posture_refresh
 from app.services.dns_prewarm import prewarm_dns_cache
+from app.services.forensic_analysis import scheduled_forensic_analysis_backfill
 from app.services.gmail_client import GmailClient
 from app.services.health_snapshot_refresh import scheduled_health_snapshot_refresh
 from app.services.imap_client import IMAPClient
 from app.services.import_history import record_import_attempt
+from app.services.ingestion_dedup import (
+    CONNECTOR_GMAIL,
+    CONNECTOR_M365,
+    load_ingested_message_ids,
+    record_ingested_message_ids,
+)
+from app.services.ingestion_queue import scheduled_ingestion_workers
 from app.services.mail_connector import initial_import_stats
 from app.services.mail_service_imports import mail_service_context_from_domain
 from app.services.mail_source_backfill_worker import run_due_mail_source_backfill_jobs
@@ -69,6 +101,7 @@ from app.services.microsoft_graph_client import (
 )
 from app.services.provider_access import require_provider_operator_access
 from app.services.release_info import build_release_info
+from app.services.report_partitions import scheduled_report_partition_maintenance
 from app.services.runtime_status import (
     mark_scheduler_cycle_started,
     mark_scheduler_error,
@@ -82,6 +115,8 @@ from app.services.summary_notifications import send_due_scheduled_summaries
 from app.services.support_sessions import support_session_from_request
 from app.services.webhook_events import deliver_due_webhooks
 
+mark_imports_complete()
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -94,6 +129,10 @@ source_evidence_prewarm_task = None
 source_projection_backfill_task = None
 health_snapshot_refresh_task = None
 dns_posture_refresh_task = None
+ingestion_worker_task = None
+report_partition_task = None
+forensic_analysis_backfill_task = None
+api_token_usage_task = None
 last_check_time = None
 
 
@@ -190,7 +229,7 @@ def _poll_single_gmail_source(source: MailSource) -> None:  # noqa: C901
     try:
         src = db.query(MailSource).get(source.id)
         poll_source = src or source
-        already = GmailClient.load_ingested_ids(poll_source.gmail_ingested_ids)
+        already = load_ingested_message_ids(db, poll_source, CONNECTOR_GMAIL)
         client = GmailClient(
             client_id=poll_source.gmail_client_id or "",
             client_secret=poll_source.gmail_client_secret or "",
@@ -204,9 +243,9 @@ def _poll_single_gmail_source(source: MailSource) -> None:  # noqa: C901
         started_at = datetime.utcnow()
         results = client.fetch_reports()
         if src:
-            if results.get("new_ingested_ids"):
-                all_ids = list(dict.fromkeys(already + results["new_ingested_ids"]))
-                src.gmail_ingested_ids = GmailClient.dump_ingested_ids(all_ids)
+            record_ingested_message_ids(
+                db, src, CONNECTOR_GMAIL, results.get("new_ingested_ids") or []
+            )
 
             refreshed = client.get_refreshed_tokens()
             if refreshed:
@@ -256,7 +295,7 @@ def _poll_single_m365_source(source: MailSource) -> None:
     try:
         src = db.query(MailSource).get(source.id)
         poll_source = src or source
-        already = MicrosoftGraphClient.load_ingested_ids(poll_source.m365_ingested_ids)
+        already = load_ingested_message_ids(db, poll_source, CONNECTOR_M365)
         client = MicrosoftGraphClient(
             tenant_id=poll_source.m365_tenant_id or "common",
             client_id=poll_source.m365_client_id or "",
@@ -275,9 +314,9 @@ def _poll_single_m365_source(source: MailSource) -> None:
         started_at = datetime.utcnow()
         results = client.fetch_reports(days=7)
         if src:
-            if results.get("new_ingested_ids"):
-                all_ids = list(dict.fromkeys(already + results["new_ingested_ids"]))
-                src.m365_ingested_ids = MicrosoftGraphClient.dump_ingested_ids(all_ids)
+            record_ingested_message_ids(
+                db, src, CONNECTOR_M365, results.get("new_ingested_ids") or []
+            )
 
             refreshed = client.get_refreshed_tokens()
             if refreshed:
@@ -326,30 +365,36 @@ def _poll_all_enabled_sources() -> list[MailSource]:  # noqa: C901
         return enabled_sources
 
     for source in enabled_sources:
-        if source.method == "GMAIL_API":
-            try:
-                _poll_single_gmail_source(source)
-            except Exception as e:  # pylint: disable=broad-exception-caught
-                logger.error("Error polling Gmail source id=%d: %s", source.id, str(e))
-        elif source.method == "M365_GRAPH":
-            try:
-                _poll_single_m365_source(source)
-            except Exception as e:  # pylint: disable=broad-exception-caught
-                logger.error("Error polling Microsoft 365 source id=%d: %s", source.id, str(e))
-        elif source.method == "IMAP":
-            try:
-                _poll_single_imap_source(source)
-            except Exception as e:  # pylint: disable=broad-exception-caught
-                logger.error("Error polling mail source id=%d: %s", source.id, str(e))
-        else:
+        if source.method not in {"GMAIL_API", "M365_GRAPH", "IMAP"}:
             logger.info(
                 "Skipping mail source id=%d method=%r (not yet implemented)",
                 source.id,
                 source.method,
             )
+            continue
+        with observe_duration(MAILBOX_POLL_DURATION, method=source.method, source=str(source.id)):
+            _poll_enabled_source(source)
     return enabled_sources
 
 
+def _poll_enabled_source(source: MailSource) -> None:
+    if source.method == "GMAIL_API":
+        try:
+            _poll_single_gmail_source(source)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Error polling Gmail source id=%d: %s", source.id, str(e))
+    elif source.method == "M365_GRAPH":
+        try:
+            _poll_single_m365_source(source)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Error polling Microsoft 365 source id=%d: %s", source.id, str(e))
+    else:
+        try:
+            _poll_single_imap_source(source)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Error polling mail source id=%d: %s", source.id, str(e))
+
+
 def _send_due_summary_notifications() -> None:
     """Send scheduled summary notifications when their configured cadence is due."""
     db = SessionLocal()
@@ -383,6 +428,14 @@ def _deliver_due_webhook_events() -> None:
         db.close()
 
 
+def _flush_api_token_usage() -> None:
+    """Persist buffered API token usage counters before the process exits."""
+    try:
+        flush_buffered_api_token_usage()
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.warning("Failed to flush API token usage during shutdown: %s", exc)
+
+
 def _run_due_mail_source_backfills() -> int:
     """Execute a bounded batch of queued mail-source backfill jobs."""
     db = SessionLocal()
@@ -429,13 +482,18 @@ def _next_sleep_seconds(
 
 def _run_mailbox_scheduler_cycle() -> List[MailSource]:
     """Run blocking mailbox and delivery work outside the application event loop."""
-    enabled_sources = _poll_all_enabled_sources()
-    _run_due_mail_source_backfills()
-    calm_watch = _run_calm_watch_cycle()
+    with observe_scheduler_cycle("mailbox_poll"):
+        enabled_sources = _poll_all_enabled_sources()
+    with observe_scheduler_cycle("mail_source_backfill"):
+        _run_due_mail_source_backfills()
+    with observe_scheduler_cycle("calm_watch"):
+        calm_watch = _run_calm_watch_cycle()
     if calm_watch["sent"]:
         logger.info("Calm Watch sent %d incident notification(s)", len(calm_watch["sent"]))
-    _send_due_summary_notifications()
-    _deliver_due_webhook_events()
+    with observe_scheduler_cycle("summary_notifications"):
+        _send_due_summary_notifications()
+    with observe_scheduler_cycle("webhook_delivery"):
+        _deliver_due_webhook_events()
     return enabled_sources
 
 
@@ -591,6 +649,8 @@ def _start_background_tasks() -> None:
     """Start the mailbox scheduler and DNS prewarm tasks for this deployment mode."""
     global background_task, dns_prewarm_task, source_evidence_prewarm_task
     global source_projection_backfill_task, health_snapshot_refresh_task, dns_posture_refresh_task  # pylint: disable=global-statement
+    global ingestion_worker_task, report_partition_task, forensic_analysis_backfill_task  # pylint: disable=global-statement
+    global api_token_usage_task  # pylint: disable=global-statement
 
     if settings.DEMO_MODE and settings.PROVIDER_DEMO_ENABLED:
         logger.info("Skipping external mailbox polling for the relational provider demo")
@@ -603,6 +663,14 @@ def _start_background_tasks() -> None:
     source_evidence_prewarm_task = asyncio.create_task(scheduled_source_evidence_prewarm())
     source_projection_backfill_task = asyncio.create_task(scheduled_source_projection_backfill())
     health_snapshot_refresh_task = asyncio.create_task(scheduled_health_snapshot_refresh())
+    forensic_analysis_backfill_task = asyncio.create_task(scheduled_forensic_analysis_backfill())
+    api_token_usage_task = asyncio.create_task(scheduled_api_token_usage_flush())
+    if settings.INGESTION_QUEUE_ENABLED:
+        logger.info("Starting ingestion queue workers")
+        ingestion_worker_task = asyncio.create_task(scheduled_ingestion_workers())
+    if settings.REPORT_PARTITIONING_ENABLED:
+        logger.info("Starting report partition maintenance")
+        report_partition_task = asyncio.create_task(scheduled_report_partition_maintenance())
 
 
 def create_app() -> FastAPI:
@@ -616,6 +684,10 @@ def create_app() -> FastAPI:
     # Add security headers middleware
     # Determine environment from settings or environment variable
     environment = os.getenv("ENVIRONMENT", "development")
+    # Compress large JSON and HTML bodies; innermost so it sees the app's raw response
+    application.add_middleware(
+        CompressionMiddleware, minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES
+    )
     application.add_middleware(SecurityHeadersMiddleware, environment=environment)
     application.add_middleware(DemoReadOnlyMiddleware)
 
@@ -645,13 +717,17 @@ def create_app() -> FastAPI:
             max_age=600,  # Cache preflight requests for 10 minutes
         )
 
+    # Request metrics; outermost so latency covers every other middleware
+    application.add_middleware(MetricsMiddleware, enabled=settings.METRICS_ENABLED)
+
     # Include API router
     application.include_router(api_router, prefix=settings.API_V1_STR)
 
-    # Mount static files directory
+    # Mount static files directory; fingerprinted copies under /static/dist are
+    # immutable and served precompressed when the client accepts it.
     application.mount(
         "/static",
-        StaticFiles(directory=os.path.join(os.path.dirname(__file__), "static")),
+        PrecompressedStaticFiles(directory=os.path.join(os.path.dirname(__file__), "static")),
         name="static",
     )
 
@@ -659,13 +735,16 @@ def create_app() -> FastAPI:
     @application.on_event("startup")
     async def startup_event():
         """Initialize background tasks and security on application startup"""
-        run_startup_checks(settings)
+        with startup_phase("startup_checks"):
+            run_startup_checks(settings)
 
         # Ensure all tables exist (no-op if already present)
-        Base.metadata.create_all(bind=engine)
+        with startup_phase("schema"):
+            Base.metadata.create_all(bind=engine)
 
-        _initialize_provider_data()
-        _initialize_synthetic_load_data()
+        with startup_phase("seed_data"):
+            _initialize_provider_data()
+            _initialize_synthetic_load_data()
 
         # Warn loudly when authentication is completely disabled
         if settings.AUTH_DISABLED:
@@ -714,17 +793,22 @@ def create_app() -> FastAPI:
         # One-time migration: if IMAP_* env vars are set and no mail sources exist,
         # create an initial MailSource from those settings so existing deployments
         # continue to work without manual reconfiguration.
-        _migrate_imap_env_vars_to_db()
-        _encrypt_legacy_mail_source_secrets()
+        with startup_phase("mail_source_migrations"):
+            _migrate_imap_env_vars_to_db()
+            _encrypt_legacy_mail_source_secrets()
 
         # Start background polling task (iterates over DB-enabled mail sources)
-        _start_background_tasks()
+        with startup_phase("background_tasks"):
+            _start_background_tasks()
+        mark_startup_complete()
 
     @application.on_event("shutdown")
     async def shutdown_event():
         """Clean up background tasks on application shutdown"""
         global dns_prewarm_task, source_evidence_prewarm_task
         global source_projection_backfill_task, health_snapshot_refresh_task, dns_posture_refresh_task  # pylint: disable=global-statement
+        global ingestion_worker_task, report_partition_task, forensic_analysis_backfill_task  # pylint: disable=global-statement
+        global api_token_usage_task  # pylint: disable=global-statement
 
         await _cancel_background_task(dns_prewarm_task, "DNS prewarm")
         dns_prewarm_task = None
@@ -739,6 +823,14 @@ def create_app() -> FastAPI:
         health_snapshot_refresh_task = None
         await _cancel_background_task(dns_posture_refresh_task, "DNS posture refresh")
         dns_posture_refresh_task = None
+        await _cancel_background_task(ingestion_worker_task, "ingestion queue")
+        ingestion_worker_task = None
+        await _cancel_background_task(report_partition_task, "report partition maintenance")
+        report_partition_task = None
+        await _cancel_background_task(forensic_analysis_backfill_task, "forensic analysis backfill")
+        forensic_analysis_backfill_task = None
+        await _cancel_background_task(api_token_usage_task, "API token usage flush")
+        api_token_usage_task = None
         if background_task:
             logger.info("Cancelling IMAP polling background task")
             background_task.cancel()
@@ -747,11 +839,15 @@ def create_app() -> FastAPI:
             except asyncio.CancelledError:
                 pass
             mark_scheduler_stopped()
+        await run_in_threadpool(_flush_api_token_usage)
+        shutdown_executors(wait=False)
 
     return application
 
 
-app = create_app()  # noqa: F811 – intentional rebind; `app` package imported above for side-effects
+# Intentional rebind: the `app` package is imported above for side-effects.
+with startup_phase("create_app"):
+    app = create_app()  # noqa: F811
 
 # Initialize Jinja2 templates
 templates_dir = os.path.join(os.path.dirname(__file__), "templates")
@@ -768,6 +864,7 @@ templates.env.globals["guided_mail_health_ui_enabled"] = settings.GUIDED_MAIL_HE
 templates.env.globals["app_timezone"] = settings.APP_TIMEZONE
 templates.env.globals["release_info"] = build_release_info(settings)
 templates.env.globals["support_session_context"] = support_session_from_request
+templates.env.globals["static_url"] = static_url
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -1022,9 +1119,29 @@ async def health():
             "environment": release["environment"],
             "build": release["build"],
         },
+        "startup": startup_timings(),
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus/OpenMetrics scrape endpoint, aggregated across workers.
+
+    Served only when METRICS_TOKEN is configured, so route templates and mail
+    source labels are never exposed without a scrape credential.
+    """
+    if not settings.METRICS_ENABLED or not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(
+        request.headers.get("authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    if not metrics_available():
+        raise HTTPException(status_code=503, detail="prometheus_client is not installed")
+    body, content_type = await run_in_threadpool(render_metrics, request.headers.get("accept"))
+    return Response(content=body, media_type=content_type)
+
+
 # ---------------------------------------------------------------------------
 # Helpers for the manual trigger-poll endpoint
 # ---------------------------------------------------------------------------
@@ -1079,7 +1196,7 @@ def _trigger_poll_gmail_source(source: MailSource, db) -> dict:
     """Poll a single GMAIL_API source and return a result dict for the API response."""
     global last_check_time  # pylint: disable=global-statement
 
-    already = GmailClient.load_ingested_ids(source.gmail_ingested_ids)
+    already = load_ingested_message_ids(db, source, CONNECTOR_GMAIL)
     gmail_client = GmailClient(
         client_id=source.gmail_client_id or "",
         client_secret=source.gmail_client_secret or "",
@@ -1093,9 +1210,7 @@ def _trigger_poll_gmail_source(source: MailSource, db) -> dict:
     results = gmail_client.fetch_reports()
     last_check_time = datetime.now()
 
-    if results.get("new_ingested_ids"):
-        all_ids = list(dict.fromkeys(already + results["new_ingested_ids"]))
-        source.gmail_ingested_ids = GmailClient.dump_ingested_ids(all_ids)
+    record_ingested_message_ids(db, source, CONNECTOR_GMAIL, results.get("new_ingested_ids") or [])
     refreshed = gmail_client.get_refreshed_tokens()
     if refreshed:
         source.gmail_access_token = refreshed["access_token"]
@@ -1111,7 +1226,7 @@ def _trigger_poll_m365_source(source: MailSource, db, days: int = 7) -> dict:
     """Poll a single M365_GRAPH source and return a result dict for the API response."""
     global last_check_time  # pylint: disable=global-statement
 
-    already = MicrosoftGraphClient.load_ingested_ids(source.m365_ingested_ids)
+    already = load_ingested_message_ids(db, source, CONNECTOR_M365)
     graph_client = MicrosoftGraphClient(
         tenant_id=source.m365_tenant_id or "common",
         client_id=source.m365_client_id or "",
@@ -1130,9 +1245,7 @@ def _trigger_poll_m365_source(source: MailSource, db, days: int = 7) -> dict:
     results = graph_client.fetch_reports(days=days)
     last_check_time = datetime.now()
 
-    if results.get("new_ingested_ids"):
-        all_ids = list(dict.fromkeys(already + results["new_ingested_ids"]))
-        source.m365_ingested_ids = MicrosoftGraphClient.dump_ingested_ids(all_ids)
+    record_ingested_message_ids(db, source, CONNECTOR_M365, results.get("new_ingested_ids") or [])
     refreshed = graph_client.get_refreshed_tokens()
     if refreshed:
         source.m365_access_token = refreshed["access_token"]
@@ -11,12 +11,11 @@ responses so that programmatic clients are not broken.
 
 from __future__ import annotations
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import RedirectResponse, Response
-from starlette.types import ASGIApp
+from starlette.responses import RedirectResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.core.logto import SESSION_COOKIE, decode_session_token
+from app.core.logto import session_user_id_for_request
 
 # Paths that are always publicly accessible
 _PUBLIC_PATHS: frozenset[str] = frozenset(
@@ -56,10 +55,30 @@ _STATIC_EXTENSIONS: tuple[str, ...] = (
 )
 
 
-class AuthRedirectMiddleware(BaseHTTPMiddleware):
+def _metrics_scrape_path(path: str) -> bool:
+    """``/metrics`` checks its own bearer token, and is only served when one is set."""
+    from app.core.config import get_settings  # local import avoids circular dep
+
+    return path == "/metrics" and bool(get_settings().METRICS_TOKEN)
+
+
+def _is_public_path(path: str) -> bool:
+    return (
+        path in _PUBLIC_PATHS
+        or path.startswith(_PUBLIC_PREFIXES)
+        or path.endswith(_STATIC_EXTENSIONS)
+        or _metrics_scrape_path(path)
+    )
+
+
+class AuthRedirectMiddleware:
     """
     Redirect unauthenticated browser requests to the appropriate page.
 
+    Pure ASGI middleware: public paths are decided on the raw scope, and a
+    ``Request`` is only built for protected pages that need header or cookie
+    checks.
+
     Decision tree
     -------------
     1. Path is public → pass through.
@@ -69,46 +88,45 @@ class AuthRedirectMiddleware(BaseHTTPMiddleware):
     """
 
     def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next) -> Response:  # type: ignore[override]
-        path = request.url.path
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or _is_public_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
 
+        redirect_url = self._redirect_url(Request(scope))
+        if redirect_url is None:
+            await self.app(scope, receive, send)
+            return
+        await RedirectResponse(url=redirect_url, status_code=302)(scope, receive, send)
+
+    @staticmethod
+    def _redirect_url(request: Request) -> str | None:
         # ── 0. Auth disabled globally ─────────────────────────────────────────
         from app.core.config import get_settings  # local import avoids circular dep
 
         cfg = get_settings()
         if cfg.AUTH_DISABLED or getattr(cfg, "active_auth_provider", "") == "disabled":
-            return await call_next(request)
-
-        # ── 1. Public paths & prefixes ────────────────────────────────────────
-        if path in _PUBLIC_PATHS:
-            return await call_next(request)
-        if any(path.startswith(p) for p in _PUBLIC_PREFIXES):
-            return await call_next(request)
-        if any(path.endswith(ext) for ext in _STATIC_EXTENSIONS):
-            return await call_next(request)
+            return None
 
-        # ── 2. Trusted proxy / Authentik Outpost headers ─────────────────────
+        # ── 1. Trusted proxy / Authentik Outpost headers ─────────────────────
         from app.core.auth_providers import trusted_proxy_auth_context
 
         if trusted_proxy_auth_context(request, cfg) is not None:
-            return await call_next(request)
+            return None
 
-        # ── 3. Valid session cookie ───────────────────────────────────────────
-        token = request.cookies.get(SESSION_COOKIE)
-        if token and decode_session_token(token) is not None:
-            return await call_next(request)
+        # ── 2. Valid session cookie ───────────────────────────────────────────
+        if session_user_id_for_request(request) is not None:
+            return None
 
-        # ── 4. Browser auth not configured ───────────────────────────────────
+        # ── 3. Browser auth not configured ───────────────────────────────────
+        query = request.url.query
         if not getattr(cfg, "auth_configured", False):
-            setup_url = "/setup"
-            if request.url.query:
-                setup_url = f"{setup_url}?{request.url.query}"
-            return RedirectResponse(url=setup_url, status_code=302)
+            return f"/setup?{query}" if query else "/setup"
 
-        # ── 5. Redirect to login ──────────────────────────────────────────────
+        # ── 4. Redirect to login ──────────────────────────────────────────────
         next_path = request.url.path
-        if request.url.query:
-            next_path = f"{next_path}?{request.url.query}"
-        return RedirectResponse(url=f"/login?next={next_path}", status_code=302)
+        if query:
+            next_path = f"{next_path}?{query}"
+        return f"/login?next={next_path}"
@@ -0,0 +1,176 @@
+"""
+Response compression middleware for DMARQ application.
+
+Compresses JSON, HTML, text and script responses with brotli when the client
+accepts it and the optional ``brotli`` package is installed, and with gzip
+otherwise. Bodies below the configured minimum size, responses that already
+carry a ``Content-Encoding`` (such as precompressed static assets) and
+``204``/``304`` replies pass through untouched. Strong ETags on compressed
+responses are downgraded to weak validators, since the encoded bytes differ
+from the representation the tag was computed for.
+"""
+
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.static_assets import accepted_encodings
+
+try:  # optional: fall back to gzip when brotli is not installed
+    import brotli
+except ImportError:  # pragma: no cover - depends on the build environment
+    brotli = None
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+UNCOMPRESSED_STATUS_CODES = frozenset({204, 304})
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def _is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "").lower()
+    return content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+
+
+class _Compressor:
+    """Incremental encoder for one response body."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class _CompressionResponder:
+    """Send wrapper that decides per response whether to encode the body."""
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    def _prepare_headers(self, *, content_length: Optional[int]) -> None:
+        headers = MutableHeaders(scope=self.start_message)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+    async def _flush_start(self) -> None:
+        if self.start_message is not None and self.compressor is None:
+            self.passthrough = True
+            await self.send(self.start_message)
+            self.start_message = None
+
+    async def _start(self, message: Message) -> None:
+        headers = Headers(raw=message.get("headers", []))
+        self.passthrough = (
+            message["status"] in UNCOMPRESSED_STATUS_CODES
+            or "content-encoding" in headers
+            or not _is_compressible(headers)
+        )
+        if self.passthrough:
+            await self.send(message)
+        else:
+            self.start_message = message
+
+    async def _body(self, message: Message) -> None:
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            if not more_body and len(body) < self.minimum_size:
+                await self._flush_start()
+                await self.send(message)
+                return
+            self.compressor = _Compressor(self.encoding)
+            if not more_body:
+                payload = self.compressor.compress(body) + self.compressor.finish()
+                self._prepare_headers(content_length=len(payload))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": payload})
+                return
+            self._prepare_headers(content_length=None)
+            await self.send(self.start_message)
+
+        payload = self.compressor.compress(body)
+        if not more_body:
+            payload += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": payload, "more_body": more_body})
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            await self._start(message)
+        elif self.passthrough or message["type"] != "http.response.body":
+            # e.g. ``http.response.debug`` sent by template responses before the
+            # start, or zero-copy ``http.response.pathsend``: nothing to encode.
+            await self._flush_start()
+            await self.send(message)
+        else:
+            await self._body(message)
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware that compresses text-like responses on the fly.
+
+    Unary responses below ``minimum_size`` bytes are sent as-is; streamed
+    responses are encoded chunk by chunk without buffering the whole body.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        """
+        Initialize compression middleware.
+
+        Args:
+            app: Downstream ASGI application
+            minimum_size: Smallest unary body worth compressing; 0 disables compression
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+
+    def _select_encoding(self, scope: Scope) -> Optional[str]:
+        accepted = accepted_encodings(Headers(scope=scope))
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.minimum_size <= 0:
+            await self.app(scope, receive, send)
+            return
+        encoding = self._select_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder)
@@ -4,9 +4,9 @@ from __future__ import annotations
 
 from typing import Any, Callable
 
-from fastapi import Request, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse, Response
+from fastapi import status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.core.config import get_settings
 
@@ -14,10 +14,10 @@ SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
 DEMO_BACKFILL_SOURCE_IDS = frozenset({"9001", "9002", "9003"})
 
 
-def _is_demo_backfill_simulation(request: Request) -> bool:
-    if request.method.upper() != "POST":
+def _is_demo_backfill_simulation(method: str, path: str) -> bool:
+    if method != "POST":
         return False
-    parts = request.url.path.strip("/").split("/")
+    parts = path.strip("/").split("/")
     return (
         len(parts) >= 5
         and parts[:3] == ["api", "v1", "mail-sources"]
@@ -26,41 +26,52 @@ def _is_demo_backfill_simulation(request: Request) -> bool:
     )
 
 
-def _is_demo_support_session_simulation(request: Request, settings: Any) -> bool:
-    method = request.method.upper()
-    if request.url.path == "/api/v1/operator/demo/support-session":
+def _is_demo_support_session_simulation(method: str, path: str, settings: Any) -> bool:
+    if path == "/api/v1/operator/demo/support-session":
         return method == "POST"
     return bool(getattr(settings, "PROVIDER_DEMO_ENABLED", False)) and (
-        request.url.path == "/api/v1/operator/support-session" and method in {"POST", "DELETE"}
+        path == "/api/v1/operator/support-session" and method in {"POST", "DELETE"}
     )
 
 
-class DemoReadOnlyMiddleware(BaseHTTPMiddleware):
-    """Block mutating requests when the public demo data mode is enabled."""
+class DemoReadOnlyMiddleware:
+    """Block mutating requests when the public demo data mode is enabled.
+
+    Implemented as pure ASGI middleware: safe methods are passed through on the
+    raw scope without consulting settings or wrapping the response.
+    """
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         settings_provider: Callable[[], Any] = get_settings,
     ) -> None:
-        super().__init__(app)
+        self.app = app
         self._settings_provider = settings_provider
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        settings = self._settings_provider()
-        if (
-            settings.DEMO_MODE
-            and request.method.upper() not in SAFE_METHODS
-            and not _is_demo_backfill_simulation(request)
-            and not _is_demo_support_session_simulation(request, settings)
-        ):
-            return JSONResponse(
-                status_code=status.HTTP_403_FORBIDDEN,
-                content={
-                    "detail": (
-                        "This public demo is read-only. "
-                        "Deploy DMARQ with DEMO_MODE=false to make changes."
-                    )
-                },
-            )
-        return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"].upper()
+        if method not in SAFE_METHODS:
+            path = scope["path"]
+            settings = self._settings_provider()
+            if (
+                settings.DEMO_MODE
+                and not _is_demo_backfill_simulation(method, path)
+                and not _is_demo_support_session_simulation(method, path, settings)
+            ):
+                response = JSONResponse(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    content={
+                        "detail": (
+                            "This public demo is read-only. "
+                            "Deploy DMARQ with DEMO_MODE=false to make changes."
+                        )
+                    },
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
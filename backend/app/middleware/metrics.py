@@ -0,0 +1,87 @@
+"""
+Request metrics middleware for DMARQ application.
+
+Counts requests and observes their latency per route template (for example
+``/api/v1/domains/{domain_id}``) rather than per raw path, so label
+cardinality stays bounded no matter which IDs clients request. Requests that
+match no route share a single label.
+"""
+
+import re
+import time
+from typing import Dict, Pattern
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    UNMATCHED_ROUTE,
+)
+
+_suffix_patterns: Dict[str, Pattern[str]] = {}
+
+
+def _suffix_pattern(path_regex: Pattern[str]) -> Pattern[str]:
+    pattern = _suffix_patterns.get(path_regex.pattern)
+    if pattern is None:
+        pattern = re.compile(path_regex.pattern.lstrip("^"))
+        _suffix_patterns[path_regex.pattern] = pattern
+    return pattern
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if not template:
+        return UNMATCHED_ROUTE
+    # Routes of an included router may keep their router-local template; the
+    # literal include prefix is whatever precedes the local match in the path.
+    path = scope.get("path", "")
+    path_regex = getattr(route, "path_regex", None)
+    if path_regex is None or path_regex.match(path):
+        return template
+    match = _suffix_pattern(path_regex).search(path)
+    return path[: match.start()] + template if match else template
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware that records HTTP request metrics."""
+
+    def __init__(self, app: ASGIApp, enabled: bool = True):
+        """
+        Initialize metrics middleware.
+
+        Args:
+            app: Downstream ASGI application
+            enabled: Record request metrics; False passes every request through
+        """
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            method = scope.get("method", "")
+            route = _route_template(scope)
+            HTTP_REQUEST_DURATION.labels(method=method, route=route).observe(
+                time.perf_counter() - started
+            )
+            HTTP_REQUESTS.labels(method=method, route=route, status=str(status_code)).inc()
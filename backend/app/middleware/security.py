@@ -13,14 +13,14 @@ Implements various security headers to protect against common web vulnerabilitie
 
 import logging
 import os
-from typing import Callable
+from typing import List, Tuple
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
+RawHeaders = List[Tuple[bytes, bytes]]
+
 
 def _strict_csp_directives() -> list[str]:
     """Return the default CSP for the local CSP-compatible frontend runtime."""
@@ -57,96 +57,122 @@ def _truthy_env(name: str) -> bool:
     return os.environ.get(name, "false").strip().lower() in {"1", "true", "yes", "on"}
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+def security_headers(environment: str = "development") -> dict[str, str]:
+    """Return the security headers added to every HTTP response."""
+    headers: dict[str, str] = {}
+
+    # Content Security Policy (CSP). The shipped Alpine runtime is the CSP build,
+    # so strict mode is the default. Keep a temporary compatibility escape hatch
+    # for operators with custom templates or extensions.
+    csp_directives = (
+        _relaxed_csp_directives()
+        if _truthy_env("CSP_COMPATIBILITY_MODE")
+        else _strict_csp_directives()
+    )
+    headers["Content-Security-Policy"] = "; ".join(csp_directives)
+
+    if _truthy_env("CSP_REPORT_ONLY"):
+        headers["Content-Security-Policy-Report-Only"] = "; ".join(_strict_csp_directives())
+
+    # X-Frame-Options: Prevent clickjacking attacks
+    # 'DENY' prevents the page from being displayed in a frame
+    headers["X-Frame-Options"] = "DENY"
+
+    # X-Content-Type-Options: Prevent MIME type sniffing
+    # Forces browsers to respect the declared Content-Type
+    headers["X-Content-Type-Options"] = "nosniff"
+
+    # X-XSS-Protection: Enable browser XSS protection
+    # Note: Modern browsers rely more on CSP, but this provides defense-in-depth
+    headers["X-XSS-Protection"] = "1; mode=block"
+
+    # Referrer-Policy: Control referrer information
+    # 'strict-origin-when-cross-origin' provides good balance of privacy and functionality
+    headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+
+    # Permissions-Policy: Control browser features
+    # Disable features that aren't needed
+    permissions_policies = [
+        "accelerometer=()",
+        "camera=()",
+        "geolocation=()",
+        "gyroscope=()",
+        "magnetometer=()",
+        "microphone=()",
+        "payment=()",
+        "usb=()",
+    ]
+    headers["Permissions-Policy"] = ", ".join(permissions_policies)
+
+    # Strict-Transport-Security (HSTS): Force HTTPS
+    # Only enable in production with HTTPS
+    if environment == "production":
+        # max-age=31536000 = 1 year
+        # includeSubDomains applies to all subdomains
+        # preload allows inclusion in browser HSTS preload lists
+        headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
+
+    return headers
+
+
+# Cache-Control for sensitive pages
+# Prevent caching of potentially sensitive data
+API_CACHE_HEADERS = {
+    "Cache-Control": "no-store, no-cache, must-revalidate, private",
+    "Pragma": "no-cache",
+    "Expires": "0",
+}
+
+
+def _encode_headers(headers: dict[str, str]) -> RawHeaders:
+    return [
+        (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()
+    ]
+
+
+class SecurityHeadersMiddleware:
     """
-    Middleware to add security headers to all HTTP responses.
+    Pure ASGI middleware that adds security headers to all HTTP responses.
+
+    Header values depend only on process configuration, so they are encoded
+    once when the middleware stack is built and appended to the response start
+    message without wrapping the response body.
     """
 
-    def __init__(self, app, environment: str = "development"):
+    def __init__(self, app: ASGIApp, environment: str = "development"):
         """
         Initialize security headers middleware.
 
         Args:
-            app: FastAPI application instance
+            app: Downstream ASGI application
             environment: Application environment (development/production)
         """
-        super().__init__(app)
+        self.app = app
         self.environment = environment
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Process the request and add security headers to the response.
-
-        Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/handler in the chain
-
-        Returns:
-            HTTP response with security headers added
-        """
-        response = await call_next(request)
-
-        # Content Security Policy (CSP). The shipped Alpine runtime is the CSP build,
-        # so strict mode is the default. Keep a temporary compatibility escape hatch
-        # for operators with custom templates or extensions.
-        csp_directives = (
-            _relaxed_csp_directives()
-            if _truthy_env("CSP_COMPATIBILITY_MODE")
-            else _strict_csp_directives()
-        )
-        response.headers["Content-Security-Policy"] = "; ".join(csp_directives)
-
-        if _truthy_env("CSP_REPORT_ONLY"):
-            report_only_directives = _strict_csp_directives()
-            response.headers["Content-Security-Policy-Report-Only"] = "; ".join(
-                report_only_directives
-            )
-
-        # X-Frame-Options: Prevent clickjacking attacks
-        # 'DENY' prevents the page from being displayed in a frame
-        response.headers["X-Frame-Options"] = "DENY"
-
-        # X-Content-Type-Options: Prevent MIME type sniffing
-        # Forces browsers to respect the declared Content-Type
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # X-XSS-Protection: Enable browser XSS protection
-        # Note: Modern browsers rely more on CSP, but this provides defense-in-depth
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
-        # Referrer-Policy: Control referrer information
-        # 'strict-origin-when-cross-origin' provides good balance of privacy and functionality
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # Permissions-Policy: Control browser features
-        # Disable features that aren't needed
-        permissions_policies = [
-            "accelerometer=()",
-            "camera=()",
-            "geolocation=()",
-            "gyroscope=()",
-            "magnetometer=()",
-            "microphone=()",
-            "payment=()",
-            "usb=()",
-        ]
-        response.headers["Permissions-Policy"] = ", ".join(permissions_policies)
-
-        # Strict-Transport-Security (HSTS): Force HTTPS
-        # Only enable in production with HTTPS
-        if self.environment == "production":
-            # max-age=31536000 = 1 year
-            # includeSubDomains applies to all subdomains
-            # preload allows inclusion in browser HSTS preload lists
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains; preload"
-            )
-
-        # Cache-Control for sensitive pages
-        # Prevent caching of potentially sensitive data
-        if request.url.path.startswith("/api/"):
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
-
-        return response
+        self._headers = _encode_headers(security_headers(environment))
+        self._api_headers = self._headers + _encode_headers(API_CACHE_HEADERS)
+        self._header_names = frozenset(name for name, _value in self._headers)
+        self._api_header_names = frozenset(name for name, _value in self._api_headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["path"].startswith("/api/"):
+            added, replaced = self._api_headers, self._api_header_names
+        else:
+            added, replaced = self._headers, self._header_names
+
+        async def send_with_security_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                raw = [
+                    (name, value)
+                    for name, value in message.get("headers", ())
+                    if name.lower() not in replaced
+                ]
+                raw.extend(added)
+                message["headers"] = raw
+            await send(message)
+
+        await self.app(scope, receive, send_with_security_headers)
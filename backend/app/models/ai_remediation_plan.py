@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from app.core.database import Base
+
+
+class AIRemediationPlan(Base):
+    """Generated remediation plan shared by every API process.
+
+    Rows are keyed by the hash of the provider settings and the redacted
+    evidence context, so a plan is reused only while that evidence is unchanged.
+    """
+
+    __tablename__ = "ai_remediation_plans"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), nullable=False, unique=True, index=True)
+    domain = Column(String, nullable=False, index=True)
+    plan_json = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<AIRemediationPlan {self.domain} {self.cache_key[:12]}>"
@@ -38,6 +38,9 @@ class Domain(Base):
         "ForensicReport", back_populates="domain", cascade="all, delete-orphan"
     )
     tls_reports = relationship("TLSReport", back_populates="domain", cascade="all, delete-orphan")
+    tls_report_rollups = relationship(
+        "TLSReportDailyRollup", back_populates="domain", cascade="all, delete-orphan"
+    )
     user_domains = relationship("UserDomain", back_populates="domain", cascade="all, delete-orphan")
 
     # Indexes for common queries
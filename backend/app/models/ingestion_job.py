@@ -0,0 +1,97 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    func,
+    text,
+)
+
+from app.core.database import Base
+
+# Jobs in these states hold the payload's place in the queue; a second job for
+# the same bytes is only accepted once the first has finished.
+ACTIVE_INGESTION_JOB_SQL = "status IN ('queued', 'backoff', 'running')"
+
+
+class IngestionJob(Base):
+    """Durable queue row for one accepted report upload or inbound email.
+
+    The raw payload is kept until a worker has parsed and persisted it, so an
+    accepted submission survives restarts and can be retried or dead-lettered.
+    """
+
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=True, index=True)
+    kind = Column(String(32), nullable=False, index=True)
+    source = Column(String(64), nullable=False, default="api")
+    status = Column(String(24), nullable=False, default="queued", index=True)
+
+    filename = Column(String(255), nullable=True)
+    content_sha256 = Column(String(64), nullable=False)
+    payload_size = Column(Integer, nullable=False, default=0)
+    payload = Column(LargeBinary, nullable=True)
+    options = Column(Text, nullable=True)
+
+    attempt_count = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    last_error = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)
+
+    next_retry_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_ingestion_jobs_status_retry", "status", "next_retry_at"),
+        Index("ix_ingestion_jobs_kind_sha256", "kind", "content_sha256"),
+        Index("ix_ingestion_jobs_workspace_status", "workspace_id", "status"),
+        Index(
+            "uq_ingestion_jobs_active_payload",
+            kind,
+            func.coalesce(workspace_id, 0),
+            content_sha256,
+            unique=True,
+            postgresql_where=text(ACTIVE_INGESTION_JOB_SQL),
+            sqlite_where=text(ACTIVE_INGESTION_JOB_SQL),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<IngestionJob id={self.id} kind={self.kind!r} status={self.status!r}>"
+
+
+class IngestedPayloadDigest(Base):
+    """SHA-256 of a raw report payload and the report it was persisted as.
+
+    Lets every intake path recognise an attachment it has already stored before
+    decompressing or parsing it again. The referenced report is re-checked on
+    lookup, so deleted or purged reports can be imported again.
+    """
+
+    __tablename__ = "ingested_payload_digests"
+
+    id = Column(Integer, primary_key=True, index=True)
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=True)
+    kind = Column(String(24), nullable=False)
+    content_sha256 = Column(String(64), nullable=False)
+    domain = Column(String(255), nullable=True)
+    report_id = Column(String(255), nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_ingested_payload_digests_lookup", "content_sha256", "kind", "workspace_id"),
+    )
+
+    def __repr__(self):
+        return f"<IngestedPayloadDigest kind={self.kind!r} report_id={self.report_id!r}>"
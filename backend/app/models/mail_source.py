@@ -47,7 +47,8 @@ class MailSource(Base):
     _gmail_refresh_token = Column("gmail_refresh_token", Text, nullable=True)
     # Email address of the authorised Gmail account
     gmail_email = Column(String, nullable=True)
-    # JSON-encoded list of Gmail message IDs that have already been ingested
+    # Legacy JSON list of ingested Gmail message IDs; folded into
+    # mail_source_ingested_messages on the next poll.
     gmail_ingested_ids = Column(Text, nullable=True, default="[]")
 
     # Microsoft 365 / Graph OAuth2 credentials (used by M365_GRAPH method)
@@ -70,7 +71,8 @@ class MailSource(Base):
     m365_folder_id = Column(String, nullable=True)
     # Email address reported by Microsoft Graph for the authorised account.
     m365_email = Column(String, nullable=True)
-    # JSON-encoded list of Graph message IDs that have already been ingested
+    # Legacy JSON list of ingested Graph message IDs; folded into
+    # mail_source_ingested_messages on the next poll.
     m365_ingested_ids = Column(Text, nullable=True, default="[]")
 
     # Polling behaviour
@@ -94,6 +96,11 @@ class MailSource(Base):
         back_populates="mail_source",
         cascade="all, delete-orphan",
     )
+    ingested_messages = relationship(
+        "MailSourceIngestedMessage",
+        back_populates="mail_source",
+        cascade="all, delete-orphan",
+    )
     workspace = relationship("Workspace", back_populates="mail_sources")
 
     __table_args__ = (
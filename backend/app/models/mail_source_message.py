@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class MailSourceIngestedMessage(Base):
+    """Provider message ID a Gmail or Microsoft 365 source has already examined."""
+
+    __tablename__ = "mail_source_ingested_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    mail_source_id = Column(Integer, ForeignKey("mail_sources.id"), nullable=False)
+    connector = Column(String(16), nullable=False)
+    message_id = Column(String(512), nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    mail_source = relationship("MailSource", back_populates="ingested_messages")
+
+    __table_args__ = (
+        UniqueConstraint(
+            "mail_source_id",
+            "connector",
+            "message_id",
+            name="uq_mail_source_ingested_message",
+        ),
+    )
+
+    def __repr__(self):
+        return (
+            f"<MailSourceIngestedMessage source={self.mail_source_id} "
+            f"connector={self.connector!r}>"
+        )
@@ -1,9 +1,31 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    event,
+    select,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.models.types import IPAddress, JSONDocument, inet_or_none
+
+# Records where neither DKIM nor SPF passed, i.e. DMARC failures. Queries that
+# repeat this predicate can use the PostgreSQL partial index below.
+DMARC_FAILING_RECORD_SQL = "dkim IS DISTINCT FROM 'pass' AND spf IS DISTINCT FROM 'pass'"
+
+
+def _source_inet_default(context) -> str | None:
+    return inet_or_none(context.get_current_parameters().get("source_ip"))
 
 
 class DMARCReport(Base):
@@ -72,9 +94,14 @@ class ReportRecord(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     report_id = Column(Integer, ForeignKey("dmarc_reports.id"), nullable=False, index=True)
+    # Copy of the report's begin_date: the partition key for report_records and
+    # a prunable date filter for record queries.
+    report_begin_date = Column(Integer, nullable=True, index=True)
 
     # Source information
     source_ip = Column(String, nullable=False, index=True)
+    # Typed copy of source_ip for CIDR queries; NULL when source_ip is not an address.
+    source_inet = Column(IPAddress, nullable=True, default=_source_inet_default)
     count = Column(Integer, nullable=False, default=0)
 
     # Policy evaluation
@@ -90,12 +117,12 @@ class ReportRecord(Base):
     envelope_to = Column(String, nullable=True)
 
     # Authentication details (optional JSON fields)
-    dkim_auth_details = Column(Text, nullable=True)  # JSON array of DKIM results
-    spf_auth_details = Column(Text, nullable=True)  # JSON array of SPF results
-    policy_override_reasons = Column(Text, nullable=True)  # JSON array of policy reasons
-    record_extensions = Column(Text, nullable=True)  # JSON object of extension values
+    dkim_auth_details = Column(JSONDocument, nullable=True)  # JSON array of DKIM results
+    spf_auth_details = Column(JSONDocument, nullable=True)  # JSON array of SPF results
+    policy_override_reasons = Column(JSONDocument, nullable=True)  # JSON array of policy reasons
+    record_extensions = Column(JSONDocument, nullable=True)  # JSON object of extension values
     # Point-in-time PTR, network, and reputation evidence captured after ingestion.
-    source_evidence = Column(Text, nullable=True)
+    source_evidence = Column(JSONDocument, nullable=True)
 
     # Relationships
     report = relationship("DMARCReport", back_populates="records")
@@ -106,12 +133,52 @@ class ReportRecord(Base):
         Index("ix_report_records_source_auth", "source_ip", "dkim", "spf"),
         # Composite index for disposition and count (for statistics)
         Index("ix_report_records_disposition", "disposition", "count"),
+        # PostgreSQL only: CIDR containment (<<=) over all and over failing records,
+        # and JSONB containment (@>) over evidence and DKIM results.
+        Index(
+            "ix_report_records_source_inet",
+            "source_inet",
+            postgresql_using="gist",
+            postgresql_ops={"source_inet": "inet_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_report_records_failing_source_inet",
+            "source_inet",
+            postgresql_using="gist",
+            postgresql_ops={"source_inet": "inet_ops"},
+            postgresql_where=text(DMARC_FAILING_RECORD_SQL),
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_report_records_source_evidence",
+            "source_evidence",
+            postgresql_using="gin",
+            postgresql_ops={"source_evidence": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_report_records_dkim_auth_details",
+            "dkim_auth_details",
+            postgresql_using="gin",
+            postgresql_ops={"dkim_auth_details": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
     )
 
     def __repr__(self):
         return f"<ReportRecord {self.id} ({self.source_ip})>"
 
 
+@event.listens_for(ReportRecord, "before_insert")
+def _copy_report_begin_date(_mapper, connection, target: ReportRecord) -> None:
+    if target.report_begin_date is not None:
+        return
+    report = target.__dict__.get("report")
+    if report is not None:
+        target.report_begin_date = report.begin_date
+    elif target.report_id is not None:
+        target.report_begin_date = connection.scalar(
+            select(DMARCReport.begin_date).where(DMARCReport.id == target.report_id)
+        )
+
+
 class DomainSourceDailyProjection(Base):
     """Read-optimized daily sender facts derived during report ingestion."""
 
@@ -161,6 +228,61 @@ class DomainSourceDailyProjection(Base):
     )
 
 
+class DomainSourceFirstSeen(Base):
+    """When each sender first reported for a domain, maintained during ingestion.
+
+    Unlike the daily projections this index is not pruned with report
+    retention, so new-source detection is one range query on ``first_seen``.
+    """
+
+    __tablename__ = "domain_source_first_seen"
+
+    id = Column(Integer, primary_key=True, index=True)
+    domain_id = Column(Integer, ForeignKey("domains.id"), nullable=False, index=True)
+    source_ip = Column(String, nullable=False)
+    first_seen = Column(Integer, nullable=False)
+    last_seen = Column(Integer, nullable=False)
+    # Lifetime total; equals the window total while first_seen is in the window.
+    message_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("domain_id", "source_ip", name="uq_domain_source_first_seen"),
+        Index("ix_domain_source_first_seen_first_seen", "first_seen", "domain_id"),
+    )
+
+
+class DomainDKIMSelectorObservation(Base):
+    """Daily DKIM selector evidence per domain, maintained during ingestion.
+
+    Counts follow ``ReportStore`` selector evidence: only DKIM results whose
+    signing domain aligns with the monitored domain are kept, and a record that
+    carries both a failing and a passing result for a selector counts as failing.
+    """
+
+    __tablename__ = "domain_dkim_selector_observations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    domain_id = Column(Integer, ForeignKey("domains.id"), nullable=False, index=True)
+    selector = Column(String(255), nullable=False)
+    observed_at = Column(Integer, nullable=False)
+    first_seen = Column(Integer, nullable=False)
+    last_seen = Column(Integer, nullable=False)
+    report_count = Column(Integer, nullable=False, default=0)
+    message_count = Column(Integer, nullable=False, default=0)
+    pass_count = Column(Integer, nullable=False, default=0)
+    fail_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "domain_id",
+            "selector",
+            "observed_at",
+            name="uq_domain_dkim_selector_observation",
+        ),
+        Index("ix_domain_dkim_selector_observations_last_seen", "domain_id", "last_seen"),
+    )
+
+
 class ForensicReport(Base):
     """DMARC forensic/failure report model (RFC 6591 / ARF)."""
 
@@ -196,12 +318,28 @@ class ForensicReport(Base):
     feedback_headers = Column(Text, nullable=True)
     processed_at = Column(DateTime, default=datetime.utcnow, index=True)
 
+    # Operator analysis materialised at ingest so investigation views can group
+    # samples in SQL instead of re-parsing every row on read.
+    analysis_failure_kind = Column(String(16), nullable=True, index=True)
+    analysis_priority = Column(String(16), nullable=True, index=True)
+    analysis_priority_rank = Column(Integer, nullable=True)
+    analysis_auth_results = Column(Text, nullable=True)
+    analysis_dkim_domain = Column(String, nullable=True)
+    analysis_mail_from_domain = Column(String, nullable=True)
+    analysis_group_key = Column(String(512), nullable=True, index=True)
+
     domain = relationship("Domain", back_populates="forensic_reports")
 
     __table_args__ = (
         UniqueConstraint("domain_id", "report_id", name="uq_forensic_reports_domain_report"),
         Index("ix_forensic_reports_domain_arrival", "domain_id", "arrival_date"),
         Index("ix_forensic_reports_failure_source", "auth_failure", "source_ip"),
+        Index(
+            "ix_forensic_reports_domain_group",
+            "domain_id",
+            "analysis_group_key",
+            "analysis_priority_rank",
+        ),
     )
 
     def __repr__(self):
@@ -227,6 +365,9 @@ class TLSReport(Base):
     total_failure_sessions = Column(Integer, nullable=False, default=0)
     raw_policy = Column(Text, nullable=True)
     processed_at = Column(DateTime, default=datetime.utcnow, index=True)
+    # Latest of the report period and processing dates, so summary windows can
+    # filter on one indexed column.
+    observed_day = Column(Date, nullable=True, index=True)
 
     domain = relationship("Domain", back_populates="tls_reports")
     failures = relationship(
@@ -244,6 +385,7 @@ class TLSReport(Base):
         ),
         Index("ix_tls_reports_domain_dates", "domain_id", "begin_date", "end_date"),
         Index("ix_tls_reports_policy_domain_dates", "policy_domain", "begin_date", "end_date"),
+        Index("ix_tls_reports_domain_observed_day", "domain_id", "observed_day"),
     )
 
     def __repr__(self):
@@ -275,3 +417,35 @@ class TLSReportFailure(Base):
 
     def __repr__(self):
         return f"<TLSReportFailure {self.result_type} count={self.failed_session_count}>"
+
+
+class TLSReportDailyRollup(Base):
+    """Daily TLS-RPT session totals per policy domain, maintained at ingest."""
+
+    __tablename__ = "tls_report_daily_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    domain_id = Column(Integer, ForeignKey("domains.id"), nullable=False, index=True)
+    policy_domain = Column(String, nullable=False)
+    observed_day = Column(Date, nullable=False)
+    report_day = Column(Date, nullable=False)
+    report_count = Column(Integer, nullable=False, default=0)
+    successful_sessions = Column(Integer, nullable=False, default=0)
+    failed_sessions = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    domain = relationship("Domain", back_populates="tls_report_rollups")
+
+    __table_args__ = (
+        UniqueConstraint(
+            "domain_id",
+            "policy_domain",
+            "observed_day",
+            "report_day",
+            name="uq_tls_report_daily_rollup",
+        ),
+        Index("ix_tls_report_daily_rollups_window", "domain_id", "observed_day"),
+    )
+
+    def __repr__(self):
+        return f"<TLSReportDailyRollup {self.policy_domain} {self.report_day}>"
@@ -0,0 +1,91 @@
+"""
+Portable column types with native PostgreSQL storage.
+
+``JSONDocument`` stores JSON as ``JSONB`` on PostgreSQL and as JSON text
+elsewhere; ``IPAddress`` stores addresses as ``INET`` on PostgreSQL and as
+strings elsewhere. Both accept the values existing writers already use
+(JSON-encoded strings and address strings), so SQLite installs and tests see
+no change while PostgreSQL gains GIN/GiST indexes and server-side operators.
+"""
+
+import ipaddress
+import json
+from typing import Any, Optional
+
+from sqlalchemy import String, Text
+from sqlalchemy.dialects.postgresql import INET, JSONB
+from sqlalchemy.types import TypeDecorator
+
+
+def _is_postgresql(dialect) -> bool:
+    return dialect.name == "postgresql"
+
+
+class JSONDocument(TypeDecorator):
+    """JSON stored as ``JSONB`` on PostgreSQL and as text on other databases.
+
+    Writers may pass Python values or already-encoded JSON strings. On
+    PostgreSQL a string that is not valid JSON is kept as a JSON string
+    rather than rejected. Loaded values are decoded objects on PostgreSQL and
+    JSON text elsewhere; read them with ``decode_json_document``.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if _is_postgresql(dialect):
+            return dialect.type_descriptor(JSONB(none_as_null=True))
+        return dialect.type_descriptor(Text())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not _is_postgresql(dialect):
+            return value if isinstance(value, str) else json.dumps(value)
+        if isinstance(value, str):
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                return value
+        return value
+
+
+def decode_json_document(value: Any) -> Any:
+    """Return the decoded value of a ``JSONDocument`` column, or None if invalid."""
+    if value is None or not isinstance(value, (str, bytes)):
+        return value
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return None
+
+
+def encode_json_document(value: Any) -> Optional[str]:
+    """Return a ``JSONDocument`` value as JSON text, for copying into text columns."""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, sort_keys=True)
+
+
+class IPAddress(TypeDecorator):
+    """IP address stored as ``INET`` on PostgreSQL and as a string elsewhere."""
+
+    impl = String
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if _is_postgresql(dialect):
+            return dialect.type_descriptor(INET())
+        return dialect.type_descriptor(String(45))
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else str(value)
+
+
+def inet_or_none(value: Any) -> Optional[str]:
+    """Return the canonical form of an IP address string, or None if it is not one."""
+    try:
+        return str(ipaddress.ip_address(str(value).strip()))
+    except ValueError:
+        return None
@@ -1,9 +1,10 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, event
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.utils.domain_validator import normalize_domain_name
 
 
 class WorkspaceMembership(Base):
@@ -44,6 +45,9 @@ class WorkspaceAuditLog(Base):
     entity_type = Column(String(80), nullable=False, index=True)
     entity_id = Column(String(120), nullable=True, index=True)
     entity_name = Column(String(255), nullable=True)
+    # normalize_domain_name(entity_name), kept in sync by _set_entity_key so
+    # per-domain audit lookups can use an index instead of lower(trim(...)).
+    entity_key = Column(String(255), nullable=True)
     details = Column(Text, nullable=True)
     ip_address = Column(String(64), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -54,7 +58,19 @@ class WorkspaceAuditLog(Base):
         Index("ix_workspace_audit_workspace_created", "workspace_id", "created_at"),
         Index("ix_workspace_audit_workspace_action", "workspace_id", "action"),
         Index("ix_workspace_audit_entity", "entity_type", "entity_id"),
+        Index(
+            "ix_workspace_audit_entity_key",
+            "workspace_id",
+            "entity_type",
+            "entity_key",
+            "created_at",
+        ),
     )
 
     def __repr__(self):
         return f"<WorkspaceAuditLog {self.action} {self.entity_type}>"
+
+
+@event.listens_for(WorkspaceAuditLog.entity_name, "set")
+def _set_entity_key(target: WorkspaceAuditLog, value, _oldvalue, _initiator) -> None:
+    target.entity_key = normalize_domain_name(str(value or "")) or None
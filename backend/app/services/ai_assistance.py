@@ -2,18 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
+import logging
 import re
+import threading
 import time
+from collections import Counter, OrderedDict
 from dataclasses import asdict, dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.core.redaction import SENSITIVE_VALUE, redact_sensitive_text
+from app.models.ai_remediation_plan import AIRemediationPlan
 from app.models.domain import Domain
 from app.models.mail_source import MailSource
 from app.models.setting import Setting
@@ -41,7 +47,14 @@ AI_DEFAULTS = {
 EMAIL_PATTERN = re.compile(r"\b[A-Z0-9._%+-]+@([A-Z0-9.-]+\.[A-Z]{2,})\b", re.IGNORECASE)
 LONG_TOKEN_PATTERN = re.compile(r"\b[A-Za-z0-9._~+/=-]{24,}\b")
 REMEDIATION_CACHE_MAX_ENTRIES = 256
-_REMEDIATION_CACHE: Dict[str, tuple[float, Dict[str, Any]]] = {}
+# In-process LRU in front of the shared ai_remediation_plans table. Entries are
+# (created_at, plan) and the least recently used entry sits at the front.
+_REMEDIATION_CACHE: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+_REMEDIATION_INFLIGHT: Dict[str, asyncio.Future] = {}
+_REMEDIATION_CACHE_STATS: Counter = Counter()
+_remediation_cache_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -231,37 +244,146 @@ def _stable_cache_context(context: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _cache_get(key: str, ttl_seconds: int) -> Optional[Dict[str, Any]]:
-    _cache_prune(ttl_seconds)
-    cached = _REMEDIATION_CACHE.get(key)
-    if cached is None:
+    with _remediation_cache_lock:
+        cached = _REMEDIATION_CACHE.get(key)
+        if cached is None:
+            return None
+        created_at, payload = cached
+        if ttl_seconds and time.time() - created_at <= ttl_seconds:
+            _REMEDIATION_CACHE.move_to_end(key)
+            return payload
+        _REMEDIATION_CACHE.pop(key, None)
+        return None
+
+
+def _cache_prune(ttl_seconds: int = 0) -> None:
+    """Evict from the least recently used end until the cache fits and is fresh."""
+    now = time.time()
+    while _REMEDIATION_CACHE:
+        created_at, _payload = next(iter(_REMEDIATION_CACHE.values()))
+        expired = bool(ttl_seconds) and now - created_at > ttl_seconds
+        if not expired and len(_REMEDIATION_CACHE) <= REMEDIATION_CACHE_MAX_ENTRIES:
+            return
+        _REMEDIATION_CACHE.popitem(last=False)
+
+
+def _cache_set(key: str, payload: Dict[str, Any], created_at: Optional[float] = None) -> None:
+    with _remediation_cache_lock:
+        _REMEDIATION_CACHE[key] = (created_at or time.time(), payload)
+        _REMEDIATION_CACHE.move_to_end(key)
+        _cache_prune()
+
+
+def remediation_cache_stats() -> Dict[str, int]:
+    """Return remediation plan cache hit, miss and coalesced-request counters."""
+    return {
+        "memory_hits": _REMEDIATION_CACHE_STATS["memory_hits"],
+        "shared_hits": _REMEDIATION_CACHE_STATS["shared_hits"],
+        "coalesced": _REMEDIATION_CACHE_STATS["coalesced"],
+        "misses": _REMEDIATION_CACHE_STATS["misses"],
+        "entries": len(_REMEDIATION_CACHE),
+    }
+
+
+def clear_remediation_cache() -> None:
+    """Drop in-process remediation plans and reset the cache counters."""
+    with _remediation_cache_lock:
+        _REMEDIATION_CACHE.clear()
+        _REMEDIATION_INFLIGHT.clear()
+        _REMEDIATION_CACHE_STATS.clear()
+
+
+def _shared_plan_get(db: Session, key: str, ttl_seconds: int) -> Optional[tuple[float, Dict]]:
+    row = (
+        db.query(AIRemediationPlan.created_at, AIRemediationPlan.plan_json)
+        .filter(
+            AIRemediationPlan.cache_key == key,
+            AIRemediationPlan.created_at >= datetime.utcnow() - timedelta(seconds=ttl_seconds),
+        )
+        .first()
+    )
+    if row is None:
+        return None
+    try:
+        plan = json.loads(row.plan_json)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(plan, dict):
         return None
-    created_at, payload = cached
-    if ttl_seconds and time.time() - created_at <= ttl_seconds:
-        return payload
-    _REMEDIATION_CACHE.pop(key, None)
-    return None
+    age = (datetime.utcnow() - row.created_at).total_seconds()
+    return time.time() - max(0.0, age), plan
 
 
-def _cache_prune(ttl_seconds: int) -> None:
+def _shared_plan_set(
+    db: Session, key: str, domain: str, plan: Dict[str, Any], ttl_seconds: int
+) -> None:
+    """Store *plan* for other API processes and drop plans older than the TTL."""
+    now = datetime.utcnow()
+    try:
+        db.query(AIRemediationPlan).filter(
+            AIRemediationPlan.created_at < now - timedelta(seconds=ttl_seconds)
+        ).delete(synchronize_session=False)
+        row = db.query(AIRemediationPlan).filter(AIRemediationPlan.cache_key == key).first()
+        if row is None:
+            row = AIRemediationPlan(cache_key=key, domain=domain)
+            db.add(row)
+        row.plan_json = json.dumps(plan, sort_keys=True, default=str)
+        row.created_at = now
+        db.commit()
+    except IntegrityError:
+        # Another process stored the same plan first; theirs is equivalent.
+        db.rollback()
+    except SQLAlchemyError:
+        db.rollback()
+        logger.warning("Could not persist remediation plan for %s", domain, exc_info=True)
+
+
+async def _cached_remediation_plan(
+    db: Session,
+    key: str,
+    domain: str,
+    ttl_seconds: int,
+    generate,
+) -> Dict[str, Any]:
+    """Return a plan from the LRU, the shared table, or a single-flight *generate* call."""
+    cached = _cache_get(key, ttl_seconds)
+    if cached:
+        _REMEDIATION_CACHE_STATS["memory_hits"] += 1
+        return {**cached, "cached": True}
     if ttl_seconds:
-        now = time.time()
-        expired_keys = [
-            key
-            for key, (created_at, _payload) in _REMEDIATION_CACHE.items()
-            if now - created_at > ttl_seconds
-        ]
-        for key in expired_keys:
-            _REMEDIATION_CACHE.pop(key, None)
-    while len(_REMEDIATION_CACHE) > REMEDIATION_CACHE_MAX_ENTRIES:
-        oldest_key = min(_REMEDIATION_CACHE, key=lambda item: _REMEDIATION_CACHE[item][0])
-        _REMEDIATION_CACHE.pop(oldest_key, None)
-
-
-def _cache_set(key: str, payload: Dict[str, Any]) -> None:
-    if len(_REMEDIATION_CACHE) >= REMEDIATION_CACHE_MAX_ENTRIES:
-        oldest_key = min(_REMEDIATION_CACHE, key=lambda item: _REMEDIATION_CACHE[item][0])
-        _REMEDIATION_CACHE.pop(oldest_key, None)
-    _REMEDIATION_CACHE[key] = (time.time(), payload)
+        shared = _shared_plan_get(db, key, ttl_seconds)
+        if shared is not None:
+            _REMEDIATION_CACHE_STATS["shared_hits"] += 1
+            created_at, plan = shared
+            _cache_set(key, plan, created_at=created_at)
+            return {**plan, "cached": True}
+
+    inflight = _REMEDIATION_INFLIGHT.get(key)
+    if inflight is not None and inflight.get_loop() is asyncio.get_running_loop():
+        _REMEDIATION_CACHE_STATS["coalesced"] += 1
+        plan = await asyncio.shield(inflight)
+        return {**plan, "cached": True}
+
+    _REMEDIATION_CACHE_STATS["misses"] += 1
+    future = asyncio.get_running_loop().create_future()
+    _REMEDIATION_INFLIGHT[key] = future
+    try:
+        plan = await generate()
+        _cache_set(key, plan)
+        if ttl_seconds:
+            _shared_plan_set(db, key, domain, plan, ttl_seconds)
+        future.set_result(plan)
+        return plan
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as exc:
+        future.set_exception(exc)
+        # Mark the exception retrieved; waiters still receive it when awaiting.
+        future.exception()
+        raise
+    finally:
+        _REMEDIATION_INFLIGHT.pop(key, None)
 
 
 def _template_remediation_plan(context: Dict[str, Any]) -> Dict[str, Any]:
@@ -438,22 +560,20 @@ async def build_remediation_plan(  # pylint: disable=too-many-locals
             "context": _stable_cache_context(context),
         }
     )
-    cached = _cache_get(cache_key, cache_ttl)
-    if cached:
-        return {**cached, "cached": True}
 
-    plan = _template_remediation_plan(context)
-    if (
-        config.ai_enabled
-        and config.provider in {"remote", "local", "litellm"}
-        and not get_settings().DEMO_MODE
-    ):
-        llm_plan = await _litellm_remediation_plan(config, context)
-        if llm_plan is not None:
-            plan = llm_plan
-
-    _cache_set(cache_key, plan)
-    return plan
+    async def generate() -> Dict[str, Any]:
+        plan = _template_remediation_plan(context)
+        if (
+            config.ai_enabled
+            and config.provider in {"remote", "local", "litellm"}
+            and not get_settings().DEMO_MODE
+        ):
+            llm_plan = await _litellm_remediation_plan(config, context)
+            if llm_plan is not None:
+                plan = llm_plan
+        return plan
+
+    return await _cached_remediation_plan(db, cache_key, domain, cache_ttl, generate)
 
 
 def build_safe_context(
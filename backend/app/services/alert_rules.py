@@ -6,11 +6,11 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import case, func
+from sqlalchemy import case, exists, func
 from sqlalchemy.orm import Session
 
 from app.models.domain import Domain
-from app.models.report import DMARCReport, ReportRecord
+from app.models.report import DMARCReport, DomainSourceFirstSeen, ReportRecord
 from app.models.setting import Setting
 from app.services.alert_history import record_alert_evaluation
 from app.services.notifications import NotificationResult, send_notification
@@ -19,7 +19,7 @@ from app.services.webhook_events import (
     EVENT_COMPLIANCE_DROP,
     EVENT_REPORTS_MISSING,
     EVENT_SENDER_NEW,
-    enqueue_webhook_event,
+    enqueue_webhook_events,
 )
 
 logger = logging.getLogger(__name__)
@@ -48,37 +48,32 @@ def _days_ago_ts(days: int) -> int:
 
 
 def _new_source_alerts(db: Session, window_days: int = 7) -> List[Dict[str, Any]]:
-    cutoff_ts = _days_ago_ts(window_days)
-    previous_sources = {
-        (row.domain, row.source_ip)
-        for row in (
-            db.query(Domain.name.label("domain"), ReportRecord.source_ip.label("source_ip"))
-            .join(DMARCReport, DMARCReport.domain_id == Domain.id)
-            .join(ReportRecord, ReportRecord.report_id == DMARCReport.id)
-            .filter(DMARCReport.begin_date < cutoff_ts)
-            .distinct()
-            .all()
-        )
-    }
-
+    # Ingestion keeps one first-seen row per domain sender, so a sender is new
+    # exactly when its first report began inside the window. Its lifetime
+    # message count is then also its count for the window. Deleting a report
+    # clears its domain's rows until the backfill has projected every report
+    # again, so skip domains still waiting rather than flag known senders.
+    unprojected_reports = exists().where(
+        DMARCReport.domain_id == DomainSourceFirstSeen.domain_id,
+        DMARCReport.source_projection_at.is_(None),
+    )
     current_sources = (
         db.query(
             Domain.name.label("domain"),
-            ReportRecord.source_ip.label("source_ip"),
-            func.sum(ReportRecord.count).label("message_count"),
+            DomainSourceFirstSeen.source_ip.label("source_ip"),
+            DomainSourceFirstSeen.message_count.label("message_count"),
         )
-        .join(DMARCReport, DMARCReport.domain_id == Domain.id)
-        .join(ReportRecord, ReportRecord.report_id == DMARCReport.id)
-        .filter(DMARCReport.begin_date >= cutoff_ts)
-        .group_by(Domain.name, ReportRecord.source_ip)
-        .order_by(func.sum(ReportRecord.count).desc())
+        .join(Domain, Domain.id == DomainSourceFirstSeen.domain_id)
+        .filter(
+            DomainSourceFirstSeen.first_seen >= _days_ago_ts(window_days),
+            ~unprojected_reports,
+        )
+        .order_by(DomainSourceFirstSeen.message_count.desc(), DomainSourceFirstSeen.id.asc())
         .all()
     )
 
     alerts = []
     for row in current_sources:
-        if (row.domain, row.source_ip) in previous_sources:
-            continue
         count = int(row.message_count or 0)
         alerts.append(
             {
@@ -184,7 +179,7 @@ def _compliance_drop_alerts(
         )
         .join(DMARCReport, DMARCReport.domain_id == Domain.id)
         .join(ReportRecord, ReportRecord.report_id == DMARCReport.id)
-        .filter(DMARCReport.begin_date >= cutoff_ts)
+        .filter(DMARCReport.begin_date >= cutoff_ts, ReportRecord.report_begin_date >= cutoff_ts)
         .group_by(Domain.name, DMARCReport.begin_date)
         .order_by(Domain.name, DMARCReport.begin_date)
         .all()
@@ -252,20 +247,18 @@ def enqueue_alert_webhook_events(db: Session, alerts: List[Dict[str, Any]]) -> N
         "missing_reports": EVENT_REPORTS_MISSING,
         "compliance_drop": EVENT_COMPLIANCE_DROP,
     }
+    events = []
     for alert in alerts:
         rule = alert.get("rule", "alert")
         event_type = event_by_rule.get(rule, EVENT_ALERT_CREATED)
         domain = alert.get("domain", "global")
         idempotency_key = f"{event_type}:{domain}:{rule}:{alert.get('detail', '')}"
-        try:
-            enqueue_webhook_event(
-                db,
-                event_type=event_type,
-                payload=alert,
-                idempotency_key=idempotency_key,
-            )
-        except Exception as exc:  # pylint: disable=broad-exception-caught
-            logger.warning("Failed to queue alert webhook event: %s", exc)
+        events.append((event_type, alert, idempotency_key))
+    try:
+        enqueue_webhook_events(db, events)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        db.rollback()
+        logger.warning("Failed to queue alert webhook events: %s", exc)
 
 
 def send_current_alerts(db: Session) -> Dict[str, Any]:
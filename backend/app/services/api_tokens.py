@@ -2,14 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import hmac
+import logging
 import secrets
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterable, List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set
 
 import bcrypt
+from sqlalchemy import bindparam
 from sqlalchemy.orm import Session
 
+from app.core.concurrency import run_blocking
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.metrics import observe_scheduler_cycle
 from app.models.api_token import APIToken
 from app.services.workspaces import get_or_create_default_workspace
 
@@ -40,6 +51,11 @@ SCIM_SCOPES = {
 DELIVERY_EVENT_SCOPES = {DELIVERY_EVENTS_WRITE_SCOPE}
 ALL_API_TOKEN_SCOPES = PUBLIC_READ_SCOPES | PROVIDER_SCOPES | SCIM_SCOPES | DELIVERY_EVENT_SCOPES
 
+# Bound for the process-local verification cache.
+MAX_VERIFIED_TOKEN_CACHE_ENTRIES = 4096
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class CreatedAPIToken:
@@ -49,6 +65,28 @@ class CreatedAPIToken:
     secret: str
 
 
+@dataclass
+class _VerifiedToken:
+    token_id: int
+    key_hash: str
+    expires_at: float
+
+
+@dataclass
+class _PendingUsage:
+    count: int
+    last_used_at: datetime
+    last_used_ip: Optional[str]
+
+
+# Cache keys are HMACs under a per-process random key, so raw secrets are never
+# held in memory after verification and cache keys are useless elsewhere.
+_VERIFY_CACHE_KEY = secrets.token_bytes(32)
+_verified_tokens: Dict[bytes, _VerifiedToken] = {}
+_pending_usage: Dict[int, _PendingUsage] = {}
+_cache_lock = threading.Lock()
+
+
 def normalize_scopes(
     scopes: Iterable[str],
     *,
@@ -130,10 +168,79 @@ def create_api_token(
     return CreatedAPIToken(token=token, secret=secret)
 
 
+def _secret_fingerprint(secret: str) -> bytes:
+    return hmac.new(_VERIFY_CACHE_KEY, secret.encode("utf-8"), hashlib.sha256).digest()
+
+
+def _verify_cache_ttl() -> int:
+    return max(0, int(get_settings().API_TOKEN_VERIFY_CACHE_SECONDS or 0))
+
+
+def _usage_flush_interval() -> int:
+    return max(1, int(get_settings().API_TOKEN_USAGE_FLUSH_SECONDS or 0))
+
+
+def _cached_token_id(fingerprint: bytes) -> Optional[_VerifiedToken]:
+    with _cache_lock:
+        cached = _verified_tokens.get(fingerprint)
+        if cached is not None and cached.expires_at <= time.monotonic():
+            _verified_tokens.pop(fingerprint, None)
+            return None
+        return cached
+
+
+def _remember_verified_token(fingerprint: bytes, token: APIToken, ttl: int) -> None:
+    now = time.monotonic()
+    with _cache_lock:
+        if len(_verified_tokens) >= MAX_VERIFIED_TOKEN_CACHE_ENTRIES:
+            for key in [key for key, item in _verified_tokens.items() if item.expires_at <= now]:
+                _verified_tokens.pop(key, None)
+        while len(_verified_tokens) >= MAX_VERIFIED_TOKEN_CACHE_ENTRIES:
+            _verified_tokens.pop(next(iter(_verified_tokens)))
+        _verified_tokens[fingerprint] = _VerifiedToken(
+            token_id=token.id,
+            key_hash=token.key_hash,
+            expires_at=now + ttl,
+        )
+
+
+def evict_api_token(token_id: int) -> None:
+    """Drop every cached verification for a token so the next use re-checks it."""
+    with _cache_lock:
+        for key in [key for key, item in _verified_tokens.items() if item.token_id == token_id]:
+            _verified_tokens.pop(key, None)
+
+
+def clear_api_token_cache() -> None:
+    """Reset the verification cache and discard unflushed usage counters."""
+    with _cache_lock:
+        _verified_tokens.clear()
+        _pending_usage.clear()
+
+
 def find_api_token(db: Session, secret: str) -> Optional[APIToken]:
-    """Return the active token row matching *secret*, if any."""
+    """Return the active token row matching *secret*, if any.
+
+    Successful bcrypt verifications are cached for ``API_TOKEN_VERIFY_CACHE_SECONDS``.
+    A cache hit still loads the row by primary key, so tokens revoked by another
+    process stop working on the next request.
+    """
     if not secret:
         return None
+    ttl = _verify_cache_ttl()
+    fingerprint = _secret_fingerprint(secret)
+    if ttl:
+        cached = _cached_token_id(fingerprint)
+        if cached is not None:
+            token = (
+                db.query(APIToken)
+                .filter(APIToken.id == cached.token_id, APIToken.active == True)  # noqa: E712
+                .first()
+            )
+            if token is not None and hmac.compare_digest(token.key_hash, cached.key_hash):
+                return token
+            evict_api_token(cached.token_id)
+
     candidates = (
         db.query(APIToken)
         .filter(APIToken.key_prefix == secret[:12], APIToken.active == True)  # noqa: E712
@@ -141,16 +248,111 @@ def find_api_token(db: Session, secret: str) -> Optional[APIToken]:
     )
     for token in candidates:
         if verify_api_key_secret(secret, token.key_hash):
+            if ttl:
+                _remember_verified_token(fingerprint, token, ttl)
             return token
     return None
 
 
-def record_api_token_use(db: Session, token: APIToken, *, ip_address: Optional[str]) -> None:
-    """Persist minimal audit data for a successful API token use."""
-    token.last_used_at = datetime.utcnow()
-    token.last_used_ip = ip_address
-    token.usage_count = int(token.usage_count or 0) + 1
-    db.commit()
+def record_api_token_use(token: APIToken, *, ip_address: Optional[str]) -> None:
+    """Buffer minimal audit data for a successful API token use.
+
+    Counters are written by ``scheduled_api_token_usage_flush`` on a session of
+    its own, so authenticating a request never commits anything.
+    """
+    now = datetime.utcnow()
+    with _cache_lock:
+        pending = _pending_usage.get(token.id)
+        if pending is None:
+            _pending_usage[token.id] = _PendingUsage(
+                count=1, last_used_at=now, last_used_ip=ip_address
+            )
+        else:
+            pending.count += 1
+            pending.last_used_at = now
+            pending.last_used_ip = ip_address
+
+
+def pending_api_token_usage(token_id: int) -> int:
+    """Return uses of *token_id* recorded in this process but not yet flushed."""
+    with _cache_lock:
+        pending = _pending_usage.get(token_id)
+        return pending.count if pending is not None else 0
+
+
+def _restore_pending_usage(batch: Dict[int, _PendingUsage]) -> None:
+    with _cache_lock:
+        for token_id, usage in batch.items():
+            pending = _pending_usage.get(token_id)
+            if pending is None:
+                _pending_usage[token_id] = usage
+            else:
+                pending.count += usage.count
+
+
+def flush_api_token_usage(db: Session) -> int:
+    """Persist buffered token usage in one batched update and return the token count.
+
+    If the write fails the batch goes back into the buffer for the next flush.
+    """
+    with _cache_lock:
+        batch = dict(_pending_usage)
+        _pending_usage.clear()
+    if not batch:
+        return 0
+
+    table = APIToken.__table__
+    statement = (
+        table.update()
+        .where(table.c.id == bindparam("token_id"))
+        .values(
+            usage_count=table.c.usage_count + bindparam("usage_delta"),
+            last_used_at=bindparam("used_at"),
+            last_used_ip=bindparam("used_ip"),
+        )
+    )
+    try:
+        db.execute(
+            statement,
+            [
+                {
+                    "token_id": token_id,
+                    "usage_delta": usage.count,
+                    "used_at": usage.last_used_at,
+                    "used_ip": usage.last_used_ip,
+                }
+                for token_id, usage in batch.items()
+            ],
+        )
+        db.commit()
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        db.rollback()
+        _restore_pending_usage(batch)
+        logger.warning("Failed to flush API token usage; keeping it buffered: %s", exc)
+        return 0
+    return len(batch)
+
+
+def flush_buffered_api_token_usage() -> int:
+    """Persist buffered token usage on a session of its own."""
+    db = SessionLocal()
+    try:
+        return flush_api_token_usage(db)
+    finally:
+        db.close()
+
+
+async def scheduled_api_token_usage_flush() -> None:
+    """Write buffered token usage once per flush interval, off the request path."""
+    while True:
+        await asyncio.sleep(_usage_flush_interval())
+        try:
+            with observe_scheduler_cycle("api_token_usage_flush"):
+                await run_blocking(flush_buffered_api_token_usage)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("API token usage flush failed with %s", type(exc).__name__)
 
 
 def revoke_api_token(
@@ -169,6 +371,7 @@ def revoke_api_token(
     token.active = False
     token.revoked_at = datetime.utcnow()
     db.commit()
+    evict_api_token(token.id)
     return True
 
 
@@ -184,6 +387,6 @@ def token_to_dict(token: APIToken) -> dict:
         "created_at": token.created_at.isoformat() if token.created_at else None,
         "last_used_at": token.last_used_at.isoformat() if token.last_used_at else None,
         "last_used_ip": token.last_used_ip,
-        "usage_count": token.usage_count,
+        "usage_count": int(token.usage_count or 0) + pending_api_token_usage(token.id),
         "revoked_at": token.revoked_at.isoformat() if token.revoked_at else None,
     }
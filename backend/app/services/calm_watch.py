@@ -20,7 +20,7 @@ from app.services.webhook_events import (
     EVENT_MAIL_HEALTH_INCIDENT_CHANGED,
     EVENT_MAIL_HEALTH_INCIDENT_CREATED,
     EVENT_MAIL_HEALTH_INCIDENT_RESOLVED,
-    enqueue_webhook_event,
+    enqueue_webhook_events,
 )
 
 logger = logging.getLogger(__name__)
@@ -78,35 +78,39 @@ def evaluate_and_send_calm_watch(db: Session, *, days: int = 30) -> Dict[str, An
             end_ts=int(now.timestamp()),
         )
         lifecycle = record_mail_health_assessment(db, workspace=workspace, assessment=assessment)
+        events = []
         for item in lifecycle.get("resolved") or []:
             resolved.append(item)
-            enqueue_webhook_event(
-                db,
-                workspace_id=workspace.id,
-                event_type=EVENT_MAIL_HEALTH_INCIDENT_RESOLVED,
-                payload=_incident_payload(item),
-                idempotency_key=f"calm-watch:resolved:{item.get('id')}:{item.get('resolved_at')}",
+            events.append(
+                (
+                    EVENT_MAIL_HEALTH_INCIDENT_RESOLVED,
+                    _incident_payload(item),
+                    f"calm-watch:resolved:{item.get('id')}:{item.get('resolved_at')}",
+                )
             )
         incident = lifecycle.get("incident")
         reason = lifecycle.get("notification_reason")
+        if incident and reason:
+            event_type = (
+                EVENT_MAIL_HEALTH_INCIDENT_CREATED
+                if reason in {"created", "pending_delivery"}
+                else EVENT_MAIL_HEALTH_INCIDENT_CHANGED
+            )
+            events.append(
+                (
+                    event_type,
+                    _incident_payload(incident),
+                    (
+                        f"calm-watch:{reason}:{incident.get('id')}:"
+                        f"{incident.get('last_material_change_at')}"
+                    ),
+                )
+            )
+        if events:
+            enqueue_webhook_events(db, events, workspace_id=workspace.id)
         if not incident or not reason:
             suppressed.append({"workspace_id": workspace.id, "reason": "unchanged_or_suppressed"})
             continue
-        event_type = (
-            EVENT_MAIL_HEALTH_INCIDENT_CREATED
-            if reason in {"created", "pending_delivery"}
-            else EVENT_MAIL_HEALTH_INCIDENT_CHANGED
-        )
-        enqueue_webhook_event(
-            db,
-            workspace_id=workspace.id,
-            event_type=event_type,
-            payload=_incident_payload(incident),
-            idempotency_key=(
-                f"calm-watch:{reason}:{incident.get('id')}:"
-                f"{incident.get('last_material_change_at')}"
-            ),
-        )
         if len(sent) >= MAX_NOTIFICATIONS_PER_CYCLE:
             record_incident_notification_result(
                 db,
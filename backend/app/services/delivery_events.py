@@ -9,6 +9,7 @@ from datetime import datetime, timedelta, timezone
 from email.utils import getaddresses
 from typing import Any, Dict, Optional
 
+from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -163,6 +164,18 @@ def _delivery_event_for_key(
     )
 
 
+def _lock_delivery_event_key(db: Session, key: str) -> None:
+    """Serialize PostgreSQL writers of one provider event until the transaction ends.
+
+    A month-partitioned ``delivery_events`` table can only enforce the event key
+    together with ``occurred_at``, so a provider re-sending an event with a new
+    timestamp is deduplicated by this lock and the lookup that follows it.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtextextended(:key, 0))"), {"key": key})
+
+
 def _persist(
     db: Session,
     *,
@@ -186,6 +199,9 @@ def _persist(
     provider_semantics: Optional[str],
     sanitized_payload: Optional[Dict[str, Any]],
 ) -> tuple[DeliveryEvent, bool]:
+    _lock_delivery_event_key(
+        db, f"delivery_event:{workspace.id}:{source_system}:{provider}:{event_id}"
+    )
     existing = _delivery_event_for_key(
         db,
         workspace_id=workspace.id,
@@ -14,6 +14,12 @@ from sqlalchemy.dialects.postgresql import insert as postgresql_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.metrics import (
+    DNS_CACHE_LOOKUPS,
+    DNS_RESOLVE_DURATION,
+    RESOLVER_FALLBACKS,
+    observe_duration,
+)
 from app.models.dns_cache import DNSCache
 from app.services.dns_fallbacks import dns_fallback_candidates
 from app.services.dns_provider_detection import detection_from_json
@@ -514,10 +520,12 @@ async def resolve_domain_dns_cached(  # noqa: C901 - cache/fallback state is int
         cached_result = _result_from_json(row.result_json)
         cache_ttl = _negative_ttl_for_result(cached_result, ttl_seconds)
         if _is_fresh(row, cache_ttl, now):
+            DNS_CACHE_LOOKUPS.labels(outcome="hit").inc()
             return cached_result, True, row.checked_at
 
     try:
-        result = await _resolve_with_fallback(provider, domain, selectors=selectors)
+        with observe_duration(DNS_RESOLVE_DURATION):
+            result = await _resolve_with_fallback(provider, domain, selectors=selectors)
     except asyncio.CancelledError:
         raise
     except Exception as exc:  # pylint: disable=broad-exception-caught
@@ -538,13 +546,18 @@ async def resolve_domain_dns_cached(  # noqa: C901 - cache/fallback state is int
                 "DNS resolver failed; using last known DNS evidence for %s",
                 provider_name,
             )
+            DNS_CACHE_LOOKUPS.labels(outcome="stale").inc()
             return stale
         logger.warning(
             "DNS resolver failed with %s; returning lookup failure evidence",
             exc.__class__.__name__,
         )
+        DNS_CACHE_LOOKUPS.labels(outcome="failed").inc()
         return _lookup_failure_result(exc.__class__.__name__, now)
 
+    if result.lookup_status == "fallback":
+        RESOLVER_FALLBACKS.labels(lookup="dns").inc()
+
     if not result.resolver_route:
         result.resolver_route = _resolver_route(provider)
     if not result.resolver_identity:
@@ -565,6 +578,7 @@ async def resolve_domain_dns_cached(  # noqa: C901 - cache/fallback state is int
                 "DNS resolver returned no evidence; keeping last known DNS evidence for %s",
                 provider_name,
             )
+            DNS_CACHE_LOOKUPS.labels(outcome="stale").inc()
             return stale
 
     row = _store_cache_result(
@@ -576,6 +590,7 @@ async def resolve_domain_dns_cached(  # noqa: C901 - cache/fallback state is int
         payload=_result_to_json(result),
         checked_at=now,
     )
+    DNS_CACHE_LOOKUPS.labels(outcome="miss").inc()
     return result, False, row.checked_at
 
 
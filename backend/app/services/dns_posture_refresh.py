@@ -10,10 +10,11 @@ from sqlalchemy import text
 
 from app.core.config import get_settings
 from app.core.database import SessionLocal
+from app.core.metrics import observe_scheduler_cycle
 from app.models.dns_posture_snapshot import DomainDNSPostureCurrent
 from app.models.domain import Domain
 from app.services.dns_cache import resolve_domain_dns_cached
-from app.services.dns_posture_snapshots import capture_dns_posture_snapshot
+from app.services.dns_posture_snapshots import capture_dns_posture_snapshot, posture_selectors
 from app.services.dns_resolver import get_default_provider
 
 logger = logging.getLogger(__name__)
@@ -32,10 +33,6 @@ def _try_acquire_refresh_lock(db) -> bool:
     )
 
 
-def _selectors(domain: Domain) -> list[str]:
-    return [item.strip() for item in (domain.dkim_selectors or "").split(",") if item.strip()]
-
-
 def _candidates(limit: int) -> List[Tuple[int, str]]:
     db = SessionLocal()
     try:
@@ -73,7 +70,7 @@ async def refresh_domain_dns_posture(domain_id: int) -> bool:
         if current is not None and current.requested_at is None and current.accepted_snapshot_id:
             return False
         provider = get_default_provider(db)
-        selectors = _selectors(domain)
+        selectors = posture_selectors(db, domain)
         result, cached, checked_at = await resolve_domain_dns_cached(
             db,
             provider,
@@ -138,7 +135,8 @@ async def scheduled_dns_posture_refresh() -> None:
     await asyncio.sleep(max(5, int(settings.DNS_POSTURE_REFRESH_STARTUP_DELAY_SECONDS or 5)))
     while True:
         try:
-            count = await refresh_requested_dns_posture()
+            with observe_scheduler_cycle("dns_posture_refresh"):
+                count = await refresh_requested_dns_posture()
             if count:
                 logger.info("Materialized DNS posture evidence for %s domain(s)", count)
         except asyncio.CancelledError:
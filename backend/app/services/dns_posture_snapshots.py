@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import hashlib
 import json
+import time
 from dataclasses import asdict
 from datetime import datetime, timedelta
 from typing import Any, Dict, Iterable, Optional
@@ -19,6 +20,8 @@ from sqlalchemy.orm import Session
 from app.models.dns_posture_snapshot import DomainDNSPostureCurrent, DomainDNSPostureSnapshot
 from app.models.domain import Domain
 from app.services.dns_resolver import DomainDNSResult
+from app.services.report_store import RECENT_SELECTOR_WINDOW_DAYS, SECONDS_PER_DAY
+from app.services.source_read_projection import observed_dkim_selectors
 
 
 def _utcnow() -> datetime:
@@ -36,6 +39,14 @@ def selector_fingerprint(selectors: Iterable[str] | None) -> str:
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
+def posture_selectors(db: Session, domain: Domain) -> list[str]:
+    """Return configured selectors plus those seen in recent aggregate reports."""
+    configured = [item.strip() for item in (domain.dkim_selectors or "").split(",")]
+    since = int(time.time()) - RECENT_SELECTOR_WINDOW_DAYS * SECONDS_PER_DAY
+    observed = observed_dkim_selectors(db, domain.id, domain.name, since=since)
+    return list(dict.fromkeys(item for item in configured + observed if item))
+
+
 def _result_payload(result: DomainDNSResult) -> Dict[str, Any]:
     return asdict(result)
 
@@ -0,0 +1,228 @@
+"""Batched, typed cache for sender enrichment results.
+
+Network intelligence, reputation-feed verdicts and source reputation summaries
+are persisted in the shared ``dns_cache`` table, one namespace (its ``provider``
+column) per result type. ``EnrichmentCache.get_many`` reads a whole batch with
+one ``IN (...)`` query per chunk and ``put_many`` writes results with one bulk
+upsert, so enriching a report with thousands of senders costs a few cache
+queries instead of one per address. A bounded in-process LRU answers repeated
+reads of fresh entries without a database round trip.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Generic, Iterable, List, Mapping, Optional, Tuple, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.dns_cache import DNSCache
+
+T = TypeVar("T")
+# (subject, selectors_key): the cached IP or domain and the lookup variant.
+CacheKey = Tuple[str, str]
+
+MEMORY_CACHE_MAX_ENTRIES = 4096
+# Bounds the bind parameters of one IN (...) query or multi-row upsert.
+_BATCH_SIZE = 500
+
+# (namespace, subject, selectors_key) -> (result_json, checked_at); the least
+# recently used entry sits at the front.
+_memory: "OrderedDict[Tuple[str, str, str], Tuple[str, datetime]]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def clear_enrichment_cache() -> None:
+    """Drop in-process enrichment entries for test isolation."""
+    with _memory_lock:
+        _memory.clear()
+
+
+def _remember(namespace: str, key: CacheKey, payload: str, checked_at: datetime) -> None:
+    with _memory_lock:
+        memory_key = (namespace, *key)
+        _memory[memory_key] = (payload, checked_at)
+        _memory.move_to_end(memory_key)
+        while len(_memory) > MEMORY_CACHE_MAX_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def _recall(namespace: str, key: CacheKey) -> Optional[Tuple[str, datetime]]:
+    with _memory_lock:
+        memory_key = (namespace, *key)
+        cached = _memory.get(memory_key)
+        if cached is not None:
+            _memory.move_to_end(memory_key)
+        return cached
+
+
+def _chunks(items: List, size: int = _BATCH_SIZE) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def encode_result(value: object) -> str:
+    """Serialize a result dataclass the way every enrichment cache stores it."""
+    return json.dumps(asdict(value), sort_keys=True, separators=(",", ":"))
+
+
+@dataclass(frozen=True)
+class CachedResult(Generic[T]):
+    """A cached value, when it was checked, and whether it is within its TTL."""
+
+    value: T
+    checked_at: datetime
+    fresh: bool
+
+
+@dataclass(frozen=True)
+class EnrichmentCache(Generic[T]):
+    """Cache policy and codec for one ``dns_cache`` namespace.
+
+    ``ttl_seconds`` is the default freshness window; results for which
+    ``is_error`` returns True are only fresh for ``error_ttl_seconds`` so
+    failed lookups are retried sooner.
+    """
+
+    namespace: str
+    decode: Callable[[str], T]
+    ttl_seconds: int = 86_400
+    error_ttl_seconds: Optional[int] = None
+    is_error: Optional[Callable[[T], bool]] = None
+
+    def ttl_for(self, value: T, ttl_seconds: Optional[int] = None) -> int:
+        ttl = self.ttl_seconds if ttl_seconds is None else int(ttl_seconds)
+        if self.error_ttl_seconds is not None and self.is_error and self.is_error(value):
+            return min(ttl, self.error_ttl_seconds)
+        return ttl
+
+    def _cached(
+        self, payload: str, checked_at: datetime, now: datetime, ttl_seconds: Optional[int]
+    ) -> CachedResult[T]:
+        value = self.decode(payload)
+        fresh = checked_at >= now - timedelta(seconds=self.ttl_for(value, ttl_seconds))
+        return CachedResult(value=value, checked_at=checked_at, fresh=fresh)
+
+    def get_many(
+        self,
+        db: Session,
+        keys: Iterable[CacheKey],
+        *,
+        now: datetime,
+        ttl_seconds: Optional[int] = None,
+    ) -> Dict[CacheKey, CachedResult[T]]:
+        """Return cached results for *keys*; missing keys are absent from the result.
+
+        Fresh entries come from process memory when possible. Everything else
+        is read with one query per batch, including stale entries, which
+        callers may still use as a fallback.
+        """
+        results: Dict[CacheKey, CachedResult[T]] = {}
+        missing: List[CacheKey] = []
+        for key in dict.fromkeys(keys):
+            remembered = _recall(self.namespace, key)
+            if remembered is not None:
+                cached = self._cached(*remembered, now, ttl_seconds)
+                if cached.fresh:
+                    results[key] = cached
+                    continue
+            missing.append(key)
+
+        for batch in _chunks(missing):
+            wanted = set(batch)
+            rows = db.execute(
+                select(
+                    DNSCache.domain,
+                    DNSCache.selectors_key,
+                    DNSCache.result_json,
+                    DNSCache.checked_at,
+                ).where(
+                    DNSCache.provider == self.namespace,
+                    DNSCache.domain.in_({subject for subject, _selectors in batch}),
+                    DNSCache.selectors_key.in_({selectors for _subject, selectors in batch}),
+                )
+            ).all()
+            for row in rows:
+                key = (row.domain, row.selectors_key)
+                if key not in wanted:
+                    continue
+                _remember(self.namespace, key, row.result_json, row.checked_at)
+                results[key] = self._cached(row.result_json, row.checked_at, now, ttl_seconds)
+        return results
+
+    def get(
+        self,
+        db: Session,
+        key: CacheKey,
+        *,
+        now: datetime,
+        ttl_seconds: Optional[int] = None,
+    ) -> Optional[CachedResult[T]]:
+        """Return the cached result for one key, or None."""
+        return self.get_many(db, [key], now=now, ttl_seconds=ttl_seconds).get(key)
+
+    def put_many(self, db: Session, values: Mapping[CacheKey, T], *, checked_at: datetime) -> None:
+        """Upsert *values* in bulk. The caller commits."""
+        rows = [
+            {
+                "domain": subject,
+                "provider": self.namespace,
+                "selectors_key": selectors_key,
+                "result_json": encode_result(value),
+                "checked_at": checked_at,
+            }
+            for (subject, selectors_key), value in values.items()
+        ]
+        for batch in _chunks(rows):
+            _upsert(db, batch)
+        for row in rows:
+            _remember(
+                self.namespace,
+                (row["domain"], row["selectors_key"]),
+                row["result_json"],
+                checked_at,
+            )
+
+    def put(self, db: Session, key: CacheKey, value: T, *, checked_at: datetime) -> None:
+        """Upsert one result. The caller commits."""
+        self.put_many(db, {key: value}, checked_at=checked_at)
+
+
+def _upsert(db: Session, rows: List[Dict[str, object]]) -> None:
+    dialect = db.get_bind().dialect.name
+    if dialect in {"postgresql", "sqlite"}:
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        statement = insert(DNSCache).values(rows)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["domain", "provider", "selectors_key"],
+                set_={
+                    "result_json": statement.excluded.result_json,
+                    "checked_at": statement.excluded.checked_at,
+                },
+            )
+        )
+        return
+    # Other databases: update the rows that exist and insert the rest.
+    existing = {
+        (row.domain, row.selectors_key): row
+        for row in db.query(DNSCache).filter(
+            DNSCache.provider == rows[0]["provider"],
+            DNSCache.domain.in_({row["domain"] for row in rows}),
+        )
+    }
+    for values in rows:
+        row = existing.get((values["domain"], values["selectors_key"]))
+        if row is None:
+            db.add(DNSCache(**values))
+        else:
+            row.result_json = values["result_json"]
+            row.checked_at = values["checked_at"]
+    db.flush()
@@ -17,6 +17,7 @@ from app.services.api_tokens import (
     READ_REPORTS_SCOPE,
     READ_TLS_SCOPE,
     parse_scopes,
+    pending_api_token_usage,
 )
 
 PUBLIC_EXPORT_ENDPOINTS = [
@@ -219,7 +220,11 @@ def _token_summary(db: Session, auth_context: Dict[str, Any]) -> Dict[str, Any]:
             token.workspace_id if token is not None else auth_context.get("workspace_id")
         ),
         "scopes": sorted(scopes),
-        "usage_count": int(token.usage_count or 0) if token is not None else None,
+        "usage_count": (
+            int(token.usage_count or 0) + pending_api_token_usage(token.id)
+            if token is not None
+            else None
+        ),
         "last_used_at": token.last_used_at.isoformat() if token and token.last_used_at else None,
     }
 
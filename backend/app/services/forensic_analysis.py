@@ -1,9 +1,16 @@
+import asyncio
 import json
+import logging
 import re
 from collections import Counter
 from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session, selectinload
+
+from app.core.database import SessionLocal
+from app.core.metrics import observe_scheduler_cycle
 from app.models.report import ForensicReport
 from app.services.forensic_redaction import ForensicRedactionPolicy, redact_forensic_value
 
@@ -11,6 +18,11 @@ AUTH_RESULT_PATTERN = re.compile(r"\b(dkim|spf|dmarc)=([a-zA-Z0-9_-]+)", re.IGNO
 HEADER_DOMAIN_PATTERN = re.compile(r"\bheader\.d=([^;\s]+)", re.IGNORECASE)
 MAILFROM_DOMAIN_PATTERN = re.compile(r"\bsmtp\.mailfrom=([^;\s]+)", re.IGNORECASE)
 PRIORITY_ORDER = {"high": 3, "medium": 2, "low": 1}
+PRIORITY_NAMES = {rank: name for name, rank in PRIORITY_ORDER.items()}
+SAMPLES_PER_GROUP = 3
+MATERIALIZE_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
 
 
 def _clean_value(value: Any) -> str:
@@ -31,6 +43,14 @@ def _feedback_headers(row: ForensicReport) -> Dict[str, Any]:
     return parsed if isinstance(parsed, dict) else {}
 
 
+def _auth_results_from_json(value: Optional[str]) -> Dict[str, str]:
+    try:
+        parsed = json.loads(value or "{}")
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
 def _parse_authentication_results(value: str) -> Dict[str, str]:
     results: Dict[str, str] = {}
     for mechanism, result in AUTH_RESULT_PATTERN.findall(value or ""):
@@ -174,20 +194,127 @@ def _rfc9991_feedback_signals(feedback_headers: Dict[str, Any]) -> List[str]:
     return signals
 
 
-def analyze_forensic_report(
-    row: ForensicReport,
-    redaction_policy: Optional[ForensicRedactionPolicy] = None,
-) -> Dict[str, Any]:
-    """Build a privacy-preserving operator analysis for one forensic sample."""
-    feedback_headers = _feedback_headers(row)
+def _parsed_analysis(row: ForensicReport) -> Dict[str, Any]:
     auth_results = _parse_authentication_results(row.authentication_results or "")
     header_domain = _first_match(
         HEADER_DOMAIN_PATTERN, row.authentication_results or ""
-    ) or _normalize(feedback_headers.get("dkim_domain"))
+    ) or _normalize(_feedback_headers(row).get("dkim_domain"))
     mailfrom_value = _first_match(MAILFROM_DOMAIN_PATTERN, row.authentication_results or "")
     mailfrom_domain = mailfrom_value.rsplit("@", 1)[-1] if "@" in mailfrom_value else mailfrom_value
     failure_kind = _failure_kind(row, auth_results)
-    priority = _priority(row, failure_kind)
+    return {
+        "auth_results": auth_results,
+        "dkim_domain": header_domain,
+        "mail_from_domain": mailfrom_domain,
+        "failure_kind": failure_kind,
+        "priority": _priority(row, failure_kind),
+    }
+
+
+def _stored_analysis(row: ForensicReport) -> Dict[str, Any]:
+    """Return the parsed analysis fields, preferring values materialised at ingest."""
+    if not row.analysis_failure_kind:
+        return _parsed_analysis(row)
+    return {
+        "auth_results": _auth_results_from_json(row.analysis_auth_results),
+        "dkim_domain": row.analysis_dkim_domain or "",
+        "mail_from_domain": row.analysis_mail_from_domain or "",
+        "failure_kind": row.analysis_failure_kind,
+        "priority": row.analysis_priority or _priority(row, row.analysis_failure_kind),
+    }
+
+
+def forensic_group_key(domain: str, source_ip: str, failure_kind: str, delivery_result: str) -> str:
+    """Return the investigation group key shared by samples with the same shape."""
+    return "|".join(
+        (
+            _clean_value(domain),
+            _clean_value(source_ip),
+            _clean_value(failure_kind),
+            _clean_value(delivery_result),
+        )
+    )
+
+
+def materialize_forensic_analysis(
+    row: ForensicReport, domain_name: Optional[str] = None
+) -> ForensicReport:
+    """Store the parsed failure kind, priority and group key on *row*.
+
+    Called once at ingest so the analysis endpoint can count and group samples
+    in SQL. *domain_name* covers rows whose ``domain`` relationship is not
+    loaded yet.
+    """
+    derived = _parsed_analysis(row)
+    reported_domain = row.reported_domain or domain_name or (row.domain.name if row.domain else "")
+    row.analysis_failure_kind = derived["failure_kind"]
+    row.analysis_priority = derived["priority"]
+    row.analysis_priority_rank = PRIORITY_ORDER[derived["priority"]]
+    row.analysis_auth_results = json.dumps(derived["auth_results"], sort_keys=True)
+    row.analysis_dkim_domain = derived["dkim_domain"] or None
+    row.analysis_mail_from_domain = derived["mail_from_domain"] or None
+    row.analysis_group_key = forensic_group_key(
+        reported_domain, row.source_ip, derived["failure_kind"], row.delivery_result
+    )
+    return row
+
+
+def backfill_forensic_analysis(db: Session, *, limit: int = MATERIALIZE_BATCH_SIZE) -> int:
+    """Materialise analysis for a bounded batch of samples stored before ingest did it."""
+    rows = (
+        db.query(ForensicReport)
+        .options(selectinload(ForensicReport.domain))
+        .filter(ForensicReport.analysis_group_key.is_(None))
+        .order_by(ForensicReport.id)
+        .limit(max(1, limit))
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for row in rows:
+        materialize_forensic_analysis(row)
+    return len(rows)
+
+
+async def scheduled_forensic_analysis_backfill() -> None:
+    """Materialise pre-upgrade forensic samples in small batches, then stop.
+
+    New samples are materialised at ingest, so the task exits once no pending
+    rows remain.
+    """
+    await asyncio.sleep(5)
+    while True:
+        delay = 1
+        db = SessionLocal()
+        try:
+            with observe_scheduler_cycle("forensic_analysis_backfill"):
+                materialized = backfill_forensic_analysis(db)
+            if not materialized:
+                db.rollback()
+                return
+            db.commit()
+            logger.info("Materialised forensic analysis for %d stored sample(s)", materialized)
+        except asyncio.CancelledError:
+            db.rollback()
+            raise
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            db.rollback()
+            logger.warning("Forensic analysis backfill failed with %s", type(exc).__name__)
+            delay = 60
+        finally:
+            db.close()
+        await asyncio.sleep(delay)
+
+
+def analyze_forensic_report(
+    row: ForensicReport,
+    redaction_policy: Optional[ForensicRedactionPolicy] = None,
+) -> Dict[str, Any]:
+    """Build a privacy-preserving operator analysis for one forensic sample."""
+    derived = _stored_analysis(row)
+    auth_results = derived["auth_results"]
+    header_domain = derived["dkim_domain"]
+    mailfrom_domain = derived["mail_from_domain"]
+    failure_kind = derived["failure_kind"]
     reported_domain = _clean_value(row.reported_domain or (row.domain.name if row.domain else ""))
     source_ip = _clean_value(row.source_ip)
 
@@ -198,7 +325,7 @@ def analyze_forensic_report(
         "source_ip": source_ip,
         "auth_failure": failure_kind,
         "delivery_result": _clean_value(row.delivery_result),
-        "priority": priority,
+        "priority": derived["priority"],
         "diagnosis": _diagnosis(failure_kind, auth_results, row.delivery_result or ""),
         "recommendations": _recommendations(
             failure_kind,
@@ -206,7 +333,9 @@ def analyze_forensic_report(
             source_ip,
             reported_domain,
         ),
-        "signals": _signals(row, feedback_headers, auth_results, header_domain, mailfrom_domain),
+        "signals": _signals(
+            row, _feedback_headers(row), auth_results, header_domain, mailfrom_domain
+        ),
         "authentication_results": auth_results,
         "dkim_domain": header_domain,
         "mail_from_domain": mailfrom_domain,
@@ -215,69 +344,136 @@ def analyze_forensic_report(
     return redact_forensic_value(analysis, redaction_policy) if redaction_policy else analysis
 
 
-def _group_key(row: ForensicReport) -> Tuple[str, str, str, str]:
-    return (
-        _clean_value(row.reported_domain or (row.domain.name if row.domain else "")) or "unknown",
-        _clean_value(row.source_ip) or "unknown",
-        _normalize(row.auth_failure) or "unknown",
-        _normalize(row.delivery_result) or "unknown",
+def _counts(query: Query) -> Dict[str, Dict[str, int]]:
+    priority_counts: Counter = Counter()
+    failure_counts: Counter = Counter()
+    result_counts: Counter = Counter()
+    rows = (
+        query.with_entities(
+            ForensicReport.analysis_priority,
+            ForensicReport.analysis_failure_kind,
+            ForensicReport.delivery_result,
+            func.count(ForensicReport.id),
+        )
+        .group_by(
+            ForensicReport.analysis_priority,
+            ForensicReport.analysis_failure_kind,
+            ForensicReport.delivery_result,
+        )
+        .all()
     )
+    for priority, failure_kind, delivery_result, count in rows:
+        priority_counts[priority] += count
+        failure_counts[failure_kind] += count
+        result_counts[_clean_value(delivery_result)] += count
+    return {
+        "priority_counts": dict(priority_counts),
+        "failure_counts": dict(failure_counts),
+        "result_counts": dict(result_counts),
+    }
 
 
-def _latest(left: Optional[datetime], right: Optional[datetime]) -> Optional[datetime]:
-    if left is None:
-        return right
-    if right is None:
-        return left
-    return max(left, right)
+def _ranked_samples(query: Query):
+    """Return a subquery numbering samples within each group, highest priority first."""
+    return query.with_entities(
+        ForensicReport.id.label("id"),
+        ForensicReport.analysis_group_key.label("group_key"),
+        ForensicReport.analysis_priority_rank.label("priority_rank"),
+        ForensicReport.analysis_failure_kind.label("failure_kind"),
+        ForensicReport.analysis_auth_results.label("auth_results"),
+        ForensicReport.delivery_result.label("delivery_result"),
+        func.row_number()
+        .over(
+            partition_by=ForensicReport.analysis_group_key,
+            order_by=(ForensicReport.analysis_priority_rank.desc(), ForensicReport.id.desc()),
+        )
+        .label("group_rank"),
+    ).subquery()
 
 
-def summarize_forensic_samples(
-    rows: Iterable[ForensicReport],
-    redaction_policy: Optional[ForensicRedactionPolicy] = None,
-    total_available: Optional[int] = None,
-) -> Dict[str, Any]:
-    """Summarize forensic samples into investigation groups and top examples."""
-    reports = list(rows)
-    analyses = [analyze_forensic_report(row, redaction_policy=redaction_policy) for row in reports]
-    priority_counts = Counter(item["priority"] for item in analyses)
-    failure_counts = Counter(item["auth_failure"] for item in analyses)
-    result_counts = Counter(item["delivery_result"] for item in analyses)
-    grouped: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
-
-    for row, analysis in zip(reports, analyses):
-        key = (
-            analysis["domain"],
-            analysis["source_ip"],
-            analysis["auth_failure"],
-            analysis["delivery_result"],
+def _groups(db: Session, query: Query, ranked) -> Dict[str, Dict[str, Any]]:
+    aggregates = (
+        query.with_entities(
+            ForensicReport.analysis_group_key,
+            func.count(ForensicReport.id),
+            func.max(func.coalesce(ForensicReport.arrival_date, ForensicReport.processed_at)),
         )
-        group = grouped.setdefault(
-            key,
-            {
-                "key": "|".join(key),
-                "domain": key[0],
-                "source_ip": key[1],
-                "auth_failure": analysis["auth_failure"],
-                "delivery_result": analysis["delivery_result"],
+        .group_by(ForensicReport.analysis_group_key)
+        .all()
+    )
+    leaders = {
+        row.group_key: row for row in db.query(ranked).filter(ranked.c.group_rank == 1).all()
+    }
+    groups = {}
+    for key, count, latest_arrival in aggregates:
+        leader = leaders[key]
+        domain, source_ip, failure_kind, delivery_result = key.split("|", 3)
+        auth_results = _auth_results_from_json(leader.auth_results)
+        groups[key] = {
+            "key": key,
+            "domain": domain,
+            "source_ip": source_ip,
+            "auth_failure": failure_kind,
+            "delivery_result": delivery_result,
+            "count": count,
+            "priority": PRIORITY_NAMES.get(leader.priority_rank, "low"),
+            "latest_arrival": latest_arrival,
+            "diagnosis": _diagnosis(failure_kind, auth_results, leader.delivery_result or ""),
+            "recommendations": _recommendations(failure_kind, auth_results, source_ip, domain)[:3],
+        }
+    return groups
+
+
+def _add_pending_samples(
+    counts: Dict[str, Dict[str, int]],
+    groups: Dict[str, Dict[str, Any]],
+    rows: List[ForensicReport],
+) -> None:
+    """Fold samples whose analysis is not materialised yet into the SQL totals."""
+    for row in rows:
+        derived = _parsed_analysis(row)
+        failure_kind = derived["failure_kind"]
+        priority = derived["priority"]
+        domain = _clean_value(row.reported_domain or (row.domain.name if row.domain else ""))
+        source_ip = _clean_value(row.source_ip)
+        delivery_result = _clean_value(row.delivery_result)
+        key = forensic_group_key(domain, source_ip, failure_kind, delivery_result)
+        for name, value in (
+            ("priority_counts", priority),
+            ("failure_counts", failure_kind),
+            ("result_counts", delivery_result),
+        ):
+            counts[name][value] = counts[name].get(value, 0) + 1
+        arrival = row.arrival_date or row.processed_at
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {
+                "key": key,
+                "domain": domain,
+                "source_ip": source_ip,
+                "auth_failure": failure_kind,
+                "delivery_result": delivery_result,
                 "count": 0,
-                "priority": analysis["priority"],
-                "latest_arrival": None,
-                "diagnosis": analysis["diagnosis"],
-                "recommendations": analysis["recommendations"][:3],
-            },
-        )
+                "priority": "low",
+                "latest_arrival": arrival,
+            }
         group["count"] += 1
-        group["latest_arrival"] = _latest(
-            group["latest_arrival"], row.arrival_date or row.processed_at
-        )
-        if PRIORITY_ORDER[analysis["priority"]] > PRIORITY_ORDER[group["priority"]]:
-            group["priority"] = analysis["priority"]
-            group["diagnosis"] = analysis["diagnosis"]
-            group["recommendations"] = analysis["recommendations"][:3]
-
-    groups = sorted(
-        grouped.values(),
+        if arrival is not None and (
+            group["latest_arrival"] is None or arrival > group["latest_arrival"]
+        ):
+            group["latest_arrival"] = arrival
+        if "diagnosis" not in group or PRIORITY_ORDER[priority] > PRIORITY_ORDER[group["priority"]]:
+            auth_results = derived["auth_results"]
+            group["priority"] = priority
+            group["diagnosis"] = _diagnosis(failure_kind, auth_results, delivery_result)
+            group["recommendations"] = _recommendations(
+                failure_kind, auth_results, source_ip, domain
+            )[:3]
+
+
+def _sorted_groups(groups: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    ordered = sorted(
+        groups.values(),
         key=lambda item: (
             PRIORITY_ORDER[item["priority"]],
             item["count"],
@@ -285,21 +481,71 @@ def summarize_forensic_samples(
         ),
         reverse=True,
     )
-    for group in groups:
+    for group in ordered:
         if group["latest_arrival"] is not None:
             group["latest_arrival"] = group["latest_arrival"].isoformat()
+    return ordered
+
 
+def summarize_forensic_reports(
+    db: Session,
+    query: Query,
+    *,
+    sample_limit: int,
+    redaction_policy: Optional[ForensicRedactionPolicy] = None,
+    samples_per_group: int = SAMPLES_PER_GROUP,
+) -> Dict[str, Any]:
+    """Summarize matching forensic samples into investigation groups and top examples.
+
+    Counts and groups are computed in SQL over every row *query* matches, using
+    the analysis materialised at ingest. Only the top ``samples_per_group``
+    samples of each group, capped at *sample_limit*, are analysed in full.
+    Samples stored before ingest materialised analysis are parsed on read, up to
+    *sample_limit* of the newest, until the background backfill reaches them.
+    """
+    query = query.order_by(None)
+    total_available = query.count()
+    materialized = query.filter(ForensicReport.analysis_group_key.isnot(None))
+    pending_rows = (
+        query.options(selectinload(ForensicReport.domain))
+        .filter(ForensicReport.analysis_group_key.is_(None))
+        .order_by(ForensicReport.id.desc())
+        .limit(sample_limit)
+        .all()
+    )
+    ranked = _ranked_samples(materialized)
+    sample_ids = [
+        row.id
+        for row in db.query(ranked.c.id)
+        .filter(ranked.c.group_rank <= samples_per_group)
+        .order_by(ranked.c.priority_rank.desc(), ranked.c.id.desc())
+        .limit(sample_limit)
+        .all()
+    ]
+    rows = (
+        db.query(ForensicReport)
+        .options(selectinload(ForensicReport.domain))
+        .filter(ForensicReport.id.in_(sample_ids))
+        .all()
+        if sample_ids
+        else []
+    )
     samples = sorted(
-        analyses,
+        (
+            analyze_forensic_report(row, redaction_policy=redaction_policy)
+            for row in rows + pending_rows
+        ),
         key=lambda item: (PRIORITY_ORDER[item["priority"]], item["id"] or 0),
         reverse=True,
-    )
+    )[:sample_limit]
+    counts = _counts(materialized)
+    groups = _groups(db, materialized, ranked)
+    _add_pending_samples(counts, groups, pending_rows)
+    groups = _sorted_groups(groups)
     return {
-        "total_available": total_available if total_available is not None else len(reports),
-        "analyzed": len(reports),
-        "priority_counts": dict(priority_counts),
-        "failure_counts": dict(failure_counts),
-        "result_counts": dict(result_counts),
-        "groups": groups,
+        "total_available": total_available,
+        "analyzed": len(samples),
+        **counts,
+        "groups": redact_forensic_value(groups, redaction_policy) if redaction_policy else groups,
         "samples": samples,
     }
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from app.models.domain import Domain
 from app.models.report import ForensicReport
+from app.services.forensic_analysis import materialize_forensic_analysis
 from app.services.forensic_redaction import ForensicRedactionPolicy, redact_forensic_value
 from app.services.workspaces import assign_default_workspace_to_unscoped_rows
 from app.utils.domain_validator import DomainValidationError, validate_domain
@@ -108,6 +109,7 @@ def save_forensic_report(
         original_date=report.get("original_date"),
         feedback_headers=feedback_headers,
     )
+    materialize_forensic_analysis(row, domain_name=domain.name)
     db.add(row)
     try:
         db.flush()
@@ -10,14 +10,10 @@ processed twice (no messages are modified or deleted).
 import base64
 import email
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 from urllib.parse import urlencode
 
 import httpx
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 
 from app.services.delivery_events import ingest_dsn_email
 from app.services.dmarc_parser import DMARCParser
@@ -25,19 +21,28 @@ from app.services.dsn_parser import MAX_DSN_BYTES, is_dsn_message
 from app.services.forensic_parser import ForensicParser
 from app.services.forensic_persistence import forensic_report_exists, save_forensic_report
 from app.services.forensic_redaction import get_forensic_redaction_policy
+from app.services.ingestion_dedup import (
+    PAYLOAD_KIND_AGGREGATE,
+    PAYLOAD_KIND_FORENSIC,
+    message_id_lookup,
+    payload_digest,
+)
 from app.services.mail_connector import (
     append_import_detail,
     connector_failure_stats,
     dump_ingested_ids,
     initial_import_stats,
     load_ingested_ids,
+    remember_known_payload,
     sanitize_connector_error,
+    skip_known_payload,
 )
 from app.services.report_persistence import report_exists, save_parsed_report
 from app.services.report_store import ReportStore
 
 logger = logging.getLogger(__name__)
 
+
 # ---------------------------------------------------------------------------
 # OAuth2 scopes – read-only access to Gmail messages is all we need
 # ---------------------------------------------------------------------------
@@ -89,18 +94,24 @@ class GmailClient:
         client_secret: str,
         access_token: str,
         refresh_token: str,
-        already_ingested_ids: Optional[List[str]] = None,
+        already_ingested_ids: Optional[Iterable[str]] = None,
         db: Any = None,
         workspace_id: Optional[int] = None,
     ):
         self.client_id = client_id
         self.client_secret = client_secret
         self._initial_access_token = access_token
-        self.already_ingested_ids: List[str] = list(already_ingested_ids or [])
+        self.already_ingested_ids = message_id_lookup(already_ingested_ids)
         self.report_store = ReportStore.get_instance()
         self.db = db
         self.workspace_id = workspace_id
 
+        # google-auth and the discovery client take a noticeable share of API
+        # startup, so they are imported on first use.
+        from google.oauth2.credentials import (  # pylint: disable=import-outside-toplevel
+            Credentials,
+        )
+
         self.credentials = Credentials(
             token=access_token,
             refresh_token=refresh_token,
@@ -270,7 +281,7 @@ class GmailClient:
                 # Track it even when no report is found so we don't re-examine
                 # unrelated messages on every poll. Retryable failures return -1.
                 stats["new_ingested_ids"].append(msg_id)
-                self.already_ingested_ids.append(msg_id)
+                self.already_ingested_ids.add(msg_id)
 
         domains_after = set(self.report_store.get_domains())
         stats["new_domains"] = list(domains_after - domains_before)
@@ -282,6 +293,10 @@ class GmailClient:
 
     def _build_service(self):
         """Build (and auto-refresh if needed) the Gmail API service object."""
+        # pylint: disable=import-outside-toplevel
+        from google.auth.transport.requests import Request
+        from googleapiclient.discovery import build
+
         if self.credentials.expired and self.credentials.refresh_token:
             try:
                 self.credentials.refresh(Request())
@@ -313,6 +328,8 @@ class GmailClient:
         max_pages: Optional[int] = None,
     ) -> tuple[List[str], Optional[str]]:
         """Return Gmail message IDs and an optional next-page resume cursor."""
+        from googleapiclient.errors import HttpError  # pylint: disable=import-outside-toplevel
+
         ids: List[str] = []
         page_token: Optional[str] = page_cursor
         pages_read = 0
@@ -360,6 +377,8 @@ class GmailClient:
 
         Returns the number of DMARC reports found in this message.
         """
+        from googleapiclient.errors import HttpError  # pylint: disable=import-outside-toplevel
+
         try:
             msg_data = (
                 service.users().messages().get(userId="me", id=msg_id, format="raw").execute()
@@ -437,7 +456,7 @@ class GmailClient:
             or lower.endswith(".gzip")
         )
 
-    def _store_report_if_new(self, report: Dict[str, Any]) -> bool:
+    def _store_report_if_new(self, report: Dict[str, Any], digest: Optional[str] = None) -> bool:
         """Store a parsed report unless that domain/report ID is already present."""
         domain = report.get("domain", "unknown")
         report_id = report.get("report_id", "")
@@ -449,10 +468,26 @@ class GmailClient:
             )
         ):
             logger.info("Skipping duplicate DMARC report %s for %s", report_id, domain)
+            remember_known_payload(
+                self.db,
+                digest,
+                PAYLOAD_KIND_AGGREGATE,
+                report_id=report_id,
+                domain=domain,
+                workspace_id=self.workspace_id,
+            )
             return False
 
         if self.db is not None:
             save_parsed_report(self.db, report, workspace_id=self.workspace_id)
+            remember_known_payload(
+                self.db,
+                digest,
+                PAYLOAD_KIND_AGGREGATE,
+                report_id=report_id,
+                domain=domain,
+                workspace_id=self.workspace_id,
+            )
         self.report_store.add_report(report)
         return True
 
@@ -463,6 +498,9 @@ class GmailClient:
         message_id: Optional[str] = None,
     ) -> int:
         """Parse and persist one DMARC forensic report message."""
+        digest = payload_digest(raw_bytes)
+        if skip_known_payload(self.db, digest, PAYLOAD_KIND_FORENSIC, stats, message_id=message_id):
+            return 0
         try:
             report = ForensicParser.parse_bytes(
                 raw_bytes,
@@ -484,6 +522,9 @@ class GmailClient:
                 return RETRYABLE_MESSAGE_FAILURE
 
             if forensic_report_exists(self.db, report_id):
+                remember_known_payload(
+                    self.db, digest, PAYLOAD_KIND_FORENSIC, report_id=report_id, domain=domain
+                )
                 stats["duplicate_forensic_reports"] = stats.get("duplicate_forensic_reports", 0) + 1
                 self._append_detail(
                     stats,
@@ -497,6 +538,9 @@ class GmailClient:
 
             _row, created = save_forensic_report(self.db, report)
             if not created:
+                remember_known_payload(
+                    self.db, digest, PAYLOAD_KIND_FORENSIC, report_id=report_id, domain=domain
+                )
                 stats["duplicate_forensic_reports"] = stats.get("duplicate_forensic_reports", 0) + 1
                 self._append_detail(
                     stats,
@@ -508,6 +552,13 @@ class GmailClient:
                 )
                 return 0
 
+            remember_known_payload(
+                self.db,
+                digest,
+                PAYLOAD_KIND_FORENSIC,
+                report_id=report_id,
+                domain=domain,
+            )
             stats["forensic_reports_found"] = stats.get("forensic_reports_found", 0) + 1
             self._append_detail(
                 stats,
@@ -571,11 +622,23 @@ class GmailClient:
                 )
                 continue
 
+            digest = payload_digest(content)
+            if skip_known_payload(
+                self.db,
+                digest,
+                PAYLOAD_KIND_AGGREGATE,
+                stats,
+                message_id=message_id,
+                filename=filename,
+                workspace_id=self.workspace_id,
+            ):
+                continue
+
             try:
                 report = DMARCParser.parse_file(content, filename)
                 domain = str(report.get("domain", "unknown"))
                 report_id = str(report.get("report_id", ""))
-                if self._store_report_if_new(report):
+                if self._store_report_if_new(report, digest=digest):
                     stats["reports_found"] += 1
                     reports_found += 1
                     self._append_detail(
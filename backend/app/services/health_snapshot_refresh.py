@@ -8,8 +8,10 @@ from typing import List, Tuple
 
 from sqlalchemy import text
 
+from app.core.concurrency import run_blocking
 from app.core.config import get_settings
 from app.core.database import SessionLocal
+from app.core.metrics import observe_scheduler_cycle
 from app.models.domain import Domain
 from app.models.workspace import Workspace
 from app.services.report_persistence import hydrate_domain_report_store_from_db
@@ -66,7 +68,8 @@ async def _refresh_domain_snapshot(domain_name: str, workspace_id: int | None) -
         if workspace is None:
             return False
         store = ReportStore()
-        hydrate_domain_report_store_from_db(
+        await run_blocking(
+            hydrate_domain_report_store_from_db,
             db,
             store,
             domain_name,
@@ -86,7 +89,8 @@ async def _refresh_domain_snapshot(domain_name: str, workspace_id: int | None) -
             cached_only=True,
         )
         summary = store.get_domain_summary(domain_name)
-        domain_endpoints._record_health_snapshot_from_posture(
+        await run_blocking(
+            domain_endpoints._record_health_snapshot_from_posture,
             db,
             workspace_id=workspace.id,
             domain_id=domain_name,
@@ -118,7 +122,7 @@ async def refresh_health_score_snapshots() -> int:
     if limit == 0:
         return 0
     refreshed = 0
-    for _domain_id, domain_name, workspace_id in _active_domains(limit):
+    for _domain_id, domain_name, workspace_id in await run_blocking(_active_domains, limit):
         if await _refresh_domain_snapshot(domain_name, workspace_id):
             refreshed += 1
     if refreshed:
@@ -133,7 +137,8 @@ async def scheduled_health_snapshot_refresh() -> None:
     await asyncio.sleep(max(5, int(settings.HEALTH_SNAPSHOT_REFRESH_STARTUP_DELAY_SECONDS)))
     while True:
         try:
-            await refresh_health_score_snapshots()
+            with observe_scheduler_cycle("health_snapshot_refresh"):
+                await refresh_health_score_snapshots()
         except asyncio.CancelledError:
             raise
         except Exception as exc:  # pylint: disable=broad-exception-caught
@@ -14,10 +14,17 @@ from app.services.dsn_parser import MAX_DSN_BYTES, is_dsn_message
 from app.services.forensic_parser import ForensicParser
 from app.services.forensic_persistence import forensic_report_exists, save_forensic_report
 from app.services.forensic_redaction import get_forensic_redaction_policy
+from app.services.ingestion_dedup import (
+    PAYLOAD_KIND_AGGREGATE,
+    PAYLOAD_KIND_FORENSIC,
+    payload_digest,
+)
 from app.services.mail_connector import (
     append_import_detail,
     initial_import_stats,
+    remember_known_payload,
     sanitize_connector_error,
+    skip_known_payload,
 )
 from app.services.report_persistence import report_exists, save_parsed_report
 from app.services.report_store import ReportStore
@@ -254,9 +261,7 @@ class IMAPClient:
                 return
 
             raw_email = msg_data[0][1]
-            if self._skip_oversized_message(
-                mail, email_id, message_id, raw_email, stats
-            ):
+            if self._skip_oversized_message(mail, email_id, message_id, raw_email, stats):
                 return
             msg = email.message_from_bytes(raw_email)
 
@@ -319,7 +324,7 @@ class IMAPClient:
                 reason="message_processing_failed",
                 message_id=message_id,
                 error="Message processing failed. Check server logs for details.",
-                )
+            )
 
     @staticmethod
     def _skip_oversized_message(mail, email_id, message_id, raw_email, stats) -> bool:
@@ -545,6 +550,7 @@ class IMAPClient:
         filename: str,
         stats: Optional[Dict[str, Any]],
         message_id: Optional[str],
+        digest: Optional[str] = None,
     ) -> bool:
         domain = report.get("domain", "unknown")
         report_id = report.get("report_id", "")
@@ -556,6 +562,14 @@ class IMAPClient:
             )
         ):
             logger.info("Skipping duplicate DMARC report %s for %s", report_id, domain)
+            remember_known_payload(
+                self.db,
+                digest,
+                PAYLOAD_KIND_AGGREGATE,
+                report_id=report_id,
+                domain=domain,
+                workspace_id=self.workspace_id,
+            )
             if stats is not None:
                 stats["duplicate_reports"] = stats.get("duplicate_reports", 0) + 1
             self._append_detail(
@@ -570,6 +584,14 @@ class IMAPClient:
 
         if self.db is not None:
             save_parsed_report(self.db, report, workspace_id=self.workspace_id)
+            remember_known_payload(
+                self.db,
+                digest,
+                PAYLOAD_KIND_AGGREGATE,
+                report_id=report_id,
+                domain=domain,
+                workspace_id=self.workspace_id,
+            )
         self.report_store.add_report(report)
         self._append_detail(
             stats,
@@ -587,6 +609,21 @@ class IMAPClient:
         *,
         stats: Optional[Dict[str, Any]],
         message_id: Optional[str],
+    ) -> bool:
+        digest = payload_digest(raw_email)
+        if skip_known_payload(self.db, digest, PAYLOAD_KIND_FORENSIC, stats, message_id=message_id):
+            return False
+        return self._store_forensic_email(
+            raw_email, digest=digest, stats=stats, message_id=message_id
+        )
+
+    def _store_forensic_email(
+        self,
+        raw_email: bytes,
+        *,
+        digest: str,
+        stats: Optional[Dict[str, Any]],
+        message_id: Optional[str],
     ) -> bool:
         try:
             report = ForensicParser.parse_bytes(
@@ -597,6 +634,9 @@ class IMAPClient:
             domain = str(report.get("reported_domain") or "unknown")
 
             if self.db is not None and forensic_report_exists(self.db, report_id):
+                remember_known_payload(
+                    self.db, digest, PAYLOAD_KIND_FORENSIC, report_id=report_id, domain=domain
+                )
                 if stats is not None:
                     stats["duplicate_forensic_reports"] = (
                         stats.get("duplicate_forensic_reports", 0) + 1
@@ -623,6 +663,9 @@ class IMAPClient:
                 return False
 
             _row, created = save_forensic_report(self.db, report)
+            remember_known_payload(
+                self.db, digest, PAYLOAD_KIND_FORENSIC, report_id=report_id, domain=domain
+            )
             if created:
                 if stats is not None:
                     stats["forensic_reports_found"] = stats.get("forensic_reports_found", 0) + 1
@@ -662,6 +705,40 @@ class IMAPClient:
             )
             return False
 
+    def _parse_dmarc_payload(
+        self,
+        content: bytes,
+        digest: str,
+        *,
+        filename: str,
+        stats: Optional[Dict[str, Any]],
+        message_id: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Parse one attachment, or return None for known or unrelated payloads."""
+        if skip_known_payload(
+            self.db,
+            digest,
+            PAYLOAD_KIND_AGGREGATE,
+            stats,
+            message_id=message_id,
+            filename=filename,
+            workspace_id=self.workspace_id,
+        ):
+            return None
+        try:
+            return DMARCParser.parse_file(content, filename)
+        except NoXMLContentError:
+            if stats is not None:
+                stats["skipped_attachments"] = stats.get("skipped_attachments", 0) + 1
+            self._append_detail(
+                stats,
+                status="skipped",
+                reason="unrelated_attachment",
+                message_id=message_id,
+                filename=filename,
+            )
+            return None
+
     def _process_dmarc_attachment(
         self,
         part: email.message.Message,
@@ -684,24 +761,18 @@ class IMAPClient:
                 )
                 return False
 
-            try:
-                report = DMARCParser.parse_file(content, filename)
-            except NoXMLContentError:
-                if stats is not None:
-                    stats["skipped_attachments"] = stats.get("skipped_attachments", 0) + 1
-                self._append_detail(
-                    stats,
-                    status="skipped",
-                    reason="unrelated_attachment",
-                    message_id=message_id,
-                    filename=filename,
-                )
+            digest = payload_digest(content)
+            report = self._parse_dmarc_payload(
+                content, digest, filename=filename, stats=stats, message_id=message_id
+            )
+            if report is None:
                 return False
             stored = self._store_report_if_new(
                 report,
                 filename=filename,
                 stats=stats,
                 message_id=message_id,
+                digest=digest,
             )
             if stored:
                 logger.info("Successfully processed DMARC report: %s", filename)
@@ -0,0 +1,189 @@
+"""Import DMARC aggregate reports and DSNs from one raw inbound email.
+
+The webhook endpoints call this inline and the ingestion queue calls it for
+queued webhook mail, so both paths share attachment handling, duplicate checks
+and the default-workspace assignment.
+"""
+
+import email
+import logging
+from email.header import decode_header
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.redaction import sanitize_for_log
+from app.services.delivery_events import ingest_dsn_email
+from app.services.dmarc_parser import DMARCParser
+from app.services.dsn_parser import is_dsn_message
+from app.services.ingestion_dedup import (
+    PAYLOAD_KIND_AGGREGATE,
+    find_ingested_payload,
+    payload_digest,
+    remember_ingested_payload,
+)
+from app.services.report_persistence import report_exists, save_parsed_report
+from app.services.report_store import ReportStore
+from app.services.webhook_events import EVENT_REPORT_IMPORTED, enqueue_webhook_event
+from app.services.workspaces import assign_default_workspace_to_unscoped_rows
+
+logger = logging.getLogger(__name__)
+
+
+def _decode_email_header(header: Optional[str]) -> str:
+    """Decode an RFC 2047 email header to display text."""
+    if not header:
+        return ""
+    decoded_parts = []
+    for text, encoding in decode_header(header):
+        if isinstance(text, bytes):
+            decoded_parts.append(text.decode(encoding or "utf-8", errors="replace"))
+        else:
+            decoded_parts.append(text)
+    return " ".join(decoded_parts)
+
+
+def _is_dmarc_filename(filename: str) -> bool:
+    lower = filename.lower()
+    return lower.endswith((".xml", ".zip", ".gz", ".gzip"))
+
+
+def _store_report(
+    db: Session,
+    store: ReportStore,
+    report: Dict[str, Any],
+    workspace_id: int,
+) -> str:
+    domain = report.get("domain") or "unknown"
+    report_id = report.get("report_id") or ""
+    if report_id and (
+        store.has_report(domain, report_id)
+        or report_exists(db, domain, report_id, workspace_id=workspace_id)
+    ):
+        return "duplicate"
+    save_parsed_report(db, report, workspace_id=workspace_id)
+    try:
+        enqueue_webhook_event(
+            db,
+            event_type=EVENT_REPORT_IMPORTED,
+            payload={
+                "domain": domain,
+                "report_id": report_id,
+                "org_name": report.get("org_name"),
+                "begin_date": report.get("begin_date"),
+                "end_date": report.get("end_date"),
+                "records": len(report.get("records") or []),
+            },
+            idempotency_key=f"{EVENT_REPORT_IMPORTED}:{domain}:{report_id or 'unknown'}",
+        )
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.warning("Failed to queue report-import webhook event: %s", sanitize_for_log(exc))
+    store.add_report(report)
+    return "imported"
+
+
+def _process_email_attachments(msg: email.message.Message, db: Session) -> Dict[str, Any]:
+    store = ReportStore.get_instance()
+    results: Dict[str, Any] = {
+        "reports_found": 0,
+        "imported": 0,
+        "duplicates": 0,
+        "errors": [],
+    }
+    workspace_id: Optional[int] = None
+
+    for part in msg.walk():
+        if part.get_content_disposition() != "attachment":
+            continue
+
+        filename = _decode_email_header(part.get_filename())
+        if not filename or not _is_dmarc_filename(filename):
+            continue
+
+        try:
+            content = part.get_payload(decode=True)
+            if not content:
+                continue
+            if workspace_id is None:
+                # Webhook mail has no workspace of its own; reports land in the default one.
+                workspace_id = assign_default_workspace_to_unscoped_rows(db, commit=False).id
+            digest = payload_digest(content)
+            if (
+                find_ingested_payload(db, digest, PAYLOAD_KIND_AGGREGATE, workspace_id=workspace_id)
+                is not None
+            ):
+                results["reports_found"] += 1
+                results["duplicates"] += 1
+                continue
+            report = DMARCParser.parse_file(content, filename)
+            outcome = _store_report(db, store, report, workspace_id)
+            results["reports_found"] += 1
+            if outcome == "duplicate":
+                results["duplicates"] += 1
+            else:
+                remember_ingested_payload(
+                    db,
+                    digest,
+                    PAYLOAD_KIND_AGGREGATE,
+                    report_id=report.get("report_id") or "",
+                    domain=report.get("domain"),
+                    workspace_id=workspace_id,
+                )
+                results["imported"] += 1
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning(
+                "Webhook failed to process DMARC attachment %s: %s",
+                sanitize_for_log(filename),
+                sanitize_for_log(exc),
+            )
+            results["errors"].append(filename)
+
+    return results
+
+
+def _subject_from_message(msg: email.message.Message, fallback: Optional[str] = None) -> str:
+    return fallback or _decode_email_header(msg.get("Subject"))
+
+
+def ingest_inbound_email(
+    raw_email: bytes,
+    db: Session,
+    *,
+    subject: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Store the DMARC attachments or delivery events found in one RFC 822 message."""
+    try:
+        msg = email.message_from_bytes(raw_email)
+        if is_dsn_message(msg):
+            delivery_results = ingest_dsn_email(
+                db,
+                raw_email,
+                workspace_id=None,
+                source_system="webhook_dsn",
+            )
+            attachment_results = {
+                "reports_found": 0,
+                "imported": 0,
+                "duplicates": 0,
+                "errors": [],
+                "delivery_events": delivery_results,
+            }
+        else:
+            attachment_results = _process_email_attachments(msg, db)
+            db.commit()
+    except HTTPException:
+        raise
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        db.rollback()
+        logger.warning("Webhook failed to process email: %s", sanitize_for_log(exc))
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Error processing email.",
+        ) from exc
+
+    return {
+        "success": True,
+        "subject": _subject_from_message(msg, subject),
+        **attachment_results,
+    }
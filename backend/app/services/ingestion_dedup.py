@@ -0,0 +1,221 @@
+"""Indexes that let intake paths skip payloads and messages they already know.
+
+Aggregate, forensic and TLS reports are recognised by the SHA-256 of their raw
+bytes before any decompression or parsing, so the same attachment delivered by
+IMAP, Gmail, Microsoft 365, the email worker and a manual upload is parsed once.
+A digest only counts as known while the report it produced is still stored.
+
+Gmail and Microsoft 365 message IDs that a source has examined live in an
+indexed table instead of a JSON list on the mail source row, so polls append
+new IDs without reading and rewriting the whole history.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable, List, Optional, Set, Union
+
+from sqlalchemy.orm import Session
+
+from app.models.ingestion_job import IngestedPayloadDigest
+from app.models.mail_source_message import MailSourceIngestedMessage
+from app.services.forensic_persistence import forensic_report_exists
+from app.services.mail_connector import load_ingested_ids
+from app.services.report_persistence import report_exists
+from app.services.tls_report_persistence import tls_report_exists
+
+PAYLOAD_KIND_AGGREGATE = "aggregate"
+PAYLOAD_KIND_FORENSIC = "forensic"
+PAYLOAD_KIND_TLS = "tls"
+
+CONNECTOR_GMAIL = "gmail"
+CONNECTOR_M365 = "m365"
+_LEGACY_MESSAGE_ID_COLUMNS = {
+    CONNECTOR_GMAIL: "gmail_ingested_ids",
+    CONNECTOR_M365: "m365_ingested_ids",
+}
+_MESSAGE_ID_CHUNK_SIZE = 500
+
+
+def payload_digest(content: bytes) -> str:
+    """Return the hex SHA-256 of one raw attachment or report payload."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def _report_still_stored(db: Session, row: IngestedPayloadDigest) -> bool:
+    if row.kind == PAYLOAD_KIND_AGGREGATE:
+        return report_exists(db, row.domain or "", row.report_id, workspace_id=row.workspace_id)
+    if row.kind == PAYLOAD_KIND_FORENSIC:
+        return forensic_report_exists(db, row.report_id, workspace_id=row.workspace_id)
+    if row.kind == PAYLOAD_KIND_TLS:
+        return tls_report_exists(db, row.report_id, row.domain or "", workspace_id=row.workspace_id)
+    return False
+
+
+def find_ingested_payload(
+    db: Session,
+    digest: str,
+    kind: str,
+    *,
+    workspace_id: Optional[int] = None,
+) -> Optional[IngestedPayloadDigest]:
+    """Return the digest row when these exact bytes were already stored.
+
+    Without ``workspace_id`` any workspace matches, mirroring ``report_exists``.
+    """
+    query = db.query(IngestedPayloadDigest).filter(
+        IngestedPayloadDigest.content_sha256 == digest,
+        IngestedPayloadDigest.kind == kind,
+    )
+    if workspace_id is not None:
+        query = query.filter(IngestedPayloadDigest.workspace_id == workspace_id)
+    for row in query.order_by(IngestedPayloadDigest.id.desc()).limit(5):
+        if _report_still_stored(db, row):
+            return row
+    return None
+
+
+def remember_ingested_payload(
+    db: Session,
+    digest: str,
+    kind: str,
+    *,
+    report_id: str,
+    domain: Optional[str] = None,
+    workspace_id: Optional[int] = None,
+) -> None:
+    """Record which report a payload produced; the caller owns the transaction."""
+    report_id = str(report_id or "").strip()
+    if not report_id:
+        return
+    workspace_filter = (
+        IngestedPayloadDigest.workspace_id.is_(None)
+        if workspace_id is None
+        else IngestedPayloadDigest.workspace_id == workspace_id
+    )
+    exists = (
+        db.query(IngestedPayloadDigest.id)
+        .filter(
+            IngestedPayloadDigest.content_sha256 == digest,
+            IngestedPayloadDigest.kind == kind,
+            workspace_filter,
+            IngestedPayloadDigest.report_id == report_id,
+        )
+        .first()
+    )
+    if exists is not None:
+        return
+    db.add(
+        IngestedPayloadDigest(
+            workspace_id=workspace_id,
+            kind=kind,
+            content_sha256=digest,
+            domain=(domain or None) and str(domain)[:255],
+            report_id=report_id[:255],
+        )
+    )
+
+
+def _stored_message_ids(
+    db: Session,
+    mail_source_id: int,
+    connector: str,
+    candidates: List[str],
+) -> Set[str]:
+    query = db.query(MailSourceIngestedMessage.message_id).filter(
+        MailSourceIngestedMessage.mail_source_id == mail_source_id,
+        MailSourceIngestedMessage.connector == connector,
+    )
+    known: Set[str] = set()
+    for start in range(0, len(candidates), _MESSAGE_ID_CHUNK_SIZE):
+        chunk = candidates[start : start + _MESSAGE_ID_CHUNK_SIZE]
+        rows = query.filter(MailSourceIngestedMessage.message_id.in_(chunk)).all()
+        known.update(row[0] for row in rows)
+    return known
+
+
+def record_ingested_message_ids(
+    db: Session,
+    source,
+    connector: str,
+    message_ids: Iterable[str],
+) -> int:
+    """Append newly examined provider message IDs; the caller owns the transaction."""
+    if source is None or source.id is None:
+        return 0
+    pending = list(dict.fromkeys(str(item) for item in message_ids if item))
+    if not pending:
+        return 0
+    known = _stored_message_ids(db, source.id, connector, pending)
+    new_ids = [message_id for message_id in pending if message_id not in known]
+    db.add_all(
+        MailSourceIngestedMessage(
+            mail_source_id=source.id,
+            connector=connector,
+            message_id=message_id,
+        )
+        for message_id in new_ids
+    )
+    if new_ids:
+        db.flush()
+    return len(new_ids)
+
+
+class IngestedMessageIds:
+    """Message IDs a source has examined, looked up one ID at a time by index.
+
+    Connectors only ask whether each listed message is known, so polls never
+    load the source's full history.  IDs added during a fetch are kept locally
+    until the caller records them with :func:`record_ingested_message_ids`.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        mail_source_id: Optional[int],
+        connector: str,
+        known: Iterable[str] = (),
+    ) -> None:
+        self._db = db
+        self._mail_source_id = mail_source_id
+        self._connector = connector
+        self._known: Set[str] = set(known)
+
+    def __contains__(self, message_id: object) -> bool:
+        if message_id in self._known:
+            return True
+        if self._mail_source_id is None or not message_id:
+            return False
+        stored = (
+            self._db.query(MailSourceIngestedMessage.id)
+            .filter(
+                MailSourceIngestedMessage.mail_source_id == self._mail_source_id,
+                MailSourceIngestedMessage.connector == self._connector,
+                MailSourceIngestedMessage.message_id == str(message_id),
+            )
+            .first()
+        )
+        if stored is None:
+            return False
+        self._known.add(str(message_id))
+        return True
+
+    def add(self, message_id: str) -> None:
+        self._known.add(message_id)
+
+
+def message_id_lookup(message_ids: Optional[Iterable[str]]) -> Union[Set[str], IngestedMessageIds]:
+    """Return *message_ids* as something connectors can test membership against."""
+    if isinstance(message_ids, IngestedMessageIds):
+        return message_ids
+    return set(message_ids or ())
+
+
+def load_ingested_message_ids(db: Session, source, connector: str) -> IngestedMessageIds:
+    """Return the source's examined message IDs, folding in legacy JSON lists."""
+    column = _LEGACY_MESSAGE_ID_COLUMNS[connector]
+    legacy_ids = load_ingested_ids(getattr(source, column, None))
+    if legacy_ids:
+        record_ingested_message_ids(db, source, connector, legacy_ids)
+        setattr(source, column, None)
+    return IngestedMessageIds(db, source.id, connector, legacy_ids)
@@ -0,0 +1,500 @@
+"""Durable intake queue for report uploads and inbound email.
+
+When ``INGESTION_QUEUE_ENABLED`` is set, upload and email-worker endpoints only
+validate the request, store the raw payload with its SHA-256 and answer
+``202 Accepted`` with a job ID. A small pool of workers then parses and
+persists each job, retrying transient failures with backoff and moving jobs
+that keep failing to ``dead_letter`` so operators can inspect and requeue them.
+Re-submitting identical bytes while a job is still queued, backing off or
+running returns that job instead of queueing the payload twice; a partial
+unique index enforces this for concurrent submissions too. Once a job has
+finished the same bytes can be queued again, for example after the report
+was deleted, and the handler's own duplicate checks decide what to keep.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, func, or_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.concurrency import run_blocking
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.metrics import observe_scheduler_cycle
+from app.core.redaction import redact_sensitive_text
+from app.models.ingestion_job import IngestionJob
+from app.services.delivery_events import ingest_dsn_email
+from app.services.inbound_email import ingest_inbound_email
+from app.services.report_uploads import (
+    store_aggregate_upload,
+    store_forensic_upload,
+    store_tls_upload,
+)
+
+logger = logging.getLogger(__name__)
+
+INGESTION_KIND_AGGREGATE = "aggregate_report"
+INGESTION_KIND_FORENSIC = "forensic_report"
+INGESTION_KIND_TLS = "tls_report"
+INGESTION_KIND_EMAIL = "inbound_email"
+INGESTION_KIND_DSN = "dsn"
+
+RUNNABLE_INGESTION_STATUSES = ("queued", "backoff")
+# Identical payloads are not queued again while a job is in one of these states;
+# keep in sync with ``ACTIVE_INGESTION_JOB_SQL`` on the model's unique index.
+DEDUPLICATED_INGESTION_STATUSES = ("queued", "backoff", "running")
+INGESTION_STATUSES = ("queued", "backoff", "running", "succeeded", "failed", "dead_letter")
+# A running job whose worker died is picked up again after this lease.
+RUNNING_JOB_LEASE = timedelta(minutes=10)
+MAX_RETRY_DELAY_SECONDS = 900
+
+IngestionHandler = Callable[[Session, IngestionJob], Dict[str, Any]]
+
+_wake_event: Optional[asyncio.Event] = None
+
+
+class IngestionRejected(Exception):
+    """A payload that can never be ingested; the job fails without retrying."""
+
+
+def ingestion_queue_enabled() -> bool:
+    """Return whether intake endpoints should queue instead of ingesting inline."""
+    return bool(get_settings().INGESTION_QUEUE_ENABLED)
+
+
+def payload_sha256(payload: bytes) -> str:
+    """Return the hex SHA-256 used to identify queued payloads."""
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _job_options(job: IngestionJob) -> Dict[str, Any]:
+    if not job.options:
+        return {}
+    try:
+        options = json.loads(job.options)
+    except (TypeError, ValueError):
+        return {}
+    return options if isinstance(options, dict) else {}
+
+
+def _latest_job_for_payload(
+    db: Session,
+    kind: str,
+    digest: str,
+    workspace_id: Optional[int],
+    *,
+    active_only: bool = True,
+) -> Optional[IngestionJob]:
+    workspace_filter = (
+        IngestionJob.workspace_id.is_(None)
+        if workspace_id is None
+        else IngestionJob.workspace_id == workspace_id
+    )
+    query = db.query(IngestionJob).filter(
+        IngestionJob.kind == kind,
+        IngestionJob.content_sha256 == digest,
+        workspace_filter,
+    )
+    if active_only:
+        query = query.filter(IngestionJob.status.in_(DEDUPLICATED_INGESTION_STATUSES))
+    return query.order_by(IngestionJob.id.desc()).first()
+
+
+def _insert_job_ignoring_active_duplicate(db: Session, row: Dict[str, Any]) -> Optional[int]:
+    """Insert one job row; return ``None`` if an active job already holds its payload."""
+    dialect = db.get_bind().dialect.name
+    if dialect in {"postgresql", "sqlite"}:
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        statement = insert(IngestionJob).values(**row).on_conflict_do_nothing()
+        return db.execute(statement.returning(IngestionJob.id)).scalar()
+    try:
+        with db.begin_nested():
+            job = IngestionJob(**row)
+            db.add(job)
+        return job.id
+    except IntegrityError:
+        return None
+
+
+def enqueue_ingestion_job(
+    db: Session,
+    *,
+    kind: str,
+    payload: bytes,
+    workspace_id: Optional[int],
+    source: str = "api",
+    filename: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+) -> Tuple[IngestionJob, bool]:
+    """Persist one raw payload for background ingestion.
+
+    Returns ``(job, created)``; ``created`` is false when the same bytes are
+    already waiting or running for this kind and workspace.
+    """
+    digest = payload_sha256(payload)
+    existing = _latest_job_for_payload(db, kind, digest, workspace_id)
+    if existing is not None:
+        return existing, False
+
+    row = {
+        "workspace_id": workspace_id,
+        "kind": kind,
+        "source": source,
+        "status": "queued",
+        "filename": (filename or "")[:255] or None,
+        "content_sha256": digest,
+        "payload_size": len(payload),
+        "payload": payload,
+        "options": json.dumps(options, sort_keys=True) if options else None,
+        "max_attempts": max(1, int(get_settings().INGESTION_QUEUE_MAX_ATTEMPTS or 1)),
+    }
+    job_id = _insert_job_ignoring_active_duplicate(db, row)
+    db.commit()
+    if job_id is None:
+        # A concurrent submission queued the same bytes first; it may already
+        # have finished by now, so report whichever job won.
+        return _latest_job_for_payload(db, kind, digest, workspace_id, active_only=False), False
+    return db.get(IngestionJob, job_id), True
+
+
+def ingestion_job_to_dict(job: IngestionJob) -> Dict[str, Any]:
+    """Serialize job state without exposing the stored payload."""
+    result = None
+    if job.result:
+        try:
+            result = json.loads(job.result)
+        except (TypeError, ValueError):
+            result = None
+    return {
+        "id": job.id,
+        "workspace_id": job.workspace_id,
+        "kind": job.kind,
+        "source": job.source,
+        "status": job.status,
+        "filename": job.filename,
+        "content_sha256": job.content_sha256,
+        "payload_size": job.payload_size,
+        "attempt_count": job.attempt_count,
+        "max_attempts": job.max_attempts,
+        "last_error": job.last_error,
+        "result": result,
+        "next_retry_at": job.next_retry_at.isoformat() if job.next_retry_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+    }
+
+
+async def accept_for_ingestion(
+    db: Session,
+    *,
+    kind: str,
+    payload: bytes,
+    workspace_id: Optional[int],
+    source: str = "api",
+    filename: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+) -> JSONResponse:
+    """Queue one validated payload and build the ``202 Accepted`` response."""
+    job, created = await run_blocking(
+        enqueue_ingestion_job,
+        db,
+        kind=kind,
+        payload=payload,
+        workspace_id=workspace_id,
+        source=source,
+        filename=filename,
+        options=options,
+    )
+    if created:
+        notify_ingestion_workers()
+    status_url = f"{get_settings().API_V1_STR.rstrip('/')}/ingestion/jobs/{job.id}"
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "success": True,
+            "queued": True,
+            "duplicate": not created,
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": status_url,
+        },
+        headers={"Location": status_url},
+    )
+
+
+def _retry_delay(attempt_count: int) -> timedelta:
+    seconds = min(MAX_RETRY_DELAY_SECONDS, 15 * (2 ** max(attempt_count - 1, 0)))
+    return timedelta(seconds=seconds)
+
+
+def _ingest_aggregate_report(db: Session, job: IngestionJob) -> Dict[str, Any]:
+    return store_aggregate_upload(db, job.payload, job.filename or "report.xml", job.workspace_id)
+
+
+def _ingest_forensic_report(db: Session, job: IngestionJob) -> Dict[str, Any]:
+    try:
+        return store_forensic_upload(db, job.payload, job.workspace_id)
+    except ValueError as exc:
+        raise IngestionRejected("Invalid forensic report format.") from exc
+
+
+def _ingest_tls_report(db: Session, job: IngestionJob) -> Dict[str, Any]:
+    try:
+        return store_tls_upload(db, job.payload, job.filename or "", job.workspace_id)
+    except ValueError as exc:
+        raise IngestionRejected(str(exc) or "Invalid TLS report format.") from exc
+
+
+def _ingest_inbound_email(db: Session, job: IngestionJob) -> Dict[str, Any]:
+    return ingest_inbound_email(job.payload, db, subject=_job_options(job).get("subject"))
+
+
+def _ingest_dsn(db: Session, job: IngestionJob) -> Dict[str, Any]:
+    return ingest_dsn_email(
+        db,
+        job.payload,
+        workspace_id=job.workspace_id,
+        source_system=_job_options(job).get("source_system") or "manual_dsn_upload",
+    )
+
+
+_INGESTION_HANDLERS: Dict[str, IngestionHandler] = {
+    INGESTION_KIND_AGGREGATE: _ingest_aggregate_report,
+    INGESTION_KIND_FORENSIC: _ingest_forensic_report,
+    INGESTION_KIND_TLS: _ingest_tls_report,
+    INGESTION_KIND_EMAIL: _ingest_inbound_email,
+    INGESTION_KIND_DSN: _ingest_dsn,
+}
+
+
+def _permanent_failure_message(exc: Exception) -> Optional[str]:
+    """Return a stored error for failures that retrying cannot fix."""
+    if isinstance(exc, IngestionRejected):
+        return str(exc)
+    if isinstance(exc, HTTPException) and exc.status_code < 500:
+        # Intake helpers wrap unexpected errors in 4xx responses; a database or
+        # I/O error underneath is still transient and deserves a retry.
+        if isinstance(exc.__cause__, (SQLAlchemyError, OSError)):
+            return None
+        return str(exc.detail)
+    if isinstance(exc, ValueError):
+        return str(exc) or "Invalid payload."
+    return None
+
+
+def _finish_job(job: IngestionJob, status: str, *, now: datetime) -> None:
+    job.status = status
+    job.finished_at = now
+    job.next_retry_at = None
+    job.updated_at = now
+
+
+def _claimable_job_filter(now: datetime):
+    return or_(
+        and_(
+            IngestionJob.status.in_(RUNNABLE_INGESTION_STATUSES),
+            or_(
+                IngestionJob.next_retry_at.is_(None),
+                IngestionJob.next_retry_at <= now,
+            ),
+        ),
+        and_(
+            IngestionJob.status == "running",
+            IngestionJob.updated_at <= now - RUNNING_JOB_LEASE,
+        ),
+    )
+
+
+def claim_ingestion_job(db: Session, job_id: int) -> bool:
+    """Mark one due job as running; return False when another worker got it first.
+
+    The status check and the update are one statement, so concurrent workers
+    cannot both claim a job even where ``SELECT ... FOR UPDATE`` is unavailable.
+    """
+    now = datetime.utcnow()
+    claimed = (
+        db.query(IngestionJob)
+        .filter(IngestionJob.id == job_id, _claimable_job_filter(now))
+        .update(
+            {
+                IngestionJob.status: "running",
+                IngestionJob.started_at: now,
+                IngestionJob.updated_at: now,
+                IngestionJob.attempt_count: func.coalesce(IngestionJob.attempt_count, 0) + 1,
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return claimed == 1
+
+
+def run_ingestion_job(db: Session, job: IngestionJob) -> bool:
+    """Claim, parse and persist one job, recording retry or dead-letter state.
+
+    Returns False without running the handler when the job is no longer due.
+    """
+    if not claim_ingestion_job(db, job.id):
+        return False
+    db.refresh(job)
+    handler = _INGESTION_HANDLERS.get(job.kind)
+
+    if handler is None or job.payload is None:
+        job.last_error = "Unsupported ingestion job." if handler is None else "Payload missing."
+        _finish_job(job, "failed", now=datetime.utcnow())
+        db.commit()
+        return True
+
+    try:
+        result = handler(db, job)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        db.rollback()
+        now = datetime.utcnow()
+        message = _permanent_failure_message(exc)
+        if message is not None:
+            job.last_error = redact_sensitive_text(message)
+            _finish_job(job, "failed", now=now)
+        elif job.attempt_count >= int(job.max_attempts or 1):
+            logger.warning(
+                "Ingestion job id=%s moved to dead letter after %d attempt(s): %s",
+                job.id,
+                job.attempt_count,
+                type(exc).__name__,
+            )
+            job.last_error = redact_sensitive_text(f"{type(exc).__name__}: {exc}")
+            _finish_job(job, "dead_letter", now=now)
+        else:
+            logger.info(
+                "Ingestion job id=%s failed attempt %d with %s; retrying",
+                job.id,
+                job.attempt_count,
+                type(exc).__name__,
+            )
+            job.last_error = redact_sensitive_text(f"{type(exc).__name__}: {exc}")
+            job.status = "backoff"
+            job.next_retry_at = now + _retry_delay(job.attempt_count)
+            job.updated_at = now
+        db.commit()
+        return True
+
+    job.result = json.dumps(result, default=str)
+    job.last_error = None
+    # The payload is only needed until it has been persisted; keep the hash for
+    # duplicate detection and drop the bytes.
+    job.payload = None
+    _finish_job(job, "succeeded", now=datetime.utcnow())
+    db.commit()
+    return True
+
+
+def due_ingestion_jobs(db: Session, limit: int = 1) -> List[IngestionJob]:
+    """Return due queued, backoff, or abandoned running jobs, oldest first."""
+    now = datetime.utcnow()
+    safe_limit = max(1, min(limit, 50))
+    return (
+        db.query(IngestionJob)
+        .filter(_claimable_job_filter(now))
+        .order_by(IngestionJob.created_at.asc(), IngestionJob.id.asc())
+        .limit(safe_limit)
+        .all()
+    )
+
+
+def run_due_ingestion_jobs(db: Session, limit: int = 1) -> int:
+    """Execute a bounded batch of due ingestion jobs."""
+    count = 0
+    for job in due_ingestion_jobs(db, limit=limit):
+        if run_ingestion_job(db, job):
+            count += 1
+    return count
+
+
+def requeue_ingestion_job(db: Session, job: IngestionJob) -> IngestionJob:
+    """Move a dead-lettered or failed job back to the queue for another attempt."""
+    if job.status not in ("dead_letter", "failed") or job.payload is None:
+        raise ValueError("Only failed or dead-lettered jobs with a stored payload can be retried.")
+    active = _latest_job_for_payload(db, job.kind, job.content_sha256, job.workspace_id)
+    if active is not None:
+        raise ValueError(f"The same payload is already queued as job {active.id}.")
+    now = datetime.utcnow()
+    job.status = "queued"
+    job.attempt_count = 0
+    job.next_retry_at = None
+    job.finished_at = None
+    job.updated_at = now
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise ValueError("The same payload was queued again concurrently.") from exc
+    db.refresh(job)
+    return job
+
+
+def _run_due_ingestion_batch() -> int:
+    db = SessionLocal()
+    try:
+        return run_due_ingestion_jobs(db, limit=1)
+    except Exception:  # pylint: disable=broad-exception-caught
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def notify_ingestion_workers() -> None:
+    """Wake idle workers after a new job was queued in this process."""
+    if _wake_event is not None:
+        _wake_event.set()
+
+
+async def _ingestion_worker(index: int, poll_seconds: float) -> None:
+    while True:
+        try:
+            with observe_scheduler_cycle("ingestion_queue"):
+                processed = await run_blocking(_run_due_ingestion_batch)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("Ingestion worker %d failed with %s", index, type(exc).__name__)
+            processed = 0
+        if processed:
+            continue
+        try:
+            await asyncio.wait_for(_wake_event.wait(), timeout=poll_seconds)
+        except asyncio.TimeoutError:
+            pass
+        _wake_event.clear()
+
+
+async def scheduled_ingestion_workers() -> None:
+    """Run the configured number of ingestion workers until cancelled."""
+    global _wake_event  # pylint: disable=global-statement
+    settings = get_settings()
+    workers = max(1, int(settings.INGESTION_QUEUE_WORKERS or 1))
+    poll_seconds = max(0.5, float(settings.INGESTION_QUEUE_POLL_SECONDS or 0.5))
+    _wake_event = asyncio.Event()
+    tasks = [
+        asyncio.create_task(_ingestion_worker(index, poll_seconds)) for index in range(workers)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        _wake_event = None
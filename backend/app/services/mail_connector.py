@@ -164,3 +164,71 @@ def load_ingested_ids(json_text: Optional[str]) -> List[str]:
 def dump_ingested_ids(ids: Iterable[Any]) -> str:
     """Serialize connector ingested-message IDs for database storage."""
     return json.dumps([str(item) for item in ids])
+
+
+def skip_known_payload(
+    db: Any,
+    digest: str,
+    kind: str,
+    stats: Optional[Dict[str, Any]],
+    *,
+    message_id: Optional[str],
+    filename: Optional[str] = None,
+    workspace_id: Optional[int] = None,
+    context: Optional[ConnectorImportContext] = None,
+) -> bool:
+    """Count and skip payload bytes that were already stored, before parsing."""
+    # ingestion_dedup reads connector message-id columns through this module.
+    from app.services.ingestion_dedup import (  # pylint: disable=import-outside-toplevel
+        PAYLOAD_KIND_AGGREGATE,
+        find_ingested_payload,
+    )
+
+    if db is None:
+        return False
+    if find_ingested_payload(db, digest, kind, workspace_id=workspace_id) is None:
+        return False
+    if stats is not None:
+        counter = (
+            "duplicate_reports" if kind == PAYLOAD_KIND_AGGREGATE else "duplicate_forensic_reports"
+        )
+        stats[counter] = stats.get(counter, 0) + 1
+    append_import_detail(
+        stats,
+        context=context,
+        status="duplicate",
+        reason="duplicate_payload",
+        message_id=message_id,
+        filename=filename,
+    )
+    return True
+
+
+def remember_known_payload(
+    db: Any,
+    digest: Optional[str],
+    kind: str,
+    *,
+    report_id: Any,
+    domain: Any = None,
+    workspace_id: Optional[int] = None,
+) -> None:
+    """Map payload bytes to the stored report, whether just saved or already present.
+
+    Recording the digest for duplicates too lets later polls and backfills skip
+    those bytes before parsing them again.
+    """
+    from app.services.ingestion_dedup import (  # pylint: disable=import-outside-toplevel
+        remember_ingested_payload,
+    )
+
+    if db is None or not digest:
+        return
+    remember_ingested_payload(
+        db,
+        digest,
+        kind,
+        report_id=str(report_id or ""),
+        domain=str(domain) if domain else None,
+        workspace_id=workspace_id,
+    )
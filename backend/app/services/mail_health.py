@@ -32,6 +32,7 @@ from app.services.mail_signals import (
 )
 from app.services.sender_classifications import latest_sender_classifications
 from app.services.sender_intelligence import identify_sender
+from app.services.source_read_projection import json_dict_decoder
 
 ASSESSMENT_SCHEMA_VERSION = "dmarq.mail_health_assessment.v2"
 ASSESSMENT_ALGORITHM_VERSION = "deterministic-2026-07"
@@ -408,13 +409,14 @@ def _aggregated_projection_sources(
         )
         .all()
     )
+    decode = json_dict_decoder()
     for row in detail_rows:
         key = (row.domain_name, _canonical_source_ip(row.source_ip))
         source = sources.get(key)
         if source is None:
             continue
         source["evidence_refs"].append(f"domain_source_daily_projection:{row.projection_id}")
-        metadata = _as_dict(row.metadata_json)
+        metadata = decode(row.metadata_json)
         for field in (
             "report_generators",
             "header_from_domains",
@@ -427,12 +429,12 @@ def _aggregated_projection_sources(
                 normalized = str(value).strip()
                 if normalized and normalized not in source[field]:
                     source[field].append(normalized)
-        for disposition, count in _as_dict(row.disposition_counts).items():
+        for disposition, count in decode(row.disposition_counts).items():
             source["disposition_counts"][str(disposition).lower()] += _count(count)
-        evidence = _as_dict(row.source_evidence)
+        evidence = decode(row.source_evidence)
         captured_at = str(evidence.get("captured_at") or "")
         if evidence and captured_at >= source["captured_at"]:
-            source["source_evidence"] = evidence
+            source["source_evidence"] = dict(evidence)
             source["captured_at"] = captured_at
     return sources
 
@@ -18,6 +18,12 @@ from app.models.mail_source_backfill import MailSourceBackfillJob
 from app.services.gmail_client import GmailClient
 from app.services.imap_client import IMAPClient
 from app.services.import_history import record_import_attempt
+from app.services.ingestion_dedup import (
+    CONNECTOR_GMAIL,
+    CONNECTOR_M365,
+    load_ingested_message_ids,
+    record_ingested_message_ids,
+)
 from app.services.microsoft_graph_client import (
     MicrosoftGraphClient,
     m365_application_configuration_error,
@@ -393,7 +399,7 @@ def _fetch_gmail_backfill_results(
     if not source.gmail_refresh_token:
         raise ValueError("Gmail authorization cannot be refreshed. Reconnect Gmail first.")
 
-    already = GmailClient.load_ingested_ids(source.gmail_ingested_ids)
+    already = load_ingested_message_ids(db, source, CONNECTOR_GMAIL)
     client = GmailClient(
         client_id=source.gmail_client_id or "",
         client_secret=source.gmail_client_secret or "",
@@ -408,7 +414,7 @@ def _fetch_gmail_backfill_results(
         page_cursor=page_cursor,
         max_pages=PROVIDER_BACKFILL_PAGE_BATCH_LIMIT,
     )
-    _sync_gmail_backfill_state(source, client, already, results)
+    _sync_gmail_backfill_state(db, source, client, results)
     source.last_checked = datetime.utcnow()
     attempt = record_import_attempt(
         db,
@@ -422,14 +428,12 @@ def _fetch_gmail_backfill_results(
 
 
 def _sync_gmail_backfill_state(
+    db: Session,
     source: MailSource,
     client: GmailClient,
-    already_ingested: List[str],
     results: Dict[str, Any],
 ) -> None:
-    if results.get("new_ingested_ids"):
-        all_ids = list(dict.fromkeys(already_ingested + results["new_ingested_ids"]))
-        source.gmail_ingested_ids = GmailClient.dump_ingested_ids(all_ids)
+    record_ingested_message_ids(db, source, CONNECTOR_GMAIL, results.get("new_ingested_ids") or [])
 
     refreshed = client.get_refreshed_tokens()
     if refreshed:
@@ -452,7 +456,7 @@ def _fetch_m365_backfill_results(
             or "Microsoft 365 account not yet authorised. Complete OAuth2 flow first."
         )
 
-    already = MicrosoftGraphClient.load_ingested_ids(source.m365_ingested_ids)
+    already = load_ingested_message_ids(db, source, CONNECTOR_M365)
     client = MicrosoftGraphClient(
         tenant_id=source.m365_tenant_id or "common",
         client_id=source.m365_client_id or "",
@@ -472,7 +476,7 @@ def _fetch_m365_backfill_results(
         page_cursor=page_cursor,
         max_pages=PROVIDER_BACKFILL_PAGE_BATCH_LIMIT,
     )
-    _sync_m365_backfill_state(source, client, already, results)
+    _sync_m365_backfill_state(db, source, client, results)
     source.last_checked = datetime.utcnow()
     attempt = record_import_attempt(
         db,
@@ -486,14 +490,12 @@ def _fetch_m365_backfill_results(
 
 
 def _sync_m365_backfill_state(
+    db: Session,
     source: MailSource,
     client: MicrosoftGraphClient,
-    already_ingested: List[str],
     results: Dict[str, Any],
 ) -> None:
-    if results.get("new_ingested_ids"):
-        all_ids = list(dict.fromkeys(already_ingested + results["new_ingested_ids"]))
-        source.m365_ingested_ids = MicrosoftGraphClient.dump_ingested_ids(all_ids)
+    record_ingested_message_ids(db, source, CONNECTOR_M365, results.get("new_ingested_ids") or [])
 
     refreshed = client.get_refreshed_tokens()
     if refreshed:
@@ -13,6 +13,11 @@ import httpx
 from app.services.delivery_events import ingest_dsn_email
 from app.services.dmarc_parser import DMARCParser
 from app.services.dsn_parser import MAX_DSN_BYTES, is_dsn_message
+from app.services.ingestion_dedup import (
+    PAYLOAD_KIND_AGGREGATE,
+    message_id_lookup,
+    payload_digest,
+)
 from app.services.mail_connector import (
     ConnectorImportContext,
     MailSourceConnector,
@@ -22,7 +27,9 @@ from app.services.mail_connector import (
     dump_ingested_ids,
     initial_import_stats,
     load_ingested_ids,
+    remember_known_payload,
     sanitize_connector_error,
+    skip_known_payload,
 )
 from app.services.report_persistence import report_exists, save_parsed_report
 from app.services.report_store import ReportStore
@@ -130,7 +137,7 @@ class MicrosoftGraphClient(MailSourceConnector):
         mailbox: Optional[str] = None,
         folder: str = "inbox",
         folder_id: Optional[str] = None,
-        already_ingested_ids: Optional[List[str]] = None,
+        already_ingested_ids: Optional[Iterable[str]] = None,
         db: Any = None,
         workspace_id: Optional[int] = None,
         sleep: Optional[Callable[[float], None]] = None,
@@ -145,7 +152,7 @@ class MicrosoftGraphClient(MailSourceConnector):
         self.mailbox = (mailbox or "").strip()
         self.folder = folder or "inbox"
         self.folder_id = (folder_id or "").strip()
-        self.already_ingested_ids: List[str] = list(already_ingested_ids or [])
+        self.already_ingested_ids = message_id_lookup(already_ingested_ids)
         self.report_store = ReportStore.get_instance()
         self.db = db
         self.workspace_id = workspace_id
@@ -366,7 +373,7 @@ class MicrosoftGraphClient(MailSourceConnector):
             found = self._process_message(message, stats)
             if found >= 0:
                 stats["new_ingested_ids"].append(message_id)
-                self.already_ingested_ids.append(message_id)
+                self.already_ingested_ids.add(message_id)
 
         domains_after = set(self.report_store.get_domains())
         stats["new_domains"] = list(domains_after - domains_before)
@@ -705,7 +712,7 @@ class MicrosoftGraphClient(MailSourceConnector):
         )
         return list(data.get("value", []))
 
-    def _store_report_if_new(self, report: Dict[str, Any]) -> bool:
+    def _store_report_if_new(self, report: Dict[str, Any], digest: Optional[str] = None) -> bool:
         domain = report.get("domain", "unknown")
         report_id = report.get("report_id", "")
         if report_id and (
@@ -716,10 +723,26 @@ class MicrosoftGraphClient(MailSourceConnector):
             )
         ):
             logger.info("Skipping duplicate DMARC report %s for %s", report_id, domain)
+            remember_known_payload(
+                self.db,
+                digest,
+                PAYLOAD_KIND_AGGREGATE,
+                report_id=report_id,
+                domain=domain,
+                workspace_id=self.workspace_id,
+            )
             return False
 
         if self.db is not None:
             save_parsed_report(self.db, report, workspace_id=self.workspace_id)
+            remember_known_payload(
+                self.db,
+                digest,
+                PAYLOAD_KIND_AGGREGATE,
+                report_id=report_id,
+                domain=domain,
+                workspace_id=self.workspace_id,
+            )
         self.report_store.add_report(report)
         return True
 
@@ -769,10 +792,22 @@ class MicrosoftGraphClient(MailSourceConnector):
 
             try:
                 content = base64.b64decode(content_b64)
+                digest = payload_digest(content)
+                if skip_known_payload(
+                    self.db,
+                    digest,
+                    PAYLOAD_KIND_AGGREGATE,
+                    stats,
+                    message_id=message_id,
+                    filename=filename,
+                    workspace_id=self.workspace_id,
+                    context=self.import_context(),
+                ):
+                    continue
                 report = DMARCParser.parse_file(content, filename)
                 domain = str(report.get("domain", "unknown"))
                 report_id = str(report.get("report_id", ""))
-                if self._store_report_if_new(report):
+                if self._store_report_if_new(report, digest=digest):
                     stats["reports_found"] += 1
                     reports_found += 1
                     self._append_detail(
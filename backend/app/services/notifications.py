@@ -5,14 +5,16 @@ from __future__ import annotations
 import logging
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-import apprise
 from sqlalchemy.orm import Session
 
 from app.core.credential_encryption import decrypt_secret
 from app.models.setting import Setting
 
+if TYPE_CHECKING:  # pragma: no cover
+    import apprise
+
 logger = logging.getLogger(__name__)
 
 
@@ -222,6 +224,9 @@ def send_notification(
             message="No notification targets are configured.",
         )
 
+    # Apprise loads its plugin registry on import, so defer it to the first send.
+    import apprise  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
     notifier = apprise.Apprise()
     configured_targets, invalid_targets = _add_apprise_targets(notifier, urls)
 
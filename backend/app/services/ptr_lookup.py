@@ -9,6 +9,7 @@ import time
 from dataclasses import asdict, dataclass
 from typing import Any, Dict, Optional, Tuple
 
+from app.core.metrics import PTR_LOOKUPS, RESOLVER_FALLBACKS
 from app.services.dns_fallbacks import dns_fallback_candidates
 from app.services.dns_resolver import (
     CloudflareDNSProvider,
@@ -378,17 +379,21 @@ async def lookup_ptr_with_fallbacks(  # noqa: C901
     if use_cache:
         cached = _cache_get(ip)
         if cached is not None:
+            PTR_LOOKUPS.labels(outcome="cached").inc()
             return cached
 
     candidates = dns_fallback_candidates(provider)
     last_result = PtrLookupResult(status=_STATUS_UNAVAILABLE, detail="no resolver candidates")
     authoritative_negative: Optional[PtrLookupResult] = None
-    for candidate in candidates:
+    for index, candidate in enumerate(candidates):
         result = await _lookup_candidate(candidate, ip, timeout=timeout)
         last_result = result
         if result.hostname:
             if use_cache:
                 _cache_put(ip, result)
+            if index:
+                RESOLVER_FALLBACKS.labels(lookup="ptr").inc()
+            PTR_LOOKUPS.labels(outcome=result.status).inc()
             return result
         if result.authoritative_negative:
             authoritative_negative = result
@@ -397,6 +402,7 @@ async def lookup_ptr_with_fallbacks(  # noqa: C901
     preferred = authoritative_negative or last_result
     if use_cache and preferred.cacheable:
         _cache_put(ip, preferred)
+    PTR_LOOKUPS.labels(outcome=preferred.status).inc()
     return preferred
 
 
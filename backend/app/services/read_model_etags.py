@@ -0,0 +1,184 @@
+"""Strong ETags and conditional GET support for large JSON read models.
+
+Dashboard read models are expensive to build and rarely change between polls.
+Their ETag is derived from the tables they are built from rather than from the
+rendered body, so an unchanged poll is answered with ``304 Not Modified``
+before any payload work happens. The version combines:
+
+- the DMARC ingest watermark (report count, highest id and latest source
+  projection) for the workspace, or for one domain on domain-scoped endpoints;
+- the domain fingerprint (domain count and latest ``updated_at``);
+- the DNS evidence fingerprint (latest cached DNS check and posture update);
+- the settings fingerprint (setting count and latest ``updated_at``);
+- the running release, and a ``READ_MODEL_ETAG_TTL_SECONDS`` time bucket that
+  bounds staleness for inputs outside those tables and for fields that age
+  with the clock.
+
+Every part is read from the database, so all workers agree on the tag and a
+write to an unrelated table leaves it unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any, Iterable, Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.dns_cache import DNSCache
+from app.models.dns_posture_snapshot import DomainDNSPostureCurrent
+from app.models.domain import Domain
+from app.models.report import DMARCReport
+from app.models.setting import Setting
+from app.services.release_info import build_release_info
+from app.services.workspace_access_cache import identity_key
+
+
+def _domain_filter(column, domain: str):
+    if domain.isdigit():
+        return or_(column == domain, Domain.id == int(domain))
+    return column == domain
+
+
+def _ingest_watermark(db: Session, workspace_id: int, domain: Optional[str]) -> tuple:
+    query = (
+        db.query(
+            func.count(DMARCReport.id),
+            func.max(DMARCReport.id),
+            func.max(DMARCReport.source_projection_at),
+        )
+        .join(Domain, DMARCReport.domain_id == Domain.id)
+        .filter(Domain.workspace_id == workspace_id)
+    )
+    if domain:
+        query = query.filter(_domain_filter(Domain.name, domain))
+    return tuple(query.one())
+
+
+def _domain_fingerprint(db: Session, workspace_id: int, domain: Optional[str]) -> tuple:
+    query = db.query(func.count(Domain.id), func.max(Domain.updated_at)).filter(
+        Domain.workspace_id == workspace_id
+    )
+    if domain:
+        query = query.filter(_domain_filter(Domain.name, domain))
+    return tuple(query.one())
+
+
+def _dns_fingerprint(db: Session, workspace_id: int, domain: Optional[str]) -> tuple:
+    domain_names = db.query(Domain.name).filter(Domain.workspace_id == workspace_id)
+    posture = (
+        db.query(
+            func.count(DomainDNSPostureCurrent.id), func.max(DomainDNSPostureCurrent.updated_at)
+        )
+        .join(Domain, DomainDNSPostureCurrent.domain_id == Domain.id)
+        .filter(Domain.workspace_id == workspace_id)
+    )
+    if domain:
+        domain_names = domain_names.filter(_domain_filter(Domain.name, domain))
+        posture = posture.filter(_domain_filter(Domain.name, domain))
+    dns_cache = db.query(func.count(DNSCache.id), func.max(DNSCache.checked_at)).filter(
+        DNSCache.domain.in_(domain_names.scalar_subquery())
+    )
+    return tuple(dns_cache.one()) + tuple(posture.one())
+
+
+def _settings_fingerprint(db: Session) -> tuple:
+    return tuple(db.query(func.count(Setting.key), func.max(Setting.updated_at)).one())
+
+
+def _etag_ttl() -> int:
+    return max(0, int(get_settings().READ_MODEL_ETAG_TTL_SECONDS or 0))
+
+
+def read_model_etag(
+    db: Session,
+    request: Request,
+    *,
+    workspace_id: int,
+    auth_context: Optional[dict] = None,
+    domain: Optional[str] = None,
+    extra: Iterable[Any] = (),
+) -> Optional[str]:
+    """Return a strong ETag for a read model, or None when ETags are disabled."""
+    ttl = _etag_ttl()
+    if not ttl:
+        return None
+    settings = get_settings()
+    release = build_release_info(settings)
+    parts = (
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+        workspace_id,
+        identity_key(auth_context),
+        release["version"],
+        release["build"]["sha"],
+        bool(settings.DEMO_MODE),
+        int(time.time() // ttl),
+        _ingest_watermark(db, workspace_id, domain),
+        _domain_fingerprint(db, workspace_id, domain),
+        _dns_fingerprint(db, workspace_id, domain),
+        _settings_fingerprint(db),
+        tuple(extra),
+    )
+    return '"' + hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    return tag
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """Apply RFC 9110 weak comparison of If-None-Match against *etag*."""
+    if not etag:
+        return False
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    expected = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == expected for candidate in header.split(","))
+
+
+def not_modified_response(etag: str) -> Response:
+    """Return an empty 304 carrying the current validator."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def conditional_read_model(
+    db: Session,
+    request: Optional[Request],
+    response: Optional[Response],
+    *,
+    workspace_id: int,
+    auth_context: Optional[dict] = None,
+    domain: Optional[str] = None,
+) -> Optional[Response]:
+    """Return a 304 when the client's copy is current; otherwise tag *response*.
+
+    Call this after authorization and before building the payload. Internal
+    callers that reuse an endpoint without a request (public API, MCP tools)
+    pass ``None`` and always get the full payload.
+    """
+    if request is None or response is None:
+        return None
+    etag = read_model_etag(
+        db,
+        request,
+        workspace_id=workspace_id,
+        auth_context=auth_context,
+        domain=domain,
+    )
+    if etag is None:
+        return None
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    response.headers["ETag"] = etag
+    return None
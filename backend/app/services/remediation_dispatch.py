@@ -355,25 +355,36 @@ def summarize_remediation_activity(
         if normalize_domain_name(domain)
     }
 
-    normalized_entity_name = func.lower(func.rtrim(func.trim(WorkspaceAuditLog.entity_name), "."))
-    rows: List[WorkspaceAuditLog] = []
-    per_domain_limit = max(row_limit, 1)
-    for domain in domain_names:
-        rows.extend(
-            db.query(WorkspaceAuditLog)
-            .filter(
-                WorkspaceAuditLog.workspace_id == workspace.id,
-                WorkspaceAuditLog.entity_type == "remediation_notification",
-                normalized_entity_name == domain,
-                WorkspaceAuditLog.action.in_(HISTORY_ACTIONS),
+    # One windowed query keeps the newest row_limit rows of every domain.
+    ranked_rows = (
+        db.query(WorkspaceAuditLog)
+        .with_entities(
+            WorkspaceAuditLog.id.label("audit_id"),
+            func.row_number()
+            .over(
+                partition_by=WorkspaceAuditLog.entity_key,
+                order_by=(WorkspaceAuditLog.created_at.desc(), WorkspaceAuditLog.id.desc()),
             )
-            .order_by(WorkspaceAuditLog.created_at.desc(), WorkspaceAuditLog.id.desc())
-            .limit(per_domain_limit)
-            .all()
+            .label("row_number"),
+        )
+        .filter(
+            WorkspaceAuditLog.workspace_id == workspace.id,
+            WorkspaceAuditLog.entity_type == "remediation_notification",
+            WorkspaceAuditLog.entity_key.in_(domain_names),
+            WorkspaceAuditLog.action.in_(HISTORY_ACTIONS),
         )
+        .subquery()
+    )
+    recent_ids = select(ranked_rows.c.audit_id).where(ranked_rows.c.row_number <= max(row_limit, 1))
+    rows = (
+        db.query(WorkspaceAuditLog)
+        .filter(WorkspaceAuditLog.id.in_(recent_ids))
+        .order_by(WorkspaceAuditLog.created_at.desc(), WorkspaceAuditLog.id.desc())
+        .all()
+    )
 
     for row in rows:
-        domain = normalize_domain_name(str(row.entity_name or ""))
+        domain = row.entity_key
         if domain not in summaries:
             continue
         entry = _history_entry(row)
@@ -489,14 +500,13 @@ def _provider_repair_attempt_histories(
     if not ids:
         return {}
     normalized_domain = normalize_domain_name(domain)
-    normalized_entity_name = func.lower(func.rtrim(func.trim(WorkspaceAuditLog.entity_name), "."))
     rows = (
         db.query(WorkspaceAuditLog)
         .filter(
             WorkspaceAuditLog.workspace_id == workspace.id,
             WorkspaceAuditLog.action == PROVIDER_REPAIR_HISTORY_ACTION,
             WorkspaceAuditLog.entity_type == "domain",
-            normalized_entity_name == normalized_domain,
+            WorkspaceAuditLog.entity_key == normalized_domain,
         )
         .order_by(WorkspaceAuditLog.created_at.desc(), WorkspaceAuditLog.id.desc())
         .limit(max(len(ids) * limit_per_plan * 3, limit_per_plan))
@@ -572,9 +582,6 @@ def _verified_fixed_items_result(
     if not normalized_domain:
         return {"items": [], "total": 0}
     active_ids = {str(item_id or "") for item_id in current_item_ids if str(item_id or "")}
-    normalized_entity_name = func.lower(
-        func.rtrim(func.ltrim(func.trim(WorkspaceAuditLog.entity_name), "."), ".")
-    )
     resolved_details = or_(
         WorkspaceAuditLog.details.like('%"lifecycle_state": "resolved"%'),
         WorkspaceAuditLog.details.like('%"lifecycle_state":"resolved"%'),
@@ -595,7 +602,7 @@ def _verified_fixed_items_result(
             WorkspaceAuditLog.action == "remediation.notification_lifecycle_recorded",
             WorkspaceAuditLog.entity_type == "remediation_notification",
             WorkspaceAuditLog.entity_id.isnot(None),
-            normalized_entity_name == normalized_domain,
+            WorkspaceAuditLog.entity_key == normalized_domain,
         )
         .subquery()
     )
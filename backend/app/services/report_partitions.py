@@ -0,0 +1,486 @@
+"""Monthly PostgreSQL range partitions for report and delivery evidence tables.
+
+``dmarc_reports`` (by ``begin_date``), ``report_records`` (by the copied
+``report_begin_date``), ``domain_source_daily_projections`` (by
+``observed_at``) and ``delivery_events`` (by ``occurred_at``) can be converted
+once into range-partitioned tables with one partition per UTC month plus a
+``_default`` partition for out-of-range rows. Queries that already bound
+these columns are pruned to the matching months.
+
+Retention then works on whole months: a month is detached and dropped only
+after the longest ``report_retention_days`` of any workspace with data in it
+has passed (delivery events use their stored ``retention_until``). Dropping a
+partition is a catalog change, so retention no longer deletes millions of
+rows and leaves them for vacuum. SQLite installs keep plain tables and every
+function here is a no-op for them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import UniqueConstraint, text
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import AddConstraint
+
+from app.core.concurrency import run_blocking
+from app.core.config import get_settings
+from app.core.database import Base, SessionLocal
+from app.core.metrics import observe_scheduler_cycle
+from app.models.delivery_event import DeliveryEvent
+from app.models.report import DMARCReport, DomainSourceDailyProjection, ReportRecord
+
+logger = logging.getLogger(__name__)
+
+_REPORT_PARTITION_MAINTENANCE_LOCK_KEY = 1_144_591_958
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+# Matches the Workspace.report_retention_days column default.
+DEFAULT_REPORT_RETENTION_DAYS = 400
+# Older rows are kept in the default partition instead of one partition each.
+MAX_BACKFILL_MONTHS = 120
+
+
+@dataclass(frozen=True)
+class PartitionedTable:
+    """A table partitioned by month on ``key``, an epoch integer or a timestamp."""
+
+    name: str
+    key: str
+    epoch: bool
+
+
+REPORTS = PartitionedTable(DMARCReport.__tablename__, "begin_date", epoch=True)
+RECORDS = PartitionedTable(ReportRecord.__tablename__, "report_begin_date", epoch=True)
+PROJECTIONS = PartitionedTable(DomainSourceDailyProjection.__tablename__, "observed_at", epoch=True)
+DELIVERY_EVENTS = PartitionedTable(DeliveryEvent.__tablename__, "occurred_at", epoch=False)
+PARTITIONED_TABLES = (REPORTS, RECORDS, PROJECTIONS, DELIVERY_EVENTS)
+# Records reference their report by ``(id, begin_date)`` once reports are partitioned.
+RECORD_REPORT_FOREIGN_KEY = "fk_report_records_report_month"
+
+
+def _is_postgresql(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _try_acquire_maintenance_lock(db: Session) -> bool:
+    if not _is_postgresql(db):
+        return True
+    return bool(
+        db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:lock_key)"),
+            {"lock_key": _REPORT_PARTITION_MAINTENANCE_LOCK_KEY},
+        ).scalar()
+    )
+
+
+def month_start(value: datetime) -> datetime:
+    """Return the first instant of the UTC month containing *value* (naive UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    """Return the month *count* months after (or before) a ``month_start`` value."""
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: PartitionedTable, month: datetime) -> str:
+    return f"{table.name}_p{month:%Y%m}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """Return the month of a ``<table>_pYYYYMM`` partition, or None for other names."""
+    match = _PARTITION_SUFFIX.search(name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+def _bound(table: PartitionedTable, month: datetime) -> str:
+    if table.epoch:
+        return str(int(month.replace(tzinfo=timezone.utc).timestamp()))
+    return f"'{month:%Y-%m-%d %H:%M:%S}'"
+
+
+def _month_of(table: PartitionedTable, value) -> datetime:
+    if table.epoch:
+        return month_start(datetime.fromtimestamp(int(value), tz=timezone.utc))
+    return month_start(value)
+
+
+def is_partitioned(db: Session, table: PartitionedTable) -> bool:
+    """Return whether *table* is a partitioned table in this database."""
+    if not _is_postgresql(db):
+        return False
+    kind = db.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": table.name},
+    ).scalar()
+    return kind == "p"
+
+
+def list_partitions(db: Session, table: PartitionedTable) -> Dict[datetime, str]:
+    """Return the attached monthly partitions of *table* keyed by month."""
+    rows = db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:name)"
+        ),
+        {"name": table.name},
+    ).scalars()
+    partitions = {}
+    for name in rows:
+        month = partition_month(name)
+        if month is not None:
+            partitions[month] = name
+    return partitions
+
+
+def create_partition(db: Session, table: PartitionedTable, month: datetime) -> bool:
+    """Create the partition for *month*; return False if the default partition blocks it.
+
+    PostgreSQL refuses a new partition while rows for its range sit in the
+    default partition. Those months are left to the default partition.
+    """
+    name = partition_name(table, month)
+    try:
+        with db.begin_nested():
+            db.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table.name} "
+                    f"FOR VALUES FROM ({_bound(table, month)}) "
+                    f"TO ({_bound(table, add_months(month, 1))})"
+                )
+            )
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.warning("Could not create partition %s: %s", name, type(exc).__name__)
+        return False
+    return True
+
+
+def ensure_future_partitions(
+    db: Session, *, now: Optional[datetime] = None, months: Optional[int] = None
+) -> List[str]:
+    """Create missing partitions from the current month through *months* ahead."""
+    if months is None:
+        months = get_settings().REPORT_PARTITION_PREMAKE_MONTHS
+    current = month_start(now or datetime.utcnow())
+    created = []
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(db, table):
+            continue
+        existing = list_partitions(db, table)
+        for offset in range(max(0, int(months)) + 1):
+            month = add_months(current, offset)
+            if month not in existing and create_partition(db, table, month):
+                created.append(partition_name(table, month))
+    return created
+
+
+def _report_retention_days(db: Session, partition: str) -> int:
+    """Return the longest report retention of any workspace with rows in *partition*."""
+    days = db.execute(
+        text(
+            "SELECT max(COALESCE(workspaces.report_retention_days, :default_days)) "
+            f"FROM {partition} AS partition_rows "
+            "JOIN domains ON domains.id = partition_rows.domain_id "
+            "LEFT JOIN workspaces ON workspaces.id = domains.workspace_id"
+        ),
+        {"default_days": DEFAULT_REPORT_RETENTION_DAYS},
+    ).scalar()
+    if days is None:
+        # Empty month: keep it as long as the longest configured retention.
+        days = db.execute(text("SELECT max(report_retention_days) FROM workspaces")).scalar()
+    return int(days or DEFAULT_REPORT_RETENTION_DAYS)
+
+
+def _report_month_expired(db: Session, partition: str, month: datetime, now: datetime) -> bool:
+    month_end = add_months(month, 1)
+    return month_end + timedelta(days=_report_retention_days(db, partition)) <= now
+
+
+def _delivery_month_expired(db: Session, partition: str, month: datetime, now: datetime) -> bool:
+    if add_months(month, 1) > now:
+        return False
+    retained_until = db.execute(text(f"SELECT max(retention_until) FROM {partition}")).scalar()
+    return retained_until is None or retained_until <= now
+
+
+def _remove_partition(db: Session, table: PartitionedTable, partition: str, detach_only: bool):
+    db.execute(text(f"ALTER TABLE {table.name} DETACH PARTITION {partition}"))
+    if not detach_only:
+        db.execute(text(f"DROP TABLE {partition}"))
+
+
+def _expired_months(
+    db: Session, table: PartitionedTable, now: datetime
+) -> List[Tuple[datetime, str]]:
+    expired = []
+    for month, partition in sorted(list_partitions(db, table).items()):
+        if table is DELIVERY_EVENTS:
+            is_expired = _delivery_month_expired(db, partition, month, now)
+        else:
+            is_expired = _report_month_expired(db, partition, month, now)
+        if is_expired:
+            expired.append((month, partition))
+    return expired
+
+
+def drop_expired_partitions(
+    db: Session, *, now: Optional[datetime] = None, detach_only: Optional[bool] = None
+) -> List[str]:
+    """Detach (and unless *detach_only*, drop) months every workspace has expired.
+
+    Record months follow their report month, since records are only reachable
+    through their report. Detached tables keep their data for archiving.
+    """
+    if detach_only is None:
+        detach_only = get_settings().REPORT_PARTITION_DETACH_ONLY
+    now = now or datetime.utcnow()
+    if now.tzinfo is not None:
+        now = now.astimezone(timezone.utc).replace(tzinfo=None)
+    removed = []
+    if is_partitioned(db, REPORTS):
+        record_partitions = list_partitions(db, RECORDS) if is_partitioned(db, RECORDS) else {}
+        for month, partition in _expired_months(db, REPORTS, now):
+            if month in record_partitions:
+                _remove_partition(db, RECORDS, record_partitions[month], detach_only)
+                removed.append(record_partitions[month])
+            _remove_partition(db, REPORTS, partition, detach_only)
+            removed.append(partition)
+    for table in (PROJECTIONS, DELIVERY_EVENTS):
+        if not is_partitioned(db, table):
+            continue
+        for _month, partition in _expired_months(db, table, now):
+            _remove_partition(db, table, partition, detach_only)
+            removed.append(partition)
+    return removed
+
+
+def run_partition_maintenance(now: Optional[datetime] = None) -> Dict[str, List[str]]:
+    """Pre-create future partitions and remove expired ones in one locked transaction."""
+    result: Dict[str, List[str]] = {"created": [], "removed": []}
+    db = SessionLocal()
+    try:
+        if not _is_postgresql(db) or not _try_acquire_maintenance_lock(db):
+            return result
+        now = now or datetime.utcnow()
+        result["created"] = ensure_future_partitions(db, now=now)
+        result["removed"] = drop_expired_partitions(db, now=now)
+        db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def scheduled_report_partition_maintenance() -> None:
+    """Keep monthly partitions ahead of ingestion and apply retention by month."""
+    settings = get_settings()
+    await asyncio.sleep(
+        max(5, int(settings.REPORT_PARTITION_MAINTENANCE_STARTUP_DELAY_SECONDS or 60))
+    )
+    while True:
+        try:
+            with observe_scheduler_cycle("report_partition_maintenance"):
+                result = await run_blocking(run_partition_maintenance)
+            if result["created"] or result["removed"]:
+                logger.info(
+                    "Report partition maintenance created %d and removed %d partition(s)",
+                    len(result["created"]),
+                    len(result["removed"]),
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("Report partition maintenance failed with %s", type(exc).__name__)
+        await asyncio.sleep(
+            max(300, int(settings.REPORT_PARTITION_MAINTENANCE_INTERVAL_SECONDS or 3600))
+        )
+
+
+# ── One-time conversion ───────────────────────────────────────────────────────
+
+
+def _columns(names: Iterable[str], key: str) -> str:
+    names = list(names)
+    if key not in names:
+        names.append(key)
+    return ", ".join(names)
+
+
+def _data_months(db: Session, table: PartitionedTable, source: str, now: datetime):
+    low, high = db.execute(text(f"SELECT min({table.key}), max({table.key}) FROM {source}")).one()
+    current = month_start(now)
+    first = current if low is None else _month_of(table, low)
+    first = max(first, add_months(current, -MAX_BACKFILL_MONTHS))
+    last = add_months(current, max(0, int(get_settings().REPORT_PARTITION_PREMAKE_MONTHS)))
+    if high is not None:
+        last = max(last, min(_month_of(table, high), add_months(current, 12)))
+    month = first
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
+
+
+def _referencing_foreign_keys(db: Session, table: PartitionedTable) -> List[Tuple[str, str]]:
+    """Return ``(table, constraint)`` for foreign keys in other tables that point at *table*."""
+    return [
+        (referrer, name)
+        for referrer, name in db.execute(
+            text(
+                "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+                "WHERE contype = 'f' AND confrelid = to_regclass(:name) "
+                "AND conrelid <> confrelid"
+            ),
+            {"name": table.name},
+        ).all()
+    ]
+
+
+def _backfill_record_begin_dates(db: Session) -> None:
+    # Rows written before the copied key existed; the partition key and the
+    # report foreign key both need it.
+    db.execute(
+        text(
+            "UPDATE report_records SET report_begin_date = dmarc_reports.begin_date "
+            "FROM dmarc_reports WHERE dmarc_reports.id = report_records.report_id "
+            "AND report_records.report_begin_date IS NULL"
+        )
+    )
+
+
+def _link_records_to_reports(db: Session) -> None:
+    """Point records at their partitioned report through ``(id, begin_date)``."""
+    _backfill_record_begin_dates(db)
+    db.execute(
+        text(
+            f"ALTER TABLE {RECORDS.name} ADD CONSTRAINT {RECORD_REPORT_FOREIGN_KEY} "
+            f"FOREIGN KEY (report_id, {RECORDS.key}) "
+            f"REFERENCES {REPORTS.name} (id, {REPORTS.key})"
+        )
+    )
+
+
+def _recreate_schema(db: Session, table: PartitionedTable) -> None:
+    """Add keys, constraints and indexes from the model metadata to the new parent."""
+    metadata_table = Base.metadata.tables[table.name]
+    db.execute(text(f"ALTER TABLE {table.name} ADD PRIMARY KEY ({_columns(['id'], table.key)})"))
+    for constraint in metadata_table.constraints:
+        if isinstance(constraint, UniqueConstraint) and constraint.name:
+            # Unique keys on a partitioned table must include the partition key.
+            columns = _columns((column.name for column in constraint.columns), table.key)
+            db.execute(
+                text(
+                    f"ALTER TABLE {table.name} ADD CONSTRAINT {constraint.name} UNIQUE ({columns})"
+                )
+            )
+    partitioned = {item.name: item for item in PARTITIONED_TABLES}
+    for foreign_key in metadata_table.foreign_key_constraints:
+        referred = partitioned.get(foreign_key.referred_table.name)
+        # A partitioned table cannot be referenced by ``id`` alone; the record
+        # link to a partitioned report table is added by _link_records_to_reports.
+        if referred is None or not is_partitioned(db, referred):
+            db.execute(AddConstraint(foreign_key))
+    for index in metadata_table.indexes:
+        index.create(bind=db.connection())
+
+
+def convert_table(db: Session, table: PartitionedTable, *, now: Optional[datetime] = None) -> bool:
+    """Rebuild *table* as a monthly range-partitioned table, copying every row.
+
+    Runs in the caller's transaction and holds an exclusive lock on the table
+    until it commits. Returns False when the table is already partitioned.
+    Foreign keys from other tables are dropped by name and restored; only the
+    record-to-report key can be restored, so any other reference aborts the
+    conversion.
+    """
+    if not _is_postgresql(db):
+        raise RuntimeError("Report partitioning requires PostgreSQL")
+    if is_partitioned(db, table):
+        return False
+    referencing = _referencing_foreign_keys(db, table)
+    for referrer, name in referencing:
+        if (referrer, table) != (RECORDS.name, REPORTS):
+            raise RuntimeError(
+                f"{referrer}.{name} references {table.name}; "
+                "drop that foreign key before partitioning"
+            )
+    legacy = f"{table.name}_unpartitioned"
+    sequence = db.execute(
+        text("SELECT pg_get_serial_sequence(:name, 'id')"), {"name": table.name}
+    ).scalar()
+    if table is RECORDS:
+        _backfill_record_begin_dates(db)
+    for referrer, name in referencing:
+        db.execute(text(f"ALTER TABLE {referrer} DROP CONSTRAINT {name}"))
+    db.execute(text(f"ALTER TABLE {table.name} RENAME TO {legacy}"))
+    db.execute(
+        text(
+            f"CREATE TABLE {table.name} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE ({table.key})"
+        )
+    )
+    if sequence:
+        # Keep the id sequence alive when the legacy table is dropped.
+        db.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {table.name}.id"))
+    for month in _data_months(db, table, legacy, now or datetime.utcnow()):
+        create_partition(db, table, month)
+    db.execute(text(f"CREATE TABLE {table.name}_default PARTITION OF {table.name} DEFAULT"))
+    db.execute(text(f"INSERT INTO {table.name} SELECT * FROM {legacy}"))
+    db.execute(text(f"DROP TABLE {legacy}"))
+    _recreate_schema(db, table)
+    if table in (REPORTS, RECORDS) and is_partitioned(db, REPORTS):
+        _link_records_to_reports(db)
+    return True
+
+
+def convert_all(db: Session, *, now: Optional[datetime] = None) -> List[str]:
+    """Convert every partitionable table, committing after each one."""
+    converted = []
+    for table in PARTITIONED_TABLES:
+        if convert_table(db, table, now=now):
+            converted.append(table.name)
+        db.commit()
+    return converted
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Manage monthly report table partitions.")
+    parser.add_argument(
+        "command",
+        choices=("convert", "maintain"),
+        help="convert: partition the tables once (maintenance window); "
+        "maintain: run one maintenance cycle now",
+    )
+    args = parser.parse_args()
+    if args.command == "maintain":
+        result = run_partition_maintenance()
+        print(f"Created: {', '.join(result['created']) or 'none'}")
+        print(f"Removed: {', '.join(result['removed']) or 'none'}")
+        return 0
+    db = SessionLocal()
+    try:
+        if not _is_postgresql(db):
+            print("Report partitioning requires PostgreSQL; nothing to do.")
+            return 1
+        converted = convert_all(db)
+    finally:
+        db.close()
+    print(f"Partitioned: {', '.join(converted) or 'nothing (already partitioned)'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,3 +1,4 @@
+import ipaddress
 import json
 import time
 from datetime import datetime
@@ -7,14 +8,30 @@ from sqlalchemy import case, distinct, func, or_
 from sqlalchemy.orm import Session, selectinload
 
 from app.core.config import get_settings, uses_legacy_demo_fixtures
+from app.core.metrics import (
+    REPORT_INGEST_DURATION,
+    REPORT_RECORDS_INGESTED,
+    REPORTS_INGESTED,
+    observe_duration,
+)
 from app.models.domain import Domain
-from app.models.report import DMARCReport, DomainSourceDailyProjection, ReportRecord
-from app.services.source_read_projection import materialize_source_projection
+from app.models.report import (
+    DMARCReport,
+    DomainDKIMSelectorObservation,
+    DomainSourceDailyProjection,
+    DomainSourceFirstSeen,
+    ReportRecord,
+)
+from app.models.types import decode_json_document
+from app.services.source_read_projection import (
+    load_selector_observations,
+    materialize_source_projection,
+)
 from app.models.workspace import Workspace
-from app.services.dns_posture_snapshots import request_dns_posture_refresh
+from app.services.dns_posture_snapshots import posture_selectors, request_dns_posture_refresh
 from app.services.demo_data import seed_demo_report_store
 from app.services.organizations import require_organization_plan_limit
-from app.services.report_store import ReportStore
+from app.services.report_store import ReportStore, StoredRecord
 from app.services.workspaces import assign_default_workspace_to_unscoped_rows
 
 
@@ -40,23 +57,17 @@ def _iso_from_timestamp(value: int) -> str:
     return datetime.fromtimestamp(value).isoformat()
 
 
-def _loads_json_list(value: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+def _loads_json_list(value: Any) -> Optional[List[Dict[str, Any]]]:
     if not value:
         return None
-    try:
-        decoded = json.loads(value)
-    except (json.JSONDecodeError, TypeError):
-        return None
+    decoded = decode_json_document(value)
     return decoded if isinstance(decoded, list) else None
 
 
-def _loads_json_dict(value: Optional[str]) -> Optional[Dict[str, Any]]:
+def _loads_json_dict(value: Any) -> Optional[Dict[str, Any]]:
     if not value:
         return None
-    try:
-        decoded = json.loads(value)
-    except (json.JSONDecodeError, TypeError):
-        return None
+    decoded = decode_json_document(value)
     return decoded if isinstance(decoded, dict) else None
 
 
@@ -152,6 +163,20 @@ def save_parsed_report(
     Returns ``(row, created)``. The caller owns the transaction and should
     commit after all related work has completed.
     """
+    with observe_duration(REPORT_INGEST_DURATION):
+        row, created = _save_parsed_report(db, report, workspace_id=workspace_id)
+    REPORTS_INGESTED.labels(outcome="created" if created else "duplicate").inc()
+    if created:
+        REPORT_RECORDS_INGESTED.inc(len(report.get("records") or []))
+    return row, created
+
+
+def _save_parsed_report(
+    db: Session,
+    report: Dict[str, Any],
+    *,
+    workspace_id: Optional[int],
+) -> tuple[DMARCReport, bool]:
     domain_name = report.get("domain") or "unknown"
     report_id = report.get("report_id") or ""
     policy = _policy_parts(report)
@@ -216,6 +241,7 @@ def save_parsed_report(
         db.add(
             ReportRecord(
                 report_id=db_report.id,
+                report_begin_date=db_report.begin_date,
                 source_ip=record.get("source_ip") or "unknown",
                 count=_record_message_count(record),
                 disposition=record.get("disposition") or "none",
@@ -243,15 +269,11 @@ def save_parsed_report(
     )
     # Do not resolve DNS while importing a report. Ingest only records the
     # selector inventory and lets the coalesced posture worker collect it.
-    observed_selectors = [item.strip() for item in (domain.dkim_selectors or "").split(",") if item.strip()]
-    for record in report.get("records") or []:
-        for dkim in record.get("dkim") or []:
-            if isinstance(dkim, dict) and str(dkim.get("selector") or "").strip():
-                observed_selectors.append(str(dkim["selector"]).strip())
+    db.flush()
     request_dns_posture_refresh(
         db,
         domain=domain,
-        selectors=observed_selectors,
+        selectors=posture_selectors(db, domain),
         trigger="report_ingest",
     )
 
@@ -260,35 +282,16 @@ def save_parsed_report(
 
 def persisted_report_to_dict(report: DMARCReport) -> Dict[str, Any]:
     """Convert persisted report rows into the parsed-report shape used by the UI."""
-    records: List[Dict[str, Any]] = []
+    records: List[StoredRecord] = []
     total_count = 0
     passed_count = 0
 
     for record in report.records:
-        count = int(record.count or 0)
-        dkim_result = record.dkim or "unknown"
-        spf_result = record.spf or "unknown"
-        total_count += count
-        if dkim_result == "pass" or spf_result == "pass":
-            passed_count += count
-
-        records.append(
-            {
-                "source_ip": record.source_ip,
-                "count": count,
-                "disposition": record.disposition or "none",
-                "dkim_result": dkim_result,
-                "spf_result": spf_result,
-                "header_from": record.header_from or "",
-                "envelope_from": record.envelope_from or "",
-                "envelope_to": record.envelope_to or "",
-                "dkim": _loads_json_list(record.dkim_auth_details) or [],
-                "spf": _loads_json_list(record.spf_auth_details) or [],
-                "policy_override_reasons": (_loads_json_list(record.policy_override_reasons) or []),
-                "extensions": _loads_json_dict(record.record_extensions) or {},
-                "source_evidence": _loads_json_dict(record.source_evidence) or {},
-            }
-        )
+        stored = StoredRecord.from_row(record)
+        total_count += stored.count
+        if stored.dkim_result == "pass" or stored.spf_result == "pass":
+            passed_count += stored.count
+        records.append(stored)
 
     failed_count = total_count - passed_count
     pass_rate = round(passed_count / total_count * 100, 1) if total_count > 0 else 0.0
@@ -329,6 +332,22 @@ def persisted_report_to_dict(report: DMARCReport) -> Dict[str, Any]:
     }
 
 
+def _hydrate_selector_observations(
+    db: Session,
+    store: ReportStore,
+    reports: List[DMARCReport],
+    *,
+    since: Optional[int] = None,
+) -> None:
+    domain_names = {
+        report.domain_id: report.domain.name for report in reports if report.domain is not None
+    }
+    for domain_id, observations in load_selector_observations(
+        db, domain_names, since=since
+    ).items():
+        store.set_domain_selector_observations(domain_names[domain_id], observations)
+
+
 def hydrate_report_store_from_db(
     db: Session,
     store: Optional[ReportStore] = None,
@@ -365,6 +384,7 @@ def hydrate_report_store_from_db(
     reports = query.order_by(DMARCReport.end_date.desc()).all()
     for report in reports:
         store.add_report(persisted_report_to_dict(report))
+    _hydrate_selector_observations(db, store, reports)
     return len(reports)
 
 
@@ -395,6 +415,7 @@ def hydrate_domain_report_store_from_db(
     )
     if workspace_id is not None:
         query = query.filter(Domain.workspace_id == workspace_id)
+    cutoff: Optional[int] = None
     if days is not None:
         # DMARCReport.end_date is persisted as a Unix timestamp.  Comparing it
         # to a datetime happens to be permissive in SQLite but fails in
@@ -405,6 +426,7 @@ def hydrate_domain_report_store_from_db(
     reports = query.order_by(DMARCReport.end_date.desc()).all()
     for report in reports:
         store.add_report(persisted_report_to_dict(report))
+    _hydrate_selector_observations(db, store, reports, since=cutoff)
     return len(reports)
 
 
@@ -556,6 +578,86 @@ def domain_reports_and_timeline_from_db(
     return [persisted_report_to_dict(report) for report in reports], timeline
 
 
+def network_sources_from_db(
+    db: Session,
+    network: str,
+    *,
+    start_ts: int,
+    end_ts: int,
+    workspace_id: Optional[int] = None,
+    failing_only: bool = True,
+    limit: int = 100,
+) -> List[Dict[str, Any]]:
+    """Return per-address message totals for report sources inside *network*.
+
+    On PostgreSQL the CIDR match is an ``INET`` containment test served by the
+    GiST indexes on ``source_inet`` (the partial one when ``failing_only``);
+    other databases group by address in SQL and match the network in Python.
+    Raises ``ValueError`` when *network* is not an IP address or CIDR block.
+    """
+    parsed = ipaddress.ip_network(network.strip(), strict=False)
+    passed_count = func.coalesce(
+        func.sum(
+            case(
+                (
+                    or_(ReportRecord.dkim == "pass", ReportRecord.spf == "pass"),
+                    ReportRecord.count,
+                ),
+                else_=0,
+            )
+        ),
+        0,
+    )
+    message_count = func.coalesce(func.sum(ReportRecord.count), 0)
+    query = (
+        db.query(
+            ReportRecord.source_inet.label("source_ip"),
+            message_count.label("message_count"),
+            passed_count.label("passed_count"),
+            func.count(distinct(DMARCReport.id)).label("report_count"),
+            func.min(DMARCReport.begin_date).label("first_seen"),
+            func.max(DMARCReport.end_date).label("last_seen"),
+        )
+        .join(DMARCReport, DMARCReport.id == ReportRecord.report_id)
+        .filter(
+            ReportRecord.source_inet.isnot(None),
+            DMARCReport.end_date >= start_ts,
+            DMARCReport.begin_date <= end_ts,
+            ReportRecord.report_begin_date <= end_ts,
+        )
+        .group_by(ReportRecord.source_inet)
+        .order_by(message_count.desc(), ReportRecord.source_inet.asc())
+    )
+    if workspace_id is not None:
+        query = query.join(Domain, Domain.id == DMARCReport.domain_id).filter(
+            Domain.workspace_id == workspace_id
+        )
+    if failing_only:
+        query = query.filter(
+            ReportRecord.dkim.is_distinct_from("pass"), ReportRecord.spf.is_distinct_from("pass")
+        )
+    if db.get_bind().dialect.name == "postgresql":
+        rows = query.filter(ReportRecord.source_inet.op("<<=")(str(parsed))).limit(limit).all()
+    else:
+        rows = [row for row in query.all() if ipaddress.ip_address(row.source_ip) in parsed]
+    sources = []
+    for row in rows[: max(0, limit)]:
+        total = int(row.message_count or 0)
+        passed = int(row.passed_count or 0)
+        sources.append(
+            {
+                "source_ip": str(row.source_ip),
+                "message_count": total,
+                "passed_count": passed,
+                "failed_count": max(0, total - passed),
+                "report_count": int(row.report_count or 0),
+                "first_seen": _iso_from_timestamp(int(row.first_seen or 0)),
+                "last_seen": _iso_from_timestamp(int(row.last_seen or 0)),
+            }
+        )
+    return sources
+
+
 def delete_persisted_report(
     db: Session,
     domain_name: str,
@@ -574,11 +676,17 @@ def delete_persisted_report(
     report = query.first()
     if report is None:
         return False
-    # Projections combine same-day source rows across reports. Rebuild this
-    # domain lazily in the background so deletion never leaves stale counters.
+    # Projections, first-seen and selector rows combine rows across reports. Rebuild
+    # this domain lazily in the background so deletion never leaves stale counters.
     db.query(DomainSourceDailyProjection).filter(
         DomainSourceDailyProjection.domain_id == report.domain_id
     ).delete(synchronize_session=False)
+    db.query(DomainSourceFirstSeen).filter(
+        DomainSourceFirstSeen.domain_id == report.domain_id
+    ).delete(synchronize_session=False)
+    db.query(DomainDKIMSelectorObservation).filter(
+        DomainDKIMSelectorObservation.domain_id == report.domain_id
+    ).delete(synchronize_session=False)
     db.query(DMARCReport).filter(DMARCReport.domain_id == report.domain_id).update(
         {DMARCReport.source_projection_at: None},
         synchronize_session=False,
@@ -595,5 +703,11 @@ def delete_persisted_domain(db: Session, domain_name: str) -> bool:
     db.query(DomainSourceDailyProjection).filter(
         DomainSourceDailyProjection.domain_id == domain.id
     ).delete(synchronize_session=False)
+    db.query(DomainSourceFirstSeen).filter(DomainSourceFirstSeen.domain_id == domain.id).delete(
+        synchronize_session=False
+    )
+    db.query(DomainDKIMSelectorObservation).filter(
+        DomainDKIMSelectorObservation.domain_id == domain.id
+    ).delete(synchronize_session=False)
     db.delete(domain)
     return True
@@ -1,12 +1,133 @@
+import sys
 import threading
+from collections.abc import Iterator, Mapping
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from app.models.types import decode_json_document
+
 ACTIVE_SELECTOR_WINDOW_DAYS = 7
 RECENT_SELECTOR_WINDOW_DAYS = 30
 SECONDS_PER_DAY = 86_400
 
 
+def _interned(value: Any) -> str:
+    return sys.intern(str(value)) if value else ""
+
+
+def _decoded(value: Any, kind: type) -> Any:
+    decoded = decode_json_document(value) if value else None
+    return decoded if isinstance(decoded, kind) else kind()
+
+
+class StoredRecord(Mapping):
+    """Compact, read-only aggregate record kept by ``ReportStore``.
+
+    Hydrated workspaces hold every record in memory, so records use
+    ``__slots__`` and intern repeated strings such as results, dispositions and
+    header domains. JSON detail columns arrive as text on SQLite and already
+    decoded on PostgreSQL; text is decoded once, on first read, and the result
+    replaces it. The record reads like the parsed-record dict
+    (``record.get("dkim")``); ``to_dict`` builds a plain dict for the API and
+    export boundary.
+    """
+
+    KEYS = (
+        "source_ip",
+        "count",
+        "disposition",
+        "dkim_result",
+        "spf_result",
+        "header_from",
+        "envelope_from",
+        "envelope_to",
+        "dkim",
+        "spf",
+        "policy_override_reasons",
+        "extensions",
+        "source_evidence",
+    )
+    # JSON document keys, their slot and the type a valid document decodes to.
+    _DOCUMENTS = {
+        "dkim": ("_dkim", list),
+        "spf": ("_spf", list),
+        "policy_override_reasons": ("_policy_override_reasons", list),
+        "extensions": ("_extensions", dict),
+        "source_evidence": ("_source_evidence", dict),
+    }
+
+    __slots__ = (
+        "source_ip",
+        "count",
+        "disposition",
+        "dkim_result",
+        "spf_result",
+        "header_from",
+        "envelope_from",
+        "envelope_to",
+        "_dkim",
+        "_spf",
+        "_policy_override_reasons",
+        "_extensions",
+        "_source_evidence",
+    )
+
+    def __init__(self, **fields: Any) -> None:
+        for key in self.KEYS:
+            slot = self._DOCUMENTS[key][0] if key in self._DOCUMENTS else key
+            setattr(self, slot, fields.get(key))
+
+    @classmethod
+    def from_row(cls, record: Any) -> "StoredRecord":
+        """Build a stored record from a persisted ``ReportRecord`` row."""
+        return cls(
+            source_ip=_interned(record.source_ip) or record.source_ip,
+            count=int(record.count or 0),
+            disposition=_interned(record.disposition or "none"),
+            dkim_result=_interned(record.dkim or "unknown"),
+            spf_result=_interned(record.spf or "unknown"),
+            header_from=_interned(record.header_from),
+            envelope_from=_interned(record.envelope_from),
+            envelope_to=_interned(record.envelope_to),
+            dkim=record.dkim_auth_details,
+            spf=record.spf_auth_details,
+            policy_override_reasons=record.policy_override_reasons,
+            extensions=record.record_extensions,
+            source_evidence=record.source_evidence,
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        document = self._DOCUMENTS.get(key)
+        if document is not None:
+            slot, kind = document
+            value = getattr(self, slot)
+            if not isinstance(value, kind):
+                value = _decoded(value, kind)
+                setattr(self, slot, value)
+            return value
+        if key in self.KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        return f"StoredRecord(source_ip={self.source_ip!r}, count={self.count!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the parsed-record dict shape used at the API boundary."""
+        return {key: self[key] for key in self.KEYS}
+
+
+def record_to_dict(record: Mapping) -> Dict[str, Any]:
+    """Return a stored or freshly parsed record as a plain, JSON-ready dict."""
+    return record.to_dict() if isinstance(record, StoredRecord) else dict(record)
+
+
 def _auth_status_from_counts(pass_count: int, fail_count: int, unknown_count: int = 0) -> str:
     """Return a compact status label for aggregated authentication results."""
     if pass_count > 0 and fail_count > 0:
@@ -214,12 +335,14 @@ def _new_selector_evidence(selector: str) -> Dict[str, Any]:
         "message_count": 0,
         "current_failure_count": 0,
         "current_pass_count": 0,
+        "report_count": 0,
         "_report_ids": set(),
         "_record_keys": set(),
     }
 
 
-def _selector_results_from_record(record: Dict[str, Any], domain: str) -> Dict[str, set[str]]:
+def dkim_selector_results(record: Mapping[str, Any], domain: str) -> Dict[str, set[str]]:
+    """Return the DKIM results reported for each selector aligned with *domain*."""
     results: Dict[str, set[str]] = {}
     for auth in record.get("dkim") or []:
         if not isinstance(auth, dict) or not _dkim_domain_matches(auth.get("domain"), domain):
@@ -266,6 +389,54 @@ def _update_selector_evidence(
         row["current_pass_count"] += count
 
 
+def _selector_evidence_from_reports(
+    reports: List[Dict[str, Any]], domain: str, *, now: int, active_cutoff: int
+) -> Dict[str, Dict[str, Any]]:
+    evidence: Dict[str, Dict[str, Any]] = {}
+    for report in reports:
+        observed_start, observed_end = _observed_report_window(report, now=now)
+        report_id = str(report.get("report_id") or "").strip()
+        for record_index, record in enumerate(report.get("records") or []):
+            count = max(0, int(record.get("count") or 0))
+            for selector, results in dkim_selector_results(record, domain).items():
+                row = evidence.setdefault(selector, _new_selector_evidence(selector))
+                _update_selector_evidence(
+                    row,
+                    count=count,
+                    report_id=report_id,
+                    record_key=(report_id or id(report), record_index),
+                    observed_start=observed_start,
+                    observed_end=observed_end,
+                    active_cutoff=active_cutoff,
+                    results=results,
+                )
+    return evidence
+
+
+def _selector_evidence_from_observations(
+    observations: List[Dict[str, Any]], *, now: int, active_cutoff: int
+) -> Dict[str, Dict[str, Any]]:
+    """Fold daily selector observations; the active window is day-granular here."""
+    evidence: Dict[str, Dict[str, Any]] = {}
+    for observation in observations:
+        selector = str(observation["selector"])
+        row = evidence.setdefault(selector, _new_selector_evidence(selector))
+        first_seen = min(int(observation["first_seen"]), now)
+        last_seen = min(int(observation["last_seen"]), now)
+        row["first_seen"] = (
+            first_seen if row["first_seen"] is None else min(int(row["first_seen"]), first_seen)
+        )
+        row["last_seen"] = (
+            last_seen if row["last_seen"] is None else max(int(row["last_seen"]), last_seen)
+        )
+        row["message_count"] += int(observation["message_count"] or 0)
+        row["report_count"] += int(observation["report_count"] or 0)
+        if last_seen >= active_cutoff:
+            row["current_failure_count"] += int(observation["fail_count"] or 0)
+            row["current_pass_count"] += int(observation["pass_count"] or 0)
+    return evidence
+
+
 def _update_source_window(
     source: Dict[str, Any],
     report: Dict[str, Any],
@@ -414,6 +585,8 @@ class ReportStore:
         self.domain_summary: Dict[str, Dict[str, Any]] = {}
         # Domain -> sources (sending IPs)
         self.domain_sources: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # Domain -> daily DKIM selector observations persisted at ingest
+        self.domain_selector_observations: Dict[str, List[Dict[str, Any]]] = {}
 
     def has_report(self, domain: str, report_id: str) -> bool:
         """
@@ -484,6 +657,8 @@ class ReportStore:
 
         # Add the new report
         self.domain_reports[domain].append(report)
+        # Persisted selector observations do not include this report yet
+        self.domain_selector_observations.pop(domain, None)
 
         # Recompute all summary stats from the full list to keep them consistent
         self._recompute_domain_stats(domain)
@@ -578,6 +753,16 @@ class ReportStore:
             return sorted_reports[:limit]
         return sorted_reports
 
+    def set_domain_selector_observations(
+        self, domain: str, observations: List[Dict[str, Any]]
+    ) -> None:
+        """Use persisted daily selector observations instead of walking report records.
+
+        Only valid while the store holds every report the observations were built
+        from; adding or deleting a report drops them for the domain again.
+        """
+        self.domain_selector_observations[domain] = observations
+
     def get_domain_selector_evidence(
         self,
         domain: str,
@@ -585,28 +770,25 @@ class ReportStore:
         manual_selectors: Optional[List[str]] = None,
         now: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
-        """Derive selector activity and failure evidence from aggregate reports."""
+        """Derive selector activity and failure evidence from aggregate reports.
+
+        Hydrated stores read the daily selector observations persisted at ingest;
+        otherwise every stored record is walked.
+        """
         current_time = int(now if now is not None else _now_timestamp())
         active_cutoff = current_time - ACTIVE_SELECTOR_WINDOW_DAYS * SECONDS_PER_DAY
-        evidence: Dict[str, Dict[str, Any]] = {}
-
-        for report in self.get_domain_reports(domain):
-            observed_start, observed_end = _observed_report_window(report, now=current_time)
-            report_id = str(report.get("report_id") or "").strip()
-            for record_index, record in enumerate(report.get("records") or []):
-                count = max(0, int(record.get("count") or 0))
-                for selector, results in _selector_results_from_record(record, domain).items():
-                    row = evidence.setdefault(selector, _new_selector_evidence(selector))
-                    _update_selector_evidence(
-                        row,
-                        count=count,
-                        report_id=report_id,
-                        record_key=(report_id or id(report), record_index),
-                        observed_start=observed_start,
-                        observed_end=observed_end,
-                        active_cutoff=active_cutoff,
-                        results=results,
-                    )
+        observations = self.domain_selector_observations.get(domain)
+        if observations is not None:
+            evidence = _selector_evidence_from_observations(
+                observations, now=current_time, active_cutoff=active_cutoff
+            )
+        else:
+            evidence = _selector_evidence_from_reports(
+                self.get_domain_reports(domain),
+                domain,
+                now=current_time,
+                active_cutoff=active_cutoff,
+            )
 
         manual = list(dict.fromkeys(str(value).strip() for value in manual_selectors or []))
         for selector in manual:
@@ -634,7 +816,7 @@ class ReportStore:
                     "first_seen_at": _timestamp_iso(raw["first_seen"]),
                     "last_seen": raw["last_seen"],
                     "last_seen_at": _timestamp_iso(raw["last_seen"]),
-                    "report_count": len(raw["_report_ids"]),
+                    "report_count": int(raw["report_count"] or len(raw["_report_ids"])),
                     "message_count": int(raw["message_count"]),
                     "current_failure_count": int(raw["current_failure_count"]),
                     "current_pass_count": int(raw["current_pass_count"]),
@@ -669,8 +851,7 @@ class ReportStore:
 
         if days is None:
             sources = [
-                _source_public_entry(ip, data)
-                for ip, data in self.domain_sources[domain].items()
+                _source_public_entry(ip, data) for ip, data in self.domain_sources[domain].items()
             ]
             return sorted(sources, key=lambda source: source["count"], reverse=True)
 
@@ -682,10 +863,7 @@ class ReportStore:
             and observed_end >= cutoff
         ]
         aggregated_sources = _aggregate_sources(reports)
-        sources = [
-            _source_public_entry(ip, data)
-            for ip, data in aggregated_sources.items()
-        ]
+        sources = [_source_public_entry(ip, data) for ip, data in aggregated_sources.items()]
 
         # Sort sources by count (highest first)
         return sorted(sources, key=lambda s: s["count"], reverse=True)
@@ -697,6 +875,7 @@ class ReportStore:
         self.domain_reports = {}
         self.domain_summary = {}
         self.domain_sources = {}
+        self.domain_selector_observations = {}
 
     def delete_report(self, domain: str, report_id: str) -> bool:
         """
@@ -720,6 +899,8 @@ class ReportStore:
             # Nothing was removed
             return False
 
+        self.domain_selector_observations.pop(domain, None)
+
         if not self.domain_reports[domain]:
             # Domain has no remaining reports – clean up entirely
             self.domain_reports.pop(domain, None)
@@ -748,6 +929,7 @@ class ReportStore:
             self.domain_reports.pop(domain, None)
             self.domain_summary.pop(domain, None)
             self.domain_sources.pop(domain, None)
+            self.domain_selector_observations.pop(domain, None)
             return True
         except Exception:  # pylint: disable=broad-exception-caught
             # If any exception occurs during deletion, return False
@@ -0,0 +1,285 @@
+"""Parse and persist uploaded DMARC, forensic and TLS report payloads.
+
+The upload endpoints call these after validating the request, and the
+ingestion queue calls them for payloads it accepted earlier, so both paths
+apply the same duplicate checks, workspace rules and error translation.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.domain import Domain
+from app.models.report import TLSReport
+from app.services.dmarc_parser import DMARCParser
+from app.services.forensic_parser import ForensicParser
+from app.services.forensic_persistence import forensic_report_exists, save_forensic_report
+from app.services.forensic_redaction import get_forensic_redaction_policy
+from app.services.ingestion_dedup import (
+    PAYLOAD_KIND_AGGREGATE,
+    PAYLOAD_KIND_FORENSIC,
+    PAYLOAD_KIND_TLS,
+    find_ingested_payload,
+    payload_digest,
+    remember_ingested_payload,
+)
+from app.services.organizations import OrganizationPlanLimitError
+from app.services.report_persistence import report_exists, save_parsed_report
+from app.services.tls_report_parser import TLSReportParser
+from app.services.tls_report_persistence import TLS_REPORT_PRIVACY_CONTROLS, save_tls_report
+from app.utils.domain_validator import DomainValidationError, normalize_domain_name, validate_domain
+
+logger = logging.getLogger(__name__)
+
+
+def _domain_workspace_conflict(domain: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=(
+            f"Domain '{domain}' already belongs to another workspace. "
+            "Move or rename the domain before uploading reports for this workspace."
+        ),
+    )
+
+
+def _raise_if_domain_owned_by_other_workspace(db: Session, domain: str, workspace_id: int) -> None:
+    existing_domain = db.query(Domain).filter(Domain.name == domain).first()
+    if existing_domain is not None and existing_domain.workspace_id != workspace_id:
+        raise _domain_workspace_conflict(domain)
+
+
+def _raise_plan_limit_payment_required(db: Session, exc: OrganizationPlanLimitError) -> None:
+    db.rollback()
+    raise HTTPException(
+        status_code=status.HTTP_402_PAYMENT_REQUIRED,
+        detail=exc.to_detail(),
+    ) from exc
+
+
+def _save_parsed_upload(
+    db: Session,
+    report: Dict[str, Any],
+    domain: str,
+    workspace_id: int,
+    digest: Optional[str],
+) -> None:
+    save_parsed_report(db, report, workspace_id=workspace_id)
+    if digest:
+        remember_ingested_payload(
+            db,
+            digest,
+            PAYLOAD_KIND_AGGREGATE,
+            report_id=report.get("report_id", ""),
+            domain=domain,
+            workspace_id=workspace_id,
+        )
+    db.commit()
+
+
+def _save_uploaded_report(
+    db: Session,
+    report: Dict[str, Any],
+    domain: str,
+    workspace_id: int,
+    *,
+    digest: Optional[str] = None,
+) -> None:
+    try:
+        _save_parsed_upload(db, report, domain, workspace_id, digest)
+    except OrganizationPlanLimitError as exc:
+        _raise_plan_limit_payment_required(db, exc)
+    except IntegrityError as exc:
+        db.rollback()
+        try:
+            _raise_if_domain_owned_by_other_workspace(db, domain, workspace_id)
+        except HTTPException as conflict:
+            raise conflict from exc
+        try:
+            _save_parsed_upload(db, report, domain, workspace_id, digest)
+        except OrganizationPlanLimitError as plan_exc:
+            _raise_plan_limit_payment_required(db, plan_exc)
+
+
+def raise_for_report_parse_error(filename: str, error_message: str) -> None:
+    """Translate a parser ValueError into a sanitized HTTPException.
+
+    Always raises — never returns.
+    """
+    logger.error("ValueError processing report %s: %s", filename, error_message)
+    if "too large" in error_message.lower():
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large"
+        )
+    if "zip bomb" in error_message.lower():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid archive file")
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid report format")
+
+
+def reject_known_aggregate_payload(db: Session, digest: str, workspace_id: int) -> None:
+    """Reject byte-identical uploads before they are decompressed and parsed."""
+    known = find_ingested_payload(db, digest, PAYLOAD_KIND_AGGREGATE, workspace_id=workspace_id)
+    if known is None:
+        return
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=(
+            f"Report '{known.report_id}' for domain '{known.domain}' has already been uploaded. "
+            "Duplicate reports are not stored to keep statistics accurate."
+        ),
+    )
+
+
+def store_aggregate_report(
+    db: Session,
+    report: Dict[str, Any],
+    workspace_id: int,
+    *,
+    digest: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Validate a parsed aggregate report, reject duplicates, and persist it."""
+    # Security: Validate domain from report
+    domain = report.get("domain", "")
+    if not domain:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Report does not contain a valid domain",
+        )
+    domain = normalize_domain_name(domain)
+    report["domain"] = domain
+
+    # Validate domain format (not DNS resolution to avoid external calls)
+    is_valid, error_msg, error_code = validate_domain(domain, check_dns=False)
+    if not is_valid and error_code != DomainValidationError.DNS_RESOLUTION_FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid domain in report: {error_msg}",
+        )
+
+    # Check for duplicate report before storing
+    report_id = report.get("report_id", "")
+    if report_id and report_exists(db, domain, report_id, workspace_id=workspace_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                f"Report '{report_id}' for domain '{domain}' has already been uploaded. "
+                "Duplicate reports are not stored to keep statistics accurate."
+            ),
+        )
+
+    _raise_if_domain_owned_by_other_workspace(db, domain, workspace_id)
+
+    # Store the report
+    _save_uploaded_report(db, report, domain, workspace_id, digest=digest)
+
+    return {
+        "success": True,
+        "domain": domain,
+        "message": f"Report processed successfully for domain {domain}",
+        "processed_records": report.get("summary", {}).get("total_count", 0),
+    }
+
+
+def store_aggregate_upload(
+    db: Session, content: bytes, filename: str, workspace_id: int
+) -> Dict[str, Any]:
+    """Deduplicate, parse, and persist one aggregate report payload."""
+    digest = payload_digest(content)
+    reject_known_aggregate_payload(db, digest, workspace_id)
+    try:
+        report = DMARCParser.parse_file(content, filename)
+    except ValueError as exc:
+        raise_for_report_parse_error(filename, str(exc))
+    return store_aggregate_report(db, report, workspace_id, digest=digest)
+
+
+def store_forensic_upload(db: Session, content: bytes, workspace_id: int) -> Dict[str, Any]:
+    """Parse, deduplicate, and persist one uploaded forensic report."""
+    digest = payload_digest(content)
+    if find_ingested_payload(db, digest, PAYLOAD_KIND_FORENSIC, workspace_id=workspace_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Forensic report has already been uploaded.",
+        )
+    redaction_policy = get_forensic_redaction_policy(db)
+    parsed = ForensicParser.parse_bytes(content, redaction_policy=redaction_policy)
+    if forensic_report_exists(db, parsed["report_id"], workspace_id=workspace_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Forensic report has already been uploaded.",
+        )
+
+    row, created = save_forensic_report(db, parsed, workspace_id=workspace_id)
+    if not created:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Forensic report has already been uploaded.",
+        )
+    remember_ingested_payload(
+        db,
+        digest,
+        PAYLOAD_KIND_FORENSIC,
+        report_id=row.report_id,
+        domain=row.reported_domain,
+        workspace_id=workspace_id,
+    )
+    db.commit()
+    db.refresh(row)
+    return {
+        "success": True,
+        "report_id": row.report_id,
+        "domain": row.reported_domain,
+        "message": "Forensic report processed successfully.",
+    }
+
+
+def store_tls_upload(
+    db: Session, content: bytes, filename: str, workspace_id: int
+) -> Dict[str, Any]:
+    """Parse and persist one uploaded TLS report; re-imports are reported as duplicates."""
+    digest = payload_digest(content)
+    known = find_ingested_payload(db, digest, PAYLOAD_KIND_TLS, workspace_id=workspace_id)
+    if known is not None:
+        stored_policies = (
+            db.query(TLSReport.id)
+            .join(Domain, TLSReport.domain_id == Domain.id)
+            .filter(TLSReport.report_id == known.report_id, Domain.workspace_id == workspace_id)
+            .count()
+        )
+        return {
+            "success": True,
+            "report_id": known.report_id,
+            "policies_created": 0,
+            "policies_skipped": stored_policies,
+            "duplicate": True,
+            "message": "TLS report had already been imported.",
+            "privacy": TLS_REPORT_PRIVACY_CONTROLS,
+        }
+
+    parsed = TLSReportParser.parse_file(content, filename)
+    result = save_tls_report(db, parsed, workspace_id=workspace_id)
+    if result["rows"]:
+        remember_ingested_payload(
+            db,
+            digest,
+            PAYLOAD_KIND_TLS,
+            report_id=parsed["report_id"],
+            domain=result["rows"][0].policy_domain,
+            workspace_id=workspace_id,
+        )
+    db.commit()
+    return {
+        "success": True,
+        "report_id": parsed["report_id"],
+        "policies_created": result["created"],
+        "policies_skipped": result["skipped"],
+        "duplicate": result["created"] == 0 and result["skipped"] > 0,
+        "message": (
+            "TLS report imported." if result["created"] else "TLS report had already been imported."
+        ),
+        "privacy": TLS_REPORT_PRIVACY_CONTROLS,
+    }
@@ -15,13 +15,15 @@ from app.models.workspace import Workspace
 from app.services.organizations import require_organization_plan_limit
 from app.services.workspaces import assign_default_workspace_to_unscoped_rows
 
-try:  # pragma: no cover - exercised through monkeypatched fakes in tests.
-    import boto3
+try:  # pragma: no cover - botocore exceptions are cheap; boto3 itself is not.
     from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
 except ImportError:  # pragma: no cover - depends on optional runtime dependency.
-    boto3 = None  # type: ignore[assignment]
     BotoCoreError = ClientError = NoCredentialsError = Exception  # type: ignore[misc]
 
+# boto3 adds hundreds of milliseconds to startup, so it is imported on first use
+# by ``_boto3_module``. Tests replace this attribute with a fake.
+boto3: Any = None
+
 PROVIDER_NAME = "route53"
 ROUTE53_ROLE_SESSION_NAME = "dmarq-route53-zone-import"
 
@@ -203,9 +205,19 @@ def get_route53_dns_credentials() -> Route53DNSCredentials:
     )
 
 
-def _build_route53_boto_client(credentials: Route53DNSCredentials) -> Any:
+def _boto3_module() -> Any:
+    global boto3  # pylint: disable=global-statement
     if boto3 is None:
-        raise LookupError("boto3 is not installed; Route 53 DNS import is unavailable")
+        try:
+            import boto3 as boto3_module  # pylint: disable=import-outside-toplevel
+        except ImportError as exc:
+            raise LookupError("boto3 is not installed; Route 53 DNS import is unavailable") from exc
+        boto3 = boto3_module
+    return boto3
+
+
+def _build_route53_boto_client(credentials: Route53DNSCredentials) -> Any:
+    boto3_module = _boto3_module()
 
     session_kwargs: Dict[str, str] = {}
     if credentials.profile_name:
@@ -213,7 +225,7 @@ def _build_route53_boto_client(credentials: Route53DNSCredentials) -> Any:
     if credentials.region_name:
         session_kwargs["region_name"] = credentials.region_name
 
-    session = boto3.Session(**session_kwargs)
+    session = boto3_module.Session(**session_kwargs)
     if not credentials.role_arn:
         return session.client("route53")
 
@@ -11,9 +11,12 @@ from typing import List
 
 from sqlalchemy import func, or_, text
 
+from app.core.concurrency import run_blocking
 from app.core.config import get_settings
 from app.core.database import SessionLocal
+from app.core.metrics import observe_scheduler_cycle
 from app.models.report import DMARCReport, ReportRecord
+from app.models.types import decode_json_document
 from app.services.dns_resolver import get_default_provider
 from app.services.ptr_lookup import PtrLookupResult, lookup_ptr_with_fallbacks
 from app.services.source_network import SourceNetworkIntelligence, lookup_sources_network_cached
@@ -41,6 +44,15 @@ def _try_acquire_prewarm_lock(db) -> bool:
     )
 
 
+def _needs_evidence(db):
+    """Match rows without an evidence snapshot or with a pending PTR retry."""
+    if db.get_bind().dialect.name == "postgresql":
+        retry_pending = ReportRecord.source_evidence.op("@>")({"ptr_retry_pending": True})
+    else:
+        retry_pending = ReportRecord.source_evidence.like(_PTR_RETRY_MARKER)
+    return or_(ReportRecord.source_evidence.is_(None), retry_pending)
+
+
 def ptr_from_source_evidence(evidence: object):
     """Restore a structured PTR result from a report-row evidence snapshot."""
     if not isinstance(evidence, dict) or not isinstance(evidence.get("ptr"), dict):
@@ -77,10 +89,7 @@ def _pending_source_ips(limit: int) -> List[str]:
             )
             .join(DMARCReport, DMARCReport.id == ReportRecord.report_id)
             .filter(
-                or_(
-                    ReportRecord.source_evidence.is_(None),
-                    ReportRecord.source_evidence.like(_PTR_RETRY_MARKER),
-                ),
+                _needs_evidence(db),
                 ReportRecord.source_ip.isnot(None),
                 ReportRecord.source_ip != "unknown",
             )
@@ -120,7 +129,7 @@ def _apply_evidence_snapshot(
     captured_at: str,
 ) -> bool:
     """Persist a new snapshot or finish the PTR portion of a partial one."""
-    existing = json.loads(row.source_evidence) if row.source_evidence else None
+    existing = decode_json_document(row.source_evidence) if row.source_evidence else None
     if existing:
         if ptr_result.transient:
             return False
@@ -141,6 +150,44 @@ def _apply_evidence_snapshot(
     return True
 
 
+def _persist_evidence_snapshots(
+    db,
+    source_ips: List[str],
+    ptr_results: dict,
+    networks: dict,
+    reputation: dict,
+    feed_providers,
+) -> int:
+    """Write captured evidence onto pending report rows and their projections."""
+    captured_at = (
+        datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    )
+    rows = (
+        db.query(ReportRecord)
+        .filter(
+            _needs_evidence(db),
+            ReportRecord.source_ip.in_(source_ips),
+        )
+        .all()
+    )
+    changed_rows = []
+    for row in rows:
+        ip = str(row.source_ip)
+        if _apply_evidence_snapshot(
+            row,
+            ptr_results[ip],
+            networks.get(ip),
+            reputation.get(ip),
+            feed_providers,
+            captured_at,
+        ):
+            changed_rows.append(row)
+    if changed_rows:
+        sync_source_projection_evidence(db, changed_rows)
+        db.commit()
+    return len(changed_rows)
+
+
 async def prewarm_source_evidence() -> int:  # noqa: C901 - bounded enrichment pipeline
     """Capture point-in-time PTR, network, and reputation evidence for report rows."""
     settings = get_settings()
@@ -148,7 +195,7 @@ async def prewarm_source_evidence() -> int:  # noqa: C901 - bounded enrichment p
         return 0
 
     limit = max(0, int(settings.SOURCE_EVIDENCE_PREWARM_LIMIT or 0))
-    source_ips = _pending_source_ips(limit) if limit else []
+    source_ips = await run_blocking(_pending_source_ips, limit) if limit else []
     if not source_ips:
         return 0
 
@@ -189,35 +236,15 @@ async def prewarm_source_evidence() -> int:  # noqa: C901 - bounded enrichment p
             max_ips=limit,
         )
 
-        captured_at = (
-            datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
-        )
-        rows = (
-            db.query(ReportRecord)
-            .filter(
-                or_(
-                    ReportRecord.source_evidence.is_(None),
-                    ReportRecord.source_evidence.like(_PTR_RETRY_MARKER),
-                ),
-                ReportRecord.source_ip.in_(source_ips),
-            )
-            .all()
+        changed = await run_blocking(
+            _persist_evidence_snapshots,
+            db,
+            source_ips,
+            ptr_results,
+            networks,
+            reputation,
+            feed_providers,
         )
-        changed_rows = []
-        for row in rows:
-            ip = str(row.source_ip)
-            if _apply_evidence_snapshot(
-                row,
-                ptr_results[ip],
-                networks.get(ip),
-                reputation.get(ip),
-                feed_providers,
-                captured_at,
-            ):
-                changed_rows.append(row)
-        if changed_rows:
-            sync_source_projection_evidence(db, changed_rows)
-            db.commit()
     except asyncio.CancelledError:
         raise
     except Exception as exc:  # pylint: disable=broad-exception-caught
@@ -228,10 +255,10 @@ async def prewarm_source_evidence() -> int:  # noqa: C901 - bounded enrichment p
 
     logger.info(
         "Captured sender evidence for %d report row(s) across %d source IP(s)",
-        len(changed_rows),
+        changed,
         len(source_ips),
     )
-    return len(changed_rows)
+    return changed
 
 
 async def scheduled_source_evidence_prewarm() -> None:
@@ -242,7 +269,8 @@ async def scheduled_source_evidence_prewarm() -> None:
     await asyncio.sleep(2)
     while True:
         try:
-            await prewarm_source_evidence()
+            with observe_scheduler_cycle("source_evidence_prewarm"):
+                await prewarm_source_evidence()
         except asyncio.CancelledError:
             raise
         except Exception as exc:  # pylint: disable=broad-exception-caught
@@ -8,20 +8,19 @@ import ipaddress
 import json
 import logging
 import time
-from dataclasses import asdict, dataclass, replace
-from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 from urllib.error import HTTPError, URLError
 from urllib.parse import quote, urlencode, urlparse
 from urllib.request import HTTPRedirectHandler, Request, build_opener, urlopen
 
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.models.dns_cache import DNSCache
 from app.services.dns_fallbacks import dns_fallback_candidates
 from app.services.dns_resolver import BaseDNSProvider
+from app.services.enrichment_cache import EnrichmentCache
 
 _CACHE_PROVIDER = "source-network-intelligence-v1"
 _SELECTORS_KEY = "source-network-v5"
@@ -227,10 +226,6 @@ def _utcnow_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
-def _is_fresh(row: DNSCache, ttl_seconds: int, now: datetime) -> bool:
-    return row.checked_at >= now - timedelta(seconds=ttl_seconds)
-
-
 def _query_name(ip: str) -> str:
     address = ipaddress.ip_address(ip)
     if address.version == 4:
@@ -320,6 +315,14 @@ def _from_json(value: str) -> SourceNetworkIntelligence:
     return SourceNetworkIntelligence(**{key: data[key] for key in data if key in allowed})
 
 
+SOURCE_NETWORK_CACHE: EnrichmentCache[SourceNetworkIntelligence] = EnrichmentCache(
+    namespace=_CACHE_PROVIDER,
+    decode=_from_json,
+    error_ttl_seconds=_ERROR_CACHE_TTL_SECONDS,
+    is_error=lambda result: bool(result.error),
+)
+
+
 def _radar_url(ip: str) -> str:
     return f"https://radar.cloudflare.com/ip/{quote(ip, safe='')}"
 
@@ -859,65 +862,23 @@ async def lookup_source_network_cached(
     """Lookup one IP network context with persistent cache semantics."""
     now = _utcnow_naive()
     settings = get_settings()
-    selectors_key = _source_network_cache_selectors_key(settings)
+    key = (ip, _source_network_cache_selectors_key(settings))
     custom_mode = bool(_custom_geoip_url_template(settings))
-    row = (
-        db.query(DNSCache)
-        .filter(
-            DNSCache.domain == ip,
-            DNSCache.provider == _CACHE_PROVIDER,
-            DNSCache.selectors_key == selectors_key,
-        )
-        .first()
-    )
     cached_result: Optional[SourceNetworkIntelligence] = None
-    if row and not refresh:
-        cached_result = _from_json(row.result_json)
-        cache_ttl = (
-            min(ttl_seconds, _ERROR_CACHE_TTL_SECONDS) if cached_result.error else ttl_seconds
-        )
-        if _is_fresh(row, cache_ttl, now):
-            return _annotate_enrichment_availability(cached_result), True, row.checked_at
+    if not refresh:
+        cached = SOURCE_NETWORK_CACHE.get(db, key, now=now, ttl_seconds=ttl_seconds)
+        if cached is not None:
+            cached_result = cached.value
+            if cached.fresh:
+                return _annotate_enrichment_availability(cached_result), True, cached.checked_at
 
     if cached_result and cached_result.dns_retry_pending and not custom_mode:
         result = await _retry_cached_dns_enrichment(provider, cached_result)
     else:
         result = await lookup_source_network(provider, ip)
-    payload = json.dumps(asdict(result), sort_keys=True, separators=(",", ":"))
-    if row is None:
-        row = DNSCache(
-            domain=ip,
-            provider=_CACHE_PROVIDER,
-            selectors_key=selectors_key,
-            result_json=payload,
-            checked_at=now,
-        )
-        db.add(row)
-    else:
-        row.result_json = payload
-        row.checked_at = now
-
-    try:
-        db.commit()
-    except IntegrityError:
-        db.rollback()
-        row = (
-            db.query(DNSCache)
-            .filter(
-                DNSCache.domain == ip,
-                DNSCache.provider == _CACHE_PROVIDER,
-                DNSCache.selectors_key == selectors_key,
-            )
-            .first()
-        )
-        if row is None:
-            raise
-        row.result_json = payload
-        row.checked_at = now
-        db.commit()
-
-    db.refresh(row)
-    return result, False, row.checked_at
+    SOURCE_NETWORK_CACHE.put(db, key, result, checked_at=now)
+    db.commit()
+    return result, False, now
 
 
 async def lookup_sources_network_cached(  # noqa: C901 - batch cache and network coordination
@@ -933,10 +894,11 @@ async def lookup_sources_network_cached(  # noqa: C901 - batch cache and network
 ) -> Dict[str, SourceNetworkIntelligence]:
     """Lookup network context for a bounded set of observed source IPs.
 
-    Cache reads and writes stay on the request session, while uncached remote
-    lookups run with bounded concurrency.  A report with many unique senders
-    must not serially wait for one DNS/API timeout per sender. When a time
-    budget is supplied, completed lookups are returned and cached instead of
+    The cache is read with one batched query and written with one bulk
+    upsert on the request session, while uncached remote lookups run with
+    bounded concurrency.  A report with many unique senders must not
+    serially wait for one DNS/API timeout per sender. When a time budget is
+    supplied, completed lookups are returned and cached instead of
     discarding the whole batch because one remote resolver is slow.
     """
     results: Dict[str, SourceNetworkIntelligence] = {}
@@ -950,57 +912,42 @@ async def lookup_sources_network_cached(  # noqa: C901 - batch cache and network
         unique_ips.append(ip)
         if len(unique_ips) >= max_ips:
             break
-    # ``lookup_source_network_cached`` persists through this SQLAlchemy
-    # session, so do cache inspection and writes sequentially.  Only the
-    # independent remote calls are parallelized below.
     now = _utcnow_naive()
     settings = get_settings()
     selectors_key = _source_network_cache_selectors_key(settings)
     custom_mode = bool(_custom_geoip_url_template(settings))
-    pending: List[Tuple[str, Optional[DNSCache], Optional[SourceNetworkIntelligence]]] = []
-    for ip in unique_ips:
-        row = (
-            db.query(DNSCache)
-            .filter(
-                DNSCache.domain == ip,
-                DNSCache.provider == _CACHE_PROVIDER,
-                DNSCache.selectors_key == selectors_key,
-            )
-            .first()
+    cached_by_key = (
+        {}
+        if refresh
+        else SOURCE_NETWORK_CACHE.get_many(
+            db, [(ip, selectors_key) for ip in unique_ips], now=now, ttl_seconds=ttl_seconds
         )
-        cached_result = _from_json(row.result_json) if row and not refresh else None
-        if cached_result is not None:
-            cache_ttl = (
-                min(ttl_seconds, _ERROR_CACHE_TTL_SECONDS) if cached_result.error else ttl_seconds
-            )
-            if _is_fresh(row, cache_ttl, now):
-                results[ip] = cached_result
-                continue
-        pending.append((ip, row, cached_result))
+    )
+    pending: List[Tuple[str, Optional[SourceNetworkIntelligence]]] = []
+    for ip in unique_ips:
+        cached = cached_by_key.get((ip, selectors_key))
+        if cached is not None and cached.fresh:
+            results[ip] = cached.value
+            continue
+        pending.append((ip, cached.value if cached is not None else None))
 
     semaphore = asyncio.Semaphore(max(1, int(concurrency or 1)))
 
     async def _lookup_pending(
         ip: str,
-        _row: Optional[DNSCache],
         cached_result: Optional[SourceNetworkIntelligence],
-    ) -> Tuple[str, Optional[DNSCache], SourceNetworkIntelligence]:
+    ) -> Tuple[str, SourceNetworkIntelligence]:
         async with semaphore:
             if cached_result and cached_result.dns_retry_pending and not custom_mode:
                 result = await _retry_cached_dns_enrichment(provider, cached_result)
             else:
                 result = await lookup_source_network(provider, ip)
-            return ip, _row, result
+            return ip, result
 
-    tasks = {
-        asyncio.create_task(_lookup_pending(ip, row, cached))
-        for ip, row, cached in pending
-    }
-    looked_up: List[Tuple[str, Optional[DNSCache], SourceNetworkIntelligence]] = []
+    tasks = {asyncio.create_task(_lookup_pending(ip, cached)) for ip, cached in pending}
+    looked_up: Dict[str, SourceNetworkIntelligence] = {}
     deadline = (
-        time.monotonic() + max(0.0, float(timeout_seconds))
-        if timeout_seconds is not None
-        else None
+        time.monotonic() + max(0.0, float(timeout_seconds)) if timeout_seconds is not None else None
     )
 
     while tasks:
@@ -1016,47 +963,24 @@ async def lookup_sources_network_cached(  # noqa: C901 - batch cache and network
             break
         for task in done:
             try:
-                looked_up.append(task.result())
+                ip, result = task.result()
             except Exception as exc:  # pylint: disable=broad-exception-caught
                 logger.info("Source network lookup failed: %s", type(exc).__name__)
+                continue
+            looked_up[ip] = result
 
     if tasks:
         for task in tasks:
             task.cancel()
         await asyncio.gather(*tasks, return_exceptions=True)
-    for ip, row, result in looked_up:
-        payload = json.dumps(asdict(result), sort_keys=True, separators=(",", ":"))
-        if row is None:
-            row = DNSCache(
-                domain=ip,
-                provider=_CACHE_PROVIDER,
-                selectors_key=selectors_key,
-                result_json=payload,
-                checked_at=now,
-            )
-            db.add(row)
-        else:
-            row.result_json = payload
-            row.checked_at = now
-        results[ip] = result
-
     if looked_up:
-        try:
-            db.commit()
-        except IntegrityError:
-            db.rollback()
-            # A concurrent request won the cache insert race. Re-run the
-            # normal single-IP path so its established recovery logic keeps
-            # the final cache state consistent.
-            for ip, _row, _result in looked_up:
-                result, _, _ = await lookup_source_network_cached(
-                    db,
-                    provider,
-                    ip,
-                    ttl_seconds=ttl_seconds,
-                    refresh=refresh,
-                )
-                results[ip] = result
+        SOURCE_NETWORK_CACHE.put_many(
+            db,
+            {(ip, selectors_key): result for ip, result in looked_up.items()},
+            checked_at=now,
+        )
+        db.commit()
+        results.update(looked_up)
     return results
 
 
@@ -7,14 +7,23 @@ import json
 import logging
 from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import text
+from sqlalchemy import func, text
 from sqlalchemy.orm import Session, selectinload
 
 from app.core.config import get_settings
 from app.core.database import SessionLocal
-from app.models.report import DMARCReport, DomainSourceDailyProjection, ReportRecord
+from app.core.metrics import observe_scheduler_cycle
+from app.models.report import (
+    DMARCReport,
+    DomainDKIMSelectorObservation,
+    DomainSourceDailyProjection,
+    DomainSourceFirstSeen,
+    ReportRecord,
+)
+from app.models.types import decode_json_document, encode_json_document
+from app.services.report_store import dkim_selector_results
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +34,21 @@ _SOURCE_PROJECTION_ADVISORY_LOCK_KEY = 1_144_591_954
 # per-source row. Keep that shared value small so one report cannot amplify an
 # oversized generator name across every projection it creates.
 MAX_REPORT_GENERATOR_LENGTH = 256
+# DNS names are at most 253 characters, so longer report selectors can never be
+# looked up and are not indexed.
+MAX_SELECTOR_LENGTH = 253
+
+
+PROJECTION_COUNT_FIELDS = (
+    "spf_pass_count",
+    "spf_fail_count",
+    "spf_unknown_count",
+    "dkim_pass_count",
+    "dkim_fail_count",
+    "dkim_unknown_count",
+    "dmarc_pass_count",
+    "dmarc_fail_count",
+)
 
 
 def _acquire_source_projection_write_lock(db: Session) -> None:
@@ -45,26 +69,40 @@ def _int(value: Any) -> int:
         return 0
 
 
-def _json_dict(value: str | None) -> Dict[str, Any]:
+def _json_dict(value: Any) -> Dict[str, Any]:
     if not value:
         return {}
-    try:
-        parsed = json.loads(value)
-    except (TypeError, ValueError, json.JSONDecodeError):
-        return {}
+    parsed = decode_json_document(value)
     return parsed if isinstance(parsed, dict) else {}
 
 
-def _json_list(value: str | None) -> List[Dict[str, Any]]:
+def _json_list(value: Any) -> List[Dict[str, Any]]:
     if not value:
         return []
-    try:
-        parsed = json.loads(value)
-    except (TypeError, ValueError, json.JSONDecodeError):
-        return []
+    parsed = decode_json_document(value)
     return [item for item in parsed if isinstance(item, dict)] if isinstance(parsed, list) else []
 
 
+def json_dict_decoder() -> Callable[[Any], Dict[str, Any]]:
+    """Return a JSON-object decoder that parses each distinct document once.
+
+    Daily projection rows repeat the same metadata, disposition and evidence
+    text from one day to the next. Callers must treat returned dicts as
+    read-only because equal documents share one decoded object.
+    """
+    decoded: Dict[Any, Dict[str, Any]] = {}
+
+    def decode(value: Any) -> Dict[str, Any]:
+        if not isinstance(value, (str, bytes)):
+            return _json_dict(value)
+        cached = decoded.get(value)
+        if cached is None:
+            cached = decoded[value] = _json_dict(value)
+        return cached
+
+    return decode
+
+
 def _add_unique(values: List[str], value: Any, *, max_length: int | None = None) -> None:
     text = str(value or "").strip()
     if max_length is not None:
@@ -181,6 +219,98 @@ def _observation_window(report: Dict[str, Any]) -> tuple[int, int, int]:
     return begin or observed_at, end or observed_at, observed_at - (observed_at % 86_400)
 
 
+def _record_first_seen(
+    db: Session,
+    *,
+    domain_id: int,
+    source_ip: str,
+    message_count: int,
+    first_seen: int,
+    last_seen: int,
+) -> None:
+    row = (
+        db.query(DomainSourceFirstSeen)
+        .filter(
+            DomainSourceFirstSeen.domain_id == domain_id,
+            DomainSourceFirstSeen.source_ip == source_ip,
+        )
+        .first()
+    )
+    if row is None:
+        db.add(
+            DomainSourceFirstSeen(
+                domain_id=domain_id,
+                source_ip=source_ip,
+                first_seen=first_seen,
+                last_seen=last_seen,
+                message_count=message_count,
+            )
+        )
+        return
+    row.first_seen = min(_int(row.first_seen) or first_seen, first_seen)
+    row.last_seen = max(_int(row.last_seen), last_seen)
+    row.message_count = _int(row.message_count) + message_count
+
+
+def _selector_observation_counts(
+    records: Iterable[Dict[str, Any]], domain: str
+) -> Dict[str, Dict[str, int]]:
+    counts: Dict[str, Dict[str, int]] = {}
+    for record in records:
+        count = _int(record.get("count"))
+        for selector, results in dkim_selector_results(record, domain).items():
+            if len(selector) > MAX_SELECTOR_LENGTH:
+                continue
+            item = counts.setdefault(
+                selector, {"message_count": 0, "pass_count": 0, "fail_count": 0}
+            )
+            item["message_count"] += count
+            if "fail" in results:
+                item["fail_count"] += count
+            elif "pass" in results:
+                item["pass_count"] += count
+    return counts
+
+
+def _record_selector_observations(
+    db: Session,
+    report: Dict[str, Any],
+    *,
+    domain_id: int,
+    first_seen: int,
+    last_seen: int,
+    observed_at: int,
+) -> None:
+    counts = _selector_observation_counts(
+        report.get("records") or [], str(report.get("domain") or "")
+    )
+    for selector, values in counts.items():
+        row = (
+            db.query(DomainDKIMSelectorObservation)
+            .filter(
+                DomainDKIMSelectorObservation.domain_id == domain_id,
+                DomainDKIMSelectorObservation.selector == selector,
+                DomainDKIMSelectorObservation.observed_at == observed_at,
+            )
+            .first()
+        )
+        if row is None:
+            row = DomainDKIMSelectorObservation(
+                domain_id=domain_id,
+                selector=selector,
+                observed_at=observed_at,
+                first_seen=first_seen,
+                last_seen=last_seen,
+            )
+            db.add(row)
+        else:
+            row.first_seen = min(_int(row.first_seen) or first_seen, first_seen)
+            row.last_seen = max(_int(row.last_seen), last_seen)
+        row.report_count = _int(row.report_count) + 1
+        for field, count in values.items():
+            setattr(row, field, _int(getattr(row, field)) + count)
+
+
 def materialize_source_projection(
     db: Session,
     report: Dict[str, Any],
@@ -199,6 +329,14 @@ def materialize_source_projection(
         report.get("records") or [],
         report_generator=str(report.get("org_name") or report.get("email") or "") or None,
     ).items():
+        _record_first_seen(
+            db,
+            domain_id=domain_id,
+            source_ip=source_ip,
+            message_count=values["message_count"],
+            first_seen=first_seen,
+            last_seen=last_seen,
+        )
         projection = (
             db.query(DomainSourceDailyProjection)
             .filter(
@@ -223,16 +361,7 @@ def materialize_source_projection(
 
         projection.message_count = _int(projection.message_count) + values["message_count"]
         projection.report_count = _int(projection.report_count) + 1
-        for field in (
-            "spf_pass_count",
-            "spf_fail_count",
-            "spf_unknown_count",
-            "dkim_pass_count",
-            "dkim_fail_count",
-            "dkim_unknown_count",
-            "dmarc_pass_count",
-            "dmarc_fail_count",
-        ):
+        for field in PROJECTION_COUNT_FIELDS:
             setattr(projection, field, _int(getattr(projection, field)) + values[field])
         dispositions = _json_dict(projection.disposition_counts)
         for name, count in values["disposition_counts"].items():
@@ -245,6 +374,14 @@ def materialize_source_projection(
         if values["source_evidence"]:
             projection.source_evidence = json.dumps(values["source_evidence"], sort_keys=True)
 
+    _record_selector_observations(
+        db,
+        report,
+        domain_id=domain_id,
+        first_seen=first_seen,
+        last_seen=last_seen,
+        observed_at=observed_at,
+    )
     db_report.source_projection_at = datetime.utcnow()
 
 
@@ -268,7 +405,7 @@ def backfill_source_projections(db: Session, *, limit: int = 100) -> int:
     """Materialize a bounded batch of historic reports without UI read work."""
     reports = (
         db.query(DMARCReport)
-        .options(selectinload(DMARCReport.records))
+        .options(selectinload(DMARCReport.domain), selectinload(DMARCReport.records))
         .filter(DMARCReport.source_projection_at.is_(None))
         .order_by(DMARCReport.end_date.asc())
         .limit(max(1, limit))
@@ -279,6 +416,7 @@ def backfill_source_projections(db: Session, *, limit: int = 100) -> int:
         materialize_source_projection(
             db,
             {
+                "domain": report.domain.name if report.domain else "",
                 "org_name": report.org_name,
                 "email": report.source_email,
                 "begin_timestamp": report.begin_date,
@@ -305,6 +443,87 @@ def source_projection_is_complete(
     return query.filter(DMARCReport.source_projection_at.is_(None)).first() is None
 
 
+def _record_dkim_selectors(
+    db: Session, domain_id: int, domain_name: str, *, since: Optional[int] = None
+) -> List[str]:
+    query = (
+        db.query(DMARCReport.begin_date, DMARCReport.end_date, ReportRecord.dkim_auth_details)
+        .join(ReportRecord, ReportRecord.report_id == DMARCReport.id)
+        .filter(DMARCReport.domain_id == domain_id, ReportRecord.dkim_auth_details.isnot(None))
+    )
+    if since is not None:
+        query = query.filter(DMARCReport.end_date >= since)
+    first_seen: Dict[str, int] = {}
+    for begin_date, end_date, details in query.yield_per(1000):
+        observed = _int(begin_date) or _int(end_date)
+        for selector in dkim_selector_results({"dkim": _json_list(details)}, domain_name):
+            if len(selector) <= MAX_SELECTOR_LENGTH:
+                first_seen[selector] = min(first_seen.get(selector, observed), observed)
+    return sorted(first_seen, key=lambda selector: (first_seen[selector], selector))
+
+
+def observed_dkim_selectors(
+    db: Session, domain_id: int, domain_name: str, *, since: Optional[int] = None
+) -> List[str]:
+    """Return selectors observed for a domain, in first-seen order.
+
+    Reads the selector index once every report of the domain is projected and
+    walks the report records while the backfill still has reports to index,
+    for example right after a report was deleted.
+    """
+    if not source_projection_is_complete(db, domain_id=domain_id, days=None):
+        return _record_dkim_selectors(db, domain_id, domain_name, since=since)
+    selector = DomainDKIMSelectorObservation.selector
+    query = db.query(selector).filter(DomainDKIMSelectorObservation.domain_id == domain_id)
+    if since is not None:
+        query = query.filter(DomainDKIMSelectorObservation.last_seen >= since)
+    rows = query.group_by(selector).order_by(
+        func.min(DomainDKIMSelectorObservation.first_seen), selector
+    )
+    return [str(row.selector) for row in rows]
+
+
+def load_selector_observations(
+    db: Session, domain_ids: Iterable[int], *, since: Optional[int] = None
+) -> Dict[int, List[Dict[str, Any]]]:
+    """Return daily selector observations for domains whose reports are all projected.
+
+    Domains with reports still waiting for the projection backfill are left
+    out, so callers keep deriving their selector evidence from report records.
+    """
+    wanted = set(domain_ids)
+    if not wanted:
+        return {}
+    pending = {
+        row.domain_id
+        for row in db.query(DMARCReport.domain_id)
+        .filter(
+            DMARCReport.domain_id.in_(wanted),
+            DMARCReport.source_projection_at.is_(None),
+        )
+        .distinct()
+    }
+    complete = wanted - pending
+    observations: Dict[int, List[Dict[str, Any]]] = {domain_id: [] for domain_id in complete}
+    if not complete:
+        return observations
+    query = db.query(
+        DomainDKIMSelectorObservation.domain_id,
+        DomainDKIMSelectorObservation.selector,
+        DomainDKIMSelectorObservation.first_seen,
+        DomainDKIMSelectorObservation.last_seen,
+        DomainDKIMSelectorObservation.report_count,
+        DomainDKIMSelectorObservation.message_count,
+        DomainDKIMSelectorObservation.pass_count,
+        DomainDKIMSelectorObservation.fail_count,
+    ).filter(DomainDKIMSelectorObservation.domain_id.in_(complete))
+    if since is not None:
+        query = query.filter(DomainDKIMSelectorObservation.last_seen >= since)
+    for row in query:
+        observations[row.domain_id].append(dict(row._mapping))
+    return observations
+
+
 def _status(pass_count: int, fail_count: int, unknown_count: int = 0) -> str:
     if pass_count and fail_count:
         return "mixed"
@@ -319,6 +538,85 @@ def _dominant(counts: Dict[str, int]) -> str:
     return max(counts.items(), key=lambda item: item[1])[0] if counts else "none"
 
 
+def _read_source_totals(db: Session, filters: List[Any]) -> Dict[str, Dict[str, Any]]:
+    """Sum counters and observation windows per sender in one grouped query."""
+    projection = DomainSourceDailyProjection
+    rows = (
+        db.query(
+            projection.source_ip,
+            func.sum(projection.message_count).label("count"),
+            *(
+                func.sum(getattr(projection, field)).label(field)
+                for field in PROJECTION_COUNT_FIELDS
+            ),
+            func.sum(projection.report_count).label("report_count"),
+            func.min(func.nullif(projection.first_seen, 0)).label("first_seen"),
+            func.max(projection.last_seen).label("last_seen"),
+            func.min(
+                func.coalesce(func.nullif(projection.first_seen, 0), projection.observed_at)
+            ).label("window_start"),
+            func.max(
+                func.coalesce(func.nullif(projection.last_seen, 0), projection.observed_at)
+            ).label("window_end"),
+        )
+        .filter(*filters)
+        .group_by(projection.source_ip)
+        .all()
+    )
+    return {
+        str(row.source_ip): {
+            "count": _int(row.count),
+            **{field: _int(getattr(row, field)) for field in PROJECTION_COUNT_FIELDS},
+            "report_count": _int(row.report_count),
+            "first_seen": _int(row.first_seen),
+            "last_seen": _int(row.last_seen),
+            "window_start": row.window_start,
+            "window_end": row.window_end,
+        }
+        for row in rows
+    }
+
+
+def _empty_read_source(ip: str, totals: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "source_ip": ip,
+        "count": totals["count"],
+        **{field: totals[field] for field in PROJECTION_COUNT_FIELDS},
+        "disposition_counts": {},
+        "first_seen": totals["first_seen"],
+        "last_seen": totals["last_seen"],
+        "active_days": 0,
+        "report_count": totals["report_count"],
+        "volume_history": [],
+        "source_evidence": {},
+        "_metadata": _record_metadata({}),
+        "_metadata_documents": set(),
+        "_active_dates": set(),
+        "_captured_at": "",
+        "window_start": totals["window_start"],
+        "window_end": totals["window_end"],
+        "evidence_refs": [],
+    }
+
+
+def _fold_projection_documents(
+    source: Dict[str, Any], row: Any, decode: Callable[[Any], Dict[str, Any]]
+) -> None:
+    for name, count in decode(row.disposition_counts).items():
+        source["disposition_counts"][name] = _int(source["disposition_counts"].get(name)) + _int(
+            count
+        )
+    # Merging is idempotent, so a sender's repeated daily metadata is folded once.
+    if row.metadata_json not in source["_metadata_documents"]:
+        source["_metadata_documents"].add(row.metadata_json)
+        source["_metadata"] = _merge_metadata(source["_metadata"], decode(row.metadata_json))
+    evidence = decode(row.source_evidence)
+    captured_at = str(evidence.get("captured_at") or "")
+    if evidence and captured_at >= source["_captured_at"]:
+        source["source_evidence"] = dict(evidence)
+        source["_captured_at"] = captured_at
+
+
 def load_domain_source_read_projection(
     db: Session,
     *,
@@ -327,116 +625,71 @@ def load_domain_source_read_projection(
     days: Optional[int],
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """Return source rows and anomaly-ready daily evidence from stored facts."""
-    query = db.query(DomainSourceDailyProjection).filter(
-        DomainSourceDailyProjection.domain_id == domain_id
-    )
+    projection = DomainSourceDailyProjection
+    filters = [projection.domain_id == domain_id]
     if days is not None:
         cutoff = int(datetime.now(timezone.utc).timestamp()) - max(1, int(days)) * 86_400
-        query = query.filter(DomainSourceDailyProjection.last_seen >= cutoff)
-    rows = query.order_by(DomainSourceDailyProjection.observed_at.asc()).all()
+        filters.append(projection.last_seen >= cutoff)
+    totals = _read_source_totals(db, filters)
+    # Counters are summed in SQL; the per-day pass only reads the columns that
+    # feed volume history and the JSON documents, as plain rows without ORM
+    # identity-map bookkeeping.
+    rows = (
+        db.query(
+            projection.id,
+            projection.source_ip,
+            projection.observed_at,
+            projection.message_count,
+            projection.dmarc_pass_count,
+            projection.dmarc_fail_count,
+            projection.disposition_counts,
+            projection.metadata_json,
+            projection.source_evidence,
+        )
+        .filter(*filters)
+        .order_by(projection.observed_at.asc())
+        .all()
+    )
+    decode = json_dict_decoder()
+    day_buckets: Dict[int, str] = {}
     sources: Dict[str, Dict[str, Any]] = {}
     daily_records: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
     for row in rows:
         ip = str(row.source_ip)
-        source = sources.setdefault(
-            ip,
-            {
-                "source_ip": ip,
-                "count": 0,
-                "spf_pass_count": 0,
-                "spf_fail_count": 0,
-                "spf_unknown_count": 0,
-                "dkim_pass_count": 0,
-                "dkim_fail_count": 0,
-                "dkim_unknown_count": 0,
-                "dmarc_pass_count": 0,
-                "dmarc_fail_count": 0,
-                "disposition_counts": {},
-                "first_seen": row.first_seen,
-                "last_seen": row.last_seen,
-                "active_days": 0,
-                "report_count": 0,
-                "volume_history": [],
-                "source_evidence": {},
-                "_metadata": _record_metadata({}),
-                "_active_dates": set(),
-                "_captured_at": "",
-                "window_start": None,
-                "window_end": None,
-                "evidence_refs": [],
-            },
-        )
-        source["count"] += _int(row.message_count)
-        source["report_count"] += _int(row.report_count)
-        source["first_seen"] = min(
-            _int(source.get("first_seen")) or _int(row.first_seen),
-            _int(row.first_seen) or _int(source.get("first_seen")),
-        )
-        source["last_seen"] = max(_int(source.get("last_seen")), _int(row.last_seen))
-        source["window_start"] = (
-            row.first_seen or row.observed_at
-            if source["window_start"] is None
-            else min(source["window_start"], row.first_seen or row.observed_at)
-        )
-        source["window_end"] = (
-            row.last_seen or row.observed_at
-            if source["window_end"] is None
-            else max(source["window_end"], row.last_seen or row.observed_at)
-        )
+        source = sources.get(ip)
+        if source is None:
+            source = sources[ip] = _empty_read_source(ip, totals[ip])
+        passed = _int(row.dmarc_pass_count)
+        failed = _int(row.dmarc_fail_count)
         source["evidence_refs"].append(f"domain_source_daily_projection:{row.id}")
-        for field in (
-            "spf_pass_count",
-            "spf_fail_count",
-            "spf_unknown_count",
-            "dkim_pass_count",
-            "dkim_fail_count",
-            "dkim_unknown_count",
-            "dmarc_pass_count",
-            "dmarc_fail_count",
-        ):
-            source[field] += _int(getattr(row, field))
-        for name, count in _json_dict(row.disposition_counts).items():
-            source["disposition_counts"][name] = _int(
-                source["disposition_counts"].get(name)
-            ) + _int(count)
-        source["_metadata"] = _merge_metadata(source["_metadata"], _json_dict(row.metadata_json))
-        evidence = _json_dict(row.source_evidence)
-        captured_at = str(evidence.get("captured_at") or "")
-        if evidence and captured_at >= source["_captured_at"]:
-            source["source_evidence"] = evidence
-            source["_captured_at"] = captured_at
-        bucket = datetime.fromtimestamp(row.observed_at, tz=timezone.utc).date().isoformat()
+        _fold_projection_documents(source, row, decode)
+        bucket = day_buckets.get(row.observed_at)
+        if bucket is None:
+            bucket = day_buckets[row.observed_at] = (
+                datetime.fromtimestamp(row.observed_at, tz=timezone.utc).date().isoformat()
+            )
         source["_active_dates"].add(bucket)
         source["volume_history"].append(
             {
                 "date": bucket,
                 "count": _int(row.message_count),
-                "passed": _int(row.dmarc_pass_count),
-                "failed": _int(row.dmarc_fail_count),
+                "passed": passed,
+                "failed": failed,
             }
         )
-        if _int(row.dmarc_pass_count):
+        if passed:
             daily_records[row.observed_at].append(
-                {
-                    "source_ip": ip,
-                    "count": _int(row.dmarc_pass_count),
-                    "dkim_result": "pass",
-                    "spf_result": "unknown",
-                }
+                {"source_ip": ip, "count": passed, "dkim_result": "pass", "spf_result": "unknown"}
             )
-        if _int(row.dmarc_fail_count):
+        if failed:
             daily_records[row.observed_at].append(
-                {
-                    "source_ip": ip,
-                    "count": _int(row.dmarc_fail_count),
-                    "dkim_result": "fail",
-                    "spf_result": "fail",
-                }
+                {"source_ip": ip, "count": failed, "dkim_result": "fail", "spf_result": "fail"}
             )
 
     source_rows = []
     for source in sources.values():
         source["active_days"] = len(source.pop("_active_dates"))
+        source.pop("_metadata_documents")
         source["spf_result"] = _status(
             source["spf_pass_count"], source["spf_fail_count"], source["spf_unknown_count"]
         )
@@ -487,7 +740,7 @@ def sync_source_projection_evidence(db: Session, records: Iterable[ReportRecord]
             .first()
         )
         if projection is not None:
-            projection.source_evidence = record.source_evidence
+            projection.source_evidence = encode_json_document(record.source_evidence)
 
 
 async def scheduled_source_projection_backfill() -> None:
@@ -499,10 +752,11 @@ async def scheduled_source_projection_backfill() -> None:
     while True:
         db = SessionLocal()
         try:
-            projected = backfill_source_projections(
-                db,
-                limit=max(1, int(settings.SOURCE_READ_PROJECTION_BACKFILL_LIMIT)),
-            )
+            with observe_scheduler_cycle("source_projection_backfill"):
+                projected = backfill_source_projections(
+                    db,
+                    limit=max(1, int(settings.SOURCE_READ_PROJECTION_BACKFILL_LIMIT)),
+                )
             if projected:
                 db.commit()
                 logger.info("Materialized sender facts for %d historic report(s)", projected)
@@ -6,15 +6,14 @@ import hashlib
 import ipaddress
 import json
 from dataclasses import asdict, dataclass, field
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.models.dns_cache import DNSCache
 from app.services.dns_cache import DEFAULT_DNS_CACHE_TTL_SECONDS
+from app.services.enrichment_cache import EnrichmentCache
 from app.services.source_reputation_feeds import (
     IPFeedReputation,
     ReputationFeedProvider,
@@ -80,10 +79,6 @@ def _utcnow_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
-def _is_fresh(row: DNSCache, ttl_seconds: int, now: datetime) -> bool:
-    return row.checked_at >= now - timedelta(seconds=ttl_seconds)
-
-
 def _evidence_from_json(value: Dict[str, Any]) -> ReputationEvidence:
     return ReputationEvidence(
         label=str(value.get("label") or ""),
@@ -118,6 +113,13 @@ def _result_from_json(value: str) -> DomainReputation:
     )
 
 
+SOURCE_REPUTATION_CACHE: EnrichmentCache[DomainReputation] = EnrichmentCache(
+    namespace=_CACHE_PROVIDER,
+    decode=_result_from_json,
+    ttl_seconds=DEFAULT_DNS_CACHE_TTL_SECONDS,
+)
+
+
 def _metadata_value(source: Dict[str, Any], *keys: str) -> Optional[str]:
     extensions = source.get("extensions") or {}
     for key in keys:
@@ -661,17 +663,12 @@ async def build_source_reputation_cached(
         feed_max_ips=settings.SOURCE_REPUTATION_FEED_MAX_IPS,
         days=days,
     )
-    row = (
-        db.query(DNSCache)
-        .filter(
-            DNSCache.domain == domain,
-            DNSCache.provider == _CACHE_PROVIDER,
-            DNSCache.selectors_key == cache_key,
-        )
-        .first()
+    key = (domain, cache_key)
+    cached = (
+        None if refresh else SOURCE_REPUTATION_CACHE.get(db, key, now=now, ttl_seconds=ttl_seconds)
     )
-    if row and not refresh and (_is_fresh(row, ttl_seconds, now) or not allow_live):
-        return _result_from_json(row.result_json), True, row.checked_at
+    if cached is not None and (cached.fresh or not allow_live):
+        return cached.value, True, cached.checked_at
 
     if not allow_live:
         # Keep the overview useful when the background enrichment has not
@@ -706,38 +703,6 @@ async def build_source_reputation_cached(
         anomalies_by_ip=anomalies_by_ip,
         feed_results_by_ip=feed_results_by_ip,
     )
-    payload = json.dumps(asdict(result), sort_keys=True, separators=(",", ":"))
-    if row is None:
-        row = DNSCache(
-            domain=domain,
-            provider=_CACHE_PROVIDER,
-            selectors_key=cache_key,
-            result_json=payload,
-            checked_at=now,
-        )
-        db.add(row)
-    else:
-        row.result_json = payload
-        row.checked_at = now
-
-    try:
-        db.commit()
-    except IntegrityError:
-        db.rollback()
-        row = (
-            db.query(DNSCache)
-            .filter(
-                DNSCache.domain == domain,
-                DNSCache.provider == _CACHE_PROVIDER,
-                DNSCache.selectors_key == cache_key,
-            )
-            .first()
-        )
-        if row is None:
-            raise
-        row.result_json = payload
-        row.checked_at = now
-        db.commit()
-
-    db.refresh(row)
-    return result, False, row.checked_at
+    SOURCE_REPUTATION_CACHE.put(db, key, result, checked_at=now)
+    db.commit()
+    return result, False, now
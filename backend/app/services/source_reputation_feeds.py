@@ -11,19 +11,18 @@ import asyncio
 import hashlib
 import ipaddress
 import json
-from dataclasses import asdict, dataclass, field
-from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Dict, Iterable, List, Optional, Protocol, Tuple
 
 import dns.exception
 import dns.resolver
 import httpx
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.config import Settings, get_settings
-from app.models.dns_cache import DNSCache
 from app.services.dns_resolver import PUBLIC_RECURSIVE_NAMESERVERS
+from app.services.enrichment_cache import EnrichmentCache
 
 _CACHE_PROVIDER = "source-reputation-feed-v1"
 
@@ -451,10 +450,6 @@ def _cache_key(ip: str, providers: Iterable[ReputationFeedProvider]) -> str:
     return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:32]
 
 
-def _is_fresh(row: DNSCache, ttl_seconds: int, now: datetime) -> bool:
-    return row.checked_at >= now - timedelta(seconds=ttl_seconds)
-
-
 def _evidence_from_json(value: Dict[str, object]) -> FeedLookupEvidence:
     return FeedLookupEvidence(
         provider_id=str(value.get("provider_id") or ""),
@@ -475,6 +470,11 @@ def _result_from_json(value: str) -> IPFeedReputation:
     )
 
 
+FEED_REPUTATION_CACHE: EnrichmentCache[IPFeedReputation] = EnrichmentCache(
+    namespace=_CACHE_PROVIDER, decode=_result_from_json
+)
+
+
 async def lookup_ip_reputation(
     ip: str,
     providers: Iterable[ReputationFeedProvider],
@@ -502,70 +502,20 @@ async def lookup_ip_reputation_cached(
     provider_rows = list(providers)
     if not provider_rows:
         return IPFeedReputation(ip=ip), False, now
-    selectors_key = _cache_key(ip, provider_rows)
-    row = (
-        db.query(DNSCache)
-        .filter(
-            DNSCache.domain == ip,
-            DNSCache.provider == _CACHE_PROVIDER,
-            DNSCache.selectors_key == selectors_key,
-        )
-        .first()
+    key = (ip, _cache_key(ip, provider_rows))
+    cached = (
+        None if refresh else FEED_REPUTATION_CACHE.get(db, key, now=now, ttl_seconds=ttl_seconds)
     )
-    if row and not refresh and _is_fresh(row, ttl_seconds, now):
-        return _result_from_json(row.result_json), True, row.checked_at
+    if cached is not None and cached.fresh:
+        return cached.value, True, cached.checked_at
 
     result = await lookup_ip_reputation(ip, provider_rows)
-    payload = json.dumps(asdict(result), sort_keys=True, separators=(",", ":"))
-    if row is None:
-        row = DNSCache(
-            domain=ip,
-            provider=_CACHE_PROVIDER,
-            selectors_key=selectors_key,
-            result_json=payload,
-            checked_at=now,
-        )
-        db.add(row)
-    else:
-        row.result_json = payload
-        row.checked_at = now
-
-    try:
-        db.commit()
-    except IntegrityError:
-        db.rollback()
-        row = (
-            db.query(DNSCache)
-            .filter(
-                DNSCache.domain == ip,
-                DNSCache.provider == _CACHE_PROVIDER,
-                DNSCache.selectors_key == selectors_key,
-            )
-            .first()
-        )
-        if row is None:
-            raise
-        row.result_json = payload
-        row.checked_at = now
-        db.commit()
+    FEED_REPUTATION_CACHE.put(db, key, result, checked_at=now)
+    db.commit()
+    return result, False, now
 
-    db.refresh(row)
-    return result, False, row.checked_at
 
-
-async def lookup_sources_reputation_cached(
-    db: Session,
-    source_ips: Iterable[str],
-    providers: Iterable[ReputationFeedProvider],
-    *,
-    ttl_seconds: int = 86_400,
-    max_ips: int = 100,
-    refresh: bool = False,
-) -> Dict[str, IPFeedReputation]:
-    """Lookup a bounded set of source IPs across configured reputation feeds."""
-    provider_rows = list(providers)
-    if not provider_rows:
-        return {}
+def _unique_global_ips(source_ips: Iterable[str], max_ips: int) -> List[str]:
     unique_ips: List[str] = []
     seen: set[str] = set()
     for raw_ip in source_ips:
@@ -582,14 +532,39 @@ async def lookup_sources_reputation_cached(
         unique_ips.append(ip)
         if len(unique_ips) >= max_ips:
             break
+    return unique_ips
+
+
+async def lookup_sources_reputation_cached(
+    db: Session,
+    source_ips: Iterable[str],
+    providers: Iterable[ReputationFeedProvider],
+    *,
+    ttl_seconds: int = 86_400,
+    max_ips: int = 100,
+    refresh: bool = False,
+) -> Dict[str, IPFeedReputation]:
+    """Lookup a bounded set of source IPs across configured reputation feeds."""
+    provider_rows = list(providers)
+    if not provider_rows:
+        return {}
+    unique_ips = _unique_global_ips(source_ips, max_ips)
+    now = _utcnow_naive()
+    keys = {ip: (ip, _cache_key(ip, provider_rows)) for ip in unique_ips}
+    cached_by_key = (
+        {}
+        if refresh
+        else FEED_REPUTATION_CACHE.get_many(db, keys.values(), now=now, ttl_seconds=ttl_seconds)
+    )
     results: Dict[str, IPFeedReputation] = {}
-    for ip in unique_ips:
-        result, _, _ = await lookup_ip_reputation_cached(
-            db,
-            ip,
-            provider_rows,
-            ttl_seconds=ttl_seconds,
-            refresh=refresh,
-        )
-        results[ip] = result
+    looked_up: Dict[Tuple[str, str], IPFeedReputation] = {}
+    for ip, key in keys.items():
+        cached = cached_by_key.get(key)
+        if cached is not None and cached.fresh:
+            results[ip] = cached.value
+            continue
+        looked_up[key] = results[ip] = await lookup_ip_reputation(ip, provider_rows)
+    if looked_up:
+        FEED_REPUTATION_CACHE.put_many(db, looked_up, checked_at=now)
+        db.commit()
     return results
@@ -52,6 +52,7 @@ def _record(report: DMARCReport, index: int, *, large: bool) -> ReportRecord:
     disposition = "quarantine" if failure else "none"
     return ReportRecord(
         report_id=report.id,
+        report_begin_date=report.begin_date,
         source_ip=_source_ip(index),
         count=count,
         disposition=disposition,
@@ -4,14 +4,17 @@ from __future__ import annotations
 
 import json
 from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Any, Dict, Iterable, List, Optional
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
 
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Query, Session
 
 from app.models.domain import Domain
-from app.models.report import TLSReport, TLSReportFailure
+from app.models.report import TLSReport, TLSReportDailyRollup, TLSReportFailure
 from app.services.workspaces import assign_default_workspace_to_unscoped_rows
 from app.utils.domain_validator import DomainValidationError, validate_domain
 
@@ -134,7 +137,9 @@ def _save_policy_report(
         total_successful_sessions=policy.get("total_successful_sessions") or 0,
         total_failure_sessions=policy.get("total_failure_sessions") or 0,
         raw_policy=json.dumps(policy.get("policy") or {}, sort_keys=True),
+        processed_at=datetime.utcnow(),
     )
+    row.observed_day = tls_observed_day(row)
     for failure in policy.get("failures") or []:
         row.failures.append(
             TLSReportFailure(
@@ -166,6 +171,7 @@ def _save_policy_report(
         if existing is not None:
             return existing, False
         raise
+    _record_daily_rollup(db, row)
     return row, True
 
 
@@ -233,35 +239,176 @@ def tls_report_to_dict(row: TLSReport) -> Dict[str, Any]:
     }
 
 
-def _row_day(row: TLSReport) -> str:
+def _report_day(row: TLSReport) -> date:
     basis = row.begin_date or row.end_date or row.processed_at or datetime.utcnow()
-    return basis.date().isoformat()
+    return basis.date()
 
 
-def _report_rows(
-    db: Session,
-    *,
-    domain: Optional[str] = None,
-    days: int = 30,
-    workspace_id: Optional[int] = None,
-) -> Iterable[TLSReport]:
-    cutoff = datetime.utcnow() - timedelta(days=days)
-    query = db.query(TLSReport).options(
-        selectinload(TLSReport.domain), selectinload(TLSReport.failures)
+def tls_observed_day(row: TLSReport) -> date:
+    """Return the latest day a TLS report covers or was processed on."""
+    dates = [value for value in (row.begin_date, row.end_date, row.processed_at) if value]
+    return max(dates or [datetime.utcnow()]).date()
+
+
+def _record_daily_rollup(db: Session, row: TLSReport) -> None:
+    """Add a newly stored policy report to its daily rollup."""
+    values = {
+        "domain_id": row.domain_id,
+        "policy_domain": row.policy_domain,
+        "observed_day": row.observed_day,
+        "report_day": _report_day(row),
+        "report_count": 1,
+        "successful_sessions": row.total_successful_sessions or 0,
+        "failed_sessions": row.total_failure_sessions or 0,
+        "updated_at": datetime.utcnow(),
+    }
+    dialect = db.get_bind().dialect.name
+    if dialect in {"postgresql", "sqlite"}:
+        # Concurrent uploads for the same day add to one row instead of racing
+        # a read-then-insert into the unique constraint.
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        statement = insert(TLSReportDailyRollup).values(values)
+        rollups = TLSReportDailyRollup.__table__.c
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["domain_id", "policy_domain", "observed_day", "report_day"],
+                set_={
+                    "report_count": rollups.report_count + statement.excluded.report_count,
+                    "successful_sessions": rollups.successful_sessions
+                    + statement.excluded.successful_sessions,
+                    "failed_sessions": rollups.failed_sessions + statement.excluded.failed_sessions,
+                    "updated_at": statement.excluded.updated_at,
+                },
+            )
+        )
+        return
+    # Other databases: SessionLocal disables autoflush, so persist earlier
+    # policies of the same upload before looking up their shared rollup row.
+    db.flush()
+    rollup = (
+        db.query(TLSReportDailyRollup)
+        .filter(
+            TLSReportDailyRollup.domain_id == values["domain_id"],
+            TLSReportDailyRollup.policy_domain == values["policy_domain"],
+            TLSReportDailyRollup.observed_day == values["observed_day"],
+            TLSReportDailyRollup.report_day == values["report_day"],
+        )
+        .first()
     )
+    if rollup is None:
+        db.add(TLSReportDailyRollup(**values))
+        return
+    rollup.report_count += 1
+    rollup.successful_sessions += values["successful_sessions"]
+    rollup.failed_sessions += values["failed_sessions"]
+
+
+def _scoped(
+    query: Query,
+    model,
+    *,
+    domain: Optional[str],
+    days: int,
+    workspace_id: Optional[int],
+) -> Query:
+    cutoff = (datetime.utcnow() - timedelta(days=days)).date()
+    query = query.filter(model.observed_day >= cutoff)
     if workspace_id is not None or domain:
-        query = query.outerjoin(Domain)
+        query = query.join(Domain, model.domain_id == Domain.id)
     if workspace_id is not None:
         query = query.filter(Domain.workspace_id == workspace_id)
-    query = query.filter(
-        (TLSReport.begin_date >= cutoff)
-        | (TLSReport.end_date >= cutoff)
-        | (TLSReport.processed_at >= cutoff)
-    )
     if domain:
         normalized = domain.lower().strip(".")
-        query = query.filter((Domain.name == normalized) | (TLSReport.policy_domain == normalized))
-    return query.order_by(TLSReport.begin_date.desc().nullslast(), TLSReport.id.desc()).all()
+        query = query.filter((Domain.name == normalized) | (model.policy_domain == normalized))
+    return query
+
+
+def _session_totals(reports: int, successful: int, failed: int) -> Dict[str, Any]:
+    sessions = successful + failed
+    return {
+        "reports": reports,
+        "successful_sessions": successful,
+        "failed_sessions": failed,
+        "failure_rate": failed / sessions if sessions else 0.0,
+    }
+
+
+def _top_failures(db: Session, scope: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    failed_sessions = func.coalesce(func.sum(TLSReportFailure.failed_session_count), 0)
+    groups = (
+        _scoped(
+            db.query(
+                TLSReportFailure.result_type,
+                failed_sessions,
+                func.count(func.distinct(TLSReport.report_id)),
+            ).join(TLSReport, TLSReportFailure.report_id == TLSReport.id),
+            TLSReport,
+            **scope,
+        )
+        .group_by(TLSReportFailure.result_type)
+        .order_by(failed_sessions.desc(), TLSReportFailure.result_type)
+        .limit(limit)
+        .all()
+    )
+    if not groups:
+        return []
+    details: Dict[str, Dict[str, set]] = defaultdict(lambda: defaultdict(set))
+    for field, column in (
+        ("affected_domains", TLSReport.policy_domain),
+        ("receiving_mx_hostnames", TLSReportFailure.receiving_mx_hostname),
+        ("reason_codes", TLSReportFailure.failure_reason_code),
+    ):
+        rows = (
+            _scoped(
+                db.query(TLSReportFailure.result_type, column).join(
+                    TLSReport, TLSReportFailure.report_id == TLSReport.id
+                ),
+                TLSReport,
+                **scope,
+            )
+            .filter(
+                TLSReportFailure.result_type.in_([group[0] for group in groups]),
+                column.isnot(None),
+            )
+            .distinct()
+            .all()
+        )
+        for result_type, value in rows:
+            details[result_type][field].add(value)
+    return [
+        {
+            "result_type": result_type or "unknown",
+            "failed_sessions": int(failed or 0),
+            "report_count": report_count,
+            "affected_domains": sorted(details[result_type]["affected_domains"]),
+            "receiving_mx_hostnames": sorted(details[result_type]["receiving_mx_hostnames"])[:5],
+            "reason_codes": sorted(details[result_type]["reason_codes"])[:5],
+        }
+        for result_type, failed, report_count in groups
+    ]
+
+
+def _domain_top_failures(db: Session, scope: Dict[str, Any], domains: List[str]) -> Dict[str, str]:
+    if not domains:
+        return {}
+    failed_sessions = func.sum(TLSReportFailure.failed_session_count)
+    rows = (
+        _scoped(
+            db.query(TLSReport.policy_domain, TLSReportFailure.result_type, failed_sessions).join(
+                TLSReport, TLSReportFailure.report_id == TLSReport.id
+            ),
+            TLSReport,
+            **scope,
+        )
+        .filter(TLSReport.policy_domain.in_(domains))
+        .group_by(TLSReport.policy_domain, TLSReportFailure.result_type)
+        .all()
+    )
+    top: Dict[str, tuple] = {}
+    for policy_domain, result_type, failed in rows:
+        if policy_domain not in top or (failed or 0) > top[policy_domain][1]:
+            top[policy_domain] = (result_type, failed or 0)
+    return {policy_domain: item[0] for policy_domain, item in top.items()}
 
 
 def summarize_tls_reports(
@@ -272,103 +419,62 @@ def summarize_tls_reports(
     limit: int = 10,
     workspace_id: Optional[int] = None,
 ) -> Dict[str, Any]:
-    """Summarize TLS reports into trends and actionable failure groupings."""
-    rows = list(_report_rows(db, domain=domain, days=days, workspace_id=workspace_id))
+    """Summarize TLS reports into trends and actionable failure groupings.
 
-    totals = {
-        "reports": len(rows),
-        "successful_sessions": sum(row.total_successful_sessions or 0 for row in rows),
-        "failed_sessions": sum(row.total_failure_sessions or 0 for row in rows),
-    }
-    session_total = totals["successful_sessions"] + totals["failed_sessions"]
-    totals["failure_rate"] = (totals["failed_sessions"] / session_total) if session_total else 0.0
+    Totals, trends and per-domain counts are read from the daily rollup; failure
+    groups are aggregated in SQL and bounded to the top *limit* result types.
+    """
+    scope = {"domain": domain, "days": days, "workspace_id": workspace_id}
+    report_count = func.coalesce(func.sum(TLSReportDailyRollup.report_count), 0)
+    successful = func.coalesce(func.sum(TLSReportDailyRollup.successful_sessions), 0)
+    failed = func.coalesce(func.sum(TLSReportDailyRollup.failed_sessions), 0)
 
-    trend_map: Dict[str, Dict[str, Any]] = defaultdict(
-        lambda: {"date": "", "reports": 0, "successful_sessions": 0, "failed_sessions": 0}
+    totals = _session_totals(
+        *_scoped(db.query(report_count, successful, failed), TLSReportDailyRollup, **scope).one()
     )
-    domain_map: Dict[str, Dict[str, Any]] = defaultdict(
-        lambda: {
-            "domain": "",
-            "reports": 0,
-            "successful_sessions": 0,
-            "failed_sessions": 0,
-            "top_failure": None,
+    trends = [
+        {
+            "date": report_day.isoformat(),
+            "reports": reports,
+            "successful_sessions": successful_sessions,
+            "failed_sessions": failed_sessions,
         }
+        for report_day, reports, successful_sessions, failed_sessions in _scoped(
+            db.query(TLSReportDailyRollup.report_day, report_count, successful, failed),
+            TLSReportDailyRollup,
+            **scope,
+        )
+        .group_by(TLSReportDailyRollup.report_day)
+        .order_by(TLSReportDailyRollup.report_day)
+        .all()
+    ]
+    domain_rows = (
+        _scoped(
+            db.query(TLSReportDailyRollup.policy_domain, report_count, successful, failed),
+            TLSReportDailyRollup,
+            **scope,
+        )
+        .group_by(TLSReportDailyRollup.policy_domain)
+        .order_by(failed.desc(), TLSReportDailyRollup.policy_domain)
+        .limit(limit)
+        .all()
     )
-    failure_map: Dict[str, Dict[str, Any]] = defaultdict(
-        lambda: {
-            "result_type": "",
-            "failed_sessions": 0,
-            "reports": set(),
-            "affected_domains": set(),
-            "receiving_mx_hostnames": set(),
-            "reason_codes": set(),
+    top_by_domain = _domain_top_failures(db, scope, [row[0] for row in domain_rows])
+    affected_domains = [
+        {
+            "domain": policy_domain,
+            **_session_totals(reports, successful_sessions, failed_sessions),
+            "top_failure": top_by_domain.get(policy_domain),
         }
-    )
-
-    for row in rows:
-        day = _row_day(row)
-        trend = trend_map[day]
-        trend["date"] = day
-        trend["reports"] += 1
-        trend["successful_sessions"] += row.total_successful_sessions or 0
-        trend["failed_sessions"] += row.total_failure_sessions or 0
-
-        domain_summary = domain_map[row.policy_domain]
-        domain_summary["domain"] = row.policy_domain
-        domain_summary["reports"] += 1
-        domain_summary["successful_sessions"] += row.total_successful_sessions or 0
-        domain_summary["failed_sessions"] += row.total_failure_sessions or 0
-
-        top_for_row = None
-        for failure in row.failures:
-            result_type = failure.result_type or "unknown"
-            item = failure_map[result_type]
-            item["result_type"] = result_type
-            item["failed_sessions"] += failure.failed_session_count or 0
-            item["reports"].add(row.report_id)
-            item["affected_domains"].add(row.policy_domain)
-            if failure.receiving_mx_hostname:
-                item["receiving_mx_hostnames"].add(failure.receiving_mx_hostname)
-            if failure.failure_reason_code:
-                item["reason_codes"].add(failure.failure_reason_code)
-            if (
-                top_for_row is None
-                or (failure.failed_session_count or 0) > top_for_row.failed_session_count
-            ):
-                top_for_row = failure
-        if top_for_row is not None:
-            domain_summary["top_failure"] = top_for_row.result_type
-
-    trends = [trend_map[key] for key in sorted(trend_map)]
-    affected_domains = []
-    for item in domain_map.values():
-        domain_sessions = item["successful_sessions"] + item["failed_sessions"]
-        item["failure_rate"] = item["failed_sessions"] / domain_sessions if domain_sessions else 0.0
-        affected_domains.append(item)
-
-    top_failures = []
-    for item in failure_map.values():
-        top_failures.append(
-            {
-                "result_type": item["result_type"],
-                "failed_sessions": item["failed_sessions"],
-                "report_count": len(item["reports"]),
-                "affected_domains": sorted(item["affected_domains"]),
-                "receiving_mx_hostnames": sorted(item["receiving_mx_hostnames"])[:5],
-                "reason_codes": sorted(item["reason_codes"])[:5],
-            }
-        )
-
-    top_failures.sort(key=lambda item: item["failed_sessions"], reverse=True)
-    affected_domains.sort(key=lambda item: item["failed_sessions"], reverse=True)
+        for policy_domain, reports, successful_sessions, failed_sessions in domain_rows
+    ]
 
     return {
         "domain": domain,
         "days": days,
         "totals": totals,
         "trends": trends,
-        "top_failures": top_failures[:limit],
-        "affected_domains": affected_domains[:limit],
+        "top_failures": _top_failures(db, scope, limit),
+        "affected_domains": affected_domains,
         "privacy": TLS_REPORT_PRIVACY_CONTROLS,
     }
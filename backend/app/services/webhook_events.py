@@ -8,15 +8,19 @@ import json
 import secrets
 import urllib.error
 import urllib.request
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urlparse
 
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.credential_encryption import decrypt_secret, encrypt_secret, is_encrypted_secret
+from app.core.metrics import WEBHOOK_DELIVERIES, WEBHOOK_DELIVERY_LAG
 from app.models.webhook import WebhookDelivery, WebhookEndpoint
 from app.services.workspaces import get_or_create_default_workspace
 
@@ -67,6 +71,8 @@ class DeliveryAttemptResult:
 
 
 WebhookSender = Callable[[str, bytes, Dict[str, str], int], DeliveryAttemptResult]
+# (event_type, payload, idempotency_key) accepted by ``enqueue_webhook_events``.
+WebhookEventSpec = Tuple[str, Dict[str, Any], Optional[str]]
 
 
 def normalize_event_types(event_types: Iterable[str]) -> List[str]:
@@ -233,6 +239,126 @@ def default_idempotency_key(event_type: str, payload: Dict[str, Any]) -> str:
     return f"{event_type}:{digest}"
 
 
+def _endpoint_subscription_index(
+    endpoints: Iterable[WebhookEndpoint],
+) -> Dict[str, List[WebhookEndpoint]]:
+    """Map each supported event type to the endpoints subscribed to it."""
+    wildcard: List[WebhookEndpoint] = []
+    by_event: Dict[str, List[WebhookEndpoint]] = defaultdict(list)
+    for endpoint in endpoints:
+        event_types = parse_event_types(endpoint.event_types)
+        if "*" in event_types:
+            wildcard.append(endpoint)
+            continue
+        for event_type in event_types:
+            by_event[event_type].append(endpoint)
+    return {
+        event_type: sorted(by_event.get(event_type, []) + wildcard, key=lambda item: item.id)
+        for event_type in SUPPORTED_EVENT_TYPES
+    }
+
+
+def _enabled_workspace_endpoints(db: Session, workspace_id: int) -> List[WebhookEndpoint]:
+    return (
+        db.query(WebhookEndpoint)
+        .filter(
+            WebhookEndpoint.enabled.is_(True),
+            WebhookEndpoint.workspace_id == workspace_id,
+        )
+        .order_by(WebhookEndpoint.id)
+        .all()
+    )
+
+
+def _insert_deliveries_ignoring_duplicates(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """Insert delivery rows in one statement, skipping existing idempotency keys."""
+    if not rows:
+        return 0
+    dialect = db.get_bind().dialect.name
+    if dialect in {"postgresql", "sqlite"}:
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        statement = (
+            insert(WebhookDelivery)
+            .on_conflict_do_nothing(index_elements=["endpoint_id", "idempotency_key"])
+            .returning(WebhookDelivery.id)
+        )
+        return len(db.execute(statement, rows).all())
+
+    inserted = 0
+    for row in rows:
+        try:
+            with db.begin_nested():
+                db.add(WebhookDelivery(**row))
+            inserted += 1
+        except IntegrityError:
+            continue
+    return inserted
+
+
+def enqueue_webhook_events(
+    db: Session,
+    events: Iterable[WebhookEventSpec],
+    *,
+    workspace_id: Optional[int] = None,
+    commit: bool = True,
+) -> int:
+    """Create pending deliveries for many events and return how many were new.
+
+    Endpoints are loaded once and matched through an in-memory subscription
+    index, then every delivery is inserted with a single conflict-ignoring
+    statement so repeated idempotency keys are skipped without a commit per
+    endpoint.
+    """
+    specs = list(events)
+    for event_type, _payload, _key in specs:
+        if event_type not in SUPPORTED_EVENT_TYPES:
+            raise ValueError(f"Unsupported webhook event type: {event_type}")
+    if not specs:
+        return 0
+
+    resolved_workspace_id = _webhook_workspace_id(db, workspace_id)
+    index = _endpoint_subscription_index(_enabled_workspace_endpoints(db, resolved_workspace_id))
+    inserted = _insert_deliveries_ignoring_duplicates(db, _delivery_rows(specs, index))
+    if commit:
+        db.commit()
+    return inserted
+
+
+def _delivery_rows(
+    specs: List[WebhookEventSpec],
+    index: Dict[str, List[WebhookEndpoint]],
+) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    seen: set[Tuple[int, str]] = set()
+    now = datetime.utcnow()
+    for event_type, payload, idempotency_key in specs:
+        endpoints = index.get(event_type) or []
+        if not endpoints:
+            continue
+        event_payload = build_event_payload(event_type, payload)
+        key = idempotency_key or default_idempotency_key(event_type, event_payload)
+        body = _stable_json(event_payload)
+        for endpoint in endpoints:
+            if (endpoint.id, key) in seen:
+                continue
+            seen.add((endpoint.id, key))
+            rows.append(
+                {
+                    "endpoint_id": endpoint.id,
+                    "event_type": event_type,
+                    "payload": body,
+                    "idempotency_key": key,
+                    "status": DELIVERY_PENDING,
+                    "attempt_count": 0,
+                    "max_attempts": endpoint.max_attempts,
+                    "next_attempt_at": now,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+    return rows
+
+
 def enqueue_webhook_event(
     db: Session,
     *,
@@ -245,48 +371,23 @@ def enqueue_webhook_event(
     if event_type not in SUPPORTED_EVENT_TYPES:
         raise ValueError(f"Unsupported webhook event type: {event_type}")
     resolved_workspace_id = _webhook_workspace_id(db, workspace_id)
-    endpoints = (
-        db.query(WebhookEndpoint)
+    index = _endpoint_subscription_index(_enabled_workspace_endpoints(db, resolved_workspace_id))
+    endpoint_ids = [endpoint.id for endpoint in index[event_type]]
+    if not endpoint_ids:
+        return []
+    event_payload = build_event_payload(event_type, payload)
+    key = idempotency_key or default_idempotency_key(event_type, event_payload)
+    _insert_deliveries_ignoring_duplicates(db, _delivery_rows([(event_type, payload, key)], index))
+    db.commit()
+    return (
+        db.query(WebhookDelivery)
         .filter(
-            WebhookEndpoint.enabled.is_(True),
-            WebhookEndpoint.workspace_id == resolved_workspace_id,
+            WebhookDelivery.endpoint_id.in_(endpoint_ids),
+            WebhookDelivery.idempotency_key == key,
         )
+        .order_by(WebhookDelivery.endpoint_id)
         .all()
     )
-    event_payload = build_event_payload(event_type, payload)
-    key = idempotency_key or default_idempotency_key(event_type, event_payload)
-    deliveries: List[WebhookDelivery] = []
-
-    for endpoint in endpoints:
-        if not endpoint_matches_event(endpoint, event_type):
-            continue
-        delivery = WebhookDelivery(
-            endpoint_id=endpoint.id,
-            event_type=event_type,
-            payload=_stable_json(event_payload),
-            idempotency_key=key,
-            status=DELIVERY_PENDING,
-            max_attempts=endpoint.max_attempts,
-        )
-        db.add(delivery)
-        try:
-            db.commit()
-        except IntegrityError:
-            db.rollback()
-            existing = (
-                db.query(WebhookDelivery)
-                .filter(
-                    WebhookDelivery.endpoint_id == endpoint.id,
-                    WebhookDelivery.idempotency_key == key,
-                )
-                .first()
-            )
-            if existing:
-                deliveries.append(existing)
-            continue
-        db.refresh(delivery)
-        deliveries.append(delivery)
-    return deliveries
 
 
 def _delivery_body(delivery: WebhookDelivery) -> bytes:
@@ -352,6 +453,8 @@ def deliver_webhook_delivery(
     now = datetime.utcnow()
     delivery.attempt_count = int(delivery.attempt_count or 0) + 1
     delivery.last_attempt_at = now
+    if delivery.created_at is not None:
+        WEBHOOK_DELIVERY_LAG.observe(max(0.0, (now - delivery.created_at).total_seconds()))
 
     if endpoint is None or not endpoint.enabled:
         delivery.status = DELIVERY_ABANDONED
@@ -359,6 +462,7 @@ def deliver_webhook_delivery(
         delivery.next_attempt_at = now
         db.commit()
         db.refresh(delivery)
+        WEBHOOK_DELIVERIES.labels(status=delivery.status).inc()
         return delivery
 
     try:
@@ -387,6 +491,7 @@ def deliver_webhook_delivery(
 
     db.commit()
     db.refresh(delivery)
+    WEBHOOK_DELIVERIES.labels(status=delivery.status).inc()
     return delivery
 
 
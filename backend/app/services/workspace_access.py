@@ -18,6 +18,12 @@ from app.services.organizations import (
     ACCOUNT_GRACE_STATUSES,
     account_state_for_subscriptions,
 )
+from app.services.workspace_access_cache import (
+    access_version,
+    cached_workspace_role,
+    identity_key,
+    remember_workspace_role,
+)
 from app.services.workspaces import assign_default_workspace_to_unscoped_rows
 
 ROLE_WORKSPACE_OWNER = "workspace_owner"
@@ -199,7 +205,11 @@ def role_for_workspace(
     auth_context: dict,
     workspace: Workspace,
 ) -> str:
-    """Resolve the caller's effective role for one workspace."""
+    """Resolve the caller's effective role for one workspace.
+
+    Membership-derived roles are cached briefly per principal and workspace;
+    see :mod:`app.services.workspace_access_cache` for invalidation.
+    """
     auth_type = (auth_context or {}).get("auth_type")
     if auth_type in {"api_key", "disabled", "trusted_proxy"}:
         return ROLE_WORKSPACE_OWNER
@@ -211,6 +221,23 @@ def role_for_workspace(
         if token_workspace_id == workspace.id:
             return ROLE_ANALYST
 
+    identity = identity_key(auth_context)
+    if identity is None:
+        return _resolve_user_workspace_role(db, auth_context, workspace)
+    cached = cached_workspace_role(identity, workspace.id)
+    if cached is not None:
+        return cached
+    version = access_version()
+    role = _resolve_user_workspace_role(db, auth_context, workspace)
+    remember_workspace_role(identity, workspace.id, role, version=version)
+    return role
+
+
+def _resolve_user_workspace_role(
+    db: Session,
+    auth_context: dict,
+    workspace: Workspace,
+) -> str:
     user = _auth_user(db, auth_context)
     if user is None:
         return ""
@@ -0,0 +1,144 @@
+"""Short-lived, version-invalidated cache of effective workspace roles.
+
+Dashboard pages issue many API calls that each resolve the caller's role for the
+same workspace. Roles are cached per process for ``WORKSPACE_ACCESS_CACHE_SECONDS``
+under an access version. Any committed change to users, workspaces, or workspace
+and organization memberships bumps the version through SQLAlchemy session events,
+so this process stops using the old entries right away. Other worker processes
+rely on the short TTL.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.organization import OrganizationMembership
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.models.workspace_access import WorkspaceMembership
+
+MAX_WORKSPACE_ACCESS_CACHE_ENTRIES = 4096
+ACCESS_MODELS = (User, Workspace, WorkspaceMembership, OrganizationMembership)
+_SESSION_FLAG = "workspace_access_changed"
+
+IdentityKey = Tuple[Any, ...]
+
+_roles: Dict[Tuple[int, IdentityKey, int], Tuple[str, float]] = {}
+_access_version = 0
+_cache_lock = threading.Lock()
+
+
+def _cache_ttl() -> int:
+    return max(0, int(get_settings().WORKSPACE_ACCESS_CACHE_SECONDS or 0))
+
+
+def access_version() -> int:
+    """Return the current in-process access version."""
+    return _access_version
+
+
+def bump_workspace_access_version() -> int:
+    """Invalidate every cached role; call after out-of-band access changes."""
+    global _access_version  # pylint: disable=global-statement
+    with _cache_lock:
+        _access_version += 1
+        _roles.clear()
+        return _access_version
+
+
+def clear_workspace_access_cache() -> None:
+    """Reset the role cache and version counter."""
+    global _access_version  # pylint: disable=global-statement
+    with _cache_lock:
+        _roles.clear()
+        _access_version = 0
+
+
+def identity_key(auth_context: Optional[dict]) -> Optional[IdentityKey]:
+    """Return a hashable key for the principal behind *auth_context*, if it has one."""
+    context = auth_context or {}
+    payload = context.get("payload") or {}
+    user_id = context.get("user_id")
+    subject = payload.get("sub") if isinstance(payload, dict) else None
+    email = context.get("email") or (payload.get("email") if isinstance(payload, dict) else None)
+    if user_id is None and subject is None and email is None:
+        return None
+    return (
+        context.get("auth_type"),
+        context.get("support_session_id"),
+        context.get("workspace_id"),
+        str(user_id) if user_id is not None else None,
+        str(subject) if subject is not None else None,
+        str(email) if email is not None else None,
+    )
+
+
+def cached_workspace_role(identity: IdentityKey, workspace_id: int) -> Optional[str]:
+    """Return a cached role for *identity* in *workspace_id*, or None on a miss."""
+    with _cache_lock:
+        key = (_access_version, identity, workspace_id)
+        cached = _roles.get(key)
+        if cached is None:
+            return None
+        role, expires_at = cached
+        if expires_at <= time.monotonic():
+            _roles.pop(key, None)
+            return None
+        return role
+
+
+def remember_workspace_role(
+    identity: IdentityKey,
+    workspace_id: int,
+    role: str,
+    *,
+    version: int,
+) -> None:
+    """Cache *role* when the access version is still the one it was resolved under."""
+    ttl = _cache_ttl()
+    if not ttl:
+        return
+    now = time.monotonic()
+    with _cache_lock:
+        if version != _access_version:
+            return
+        if len(_roles) >= MAX_WORKSPACE_ACCESS_CACHE_ENTRIES:
+            for key in [key for key, item in _roles.items() if item[1] <= now]:
+                _roles.pop(key, None)
+        while len(_roles) >= MAX_WORKSPACE_ACCESS_CACHE_ENTRIES:
+            _roles.pop(next(iter(_roles)))
+        _roles[(version, identity, workspace_id)] = (role, now + ttl)
+
+
+def _touches_access_models(session: Session) -> bool:
+    return any(
+        isinstance(instance, ACCESS_MODELS)
+        for instance in (*session.new, *session.dirty, *session.deleted)
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _flag_access_changes(session: Session, _flush_context, _instances) -> None:
+    if _touches_access_models(session):
+        session.info[_SESSION_FLAG] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_on_flush(session: Session, _flush_context) -> None:
+    # Bump as soon as the change is visible to this session, and again when the
+    # transaction ends, so roles resolved from uncommitted rows never survive.
+    if session.info.get(_SESSION_FLAG):
+        bump_workspace_access_version()
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _bump_on_transaction_end(session: Session, *_args) -> None:
+    if session.info.pop(_SESSION_FLAG, False):
+        bump_workspace_access_version()
@@ -208,12 +208,43 @@ if (typeof document !== 'undefined') {
         nextInit.headers = headers;
         return nextInit;
     };
+    // API read models carry ETags but are sent with Cache-Control: no-store, so
+    // keep the last few bodies in memory and revalidate them with If-None-Match.
+    const readModelCache = new Map();
+    const readModelCacheLimit = 20;
+    const requestMethod = (input, init) =>
+        String((init && init.method) || (input && input.method) || 'GET').toUpperCase();
+    const fetchWithValidator = async (input, init, url) => {
+        if (requestMethod(input, init) !== 'GET') {
+            return originalFetch(input, init);
+        }
+        const headers = new Headers((init && init.headers) || (input && input.headers) || {});
+        const cacheKey = `${url}\n${headers.get(workspaceHeaderName) || ''}`;
+        const cached = readModelCache.get(cacheKey);
+        let nextInit = init;
+        if (cached && !headers.has('If-None-Match')) {
+            headers.set('If-None-Match', cached.etag);
+            nextInit = Object.assign({}, init || {}, { headers });
+        }
+        const response = await originalFetch(input, nextInit);
+        if (response.status === 304 && cached) {
+            readModelCache.delete(cacheKey);
+            readModelCache.set(cacheKey, cached);
+            return new Response(cached.body, { status: 200, statusText: 'OK', headers: cached.headers });
+        }
+        readModelCache.delete(cacheKey);
+        const etag = response.headers.get('ETag');
+        if (response.status === 200 && etag) {
+            const body = await response.clone().text();
+            readModelCache.set(cacheKey, { etag, body, headers: new Headers(response.headers) });
+            while (readModelCache.size > readModelCacheLimit) {
+                readModelCache.delete(readModelCache.keys().next().value);
+            }
+        }
+        return response;
+    };
 
     window.fetch = async function dmarqWorkspaceFetch(input, init) {
-        if (!multiWorkspaceUiEnabled()) {
-            return mirrorDemoReadOnlyError(await originalFetch(input, withoutWorkspaceContext(input, init)));
-        }
-        const workspaceId = normalizeWorkspaceId(localStorage.getItem('dmarq.selectedWorkspaceId'));
         const url =
             input instanceof URL
                 ? input.toString()
@@ -222,8 +253,14 @@ if (typeof document !== 'undefined') {
                   : (input && input.url) || '';
         const isApiRequest =
             url.startsWith('/api/') || url.startsWith(window.location.origin + '/api/');
+        const send = (nextInput, nextInit) =>
+            isApiRequest ? fetchWithValidator(nextInput, nextInit, url) : originalFetch(nextInput, nextInit);
+        if (!multiWorkspaceUiEnabled()) {
+            return mirrorDemoReadOnlyError(await send(input, withoutWorkspaceContext(input, init)));
+        }
+        const workspaceId = normalizeWorkspaceId(localStorage.getItem('dmarq.selectedWorkspaceId'));
         if (!workspaceId || !isApiRequest) {
-            return mirrorDemoReadOnlyError(await originalFetch(input, init));
+            return mirrorDemoReadOnlyError(await send(input, init));
         }
         const nextInit = Object.assign({}, init || {});
         const headers = new Headers(nextInit.headers || (input && input.headers) || {});
@@ -231,7 +268,7 @@ if (typeof document !== 'undefined') {
             headers.set(workspaceHeaderName, workspaceId);
         }
         nextInit.headers = headers;
-        return mirrorDemoReadOnlyError(await originalFetch(input, nextInit));
+        return mirrorDemoReadOnlyError(await send(input, nextInit));
     };
 })();
 
@@ -17,19 +17,25 @@ import app.models.domain  # noqa: F401  # pylint: disable=unused-import
 import app.models.mail_source as _mail_source_model  # noqa: F401  # pylint: disable=unused-import
 import app.models.mail_source_backfill as _mail_source_backfill_model  # noqa: F401  # pylint: disable=unused-import
 import app.models.mail_source_import  # noqa: F401  # pylint: disable=unused-import
+import app.models.mail_source_message  # noqa: F401  # pylint: disable=unused-import
 import app.models.report  # noqa: F401  # pylint: disable=unused-import
 import app.models.setting  # noqa: F401  # pylint: disable=unused-import
 import app.models.user  # noqa: F401  # pylint: disable=unused-import
 import app.models.webhook  # noqa: F401  # pylint: disable=unused-import
 import app.models.workspace  # noqa: F401  # pylint: disable=unused-import
 import app.models.workspace_access  # noqa: F401  # pylint: disable=unused-import
+from app.core import database
 from app.core.config import get_settings
 from app.core.database import Base, get_db
 from app.core.security import require_admin_auth
 from app.main import create_app
+from app.services.ai_assistance import clear_remediation_cache
+from app.services.api_tokens import clear_api_token_cache
+from app.services.enrichment_cache import clear_enrichment_cache
 from app.services.ptr_lookup import clear_ptr_lookup_cache
 from app.services.report_store import ReportStore
 from app.services.source_network import clear_source_network_cache
+from app.services.workspace_access_cache import clear_workspace_access_cache
 
 import_module("app.models.organization")
 import_module("app.models.health_score_snapshot")
@@ -67,6 +73,12 @@ def db_session():
         engine.dispose()
 
 
+@pytest.fixture(autouse=True)
+def _no_sqlite_read_pool(monkeypatch):
+    """Keep ``get_read_db`` on the overridden test session instead of the app's read pool."""
+    monkeypatch.setattr(database, "SQLiteReadSessionLocal", None)
+
+
 @pytest.fixture()
 def client(test_app: FastAPI, db_session):  # pylint: disable=redefined-outer-name
     """Create a TestClient with a DB override for the test app."""
@@ -88,8 +100,12 @@ def _reset_process_state():
     """Reset process-local caches and singletons around every test."""
 
     def reset() -> None:
+        clear_api_token_cache()
         clear_ptr_lookup_cache()
+        clear_enrichment_cache()
         clear_source_network_cache()
+        clear_workspace_access_cache()
+        clear_remediation_cache()
         get_settings.cache_clear()
         ZoneInfo.clear_cache()
         ReportStore.get_instance().clear()
@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, patch
 
 import httpx
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
@@ -14,11 +15,13 @@ from app.api.api_v1.endpoints import ai as ai_endpoint
 from app.api.api_v1.endpoints import mcp as mcp_endpoint
 from app.api.api_v1.endpoints import settings as settings_endpoint
 from app.core.credential_encryption import decrypt_secret, is_encrypted_secret
+from app.models.ai_remediation_plan import AIRemediationPlan
 from app.models.alert import AlertHistory
 from app.models.domain import Domain
 from app.models.organization import Entitlement, Organization
 from app.models.setting import Setting
 from app.models.workspace import Workspace
+from app.models.workspace_access import WorkspaceAuditLog
 from app.services import ai_assistance
 from app.services.ai_assistance import AssistanceConfig
 from app.services.api_tokens import MCP_READ_SCOPE, create_api_token
@@ -661,6 +664,55 @@ def test_remediation_cache_prunes_expired_entries_and_oldest_entries():
     ai_assistance._REMEDIATION_CACHE.clear()
 
 
+@pytest.mark.asyncio
+async def test_remediation_plan_cache_coalesces_and_shares_plans(db_session: Session):
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return {"domain": "example.com", "actions": []}
+
+    first, second = await asyncio.gather(
+        ai_assistance._cached_remediation_plan(db_session, "k" * 64, "example.com", 60, generate),
+        ai_assistance._cached_remediation_plan(db_session, "k" * 64, "example.com", 60, generate),
+    )
+
+    assert len(calls) == 1
+    assert first == {"domain": "example.com", "actions": []}
+    assert second["cached"] is True
+    assert db_session.query(AIRemediationPlan).one().domain == "example.com"
+
+    ai_assistance._REMEDIATION_CACHE.clear()
+    shared = await ai_assistance._cached_remediation_plan(
+        db_session, "k" * 64, "example.com", 60, generate
+    )
+    again = await ai_assistance._cached_remediation_plan(
+        db_session, "k" * 64, "example.com", 60, generate
+    )
+
+    assert len(calls) == 1
+    assert shared["cached"] is True and again["cached"] is True
+    stats = ai_assistance.remediation_cache_stats()
+    assert (stats["misses"], stats["coalesced"], stats["shared_hits"], stats["memory_hits"]) == (
+        1,
+        1,
+        1,
+        1,
+    )
+
+
+def test_remediation_cache_evicts_least_recently_used_entry():
+    for index in range(ai_assistance.REMEDIATION_CACHE_MAX_ENTRIES):
+        ai_assistance._cache_set(f"key-{index}", {"index": index})
+    assert ai_assistance._cache_get("key-0", ttl_seconds=60) == {"index": 0}
+
+    ai_assistance._cache_set("key-new", {"index": -1})
+
+    assert "key-0" in ai_assistance._REMEDIATION_CACHE
+    assert "key-1" not in ai_assistance._REMEDIATION_CACHE
+
+
 def test_ai_remediation_plan_returns_404_for_unknown_domain(
     authed_client: TestClient,
     db_session: Session,
@@ -1635,6 +1687,117 @@ def test_mcp_requires_enabled_scoped_token(client: TestClient, db_session: Sessi
     assert unsupported_tool.json()["error"]["code"] == -32602
 
 
+def test_mcp_batch_runs_tools_in_order_and_memoises_duplicates(
+    client: TestClient, db_session: Session, monkeypatch
+):
+    _persist_report(db_session)
+    token = create_api_token(db_session, name="mcp batch client", scopes=[MCP_READ_SCOPE])
+    _set_setting(db_session, "mcp.enabled", "true", "mcp")
+    calls = []
+    original = mcp_endpoint._call_read_only_tool
+
+    async def counting_call(name, arguments, **kwargs):
+        calls.append(name)
+        return await original(name, arguments, **kwargs)
+
+    monkeypatch.setattr(mcp_endpoint, "_call_read_only_tool", counting_call)
+    summary_call = {
+        "jsonrpc": "2.0",
+        "method": "tools/call",
+        "params": {"name": "domain_summary", "arguments": {"domain": DOMAIN}},
+    }
+
+    response = client.post(
+        "/api/v1/mcp",
+        headers={"X-API-Key": token.secret},
+        json=[
+            {**summary_call, "id": 1},
+            {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+            {**summary_call, "id": 3},
+            {"jsonrpc": "2.0", "id": 4, "params": {}},
+            {
+                "jsonrpc": "2.0",
+                "id": 5,
+                "method": "tools/call",
+                "params": {"name": "unknown_tool", "arguments": {}},
+            },
+            {"jsonrpc": "2.0", "method": "tools/call", "params": {"name": "list_domains"}},
+        ],
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/json")
+    body = response.json()
+    assert [item["id"] for item in body] == [1, 2, 3, 4, 5]
+    assert body[0]["result"] == body[2]["result"]
+    assert body[0]["result"]["content"][0]["json"]["summary"]["domain"] == DOMAIN
+    assert body[1]["result"]["tools"]
+    assert body[3]["error"]["code"] == -32600
+    assert body[4]["error"]["code"] == -32602
+    assert calls == ["domain_summary", "unknown_tool", "list_domains"]
+    audited = (
+        db_session.query(WorkspaceAuditLog)
+        .filter(WorkspaceAuditLog.action == "mcp.tool_called")
+        .count()
+    )
+    assert audited == 3
+
+    notifications_only = client.post(
+        "/api/v1/mcp",
+        headers={"X-API-Key": token.secret},
+        json=[{"jsonrpc": "2.0", "method": "tools/list"}],
+    )
+    assert notifications_only.status_code == 202
+    assert notifications_only.content == b""
+
+    empty = client.post("/api/v1/mcp", headers={"X-API-Key": token.secret}, json=[])
+    assert empty.json()["error"]["code"] == -32600
+
+
+def test_mcp_batch_member_http_error_rolls_back_and_keeps_other_results(
+    client: TestClient, db_session: Session, monkeypatch
+):
+    _persist_report(db_session)
+    token = create_api_token(db_session, name="mcp batch errors", scopes=[MCP_READ_SCOPE])
+    _set_setting(db_session, "mcp.enabled", "true", "mcp")
+    rollbacks = []
+    original_rollback = db_session.rollback
+
+    def counting_rollback():
+        rollbacks.append(True)
+        original_rollback()
+
+    monkeypatch.setattr(db_session, "rollback", counting_rollback)
+    original_call = mcp_endpoint._call_read_only_tool
+
+    async def failing_call(name, arguments, **kwargs):
+        if arguments.get("domain") == "missing.example":
+            raise HTTPException(status_code=404, detail="Domain not found")
+        return await original_call(name, arguments, **kwargs)
+
+    monkeypatch.setattr(mcp_endpoint, "_call_read_only_tool", failing_call)
+
+    def summary_call(request_id, domain):
+        return {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/call",
+            "params": {"name": "domain_summary", "arguments": {"domain": domain}},
+        }
+
+    response = client.post(
+        "/api/v1/mcp",
+        headers={"X-API-Key": token.secret},
+        json=[summary_call(1, "missing.example"), summary_call(2, DOMAIN)],
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body[0]["error"]["data"]["status"] == 404
+    assert body[1]["result"]["content"][0]["json"]["summary"]["domain"] == DOMAIN
+    assert rollbacks
+
+
 def test_mcp_requires_advanced_integrations_entitlement(client: TestClient, db_session: Session):
     organization = Organization(slug="mcp-disabled", name="MCP Disabled", active=True)
     workspace = Workspace(
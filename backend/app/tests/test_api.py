@@ -169,6 +169,18 @@ def test_root_healthz_includes_release_summary(authed_client: TestClient, monkey
     assert data["release"]["build"]["short_sha"] == "1234567890ab"
 
 
+def test_root_health_reports_startup_phase_timings(authed_client: TestClient):
+    """Root health exposes how long imports, app construction and startup took."""
+    del authed_client
+    data = asyncio.run(root_health())
+
+    assert data["startup"]["ready"] is True
+    assert data["startup"]["total_ms"] > 0
+    assert {"imports", "create_app", "schema", "background_tasks"} <= set(
+        data["startup"]["phases_ms"]
+    )
+
+
 def test_domains_empty(authed_client: TestClient):
     """Test that GET /api/v1/domains/domains returns empty list when no reports uploaded."""
     response = authed_client.get("/api/v1/domains/domains")
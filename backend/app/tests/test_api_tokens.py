@@ -3,8 +3,21 @@
 from __future__ import annotations
 
 import pytest
+from sqlalchemy.exc import OperationalError
 
-from app.services.api_tokens import parse_scopes
+from app.models.api_token import APIToken
+from app.services import api_tokens
+from app.services.api_tokens import (
+    READ_REPORTS_SCOPE,
+    create_api_token,
+    find_api_token,
+    flush_api_token_usage,
+    parse_scopes,
+    pending_api_token_usage,
+    record_api_token_use,
+    revoke_api_token,
+    token_to_dict,
+)
 
 
 @pytest.mark.parametrize(
@@ -22,3 +35,76 @@ from app.services.api_tokens import parse_scopes
 def test_parse_scopes_normalizes_stored_values(stored_scopes, expected) -> None:
     """Stored scope text remains safe to use after legacy or manual edits."""
     assert parse_scopes(stored_scopes) == expected
+
+
+def test_find_api_token_caches_verification_until_revoked(db_session, monkeypatch) -> None:
+    """Repeated lookups skip bcrypt, and revocation takes effect immediately."""
+    created = create_api_token(db_session, name="poller", scopes=[READ_REPORTS_SCOPE])
+    checks = []
+    verify = api_tokens.verify_api_key_secret
+    monkeypatch.setattr(
+        api_tokens,
+        "verify_api_key_secret",
+        lambda secret, hashed: checks.append(secret) or verify(secret, hashed),
+    )
+
+    assert find_api_token(db_session, created.secret).id == created.token.id
+    assert find_api_token(db_session, created.secret).id == created.token.id
+    assert len(checks) == 1
+    assert find_api_token(db_session, created.secret[:-1] + "x") is None
+
+    assert revoke_api_token(db_session, created.token.id)
+    assert find_api_token(db_session, created.secret) is None
+
+
+def test_find_api_token_rechecks_rows_deactivated_elsewhere(db_session) -> None:
+    """A cached verification never outlives the stored active flag."""
+    created = create_api_token(db_session, name="poller", scopes=[READ_REPORTS_SCOPE])
+    assert find_api_token(db_session, created.secret) is not None
+
+    db_session.query(APIToken).filter(APIToken.id == created.token.id).update({"active": False})
+    db_session.commit()
+
+    assert find_api_token(db_session, created.secret) is None
+
+
+def test_api_token_usage_is_buffered_and_flushed_in_one_batch(db_session) -> None:
+    """Usage accounting accumulates in memory until the batch flush."""
+    created = create_api_token(db_session, name="siem", scopes=[READ_REPORTS_SCOPE])
+    token = created.token
+
+    for _ in range(3):
+        record_api_token_use(token, ip_address="198.51.100.7")
+
+    assert pending_api_token_usage(token.id) == 3
+    assert token_to_dict(token)["usage_count"] == 3
+    stored = db_session.query(APIToken).filter(APIToken.id == token.id).one()
+    assert stored.usage_count == 0
+
+    assert flush_api_token_usage(db_session) == 1
+    assert flush_api_token_usage(db_session) == 0
+    stored = db_session.query(APIToken).filter(APIToken.id == token.id).one()
+    assert stored.usage_count == 3
+    assert stored.last_used_ip == "198.51.100.7"
+    assert stored.last_used_at is not None
+    assert pending_api_token_usage(token.id) == 0
+
+
+def test_api_token_usage_stays_buffered_when_the_flush_fails(db_session, monkeypatch) -> None:
+    """A failed batch write keeps the counters for the next scheduled flush."""
+    created = create_api_token(db_session, name="audit", scopes=[READ_REPORTS_SCOPE])
+    record_api_token_use(created.token, ip_address=None)
+    record_api_token_use(created.token, ip_address=None)
+
+    def unavailable(*_args, **_kwargs):
+        raise OperationalError("UPDATE api_tokens", {}, Exception("database is locked"))
+
+    with monkeypatch.context() as patched:
+        patched.setattr(db_session, "execute", unavailable)
+        assert flush_api_token_usage(db_session) == 0
+    assert pending_api_token_usage(created.token.id) == 2
+
+    record_api_token_use(created.token, ip_address=None)
+    assert flush_api_token_usage(db_session) == 1
+    stored = db_session.query(APIToken).filter(APIToken.id == created.token.id).one()
+    assert stored.usage_count == 3
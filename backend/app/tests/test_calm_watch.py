@@ -45,8 +45,8 @@ def test_calm_watch_sends_once_for_an_unchanged_incident(db_session, monkeypatch
         or SimpleNamespace(to_dict=lambda: {"success": True, "message": "sent"}),
     )
     monkeypatch.setattr(
-        "app.services.calm_watch.enqueue_webhook_event",
-        lambda _db, **kwargs: webhooks.append(kwargs),
+        "app.services.calm_watch.enqueue_webhook_events",
+        lambda _db, events, **_kwargs: webhooks.extend(events),
     )
 
     first = evaluate_and_send_calm_watch(db_session)
@@ -80,8 +80,8 @@ def test_calm_watch_retries_workspaces_deferred_by_cycle_cap(db_session, monkeyp
         or SimpleNamespace(to_dict=lambda: {"success": True, "message": "sent"}),
     )
     monkeypatch.setattr(
-        "app.services.calm_watch.enqueue_webhook_event",
-        lambda *_args, **_kwargs: None,
+        "app.services.calm_watch.enqueue_webhook_events",
+        lambda *_args, **_kwargs: 0,
     )
 
     first = evaluate_and_send_calm_watch(db_session)
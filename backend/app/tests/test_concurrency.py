@@ -0,0 +1,103 @@
+"""Tests for the blocking-work executors and the event-loop stall harness."""
+
+import asyncio
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.api_v1.endpoints import reports as report_endpoints
+from app.core import concurrency
+from app.core.concurrency import EventLoopStallMonitor, run_blocking, run_cpu_bound
+from app.core.database import get_db
+from app.core.security import require_admin_auth
+
+
+@pytest.fixture(autouse=True)
+def _fresh_executors():
+    concurrency.shutdown_executors()
+    yield
+    concurrency.shutdown_executors()
+
+
+@pytest.mark.asyncio
+async def test_stall_monitor_detects_blocking_call_on_event_loop():
+    async with EventLoopStallMonitor(threshold_ms=50) as monitor:
+        time.sleep(0.2)
+
+    assert monitor.stalls
+    assert monitor.max_lag_ms >= 150
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_keeps_event_loop_responsive():
+    async with EventLoopStallMonitor(threshold_ms=50) as monitor:
+        results = await asyncio.gather(
+            run_blocking(time.sleep, 0.2),
+            run_blocking(time.sleep, 0.2),
+            run_blocking(lambda value, *, scale: value * scale, 21, scale=2),
+        )
+
+    assert results == [None, None, 42]
+    assert monitor.stalls == []
+
+
+@pytest.mark.asyncio
+async def test_run_cpu_bound_uses_thread_pool_without_parser_processes():
+    assert concurrency._get_parser_executor() is None
+
+    assert await run_cpu_bound(sum, [1, 2, 3]) == 6
+
+
+@pytest.mark.asyncio
+async def test_report_upload_does_not_stall_event_loop(monkeypatch, test_app, db_session):
+
+    real_parse = report_endpoints.DMARCParser.parse_file
+
+    def slow_parse(content, filename):
+        time.sleep(0.3)
+        return real_parse(content, filename)
+
+    monkeypatch.setattr(report_endpoints.DMARCParser, "parse_file", staticmethod(slow_parse))
+
+    async def mock_admin_auth():
+        return {"auth_type": "api_key"}
+
+    def override_get_db():
+        yield db_session
+
+    original_overrides = dict(test_app.dependency_overrides)
+    test_app.dependency_overrides[get_db] = override_get_db
+    test_app.dependency_overrides[require_admin_auth] = mock_admin_auth
+    xml = b"""<?xml version="1.0"?>
+<feedback>
+  <report_metadata>
+    <org_name>example.net</org_name><email>dmarc@example.net</email>
+    <report_id>stall-check</report_id>
+    <date_range><begin>1700000000</begin><end>1700086400</end></date_range>
+  </report_metadata>
+  <policy_published><domain>example.com</domain><p>none</p></policy_published>
+  <record>
+    <row><source_ip>192.0.2.1</source_ip><count>1</count>
+      <policy_evaluated><disposition>none</disposition><dkim>pass</dkim><spf>pass</spf>
+      </policy_evaluated></row>
+    <identifiers><header_from>example.com</header_from></identifiers>
+  </record>
+</feedback>"""
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app), base_url="http://testserver"
+        ) as client:
+            # Warm up routing and lazily imported modules outside the measurement.
+            await client.get("/health")
+            async with EventLoopStallMonitor(threshold_ms=100) as monitor:
+                response = await client.post(
+                    "/api/v1/reports/upload",
+                    files={"file": ("report.xml", xml, "application/xml")},
+                )
+    finally:
+        test_app.dependency_overrides = original_overrides
+
+    assert response.status_code == 200, response.text
+    assert response.json()["success"] is True
+    assert monitor.stalls == []
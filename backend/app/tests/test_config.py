@@ -7,9 +7,22 @@ could run (see: pydantic_settings sources/providers/env.py decode_complex_value)
 """
 
 import pytest
+from sqlalchemy import select, text
 
+from app.core import database
 from app.core.config import Settings
-from app.core.database import _ensure_sqlite_dir, _make_sync_db_url
+from app.core.database import (
+    ReplicaLagGuard,
+    RoutingSession,
+    _create_server_engine,
+    _create_sqlite_engines,
+    _ensure_sqlite_dir,
+    _is_sqlite_file,
+    _is_write,
+    _make_sync_db_url,
+    get_read_db,
+)
+from app.models.domain import Domain
 
 
 class TestBackendCorsOriginsValidator:
@@ -192,6 +205,124 @@ class TestEnsureSqliteDir:
         assert settings.DATABASE_URL.endswith("data/dmarq.db")
 
 
+class TestSqliteTuning:
+    """Tests for the tuned SQLite engines and the read/write routing session."""
+
+    def test_only_file_backed_sqlite_is_tuned(self):
+        assert _is_sqlite_file("sqlite:///./data/dmarq.db")
+        assert not _is_sqlite_file("sqlite://")
+        assert not _is_sqlite_file("sqlite:///:memory:")
+        assert not _is_sqlite_file("postgresql://user:pass@db:5432/mydb")
+
+    def test_engines_apply_wal_and_busy_timeout(self, tmp_path):
+        writer, reader = _create_sqlite_engines(f"sqlite:///{tmp_path}/dmarq.db", Settings())
+        try:
+            with reader.connect() as conn:
+                assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+                assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 15000
+            assert writer.pool.size() == 1
+        finally:
+            writer.dispose()
+            reader.dispose()
+
+    def test_session_reads_from_reader_until_it_writes(self, tmp_path):
+        writer, reader = _create_sqlite_engines(f"sqlite:///{tmp_path}/dmarq.db", Settings())
+        session = RoutingSession(bind=writer, reader=reader)
+        try:
+            assert session.get_bind(clause=text("SELECT 1")) is reader
+            session.execute(text("CREATE TABLE t (id INTEGER)"))
+            session.execute(text("INSERT INTO t VALUES (1)"))
+            # Later reads in the same transaction must see the pending insert.
+            assert session.get_bind(clause=text("SELECT 1")) is writer
+            assert session.execute(text("SELECT count(*) FROM t")).scalar() == 1
+            session.commit()
+            assert session.get_bind(clause=text("SELECT 1")) is reader
+            assert session.execute(text("SELECT count(*) FROM t")).scalar() == 1
+        finally:
+            session.close()
+            writer.dispose()
+            reader.dispose()
+
+    def test_only_read_sessions_use_the_sqlite_read_pool(self, monkeypatch):
+        assert database.SessionLocal.kw.get("reader") is None
+
+        read_session = RoutingSession()
+        monkeypatch.setattr(database, "replica_guard", None)
+        monkeypatch.setattr(database, "SQLiteReadSessionLocal", lambda: read_session)
+        primary = RoutingSession()
+
+        assert next(get_read_db(primary)) is read_session
+
+
+class _FakeLagGuard(ReplicaLagGuard):
+    def __init__(self, lags, **kwargs):
+        super().__init__(replica=None, max_lag_seconds=30, **kwargs)
+        self.lags = list(lags)
+        self.checks = 0
+
+    def _measure_lag(self):
+        self.checks += 1
+        lag = self.lags.pop(0)
+        if isinstance(lag, Exception):
+            raise lag
+        return lag
+
+
+class TestReadReplicaRouting:
+    """Tests for server pool settings, lock routing and the replica lag guard."""
+
+    def test_server_engine_uses_pool_settings_and_postgres_options(self, monkeypatch):
+        monkeypatch.setenv("DATABASE_POOL_SIZE", "12")
+        monkeypatch.setenv("DATABASE_MAX_OVERFLOW", "3")
+        monkeypatch.setenv("DATABASE_STATEMENT_TIMEOUT_MS", "5000")
+        captured = {}
+        monkeypatch.setattr(
+            database, "create_engine", lambda url, **kwargs: captured.update(kwargs)
+        )
+
+        _create_server_engine("postgresql://db/dmarq", Settings(), read_only=True)
+
+        assert captured["pool_size"] == 12
+        assert captured["max_overflow"] == 3
+        assert captured["pool_recycle"] == 1800
+        assert captured["connect_args"]["options"] == (
+            "-c statement_timeout=5000 -c default_transaction_read_only=on"
+        )
+
+    def test_row_and_advisory_locks_are_routed_to_the_writer(self):
+        assert _is_write(select(Domain).with_for_update())
+        assert _is_write(text("SELECT pg_try_advisory_xact_lock(:lock_key)"))
+        assert not _is_write(select(Domain))
+        assert not _is_write(text("SELECT count(*) FROM domains"))
+
+    def test_lag_guard_caches_checks_and_falls_back_when_stale(self):
+        now = [0.0]
+        guard = _FakeLagGuard([1.5, 120.0, RuntimeError("down"), None], clock=lambda: now[0])
+
+        assert guard.is_fresh()
+        now[0] = 2.0
+        assert guard.is_fresh() and guard.checks == 1
+        now[0] = 6.0
+        assert not guard.is_fresh()
+        now[0] = 12.0
+        assert not guard.is_fresh()
+        now[0] = 18.0
+        assert not guard.is_fresh()
+        assert guard.checks == 4
+
+    def test_get_read_db_uses_replica_only_while_fresh(self, monkeypatch):
+        replica_session = RoutingSession()
+        monkeypatch.setattr(database, "ReadSessionLocal", lambda: replica_session)
+        monkeypatch.setattr(database, "replica_guard", _FakeLagGuard([None]))
+        monkeypatch.setattr(database, "SQLiteReadSessionLocal", None)
+        primary = RoutingSession()
+
+        assert next(get_read_db(primary)) is primary
+
+        monkeypatch.setattr(database, "replica_guard", _FakeLagGuard([0.0]))
+        assert next(get_read_db(primary)) is replica_session
+
+
 class TestAdminApiKeySetting:
     """Tests for the ADMIN_API_KEY settings field."""
 
@@ -9,6 +9,8 @@ from pathlib import Path
 import pytest
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
+from app.core.static_assets import static_url
+
 
 def _read_project_file(*parts: str) -> str:
     return (Path(__file__).resolve().parents[1].joinpath(*parts)).read_text()
@@ -20,9 +22,18 @@ def _render_template(name: str, **context: object) -> str:
         loader=FileSystemLoader(template_dir),
         autoescape=select_autoescape(("html", "xml")),
     )
+    env.globals["static_url"] = static_url
     return env.get_template(name).render(**context)
 
 
+def _static_src(path: str) -> str:
+    return f"src=\"{{{{ static_url('{path}') }}}}\""
+
+
+def _static_href(path: str) -> str:
+    return f"href=\"{{{{ static_url('{path}') }}}}\""
+
+
 def _has_script_src(markup: str, src: str) -> bool:
     return bool(
         re.search(
@@ -1459,8 +1470,8 @@ def test_dashboard_uses_external_page_script_for_csp_migration():
     script = _dashboard_script()
     styles = _read_project_file("static", "css", "styles.css")
 
-    assert 'src="/static/js/chart.umd.min.js"' in template
-    assert 'src="/static/js/dashboard-page.js"' in template
+    assert _static_src("js/chart.umd.min.js") in template
+    assert _static_src("js/dashboard-page.js") in template
     assert 'x-data="dashboardApp"' in template
     assert "dashboardApp()" not in template
     assert "Alpine.data('dashboardApp', dashboardApp)" in script
@@ -1518,7 +1529,7 @@ def test_operations_uses_external_page_script_for_csp_migration():
     template = _operations_template()
     script = _operations_script()
 
-    assert 'src="/static/js/operations-page.js"' in template
+    assert _static_src("js/operations-page.js") in template
     assert 'x-data="operationsHealth"' in template
     assert "Alpine.data('operationsHealth', operationsHealth)" in script
     assert 'x-init="load()"' not in template
@@ -1553,7 +1564,7 @@ def test_reports_uses_external_page_script_for_csp_migration():
     template = _reports_template()
     script = _reports_script()
 
-    assert 'src="/static/js/reports-page.js"' in template
+    assert _static_src("js/reports-page.js") in template
     assert 'x-data="reportsApp" x-cloak' in template
     assert "Alpine.data('reportsApp', reportsApp)" in script
     assert '@click="deleteReport' not in template
@@ -1604,7 +1615,7 @@ def test_domains_uses_external_page_script_for_csp_migration():
     template = _domains_template()
     script = _domains_script()
 
-    assert 'src="/static/js/domains-page.js"' in template
+    assert _static_src("js/domains-page.js") in template
     assert 'x-data="domainsApp" x-cloak' in template
     assert "Alpine.data('domainsApp', domainsApp)" in script
     assert "/api/v1/domains/summary" in script
@@ -1717,7 +1728,7 @@ def test_upload_uses_external_page_script_for_csp_migration():
     template = _upload_template()
     script = _upload_script()
 
-    assert 'src="/static/js/upload-page.js"' in template
+    assert _static_src("js/upload-page.js") in template
     assert 'x-data="uploadForm"' in template
     assert "uploadForm()" not in template
     assert "Alpine.data('uploadForm', uploadForm)" in script
@@ -1754,7 +1765,7 @@ def test_profile_uses_external_page_script_for_csp_migration():
     template = _profile_template()
     script = _profile_script()
 
-    assert 'src="/static/js/profile-page.js"' in template
+    assert _static_src("js/profile-page.js") in template
     assert 'x-data="profileApp"' in template
     assert "profileApp()" not in template
     assert "Alpine.data('profileApp', profileApp)" in script
@@ -1773,7 +1784,7 @@ def test_login_error_banner_uses_registered_component_for_csp_migration():
     template = _read_project_file("templates", "login.html")
     script = _read_project_file("static", "js", "login-page.js")
 
-    assert 'src="/static/js/login-page.js"' in template
+    assert _static_src("js/login-page.js") in template
     assert 'x-data="loginErrorBanner"' in template
     assert "loginErrorBanner()" not in template
     assert "Alpine.data('loginErrorBanner'" in script
@@ -1817,7 +1828,7 @@ def test_forensic_reports_uses_external_page_script_for_csp_migration():
     template = _forensic_reports_template()
     script = _forensic_reports_script()
 
-    assert 'src="/static/js/forensic-reports-page.js"' in template
+    assert _static_src("js/forensic-reports-page.js") in template
     assert 'x-data="forensicReportsApp"' in template
     assert "Alpine.data('forensicReportsApp', forensicReportsApp)" in script
     assert "/api/v1/forensics?" in script
@@ -1872,7 +1883,7 @@ def test_forensic_report_detail_uses_external_page_script_for_csp_migration():
     template = _forensic_report_detail_template()
     script = _forensic_report_detail_script()
 
-    assert 'src="/static/js/forensic-report-detail-page.js"' in template
+    assert _static_src("js/forensic-report-detail-page.js") in template
     assert 'x-data="forensicReportDetailApp"' in template
     assert "forensicReportDetailApp(" not in template
     assert "Alpine.data('forensicReportDetailApp', forensicReportDetailApp)" in script
@@ -1899,7 +1910,7 @@ def test_tls_reports_uses_external_page_script_for_csp_migration():
     template = _tls_reports_template()
     script = _tls_reports_script()
 
-    assert 'src="/static/js/tls-reports-page.js"' in template
+    assert _static_src("js/tls-reports-page.js") in template
     assert 'x-data="tlsReportsApp"' in template
     assert "Alpine.data('tlsReportsApp', tlsReportsApp)" in script
     assert "/api/v1/tls-reports/summary?" in script
@@ -1939,7 +1950,7 @@ def test_report_detail_uses_external_page_script_for_csp_migration():
     template = _report_detail_template()
     script = _report_detail_script()
 
-    assert 'src="/static/js/report-detail-page.js"' in template
+    assert _static_src("js/report-detail-page.js") in template
     assert "reportDetailApp" in template
     assert '@click="deleteReport' not in template
     assert "data-report-delete" in template
@@ -2057,7 +2068,7 @@ def test_settings_exposes_provider_agnostic_dns_import_without_html_injection():
     assert 'id="mail-service-imports"' in template
     assert "Provider Domain Discovery" in template
     assert "dns-provider-import-select" in template
-    assert 'src="/static/js/settings-page.js"' in template
+    assert _static_src("js/settings-page.js") in template
     assert "loadDNSProviders" in script
     assert "dnsImportProviders()" in script
     assert "/api/v1/domains/dns/providers" in script
@@ -2160,7 +2171,7 @@ def test_mail_sources_list_actions_are_bound_from_external_script():
     template = _mail_sources_template()
     script = _mail_sources_script()
 
-    assert _has_script_src(template, "/static/js/mail-sources-page.js")
+    assert _has_script_src(template, "{{ static_url('js/mail-sources-page.js') }}")
     assert "data-mail-sources-page" in template
     assert 'x-data="mailSourcesApp"' in template
     assert "mailSourcesApp()" not in template
@@ -2272,7 +2283,7 @@ def test_domain_details_exposes_health_history_without_html_injection():
     assert "data-domain-id" in template
     assert "health-score-chart" in template
     assert "x-html" not in template
-    assert _has_script_src(template, "/static/js/domain-details-page.js")
+    assert _has_script_src(template, "{{ static_url('js/domain-details-page.js') }}")
     assert not _has_inline_script(template)
 
 
@@ -2995,7 +3006,7 @@ def test_members_template_uses_membership_api_without_html_injection():
     template = (Path(__file__).resolve().parents[1] / "templates" / "members.html").read_text()
     script = (Path(__file__).resolve().parents[1] / "static" / "js" / "members-page.js").read_text()
 
-    assert _has_script_src(template, "/static/js/members-page.js")
+    assert _has_script_src(template, "{{ static_url('js/members-page.js') }}")
     assert 'x-data="membershipApp"' in template
     assert "membershipApp()" not in template
     assert "Alpine.data('membershipApp', membershipApp)" in script
@@ -3055,7 +3066,7 @@ def test_base_template_propagates_selected_workspace_context():
     ).read_text()
     script = (Path(__file__).resolve().parents[1] / "static" / "js" / "base-layout.js").read_text()
 
-    assert 'src="/static/js/base-layout.js"' in template
+    assert _static_src("js/base-layout.js") in template
     assert "data-multi-workspace-ui" in template
     assert "data-demo-mode" in template
     assert 'x-data="userMenu"' in template
@@ -3104,7 +3115,7 @@ def test_base_template_propagates_selected_workspace_context():
     assert 'href="/forensics"' in template
     assert 'href="/tls-reports"' in template
     assert 'href="/onboarding"' in template
-    assert 'href="/static/css/app.css"' in template
+    assert _static_href("css/app.css") in template
     assert "cdn.tailwindcss.com" not in template
     assert "Full changelog" in template
     assert "release_info.changelog_url" in template
@@ -3114,7 +3125,7 @@ def test_base_template_propagates_selected_workspace_context():
     assert "/api/v1/health/release" in template
     assert "bindReleaseModalTriggers" in script
     assert "dmarq-release-modal" in script
-    assert 'src="/static/js/vendor/alpine.min.js"' in template
+    assert _static_src("js/vendor/alpine.min.js") in template
     assert "cdn.jsdelivr.net" not in template
     assert "data-demo-readonly-banner" in template
     assert "data-demo-readonly-toast" in script
@@ -3197,7 +3208,7 @@ def test_onboarding_template_uses_single_user_setup_story_by_default():
     assert "Apply setup" in script
     assert "One monitored domain with DMARC report and DNS setup tasks." in rendered
     assert 'data-multi-workspace-ui="false"' in rendered
-    assert 'src="/static/js/onboarding-page.js"' in template
+    assert _static_src("js/onboarding-page.js") in template
     assert "data-onboarding-page" in template
     assert 'x-data="workspaceOnboarding"' in template
     assert "workspaceOnboarding({" not in template
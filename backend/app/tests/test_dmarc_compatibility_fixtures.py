@@ -76,7 +76,7 @@ def _make_imap_client(db_session) -> IMAPClient:
 
 
 def _make_gmail_client(db_session) -> GmailClient:
-    with patch("app.services.gmail_client.Credentials") as mock_credentials_class:
+    with patch("google.oauth2.credentials.Credentials") as mock_credentials_class:
         credentials = MagicMock()
         credentials.token = "access-token"
         credentials.refresh_token = "refresh-token"
@@ -3680,7 +3680,7 @@ def test_selector_map_lookup_chunks_domain_names(db_session, monkeypatch):
 
 
 def test_report_selector_map_handles_empty_and_malformed_details(db_session):
-    """Report selector lookups tolerate malformed persisted DKIM auth details."""
+    """Indexed report selectors tolerate malformed persisted DKIM auth details."""
     assert domains_endpoint._get_report_selectors_map_from_db(db_session, []) == {}
 
     domain = Domain(name="malformed-report-selectors.example", active=True)
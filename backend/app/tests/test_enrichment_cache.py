@@ -0,0 +1,81 @@
+"""Tests for the batched enrichment cache over the shared dns_cache table."""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.dns_cache import DNSCache
+from app.services.enrichment_cache import EnrichmentCache, clear_enrichment_cache
+
+
+@dataclass
+class _Verdict:
+    ip: str
+    error: Optional[str] = None
+
+
+def _decode(value: str) -> _Verdict:
+    return _Verdict(**json.loads(value))
+
+
+CACHE = EnrichmentCache(
+    namespace="test-enrichment-v1",
+    decode=_decode,
+    ttl_seconds=3600,
+    error_ttl_seconds=60,
+    is_error=lambda verdict: bool(verdict.error),
+)
+NOW = datetime(2026, 7, 1, 12, 0, 0)
+
+
+def _count_selects(db_session: Session):
+    statements = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", _record)
+    return statements
+
+
+def test_get_many_reads_a_batch_with_one_query(db_session: Session):
+    """Cold reads of many keys cost one query, and repeats are served from memory."""
+    ips = [f"198.51.100.{index}" for index in range(1, 51)]
+    CACHE.put_many(db_session, {(ip, "v1"): _Verdict(ip=ip) for ip in ips}, checked_at=NOW)
+    db_session.commit()
+    clear_enrichment_cache()
+    selects = _count_selects(db_session)
+
+    cold = CACHE.get_many(db_session, [(ip, "v1") for ip in ips + ["192.0.2.1"]], now=NOW)
+    warm = CACHE.get_many(db_session, [(ip, "v1") for ip in ips], now=NOW)
+
+    assert len(selects) == 1
+    assert len(cold) == 50 and ("192.0.2.1", "v1") not in cold
+    assert warm[("198.51.100.7", "v1")].value == _Verdict(ip="198.51.100.7")
+    assert all(item.fresh for item in warm.values())
+
+
+def test_put_many_upserts_and_errors_use_the_short_ttl(db_session: Session):
+    """Rewrites replace the shared row; failed lookups expire before good ones."""
+    key = ("203.0.113.5", "v1")
+    CACHE.put(db_session, key, _Verdict(ip=key[0]), checked_at=NOW - timedelta(hours=2))
+    CACHE.put_many(
+        db_session,
+        {key: _Verdict(ip=key[0], error="timeout"), ("203.0.113.6", "v1"): _Verdict(ip="x")},
+        checked_at=NOW - timedelta(minutes=5),
+    )
+    db_session.commit()
+    clear_enrichment_cache()
+
+    cached = CACHE.get_many(db_session, [key, ("203.0.113.6", "v1")], now=NOW)
+
+    assert db_session.query(DNSCache).filter(DNSCache.domain == key[0]).count() == 1
+    assert cached[key].value.error == "timeout"
+    assert cached[key].fresh is False
+    assert cached[("203.0.113.6", "v1")].fresh is True
+    assert CACHE.get(db_session, key, now=NOW, ttl_seconds=30).fresh is False
@@ -10,6 +10,8 @@ from app.api.api_v1.endpoints import forensics as forensics_endpoint
 from app.models.domain import Domain
 from app.models.report import ForensicReport
 from app.models.workspace import Workspace
+from app.services import report_uploads
+from app.services.forensic_analysis import backfill_forensic_analysis
 from app.services.forensic_parser import ForensicParser
 from app.services.forensic_persistence import (
     forensic_report_exists,
@@ -241,6 +243,58 @@ def test_forensic_analysis_groups_failure_samples(authed_client, db_session):
     assert truncated_data["analyzed"] == 1
 
 
+def test_save_forensic_report_materialises_analysis(db_session):
+    parsed = ForensicParser.parse_bytes(SAMPLE_FORENSIC_EMAIL)
+
+    row, _created = save_forensic_report(db_session, parsed)
+
+    assert row.analysis_failure_kind == "dkim"
+    assert row.analysis_priority == "high"
+    assert row.analysis_priority_rank == 3
+    assert json.loads(row.analysis_auth_results)["dkim"] == "fail"
+    assert row.analysis_group_key == "|".join(
+        ("example.com", row.source_ip, "dkim", row.delivery_result)
+    )
+
+
+def test_forensic_analysis_reads_pending_samples_and_backfill_materialises_them(
+    authed_client, db_session
+):
+    parsed = ForensicParser.parse_bytes(SAMPLE_FORENSIC_EMAIL)
+    for index in range(5):
+        sample = dict(parsed)
+        sample["report_id"] = f"ruf-grouped-{index}"
+        save_forensic_report(db_session, sample)
+    legacy = dict(parsed)
+    legacy.update({"report_id": "ruf-legacy", "source_ip": "198.51.100.9", "auth_failure": "spf"})
+    legacy_row, _created = save_forensic_report(db_session, legacy)
+    legacy_row.analysis_failure_kind = None
+    legacy_row.analysis_group_key = None
+    db_session.commit()
+
+    response = authed_client.get("/api/v1/forensics/analysis?domain=example.com&page_size=2")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_available"] == 6
+    assert data["analyzed"] == 2
+    assert sum(data["failure_counts"].values()) == 6
+    assert data["failure_counts"]["spf"] == 1
+    assert [group["count"] for group in data["groups"]] == [5, 1]
+    db_session.refresh(legacy_row)
+    assert legacy_row.analysis_failure_kind is None
+
+    assert backfill_forensic_analysis(db_session) == 1
+    db_session.commit()
+    assert backfill_forensic_analysis(db_session) == 0
+    db_session.refresh(legacy_row)
+    assert legacy_row.analysis_failure_kind == "spf"
+    assert (
+        response.json()
+        == authed_client.get("/api/v1/forensics/analysis?domain=example.com&page_size=2").json()
+    )
+
+
 def test_forensic_report_responses_include_sample_analysis(authed_client):
     authed_client.post(
         "/api/v1/forensics/upload",
@@ -344,12 +398,12 @@ def test_upload_forensic_report_handles_save_duplicate_race(authed_client, monke
     parsed = ForensicParser.parse_bytes(SAMPLE_FORENSIC_EMAIL)
     row = ForensicReport(report_id=parsed["report_id"], reported_domain=parsed["reported_domain"])
     monkeypatch.setattr(
-        forensics_endpoint,
+        report_uploads,
         "forensic_report_exists",
         lambda *_args, **_kwargs: False,
     )
     monkeypatch.setattr(
-        forensics_endpoint,
+        report_uploads,
         "save_forensic_report",
         lambda *_args, **_kwargs: (row, False),
     )
@@ -364,7 +418,7 @@ def test_upload_forensic_report_handles_save_duplicate_race(authed_client, monke
 
 def test_upload_forensic_report_unexpected_error_returns_500(authed_client, monkeypatch):
     monkeypatch.setattr(
-        forensics_endpoint.ForensicParser,
+        ForensicParser,
         "parse_bytes",
         lambda _content: (_ for _ in ()).throw(RuntimeError("boom")),
     )
@@ -24,8 +24,8 @@ from app.models.domain import Domain
 from app.models.report import DMARCReport, ForensicReport
 from app.models.setting import Setting
 from app.models.workspace import Workspace
-from app.services.gmail_client import DMARC_GMAIL_QUERY, RETRYABLE_MESSAGE_FAILURE, GmailClient
 from app.services.dsn_parser import MAX_DSN_BYTES
+from app.services.gmail_client import DMARC_GMAIL_QUERY, RETRYABLE_MESSAGE_FAILURE, GmailClient
 from app.services.report_store import ReportStore
 from app.tests.test_data import SAMPLE_XML
 from app.tests.test_delivery_events import _dsn_bytes
@@ -44,7 +44,7 @@ def _make_client(
     workspace_id: Optional[int] = None,
 ) -> GmailClient:
     """Instantiate a GmailClient with real Credentials mocked out."""
-    with patch("app.services.gmail_client.Credentials") as mock_creds_class:
+    with patch("google.oauth2.credentials.Credentials") as mock_creds_class:
         mock_creds = MagicMock()
         mock_creds.token = access_token
         mock_creds.refresh_token = refresh_token
@@ -120,12 +120,12 @@ class TestGmailClientInit:
 
     def test_init_already_ingested_defaults_to_empty(self):
         client = _make_client()
-        assert client.already_ingested_ids == []
+        assert client.already_ingested_ids == set()
 
     def test_init_already_ingested_is_copied(self):
         ids = ["a", "b"]
         client = _make_client(already_ingested=ids)
-        assert client.already_ingested_ids == ["a", "b"]
+        assert client.already_ingested_ids == {"a", "b"}
         # Mutating the original should not affect the client
         ids.append("c")
         assert "c" not in client.already_ingested_ids
@@ -274,7 +274,7 @@ class TestBuildService:
         client._mock_creds.expired = False
 
         mock_service = MagicMock()
-        with patch("app.services.gmail_client.build", return_value=mock_service):
+        with patch("googleapiclient.discovery.build", return_value=mock_service):
             svc = client._build_service()
 
         assert svc is mock_service
@@ -286,8 +286,8 @@ class TestBuildService:
 
         mock_service = MagicMock()
         with (
-            patch("app.services.gmail_client.build", return_value=mock_service),
-            patch("app.services.gmail_client.Request"),
+            patch("googleapiclient.discovery.build", return_value=mock_service),
+            patch("google.auth.transport.requests.Request"),
         ):
             svc = client._build_service()
 
@@ -300,7 +300,10 @@ class TestBuildService:
         client._mock_creds.refresh_token = "ref"
         client._mock_creds.refresh.side_effect = Exception("refresh failed")
 
-        with patch("app.services.gmail_client.Request"), patch("app.services.gmail_client.build"):
+        with (
+            patch("google.auth.transport.requests.Request"),
+            patch("googleapiclient.discovery.build"),
+        ):
             with pytest.raises(Exception, match="refresh failed"):
                 client._build_service()
 
@@ -913,7 +916,7 @@ class TestFetchReports:
             result = client.fetch_reports()
 
         assert result["new_ingested_ids"] == []
-        assert client.already_ingested_ids == []
+        assert client.already_ingested_ids == set()
 
     def test_reports_new_domains(self):
         """fetch_reports should report domains that appear after ingestion."""
@@ -0,0 +1,150 @@
+"""Tests for content-hash report deduplication and connector message ID tracking."""
+
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+from app.models.ingestion_job import IngestedPayloadDigest
+from app.models.mail_source import MailSource
+from app.models.mail_source_message import MailSourceIngestedMessage
+from app.models.report import DMARCReport
+from app.services.dmarc_parser import DMARCParser
+from app.services.gmail_client import GmailClient
+from app.services.ingestion_dedup import (
+    CONNECTOR_GMAIL,
+    PAYLOAD_KIND_AGGREGATE,
+    find_ingested_payload,
+    load_ingested_message_ids,
+    payload_digest,
+    record_ingested_message_ids,
+)
+from app.services.workspaces import get_or_create_default_workspace
+from app.tests.test_data import SAMPLE_XML
+from app.tests.test_webhook import _raw_email_with_report
+
+REPORT_XML = SAMPLE_XML.encode("utf-8")
+
+
+def _unexpected_parse(*_args, **_kwargs):
+    raise AssertionError("known payloads must not be parsed again")
+
+
+def test_identical_upload_is_rejected_before_parsing(
+    authed_client: TestClient, db_session, monkeypatch
+):
+    first = authed_client.post(
+        "/api/v1/reports/upload",
+        files={"file": ("report.xml", REPORT_XML, "application/xml")},
+    )
+    assert first.status_code == 200
+
+    monkeypatch.setattr(DMARCParser, "parse_file", _unexpected_parse)
+    duplicate = authed_client.post(
+        "/api/v1/reports/upload",
+        files={"file": ("renamed.xml", REPORT_XML, "application/xml")},
+    )
+
+    assert duplicate.status_code == 409
+    assert "already been uploaded" in duplicate.json()["detail"]
+    assert db_session.query(IngestedPayloadDigest).count() == 1
+
+
+def test_deleted_report_can_be_imported_again(authed_client: TestClient, db_session):
+    workspace = get_or_create_default_workspace(db_session)
+    assert (
+        authed_client.post(
+            "/api/v1/reports/upload",
+            files={"file": ("report.xml", REPORT_XML, "application/xml")},
+        ).status_code
+        == 200
+    )
+    digest = payload_digest(REPORT_XML)
+    assert find_ingested_payload(
+        db_session, digest, PAYLOAD_KIND_AGGREGATE, workspace_id=workspace.id
+    )
+
+    db_session.query(DMARCReport).delete()
+    db_session.commit()
+
+    assert (
+        find_ingested_payload(db_session, digest, PAYLOAD_KIND_AGGREGATE, workspace_id=workspace.id)
+        is None
+    )
+    again = authed_client.post(
+        "/api/v1/reports/upload",
+        files={"file": ("report.xml", REPORT_XML, "application/xml")},
+    )
+    assert again.status_code == 200
+
+
+def test_connector_remembers_digest_of_report_it_already_stored(db_session):
+    workspace = get_or_create_default_workspace(db_session)
+    client = GmailClient(
+        client_id="id",
+        client_secret="secret",
+        access_token="token",
+        refresh_token="refresh",
+        db=db_session,
+        workspace_id=workspace.id,
+    )
+    report = DMARCParser.parse_file(REPORT_XML, "report.xml")
+    assert client._store_report_if_new(report)
+    db_session.commit()
+
+    # The same report arriving in a re-zipped attachment has a new digest.
+    rezipped = payload_digest(REPORT_XML + b"\n")
+    assert not client._store_report_if_new(dict(report), digest=rezipped)
+    db_session.commit()
+
+    known = find_ingested_payload(
+        db_session, rezipped, PAYLOAD_KIND_AGGREGATE, workspace_id=workspace.id
+    )
+    assert known is not None
+    assert known.report_id == report["report_id"]
+
+
+def test_webhook_counts_known_attachment_as_duplicate(
+    authed_client: TestClient, db_session, monkeypatch
+):
+    monkeypatch.setenv("WEBHOOK_SECRET", "test-webhook-secret")
+    get_settings.cache_clear()
+    headers = {"X-Webhook-Secret": "test-webhook-secret"}
+
+    first = authed_client.post(
+        "/api/v1/webhook/email/raw", content=_raw_email_with_report(), headers=headers
+    )
+    assert first.json()["imported"] == 1
+
+    monkeypatch.setattr(DMARCParser, "parse_file", _unexpected_parse)
+    second = authed_client.post(
+        "/api/v1/webhook/email/raw", content=_raw_email_with_report(), headers=headers
+    )
+
+    assert second.status_code == 200
+    assert second.json()["duplicates"] == 1
+    assert second.json()["errors"] == []
+
+
+def test_legacy_message_id_json_is_folded_into_table(db_session):
+    workspace = get_or_create_default_workspace(db_session)
+    source = MailSource(
+        workspace_id=workspace.id,
+        name="Gmail",
+        method="GMAIL_API",
+        gmail_ingested_ids='["old-1", "old-2"]',
+    )
+    db_session.add(source)
+    db_session.commit()
+
+    known = load_ingested_message_ids(db_session, source, CONNECTOR_GMAIL)
+    assert "old-1" in known and "old-2" in known
+    assert "new-1" not in known
+    assert source.gmail_ingested_ids is None
+
+    assert record_ingested_message_ids(db_session, source, CONNECTOR_GMAIL, ["old-2", "new-1"]) == 1
+    db_session.commit()
+
+    rows = db_session.query(MailSourceIngestedMessage).filter_by(mail_source_id=source.id).all()
+    assert sorted(row.message_id for row in rows) == ["new-1", "old-1", "old-2"]
+    known = load_ingested_message_ids(db_session, source, CONNECTOR_GMAIL)
+    assert all(message_id in known for message_id in ("old-1", "old-2", "new-1"))
+    assert "new-2" not in known
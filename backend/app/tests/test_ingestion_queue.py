@@ -0,0 +1,224 @@
+"""Tests for the durable report and inbound email ingestion queue."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+from app.models.ingestion_job import IngestionJob
+from app.models.report import DMARCReport
+from app.services import ingestion_queue
+from app.services.ingestion_queue import (
+    INGESTION_KIND_AGGREGATE,
+    enqueue_ingestion_job,
+    run_due_ingestion_jobs,
+)
+from app.services.workspaces import get_or_create_default_workspace
+from app.tests.test_data import SAMPLE_XML
+from app.tests.test_webhook import _raw_email_with_report
+
+REPORT_XML = SAMPLE_XML.encode("utf-8")
+
+
+@pytest.fixture(autouse=True)
+def _queue_enabled(monkeypatch):
+    monkeypatch.setenv("INGESTION_QUEUE_ENABLED", "true")
+    monkeypatch.setenv("INGESTION_QUEUE_MAX_ATTEMPTS", "2")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+def test_report_upload_is_accepted_and_processed_by_worker(authed_client: TestClient, db_session):
+    response = authed_client.post(
+        "/api/v1/reports/upload",
+        files={"file": ("report.xml", REPORT_XML, "application/xml")},
+    )
+
+    assert response.status_code == 202
+    body = response.json()
+    assert body["queued"] is True
+    assert body["duplicate"] is False
+    assert response.headers["location"] == f"/api/v1/ingestion/jobs/{body['job_id']}"
+    assert db_session.query(DMARCReport).count() == 0
+
+    duplicate = authed_client.post(
+        "/api/v1/reports/upload",
+        files={"file": ("report.xml", REPORT_XML, "application/xml")},
+    )
+    assert duplicate.status_code == 202
+    assert duplicate.json()["job_id"] == body["job_id"]
+    assert duplicate.json()["duplicate"] is True
+
+    assert run_due_ingestion_jobs(db_session, limit=5) == 1
+
+    status_response = authed_client.get(body["status_url"])
+    assert status_response.status_code == 200
+    job = status_response.json()
+    assert job["status"] == "succeeded"
+    assert job["attempt_count"] == 1
+    assert job["result"]["success"] is True
+    assert db_session.query(DMARCReport).count() == 1
+    assert db_session.get(IngestionJob, body["job_id"]).payload is None
+
+
+def test_webhook_email_is_queued_and_visible_in_default_workspace(
+    authed_client: TestClient, db_session, monkeypatch
+):
+    monkeypatch.setenv("WEBHOOK_SECRET", "test-webhook-secret")
+    get_settings.cache_clear()
+    get_or_create_default_workspace(db_session)
+
+    response = authed_client.post(
+        "/api/v1/webhook/email/raw",
+        content=_raw_email_with_report(),
+        headers={"X-Webhook-Secret": "test-webhook-secret"},
+    )
+
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert db_session.get(IngestionJob, job_id).workspace_id is None
+
+    assert run_due_ingestion_jobs(db_session) == 1
+
+    job = authed_client.get(f"/api/v1/ingestion/jobs/{job_id}").json()
+    assert job["status"] == "succeeded"
+    assert job["result"]["imported"] == 1
+    assert db_session.query(DMARCReport).filter_by(report_id="webhook-001").count() == 1
+
+
+def test_transient_failures_retry_then_dead_letter_and_can_be_requeued(
+    authed_client: TestClient, db_session, monkeypatch
+):
+    workspace = get_or_create_default_workspace(db_session)
+    job, created = enqueue_ingestion_job(
+        db_session,
+        kind=INGESTION_KIND_AGGREGATE,
+        payload=REPORT_XML,
+        workspace_id=workspace.id,
+        filename="report.xml",
+    )
+    assert created is True
+
+    def unavailable(*_args):
+        raise ConnectionError("database unavailable")
+
+    monkeypatch.setitem(ingestion_queue._INGESTION_HANDLERS, INGESTION_KIND_AGGREGATE, unavailable)
+
+    assert run_due_ingestion_jobs(db_session) == 1
+    db_session.refresh(job)
+    assert job.status == "backoff"
+    assert job.next_retry_at > datetime.utcnow()
+    assert run_due_ingestion_jobs(db_session) == 0
+
+    job.next_retry_at = datetime.utcnow() - timedelta(seconds=1)
+    db_session.commit()
+    assert run_due_ingestion_jobs(db_session) == 1
+    db_session.refresh(job)
+    assert job.status == "dead_letter"
+    assert job.attempt_count == 2
+    assert "database unavailable" in job.last_error
+    assert job.payload == REPORT_XML
+
+    dead = authed_client.get("/api/v1/ingestion/jobs", params={"status": "dead_letter"})
+    assert [row["id"] for row in dead.json()] == [job.id]
+
+    retried = authed_client.post(f"/api/v1/ingestion/jobs/{job.id}/retry")
+    assert retried.status_code == 200
+    assert retried.json()["status"] == "queued"
+    assert retried.json()["attempt_count"] == 0
+
+
+def test_invalid_payload_fails_without_retry(authed_client: TestClient, db_session):
+    response = authed_client.post(
+        "/api/v1/reports/upload",
+        files={"file": ("report.xml", b"<feedback><broken>", "application/xml")},
+    )
+    assert response.status_code == 202
+
+    assert run_due_ingestion_jobs(db_session) == 1
+
+    job = db_session.get(IngestionJob, response.json()["job_id"])
+    assert job.status == "failed"
+    assert job.attempt_count == 1
+    assert job.last_error == "Invalid report format"
+    assert job.next_retry_at is None
+
+
+def test_a_job_is_claimed_and_handled_once(db_session, monkeypatch):
+    workspace = get_or_create_default_workspace(db_session)
+    db_session.commit()
+    job, _created = enqueue_ingestion_job(
+        db_session,
+        kind=INGESTION_KIND_AGGREGATE,
+        payload=REPORT_XML,
+        workspace_id=workspace.id,
+        filename="report.xml",
+    )
+    handled = []
+
+    def handler(_db, claimed_job):
+        handled.append(claimed_job.id)
+        return {"success": True}
+
+    monkeypatch.setitem(ingestion_queue._INGESTION_HANDLERS, INGESTION_KIND_AGGREGATE, handler)
+
+    # Both workers saw the job as due before either of them claimed it.
+    stale_view = ingestion_queue.due_ingestion_jobs(db_session)
+    assert ingestion_queue.run_ingestion_job(db_session, job) is True
+    assert ingestion_queue.run_ingestion_job(db_session, stale_view[0]) is False
+    assert ingestion_queue.claim_ingestion_job(db_session, job.id) is False
+
+    db_session.refresh(job)
+    assert handled == [job.id]
+    assert job.status == "succeeded"
+    assert job.attempt_count == 1
+
+
+def test_payload_is_queued_again_after_its_report_was_deleted(
+    authed_client: TestClient, db_session
+):
+    first = authed_client.post(
+        "/api/v1/reports/upload",
+        files={"file": ("report.xml", REPORT_XML, "application/xml")},
+    ).json()
+    assert run_due_ingestion_jobs(db_session, limit=5) == 1
+    db_session.query(DMARCReport).delete()
+    db_session.commit()
+
+    again = authed_client.post(
+        "/api/v1/reports/upload",
+        files={"file": ("report.xml", REPORT_XML, "application/xml")},
+    ).json()
+
+    assert again["duplicate"] is False
+    assert again["job_id"] != first["job_id"]
+    assert run_due_ingestion_jobs(db_session, limit=5) == 1
+    assert db_session.query(DMARCReport).count() == 1
+
+
+def test_concurrent_identical_submissions_queue_one_job(db_session, monkeypatch):
+    workspace = get_or_create_default_workspace(db_session)
+    db_session.commit()
+    first, created = enqueue_ingestion_job(
+        db_session, kind=INGESTION_KIND_AGGREGATE, payload=REPORT_XML, workspace_id=workspace.id
+    )
+    assert created is True
+
+    # The second submission checked for an active job before the first committed.
+    real_lookup = ingestion_queue._latest_job_for_payload
+    lookups = []
+
+    def stale_lookup(*args, **kwargs):
+        lookups.append(kwargs)
+        return None if len(lookups) == 1 else real_lookup(*args, **kwargs)
+
+    monkeypatch.setattr(ingestion_queue, "_latest_job_for_payload", stale_lookup)
+    second, created = enqueue_ingestion_job(
+        db_session, kind=INGESTION_KIND_AGGREGATE, payload=REPORT_XML, workspace_id=workspace.id
+    )
+
+    assert created is False
+    assert second.id == first.id
+    assert db_session.query(IngestionJob).count() == 1
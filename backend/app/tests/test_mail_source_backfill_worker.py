@@ -5,6 +5,7 @@ from unittest.mock import MagicMock
 from app.models.mail_source import MailSource
 from app.models.mail_source_backfill import MailSourceBackfillJob
 from app.models.mail_source_import import MailSourceImport
+from app.models.mail_source_message import MailSourceIngestedMessage
 from app.services.mail_source_backfill_worker import (
     _backfill_window_days,
     _mark_failure,
@@ -51,6 +52,15 @@ def _source(db_session, *, method="IMAP", enabled=True):
     return workspace, source
 
 
+def _ingested_message_ids(db_session, source):
+    rows = (
+        db_session.query(MailSourceIngestedMessage)
+        .filter_by(mail_source_id=source.id)
+        .order_by(MailSourceIngestedMessage.id)
+    )
+    return [row.message_id for row in rows]
+
+
 def _job(db_session, workspace, source, **overrides):
     values = {
         "workspace_id": workspace.id,
@@ -217,7 +227,8 @@ def test_run_due_mail_source_backfill_executes_gmail_job(db_session, monkeypatch
 
     class FakeGmailClient:
         def __init__(self, **kwargs):
-            assert kwargs["already_ingested_ids"] == ["old-id"]
+            assert "old-id" in kwargs["already_ingested_ids"]
+            assert "new-id" not in kwargs["already_ingested_ids"]
             assert kwargs["workspace_id"] == workspace.id
 
         def fetch_reports(self, days, **kwargs):
@@ -233,16 +244,6 @@ def test_run_due_mail_source_backfill_executes_gmail_job(db_session, monkeypatch
         "app.services.mail_source_backfill_worker.GmailClient",
         FakeGmailClient,
     )
-    monkeypatch.setattr(
-        "app.services.mail_source_backfill_worker.GmailClient.load_ingested_ids",
-        lambda value: ["old-id"],
-        raising=False,
-    )
-    monkeypatch.setattr(
-        "app.services.mail_source_backfill_worker.GmailClient.dump_ingested_ids",
-        lambda values: ",".join(values),
-        raising=False,
-    )
 
     assert run_due_mail_source_backfill_jobs(db_session, limit=1) == 1
 
@@ -259,7 +260,8 @@ def test_run_due_mail_source_backfill_executes_gmail_job(db_session, monkeypatch
     assert cursor["search_window_days"] == 10
     assert row.processed == 5
     assert row.reports_found == 3
-    assert source.gmail_ingested_ids == "old-id,new-id"
+    assert source.gmail_ingested_ids is None
+    assert _ingested_message_ids(db_session, source) == ["old-id", "new-id"]
     assert source.gmail_access_token == "new-access"
     assert source.gmail_refresh_token == "new-refresh"
     assert source.last_checked is not None
@@ -361,7 +363,8 @@ def test_run_due_mail_source_backfill_executes_m365_job(db_session, monkeypatch)
 
     class FakeMicrosoftGraphClient:
         def __init__(self, **kwargs):
-            assert kwargs["already_ingested_ids"] == ["old-m365-id"]
+            assert "old-m365-id" in kwargs["already_ingested_ids"]
+            assert "new-m365-id" not in kwargs["already_ingested_ids"]
             assert kwargs["workspace_id"] == workspace.id
             assert kwargs["folder"] == "INBOX/DMARC"
 
@@ -378,16 +381,6 @@ def test_run_due_mail_source_backfill_executes_m365_job(db_session, monkeypatch)
         "app.services.mail_source_backfill_worker.MicrosoftGraphClient",
         FakeMicrosoftGraphClient,
     )
-    monkeypatch.setattr(
-        "app.services.mail_source_backfill_worker.MicrosoftGraphClient.load_ingested_ids",
-        lambda value: ["old-m365-id"],
-        raising=False,
-    )
-    monkeypatch.setattr(
-        "app.services.mail_source_backfill_worker.MicrosoftGraphClient.dump_ingested_ids",
-        lambda values: ",".join(values),
-        raising=False,
-    )
 
     assert run_due_mail_source_backfill_jobs(db_session, limit=1) == 1
 
@@ -403,7 +396,8 @@ def test_run_due_mail_source_backfill_executes_m365_job(db_session, monkeypatch)
     assert cursor["processed"] == 4
     assert row.processed == 4
     assert row.reports_found == 2
-    assert source.m365_ingested_ids == "old-m365-id,new-m365-id"
+    assert source.m365_ingested_ids is None
+    assert _ingested_message_ids(db_session, source) == ["old-m365-id", "new-m365-id"]
     assert source.m365_access_token == "new-m365-access"
     assert source.m365_refresh_token == "new-m365-refresh"
     assert source.last_checked is not None
@@ -565,7 +559,7 @@ def test_gmail_backfill_queues_next_page_cursor(db_session, monkeypatch):
     assert cursor["state"] == "queued"
     assert cursor["page_cursor"] == "gmail-next-page"
     assert cursor["skipped_attachments"] == 60
-    assert source.gmail_ingested_ids == "old-id,gmail-id-1"
+    assert _ingested_message_ids(db_session, source) == ["old-id", "gmail-id-1"]
 
 
 def test_gmail_backfill_resumes_from_stored_page_cursor(db_session, monkeypatch):
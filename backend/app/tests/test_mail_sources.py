@@ -27,6 +27,7 @@ from app.models.domain import Domain
 from app.models.mail_source import MailSource
 from app.models.mail_source_backfill import MailSourceBackfillJob
 from app.models.mail_source_import import MailSourceImport
+from app.models.mail_source_message import MailSourceIngestedMessage
 from app.models.setting import Setting
 from app.models.user import User
 from app.models.workspace import Workspace
@@ -631,7 +632,7 @@ def test_mail_sources_template_exposes_backfill_progress_controls():
         Path(__file__).resolve().parents[1] / "static" / "js" / "mail-sources-page.js"
     ).read_text()
 
-    assert 'src="/static/js/mail-sources-page.js"' in template
+    assert "src=\"{{ static_url('js/mail-sources-page.js') }}\"" in template
     assert 'x-data="mailSourcesApp"' in template
     assert "mailSourcesApp()" not in template
     assert "data-backfill-progress" in template
@@ -3732,7 +3733,7 @@ class TestGmailFetchExtra:
         assert mock_source.gmail_access_token == "new_access"
         assert mock_source.gmail_refresh_token == "new_refresh"
 
-    def test_gmail_fetch_ingested_ids_are_merged(self, authed_client: TestClient):
+    def test_gmail_fetch_ingested_ids_are_merged(self, authed_client: TestClient, db_session):
         """New ingested IDs are merged with existing ones without duplicates."""
         create_resp = authed_client.post(
             "/api/v1/mail-sources",
@@ -3758,10 +3759,6 @@ class TestGmailFetchExtra:
                 "app.api.api_v1.endpoints.mail_sources.GmailClient", return_value=mock_client
             ) as mock_gmail_class,
         ):
-            # Configure the class-level static helpers used inside the endpoint
-            mock_gmail_class.load_ingested_ids.return_value = ["id1"]
-            mock_gmail_class.dump_ingested_ids.return_value = '["id1","id2","id3"]'
-
             mock_source = MagicMock()
             mock_source.method = "GMAIL_API"
             mock_source.gmail_access_token = "tok"
@@ -3775,12 +3772,16 @@ class TestGmailFetchExtra:
             resp = authed_client.post(f"/api/v1/mail-sources/{source_id}/gmail/fetch")
 
         assert resp.status_code == 200
-        # dump_ingested_ids should have been called with all 3 IDs merged
-        args, _ = mock_gmail_class.dump_ingested_ids.call_args
-        merged_ids = args[0]
-        assert "id1" in merged_ids
-        assert "id2" in merged_ids
-        assert "id3" in merged_ids
+        already = mock_gmail_class.call_args.kwargs["already_ingested_ids"]
+        assert "id1" in already
+        # The legacy JSON list is folded into the table alongside the new IDs
+        stored_ids = {
+            row.message_id
+            for row in db_session.query(MailSourceIngestedMessage).filter_by(
+                mail_source_id=source_id
+            )
+        }
+        assert stored_ids == {"id1", "id2", "id3"}
 
 
 # ---------------------------------------------------------------------------
@@ -4160,15 +4161,15 @@ class TestTriggerPollM365Source:
 
         with (
             patch("app.main.MicrosoftGraphClient", return_value=mock_gc),
-            patch("app.main.MicrosoftGraphClient.load_ingested_ids", return_value=[]),
-            patch("app.main.MicrosoftGraphClient.dump_ingested_ids", return_value='["id1"]'),
+            patch("app.main.load_ingested_message_ids", return_value=set()),
+            patch("app.main.record_ingested_message_ids") as mock_record_ids,
         ):
             result = _trigger_poll_m365_source(src, mock_db, days=30)
 
         assert result["success"] is True
         assert result["source_id"] == 8
         assert result["processed"] == 2
-        assert src.m365_ingested_ids == '["id1"]'
+        mock_record_ids.assert_called_once_with(mock_db, src, "m365", ["id1"])
         mock_gc.fetch_reports.assert_called_once_with(days=30)
         mock_db.commit.assert_called_once()
 
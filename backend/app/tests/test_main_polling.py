@@ -145,11 +145,8 @@ def test_poll_single_m365_source_persists_import_state():
     with (
         patch("app.main.SessionLocal", return_value=db),
         patch("app.main.MicrosoftGraphClient") as mock_client_cls,
-        patch("app.main.MicrosoftGraphClient.load_ingested_ids", return_value=[]),
-        patch(
-            "app.main.MicrosoftGraphClient.dump_ingested_ids",
-            return_value='["message-1"]',
-        ),
+        patch("app.main.load_ingested_message_ids", return_value=set()),
+        patch("app.main.record_ingested_message_ids") as mock_record_ids,
         patch("app.main.record_import_attempt"),
     ):
         mock_client = mock_client_cls.return_value
@@ -161,7 +158,7 @@ def test_poll_single_m365_source_persists_import_state():
 
         _poll_single_m365_source(source)
 
-    assert db_source.m365_ingested_ids == '["message-1"]'
+    mock_record_ids.assert_called_once_with(db, db_source, "m365", ["message-1"])
     assert db_source.m365_access_token == "new-tok"
     assert db_source.m365_refresh_token == "new-ref"
     mock_client.fetch_reports.assert_called_once_with(days=7)
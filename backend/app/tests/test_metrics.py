@@ -0,0 +1,76 @@
+"""Tests for the Prometheus metrics endpoint and hot-path instrumentation."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main_module
+from app.core.config import get_settings
+from app.core.metrics import observe_scheduler_cycle
+from app.middleware import auth as auth_middleware
+
+
+def _set_metrics_settings(monkeypatch, **values):
+    # The endpoint reads the settings captured by app.main; the auth middleware
+    # reads get_settings(), which the test fixtures reset between tests.
+    for current in {id(s): s for s in (main_module.settings, get_settings())}.values():
+        for name, value in values.items():
+            monkeypatch.setattr(current, name, value)
+
+
+@pytest.fixture()
+def metrics_client(monkeypatch):
+    _set_metrics_settings(monkeypatch, METRICS_ENABLED=True, METRICS_TOKEN="scrape-secret")
+    return TestClient(main_module.app, headers={"Authorization": "Bearer scrape-secret"})
+
+
+def test_metrics_label_requests_by_route_template(metrics_client):
+    metrics_client.get("/api/v1/domains/example.com/stats")
+    metrics_client.get("/api/v1/domains/example.org/stats")
+
+    response = metrics_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'route="/api/v1/domains/{domain_id}/stats"' in body
+    assert "example.com" not in body
+    assert "dmarq_http_request_duration_seconds_bucket" in body
+    assert "dmarq_db_query_duration_seconds" in body
+
+
+def test_metrics_negotiate_openmetrics_and_record_scheduler_cycles(metrics_client):
+    with observe_scheduler_cycle("test_cycle"):
+        pass
+    with pytest.raises(RuntimeError):
+        with observe_scheduler_cycle("test_cycle"):
+            raise RuntimeError("boom")
+
+    response = metrics_client.get(
+        "/metrics",
+        headers={
+            "Accept": "application/openmetrics-text; version=1.0.0",
+            "Authorization": "Bearer scrape-secret",
+        },
+    )
+
+    assert response.headers["content-type"].startswith("application/openmetrics-text")
+    assert response.text.rstrip().endswith("# EOF")
+    assert 'dmarq_scheduler_cycle_failures_total{task="test_cycle"} 1.0' in response.text
+    assert 'dmarq_scheduler_cycle_duration_seconds_count{task="test_cycle"} 2.0' in response.text
+
+
+def test_metrics_fail_closed_without_a_token(metrics_client, monkeypatch):
+    """Scrapes need the bearer token, and nothing is served until one is configured."""
+    denied = metrics_client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+
+    assert denied.status_code == 401
+
+    _set_metrics_settings(monkeypatch, METRICS_TOKEN=None)
+    unconfigured = metrics_client.get("/metrics", follow_redirects=False)
+
+    assert unconfigured.status_code in {302, 404}
+    assert "dmarq_" not in unconfigured.text
+    assert not auth_middleware._is_public_path("/metrics")  # pylint: disable=protected-access
+
+    _set_metrics_settings(monkeypatch, METRICS_TOKEN="scrape-secret", METRICS_ENABLED=False)
+    assert metrics_client.get("/metrics").status_code == 404
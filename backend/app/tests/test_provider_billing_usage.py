@@ -29,6 +29,7 @@ from app.services.api_tokens import (
     PROVIDER_WRITE_SCOPE,
     READ_REPORTS_SCOPE,
     create_api_token,
+    flush_api_token_usage,
 )
 from app.services.organizations import (
     BILLING_MODE_PROVIDER_RESALE,
@@ -259,6 +260,7 @@ def test_provider_read_token_can_export_usage_without_workspace_membership(
         item["organization"]["id"] for item in response.json()["usage"]["organizations"]
     }
     assert {first_org.id, second_org.id}.issubset(organization_ids)
+    flush_api_token_usage(db_session)
     db_session.refresh(token.token)
     assert token.token.usage_count == 1
     assert token.token.last_used_at is not None
@@ -289,6 +291,7 @@ def test_workspace_scoped_provider_scope_token_falls_back_to_admin_auth(
 
     assert response.status_code == 401
     assert response.json()["detail"].startswith("Authentication required")
+    flush_api_token_usage(db_session)
     db_session.refresh(token.token)
     assert token.token.usage_count == 0
     assert token.token.last_used_at is None
@@ -22,6 +22,7 @@ from app.services.api_tokens import (
     READ_REPORTS_SCOPE,
     READ_TLS_SCOPE,
     create_api_token,
+    flush_api_token_usage,
 )
 from app.services.health_score_snapshots import upsert_health_score_snapshot
 from app.services.organizations import (
@@ -306,6 +307,7 @@ def test_public_reports_api_requires_scoped_token(client: TestClient, db_session
     assert response.status_code == 200
     assert response.json()["reports"][0]["id"] == "public-api-001"
 
+    flush_api_token_usage(db_session)
     token = db_session.query(APIToken).filter(APIToken.id == created.token.id).one()
     assert token.usage_count == 1
     assert token.last_used_at is not None
@@ -0,0 +1,169 @@
+"""Tests for read-model ETags, conditional GETs and response compression."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+from app.api.api_v1.endpoints import domains as domains_endpoint
+from app.core.config import get_settings
+from app.middleware.compression import CompressionMiddleware
+from app.models.domain import Domain
+from app.models.setting import Setting
+from app.models.workspace import Workspace
+from app.services import report_persistence
+from app.services.workspaces import get_or_create_default_workspace
+from app.tests.test_domain_detail_endpoints import DOMAIN, REPORT_DICT_POLICY
+
+
+@pytest.fixture()
+def report_client(authed_client: TestClient, db_session):
+    workspace = get_or_create_default_workspace(db_session)
+    db_session.add(Domain(name=DOMAIN, workspace_id=workspace.id, active=True))
+    db_session.commit()
+    report_persistence.save_parsed_report(db_session, REPORT_DICT_POLICY, workspace_id=workspace.id)
+    db_session.commit()
+    return authed_client, db_session, workspace
+
+
+@pytest.fixture(autouse=True)
+def _stub_source_network_enrichment(monkeypatch):
+    async def fake_networks(*_args, **_kwargs):
+        return {}
+
+    monkeypatch.setattr(domains_endpoint, "lookup_sources_network_cached", fake_networks)
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/v1/stats/dashboard",
+        "/api/v1/domains/summary",
+        f"/api/v1/domains/{DOMAIN}/sources",
+        f"/api/v1/domains/{DOMAIN}/detail/cached",
+    ],
+)
+def test_unchanged_read_model_poll_returns_not_modified(report_client, path):
+    client, _db, _workspace = report_client
+
+    first = client.get(path)
+    etag = first.headers["etag"]
+    repeat = client.get(path, headers={"If-None-Match": etag})
+    refreshed = client.get(path, params={"refresh": "true", "force_refresh": "true"})
+
+    assert first.status_code == 200
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    assert repeat.headers["etag"] == etag.removeprefix("W/")
+    assert refreshed.status_code == 200
+
+
+def test_ingest_and_local_writes_change_the_etag(report_client):
+    client, db_session, workspace = report_client
+    path = f"/api/v1/domains/{DOMAIN}/sources"
+    etag = client.get(path).headers["etag"]
+
+    report_persistence.save_parsed_report(
+        db_session,
+        {**REPORT_DICT_POLICY, "report_id": "rpt-etag-second"},
+        workspace_id=workspace.id,
+    )
+    db_session.commit()
+    after_ingest = client.get(path, headers={"If-None-Match": etag})
+
+    db_session.add(Setting(key="etag-test", value="changed"))
+    db_session.commit()
+    after_write = client.get(path, headers={"If-None-Match": after_ingest.headers["etag"]})
+
+    assert after_ingest.status_code == 200
+    assert after_ingest.headers["etag"] != etag
+    assert after_write.status_code == 200
+    assert after_write.headers["etag"] != after_ingest.headers["etag"]
+
+
+def test_unrelated_writes_keep_the_etag(report_client):
+    client, db_session, _workspace = report_client
+    path = f"/api/v1/domains/{DOMAIN}/sources"
+    etag = client.get(path).headers["etag"]
+
+    other = Workspace(slug="etag-other", name="ETag Other", active=True)
+    db_session.add(other)
+    db_session.flush()
+    db_session.add(Domain(name="other.example", workspace_id=other.id, active=True))
+    db_session.commit()
+    repeat = client.get(path, headers={"If-None-Match": etag})
+
+    assert repeat.status_code == 304
+    assert repeat.headers["etag"] == etag.removeprefix("W/")
+
+
+def test_read_model_etags_can_be_disabled(report_client, monkeypatch):
+    client, _db, _workspace = report_client
+    monkeypatch.setenv("READ_MODEL_ETAG_TTL_SECONDS", "0")
+    get_settings.cache_clear()
+
+    response = client.get("/api/v1/domains/summary", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+
+def _compression_client(minimum_size: int = 64) -> TestClient:
+    application = FastAPI()
+    application.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+
+    @application.get("/large")
+    def large():
+        return JSONResponse({"rows": ["x" * 40] * 50}, headers={"ETag": '"abc"'})
+
+    @application.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @application.get("/stream")
+    def stream():
+        return StreamingResponse(
+            (f"line {index}\n" for index in range(200)), media_type="text/plain"
+        )
+
+    return TestClient(application)
+
+
+def test_large_json_is_compressed_with_a_weak_validator():
+    client = _compression_client()
+
+    compressed = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"] == 'W/"abc"'
+    assert "Accept-Encoding" in compressed.headers["vary"]
+    assert compressed.json() == identity.json()
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] == '"abc"'
+
+
+def test_small_and_streamed_responses():
+    client = _compression_client()
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    streamed = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in small.headers
+    assert small.text == "ok"
+    assert streamed.headers["content-encoding"] == "gzip"
+    assert "content-length" not in streamed.headers
+    assert streamed.text == "".join(f"line {index}\n" for index in range(200))
+
+
+def test_api_read_models_are_compressed_by_the_app(report_client):
+    client, _db, _workspace = report_client
+
+    response = client.get(
+        f"/api/v1/domains/{DOMAIN}/detail/cached", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].startswith('W/"')
+    assert response.json()
@@ -2,6 +2,8 @@ import json
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
+from sqlalchemy import event
+
 from app.models.workspace_access import WorkspaceAuditLog
 from app.services import remediation_dispatch
 from app.services.webhook_events import (
@@ -913,6 +915,46 @@ def test_summarize_remediation_activity_counts_verified_fixed_items(db_session):
     assert activity["summary"]["needs_operator_follow_up"] == 0
 
 
+def test_summarize_remediation_activity_caps_each_domain_in_one_query(db_session):
+    workspace = get_or_create_default_workspace(db_session)
+    db_session.add_all(
+        [
+            WorkspaceAuditLog(
+                workspace_id=workspace.id,
+                actor_type="operator",
+                action="remediation.notification_dispatch_enqueued",
+                entity_type="remediation_notification",
+                entity_id=f"dns:{domain}:{index}",
+                entity_name=f" {domain.upper()}. ",
+                details=json.dumps({"delivery_enqueued": True}),
+                created_at=datetime(2026, 7, 1, 8, index, 0),
+            )
+            for domain in ("busy.example", "quiet.example")
+            for index in range(3 if domain == "busy.example" else 1)
+        ]
+    )
+    db_session.commit()
+    db_session.refresh(workspace)
+    statements = []
+    event.listen(
+        db_session.get_bind(),
+        "before_cursor_execute",
+        lambda _conn, _cursor, statement, *_args: statements.append(statement),
+    )
+
+    activity = remediation_dispatch.summarize_remediation_activity(
+        db_session,
+        workspace=workspace,
+        domains=["busy.example", "quiet.example"],
+        row_limit=2,
+    )
+
+    assert len(statements) == 1
+    assert activity["domains"]["busy.example"]["dispatch_enqueued"] == 2
+    assert activity["domains"]["quiet.example"]["dispatch_enqueued"] == 1
+    assert db_session.query(WorkspaceAuditLog.entity_key).distinct().count() == 2
+
+
 def test_build_remediation_dispatch_preview_fetches_context_when_not_preloaded(monkeypatch):
     calls = {"settings": 0, "webhooks": 0}
 
@@ -0,0 +1,259 @@
+"""Tests for monthly report partition helpers and the copied record partition key."""
+
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_mock_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models.domain import Domain
+from app.models.report import DMARCReport, ReportRecord
+from app.services import report_partitions
+from app.services.report_partitions import (
+    DELIVERY_EVENTS,
+    PROJECTIONS,
+    RECORDS,
+    REPORTS,
+    add_months,
+    convert_table,
+    drop_expired_partitions,
+    month_start,
+    partition_month,
+    partition_name,
+)
+
+
+def test_month_helpers_cross_year_boundaries():
+    """Partition months are UTC calendar months named <table>_pYYYYMM."""
+    month = month_start(datetime(2025, 12, 31, 23, 59, tzinfo=timezone.utc))
+
+    assert month == datetime(2025, 12, 1)
+    assert add_months(month, 1) == datetime(2026, 1, 1)
+    assert add_months(month, -12) == datetime(2024, 12, 1)
+    assert partition_name(REPORTS, month) == "dmarc_reports_p202512"
+    assert partition_month("delivery_events_p202601") == datetime(2026, 1, 1)
+    assert partition_month("dmarc_reports_default") is None
+
+
+def test_partition_bounds_match_the_key_type():
+    """Integer keys are bounded by Unix time, timestamp keys by a literal."""
+    month = datetime(2026, 1, 1)
+
+    assert report_partitions._bound(REPORTS, month) == "1767225600"
+    assert report_partitions._bound(DELIVERY_EVENTS, month) == "'2026-01-01 00:00:00'"
+
+
+def test_partition_maintenance_is_a_noop_on_sqlite(db_session: Session, monkeypatch):
+    """SQLite installs keep plain tables and never run partition DDL."""
+    monkeypatch.setattr(report_partitions, "SessionLocal", lambda: db_session)
+
+    assert report_partitions.run_partition_maintenance() == {"created": [], "removed": []}
+    assert not report_partitions.is_partitioned(db_session, REPORTS)
+
+
+def test_records_copy_the_report_begin_date(db_session: Session):
+    """Records inserted with only a report id still get the partition key."""
+    domain = Domain(name="partition.example")
+    db_session.add(domain)
+    db_session.flush()
+    report = DMARCReport(
+        domain_id=domain.id,
+        report_id="partition-report",
+        org_name="Reporter",
+        begin_date=1767225600,
+        end_date=1767311999,
+    )
+    db_session.add(report)
+    db_session.flush()
+    db_session.add_all(
+        [
+            ReportRecord(report_id=report.id, source_ip="192.0.2.1", disposition="none"),
+            ReportRecord(report=report, source_ip="192.0.2.2", disposition="none"),
+        ]
+    )
+    db_session.commit()
+
+    assert {record.report_begin_date for record in db_session.query(ReportRecord)} == {1767225600}
+
+
+class _Result:
+    def __init__(self, value=None, rows=()):
+        self.value = value
+        self.rows = list(rows)
+
+    def scalar(self):
+        return self.value
+
+    def scalars(self):
+        return iter(self.rows)
+
+    def one(self):
+        return self.rows[0]
+
+    def all(self):
+        return self.rows
+
+
+class FakePostgres:
+    """Records the SQL partition management would run and answers catalog queries."""
+
+    def __init__(
+        self,
+        *,
+        partitioned=(),
+        references=None,
+        partitions=None,
+        partition_retention=None,
+        workspace_retention=None,
+    ):
+        self._bind = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+        self.partitioned = set(partitioned)
+        self.references = references or {}
+        self.partitions = partitions or {}
+        self.partition_retention = partition_retention
+        self.workspace_retention = workspace_retention
+        self.statements = []
+        self._ddl = create_mock_engine(
+            "postgresql://",
+            lambda statement, *_args, **_kwargs: self.statements.append(
+                str(statement.compile(dialect=postgresql.dialect()))
+            ),
+        )
+
+    def get_bind(self):
+        return self._bind
+
+    def connection(self):
+        return self._ddl
+
+    def begin_nested(self):
+        return nullcontext()
+
+    def execute(self, statement, params=None):
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        self.statements.append(sql)
+        name = (params or {}).get("name")
+        if "FROM pg_class" in sql:
+            return _Result("p" if name in self.partitioned else None)
+        if "FROM pg_constraint" in sql:
+            return _Result(rows=self.references.get(name, []))
+        if "FROM pg_inherits" in sql:
+            return _Result(rows=self.partitions.get(name, []))
+        if "pg_get_serial_sequence" in sql:
+            return _Result(f"{name}_id_seq")
+        if sql.startswith("SELECT min("):
+            return _Result(rows=[(None, None)])
+        if "AS partition_rows" in sql:
+            return _Result(self.partition_retention)
+        if "FROM workspaces" in sql:
+            return _Result(self.workspace_retention)
+        if "PARTITION BY RANGE" in sql:
+            self.partitioned.add(sql.split()[2])
+        return _Result()
+
+
+def test_converting_reports_moves_the_record_fk_to_the_month_key():
+    """The record foreign key is dropped by name and restored on (id, begin_date)."""
+    db = FakePostgres(
+        references={"dmarc_reports": [("report_records", "report_records_report_id_fkey")]}
+    )
+
+    assert convert_table(db, REPORTS, now=datetime(2026, 1, 15)) is True
+
+    statements = db.statements
+    assert not any("CASCADE" in sql for sql in statements)
+    drop_fk = statements.index(
+        "ALTER TABLE report_records DROP CONSTRAINT report_records_report_id_fkey"
+    )
+    assert drop_fk < statements.index("DROP TABLE dmarc_reports_unpartitioned")
+    assert "ALTER TABLE dmarc_reports ADD PRIMARY KEY (id, begin_date)" in statements
+    assert any("REFERENCES domains (id)" in sql for sql in statements)
+    assert statements[-1] == (
+        "ALTER TABLE report_records ADD CONSTRAINT fk_report_records_report_month "
+        "FOREIGN KEY (report_id, report_begin_date) REFERENCES dmarc_reports (id, begin_date)"
+    )
+
+
+def test_converting_records_links_them_to_partitioned_reports():
+    """Records never get an ``id``-only key to a partitioned report table."""
+    db = FakePostgres(partitioned={"dmarc_reports"})
+
+    assert convert_table(db, RECORDS, now=datetime(2026, 1, 15)) is True
+
+    assert not any("REFERENCES dmarc_reports (id)" in sql for sql in db.statements)
+    assert any("REFERENCES dmarc_reports (id, begin_date)" in sql for sql in db.statements)
+    assert "ALTER TABLE report_records ADD PRIMARY KEY (id, report_begin_date)" in db.statements
+
+
+def test_conversion_stops_on_foreign_keys_it_cannot_restore():
+    """Other references to a converted table abort before anything is renamed."""
+    db = FakePostgres(references={"delivery_events": [("audit_rows", "audit_rows_event_fkey")]})
+
+    with pytest.raises(RuntimeError, match="audit_rows.audit_rows_event_fkey"):
+        convert_table(db, DELIVERY_EVENTS)
+
+    assert not any("RENAME" in sql or "DROP" in sql for sql in db.statements)
+
+
+def test_partitioned_delivery_event_key_includes_the_timestamp():
+    """Unique keys are widened with the partition column, as PostgreSQL requires."""
+    db = FakePostgres()
+
+    assert convert_table(db, DELIVERY_EVENTS, now=datetime(2026, 1, 15)) is True
+
+    assert (
+        "ALTER TABLE delivery_events ADD CONSTRAINT uq_delivery_event_workspace_source_event "
+        "UNIQUE (workspace_id, source_system, provider, event_id, occurred_at)"
+    ) in db.statements
+
+
+def test_converting_a_partitioned_table_is_a_noop():
+    db = FakePostgres(partitioned={"dmarc_reports"})
+
+    assert convert_table(db, REPORTS) is False
+    assert len(db.statements) == 1
+
+
+@pytest.mark.parametrize("detach_only", [False, True])
+def test_drop_expired_partitions_removes_whole_expired_months(detach_only):
+    """Report months expire after retention; records follow their report month."""
+    db = FakePostgres(
+        partitioned={table.name for table in (REPORTS, RECORDS, PROJECTIONS, DELIVERY_EVENTS)},
+        partitions={
+            "dmarc_reports": ["dmarc_reports_p202401", "dmarc_reports_p202512"],
+            "report_records": ["report_records_p202401", "report_records_p202512"],
+            "domain_source_daily_projections": ["domain_source_daily_projections_p202401"],
+            "delivery_events": ["delivery_events_p202401", "delivery_events_p202601"],
+        },
+        partition_retention=400,
+    )
+
+    removed = drop_expired_partitions(db, now=datetime(2026, 1, 15), detach_only=detach_only)
+
+    assert removed == [
+        "report_records_p202401",
+        "dmarc_reports_p202401",
+        "domain_source_daily_projections_p202401",
+        "delivery_events_p202401",
+    ]
+    assert "ALTER TABLE dmarc_reports DETACH PARTITION dmarc_reports_p202401" in db.statements
+    assert ("DROP TABLE dmarc_reports_p202401" in db.statements) is not detach_only
+    assert not any("p202512" in sql and "DETACH" in sql for sql in db.statements)
+
+
+@pytest.mark.parametrize(
+    ("partition_retention", "workspace_retention", "expected"),
+    [(30, 800, 30), (None, 800, 800), (None, None, 400)],
+)
+def test_report_retention_uses_the_longest_workspace_setting(
+    partition_retention, workspace_retention, expected
+):
+    """Empty months fall back to the longest configured retention, then the default."""
+    db = FakePostgres(
+        partition_retention=partition_retention, workspace_retention=workspace_retention
+    )
+
+    assert report_partitions._report_retention_days(db, "dmarc_reports_p202401") == expected
@@ -1,5 +1,16 @@
+import json
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+
 from app.services import report_store as report_store_module
-from app.services.report_store import ReportStore, _auth_status_from_counts, _dominant_result
+from app.services.report_store import (
+    ReportStore,
+    StoredRecord,
+    _auth_status_from_counts,
+    _dominant_result,
+    record_to_dict,
+)
 
 
 def _sample_report(domain: str = "example.com") -> dict:
@@ -491,3 +502,59 @@ class TestReportStore:
         assert by_selector["manual-only"]["classification"] == "manually_configured"
         assert by_selector["manual-only"]["manual_configured"] is True
         assert "provider-internal" not in by_selector
+
+    def test_stored_records_read_like_parsed_record_dicts(self):
+        row = SimpleNamespace(
+            source_ip="203.0.113.9",
+            count=4,
+            disposition=None,
+            dkim="pass",
+            spf=None,
+            header_from="test.com",
+            envelope_from=None,
+            envelope_to=None,
+            dkim_auth_details='[{"domain": "test.com", "selector": "s1", "result": "fail"}]',
+            spf_auth_details=None,
+            policy_override_reasons="not json",
+            record_extensions=None,
+            source_evidence='{"captured_at": "2026-01-01T00:00:00Z"}',
+        )
+        record = StoredRecord.from_row(row)
+        store = ReportStore.get_instance()
+        store.add_report({**_sample_report("test.com"), "records": [record]})
+
+        assert not hasattr(record, "__dict__")
+        assert record.to_dict() == dict(record) == record
+        assert record["disposition"] == "none" and record["spf_result"] == "unknown"
+        assert record.get("policy_override_reasons") == [] and record.get("missing") is None
+        assert record["source_evidence"] == {"captured_at": "2026-01-01T00:00:00Z"}
+        assert store.get_domain_sources("test.com")[0]["dkim_pass_count"] == 4
+        evidence = store.get_domain_selector_evidence("test.com")
+        assert [row["selector"] for row in evidence] == ["s1"]
+
+    def test_stored_records_encode_as_parsed_record_dicts(self):
+        row = SimpleNamespace(
+            source_ip="203.0.113.9",
+            count=2,
+            disposition="none",
+            dkim="fail",
+            spf="pass",
+            header_from="test.com",
+            envelope_from=None,
+            envelope_to=None,
+            dkim_auth_details='[{"domain": "test.com", "selector": "s1", "result": "fail"}]',
+            spf_auth_details=[{"domain": "test.com", "result": "pass"}],
+            policy_override_reasons=None,
+            record_extensions=None,
+            source_evidence=None,
+        )
+        record = StoredRecord.from_row(row)
+
+        encoded = jsonable_encoder(record)
+
+        assert encoded == json.loads(json.dumps(record_to_dict(record)))
+        assert set(encoded) == set(StoredRecord.KEYS)
+        assert encoded["dkim"] == [{"domain": "test.com", "selector": "s1", "result": "fail"}]
+        assert encoded["spf"] == [{"domain": "test.com", "result": "pass"}]
+        assert record["dkim"] is record["dkim"]
+        assert record_to_dict({"source_ip": "198.51.100.1"}) == {"source_ip": "198.51.100.1"}
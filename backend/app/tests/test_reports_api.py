@@ -18,13 +18,26 @@ from app.core.database import get_db
 from app.core.security import require_admin_auth
 from app.models.domain import Domain
 from app.models.organization import Entitlement, Organization
-from app.models.report import DMARCReport, DomainSourceDailyProjection, ReportRecord
+from app.models.report import (
+    DMARCReport,
+    DomainDKIMSelectorObservation,
+    DomainSourceDailyProjection,
+    DomainSourceFirstSeen,
+    ReportRecord,
+)
 from app.models.user import User
 from app.models.workspace import Workspace
 from app.models.workspace_access import WorkspaceMembership
+from app.services import report_uploads
+from app.services.dns_posture_snapshots import posture_selectors
 from app.services.organizations import OrganizationPlanLimitError
 from app.services.ptr_lookup import PtrLookupResult
-from app.services.report_persistence import persisted_report_to_dict, save_parsed_report
+from app.services.report_persistence import (
+    delete_persisted_report,
+    hydrate_domain_report_store_from_db,
+    persisted_report_to_dict,
+    save_parsed_report,
+)
 from app.services.report_store import ReportStore
 from app.services.source_network import SourceNetworkIntelligence
 from app.services.source_read_projection import (
@@ -361,6 +374,119 @@ def test_projection_window_uses_report_end_time(db_session, monkeypatch):
     assert sources[0]["count"] == 4
 
 
+def test_source_read_projection_sums_days_per_sender(db_session):
+    """Grouped counters, per-day history and merged metadata cover every sender-day."""
+    workspace = get_or_create_default_workspace(db_session)
+    for day in range(3):
+        report = _parsed_report(
+            domain="read-projection.example",
+            report_id=f"read-projection-{day}",
+            count=day + 1,
+            begin_ts=1_704_067_200 + day * 86_400,
+            end_ts=1_704_153_599 + day * 86_400,
+        )
+        report["org_name"] = "Receiver A" if day < 2 else "Receiver B"
+        saved, _ = save_parsed_report(db_session, report, workspace_id=workspace.id)
+    db_session.commit()
+
+    sources, reports = load_domain_source_read_projection(
+        db_session,
+        domain_id=saved.domain_id,
+        domain_name="read-projection.example",
+        days=None,
+    )
+
+    assert len(sources) == 1
+    source = sources[0]
+    assert (source["count"], source["dmarc_pass_count"], source["report_count"]) == (6, 6, 3)
+    assert (source["first_seen"], source["last_seen"]) == (1_704_067_200, 1_704_326_399)
+    assert source["active_days"] == 3
+    assert [day["count"] for day in source["volume_history"]] == [1, 2, 3]
+    assert source["report_generators"] == ["Receiver A", "Receiver B"]
+    assert source["disposition_counts"] == {"none": 6}
+    assert len(reports) == 3
+
+
+def test_save_parsed_report_keeps_the_earliest_first_seen_sender(db_session):
+    """Late-arriving older reports move first_seen back and add to the total."""
+    workspace = get_or_create_default_workspace(db_session)
+    for report_id, begin_ts, count in (("later", 1_704_240_000, 4), ("earlier", 1_704_067_200, 6)):
+        save_parsed_report(
+            db_session,
+            _parsed_report(
+                domain="first-seen.example",
+                report_id=report_id,
+                count=count,
+                begin_ts=begin_ts,
+                end_ts=begin_ts + 86_399,
+            ),
+            workspace_id=workspace.id,
+        )
+    db_session.commit()
+
+    row = db_session.query(DomainSourceFirstSeen).one()
+
+    assert (row.source_ip, row.first_seen, row.last_seen) == (
+        "192.0.2.55",
+        1_704_067_200,
+        1_704_326_399,
+    )
+    assert row.message_count == 10
+
+
+def test_selector_evidence_reads_the_ingest_time_observation_index(db_session):
+    """Hydrated selector evidence comes from the index and matches a record walk."""
+    workspace = get_or_create_default_workspace(db_session)
+    now = int(time.time())
+    for report_id, end_ts, result in (("old", now - 20 * 86_400, "pass"), ("new", now, "fail")):
+        report = _parsed_report(
+            domain="selectors.example",
+            report_id=report_id,
+            begin_ts=end_ts - 3_600,
+            end_ts=end_ts,
+        )
+        report["records"][0]["dkim"] = [
+            {"domain": "selectors.example", "selector": "s1", "result": result},
+            {"domain": "mail.selectors.example", "selector": "s1", "result": "pass"},
+            {"domain": "vendor.example", "selector": "vendor", "result": "pass"},
+        ]
+        save_parsed_report(db_session, report, workspace_id=workspace.id)
+    db_session.commit()
+
+    indexed = ReportStore()
+    hydrate_domain_report_store_from_db(
+        db_session, indexed, "selectors.example", workspace_id=workspace.id
+    )
+    walked = ReportStore()
+    for report in indexed.get_domain_reports("selectors.example"):
+        walked.add_report(report)
+    domain = db_session.query(Domain).filter(Domain.name == "selectors.example").one()
+
+    assert [row.selector for row in db_session.query(DomainDKIMSelectorObservation)] == [
+        "s1",
+        "s1",
+    ]
+    evidence = indexed.get_domain_selector_evidence("selectors.example", now=now)
+
+    assert "selectors.example" in indexed.domain_selector_observations
+    assert "selectors.example" not in walked.domain_selector_observations
+    assert evidence == walked.get_domain_selector_evidence("selectors.example", now=now)
+    assert (evidence[0]["classification"], evidence[0]["current_failure_count"]) == (
+        "active_failing",
+        5,
+    )
+    assert posture_selectors(db_session, domain) == ["s1"]
+
+    # Deleting a report empties the index until the backfill re-projects the
+    # domain; the selectors are read from the remaining records meanwhile.
+    assert delete_persisted_report(
+        db_session, "selectors.example", "old", workspace_id=workspace.id
+    )
+    db_session.commit()
+    assert db_session.query(DomainDKIMSelectorObservation).count() == 0
+    assert posture_selectors(db_session, domain) == ["s1"]
+
+
 def _add_user(db_session, email: str, *, is_superuser: bool = False) -> User:
     user = User(
         email=email,
@@ -648,7 +774,7 @@ def test_upload_report_translates_raced_domain_integrity_error(
             concurrent_db.close()
         raise IntegrityError("insert", {}, Exception("UNIQUE constraint failed: domains.name"))
 
-    monkeypatch.setattr(reports_endpoint, "save_parsed_report", raced_save)
+    monkeypatch.setattr(report_uploads, "save_parsed_report", raced_save)
 
     response = authed_client.post(
         "/api/v1/reports/upload",
@@ -670,7 +796,7 @@ def test_upload_report_recovers_from_same_workspace_domain_race(
     default_workspace = get_or_create_default_workspace(db_session)
     db_session.commit()
     TestingSessionLocal = sessionmaker(bind=db_session.get_bind())
-    real_save_parsed_report = reports_endpoint.save_parsed_report
+    real_save_parsed_report = report_uploads.save_parsed_report
     call_count = 0
 
     def raced_save(db, report, *, workspace_id=None):
@@ -686,7 +812,7 @@ def test_upload_report_recovers_from_same_workspace_domain_race(
             raise IntegrityError("insert", {}, Exception("UNIQUE constraint failed: domains.name"))
         return real_save_parsed_report(db, report, workspace_id=workspace_id)
 
-    monkeypatch.setattr(reports_endpoint, "save_parsed_report", raced_save)
+    monkeypatch.setattr(report_uploads, "save_parsed_report", raced_save)
 
     response = authed_client.post(
         "/api/v1/reports/upload",
@@ -723,7 +849,7 @@ def test_upload_report_translates_retry_plan_limit_error(
             entitlement_key="aggregate_messages",
         )
 
-    monkeypatch.setattr(reports_endpoint, "save_parsed_report", raced_save)
+    monkeypatch.setattr(report_uploads, "save_parsed_report", raced_save)
 
     response = authed_client.post(
         "/api/v1/reports/upload",
@@ -830,6 +956,47 @@ def test_persisted_report_to_dict_hydrates_optional_json_metadata(db_session):
     assert hydrated_with_bad_json["records"][0]["extensions"] == {}
 
 
+def test_network_sources_match_cidr_and_failing_records(authed_client: TestClient, db_session):
+    """Source investigation filters typed source addresses by CIDR block."""
+    workspace = get_or_create_default_workspace(db_session)
+    now = int(time.time())
+    report = _parsed_report(
+        domain="network.example", report_id="network-report", begin_ts=now - 86400, end_ts=now
+    )
+    report["records"] = [
+        {"source_ip": ip, "count": count, "dkim_result": dkim, "spf_result": "fail"}
+        for ip, count, dkim in [
+            ("203.0.113.7", 4, "fail"),
+            ("203.0.113.9", 2, "pass"),
+            ("198.51.100.1", 8, "fail"),
+            ("unknown", 1, "fail"),
+        ]
+    ]
+    for record in report["records"]:
+        record.update(disposition="none", header_from="network.example")
+    _persist_parsed_report(db_session, report, workspace_id=workspace.id)
+
+    typed = {r.source_ip: r.source_inet for r in db_session.query(ReportRecord).all()}
+    assert typed["203.0.113.7"] == "203.0.113.7"
+    assert typed["unknown"] is None
+
+    failing = authed_client.get("/api/v1/reports/sources/network?network=203.0.113.0/24")
+    everything = authed_client.get(
+        "/api/v1/reports/sources/network?network=203.0.113.0/24&failing_only=false"
+    )
+    invalid = authed_client.get("/api/v1/reports/sources/network?network=not-a-network")
+
+    assert failing.status_code == 200
+    assert [(s["source_ip"], s["failed_count"]) for s in failing.json()["sources"]] == [
+        ("203.0.113.7", 4)
+    ]
+    assert [s["source_ip"] for s in everything.json()["sources"]] == [
+        "203.0.113.7",
+        "203.0.113.9",
+    ]
+    assert invalid.status_code == 400
+
+
 def test_report_reads_hydrate_from_persisted_rows(authed_client: TestClient):
     """Report read APIs rebuild the in-memory projection from the database."""
     zip_bytes = _make_zip(SAMPLE_XML)
@@ -1679,9 +1846,7 @@ def test_get_report_by_id_dedupes_ptr_lookups_for_repeated_source_ips(
     monkeypatch.setattr(reports_endpoint, "lookup_sources_network_cached", fake_networks)
 
     started = time.monotonic()
-    response = authed_client.get(
-        "/api/v1/reports/large-ptr-dedupe-report?hydrate_enrichment=true"
-    )
+    response = authed_client.get("/api/v1/reports/large-ptr-dedupe-report?hydrate_enrichment=true")
     elapsed = time.monotonic() - started
 
     assert response.status_code == 200
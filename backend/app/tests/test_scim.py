@@ -12,6 +12,7 @@ from app.services.api_tokens import (
     SCIM_READ_SCOPE,
     SCIM_WRITE_SCOPE,
     create_api_token,
+    flush_api_token_usage,
 )
 from app.services.workspaces import get_or_create_default_workspace
 
@@ -65,6 +66,7 @@ def test_scim_create_user_maps_workspace_role_and_audits(client: TestClient, db_
     assert audit.entity_name == "scim.user@example.com"
     assert "idp-user-123" not in (audit.details or "")
 
+    flush_api_token_usage(db_session)
     api_token = db_session.query(APIToken).filter_by(id=token.token.id).one()
     assert api_token.usage_count == 1
 
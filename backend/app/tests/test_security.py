@@ -9,11 +9,14 @@ import re
 from pathlib import Path
 
 import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.testclient import TestClient
 
 import app.services.dmarc_parser as parser_module
 from app.core.security import add_api_key, generate_api_key, verify_api_key
 from app.main import create_app
+from app.middleware.security import SecurityHeadersMiddleware
 from app.services.dmarc_parser import DMARCParser
 from app.utils.domain_validator import validate_domain, validate_domain_config
 
@@ -23,6 +26,16 @@ def _script_tags_without_src(body: str) -> list[str]:
     return [tag for tag in script_tags if not re.search(r"\ssrc\s*=", tag, re.IGNORECASE)]
 
 
+def _static_ref(attribute: str, path: str) -> str:
+    """Return the template source for a fingerprint-aware static asset reference."""
+    return f"{attribute}=\"{{{{ static_url('{path}') }}}}\""
+
+
+def _fresh_client() -> TestClient:
+    """Build a new app so startup-computed security headers see patched env vars."""
+    return TestClient(create_app())
+
+
 class TestAPIKeySecurity:
     """Test API key generation and verification."""
 
@@ -150,11 +163,11 @@ class TestSecurityHeaders:
         assert "https://cdn.jsdelivr.net" not in csp
         assert "https://cdn.tailwindcss.com" not in csp
 
-    def test_csp_compatibility_mode_restores_legacy_policy(self, client: TestClient, monkeypatch):
+    def test_csp_compatibility_mode_restores_legacy_policy(self, monkeypatch):
         """Operators retain a temporary escape hatch for custom legacy templates."""
         monkeypatch.setenv("CSP_COMPATIBILITY_MODE", "true")
 
-        response = client.get("/mail-sources")
+        response = _fresh_client().get("/health")
         csp = response.headers["Content-Security-Policy"]
 
         assert "'unsafe-eval'" in csp
@@ -171,15 +184,15 @@ class TestSecurityHeaders:
             Path(__file__).resolve().parents[1] / "static" / "js" / "vendor" / "alpine.min.js"
         ).read_text()
 
-        assert 'src="/static/js/vendor/alpine.min.js"' in body
+        assert _static_ref("src", "js/vendor/alpine.min.js") in body
         assert "alpinejs@3.x.x/dist/cdn.min.js" not in body
         assert "cdn.tailwindcss.com" not in body
         assert "cdn.jsdelivr.net" not in body
         assert not _script_tags_without_src(body)
         assert not re.search(r"<style\b", body, re.IGNORECASE)
-        assert 'src="/static/js/base-layout.js"' in body
-        assert 'href="/static/css/app.css"' in body
-        assert 'href="/static/css/page-utilities.css"' in body
+        assert _static_ref("src", "js/base-layout.js") in body
+        assert _static_ref("href", "css/app.css") in body
+        assert _static_ref("href", "css/page-utilities.css") in body
         assert "@alpinejs/csp" in package["devDependencies"]
         assert "new Function" not in alpine
 
@@ -191,20 +204,18 @@ class TestSecurityHeaders:
 
         assert not _script_tags_without_src(body)
         assert not re.search(r"<style\b", body, re.IGNORECASE)
-        assert f'src="/static/js/{template_name.removesuffix(".html")}-page.js"' in body
-        assert 'src="/static/js/vendor/alpine.min.js"' in body
+        assert _static_ref("src", f"js/{template_name.removesuffix('.html')}-page.js") in body
+        assert _static_ref("src", "js/vendor/alpine.min.js") in body
         assert "cdn.jsdelivr.net" not in body
         assert "cdn.tailwindcss.com" not in body
-        assert 'href="/static/css/app.css"' in body
-        assert 'href="/static/css/page-utilities.css"' in body
+        assert _static_ref("href", "css/app.css") in body
+        assert _static_ref("href", "css/page-utilities.css") in body
 
-    def test_csp_report_only_header_appears_when_flag_enabled(
-        self, client: TestClient, monkeypatch
-    ):
+    def test_csp_report_only_header_appears_when_flag_enabled(self, monkeypatch):
         """When CSP_REPORT_ONLY is true, the strict target CSP should appear as report-only."""
         monkeypatch.setenv("CSP_REPORT_ONLY", "true")
 
-        response = client.get("/mail-sources")
+        response = _fresh_client().get("/health")
         assert "Content-Security-Policy-Report-Only" in response.headers
 
         csp_ro = response.headers["Content-Security-Policy-Report-Only"]
@@ -212,11 +223,11 @@ class TestSecurityHeaders:
         assert "'unsafe-eval'" not in csp_ro
         assert "script-src 'self'" in csp_ro
 
-    def test_legacy_strict_flag_remains_strict(self, client: TestClient, monkeypatch):
+    def test_legacy_strict_flag_remains_strict(self, monkeypatch):
         """The old strict flag stays harmless for existing deployments."""
         monkeypatch.setenv("CSP_ENFORCE_STRICT", "true")
 
-        response = client.get("/mail-sources")
+        response = _fresh_client().get("/health")
 
         csp = response.headers["Content-Security-Policy"]
         assert "'unsafe-inline'" not in csp
@@ -225,6 +236,37 @@ class TestSecurityHeaders:
         assert "style-src 'self' https://fonts.googleapis.com" in csp
         assert "https://cdn.jsdelivr.net" not in csp
 
+    def test_api_cache_headers_replace_downstream_values(self):
+        """API responses get exactly one no-store header even if the route set its own."""
+        application = FastAPI()
+        application.add_middleware(SecurityHeadersMiddleware)
+
+        @application.get("/api/v1/cached")
+        def cached():
+            return JSONResponse({"ok": True}, headers={"Cache-Control": "max-age=60"})
+
+        response = TestClient(application).get("/api/v1/cached")
+
+        assert response.headers.get_list("cache-control") == [
+            "no-store, no-cache, must-revalidate, private"
+        ]
+        assert response.headers["X-Frame-Options"] == "DENY"
+
+    def test_streaming_responses_pass_through_with_headers(self):
+        """The raw ASGI middleware must not buffer streamed bodies."""
+        application = FastAPI()
+        application.add_middleware(SecurityHeadersMiddleware)
+
+        @application.get("/stream")
+        def stream():
+            return StreamingResponse(iter([b"one,", b"two"]), media_type="text/csv")
+
+        response = TestClient(application).get("/stream")
+
+        assert response.content == b"one,two"
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert "cache-control" not in response.headers
+
 
 class TestXMLParsingSecurity:
     """Test XML parsing security (defusedxml, XXE protection)."""
@@ -86,12 +86,21 @@ class TestRequireAdminAuth:
     """Unit tests for the require_admin_auth dependency."""
 
     def _make_request(self, cookies: dict = None):
-        """Build a minimal mock Request with optional cookies."""
-        from unittest.mock import MagicMock
-
-        req = MagicMock()
-        req.cookies = cookies or {}
-        return req
+        """Build a minimal real Request with optional cookies."""
+        from starlette.requests import Request
+
+        cookie_header = "; ".join(f"{name}={value}" for name, value in (cookies or {}).items())
+        headers = [(b"cookie", cookie_header.encode("latin-1"))] if cookie_header else []
+        return Request(
+            {
+                "type": "http",
+                "method": "GET",
+                "path": "/api/v1/admin",
+                "query_string": b"",
+                "headers": headers,
+                "client": ("127.0.0.1", 12345),
+            }
+        )
 
     @pytest.mark.asyncio
     async def test_valid_api_key_returns_auth_context(self):
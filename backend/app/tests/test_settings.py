@@ -13,8 +13,8 @@ from app.core.security import require_admin_auth
 from app.models.alert import AlertConfigurationAudit, AlertHistory
 from app.models.api_token import APIToken
 from app.models.domain import Domain
-from app.models.report import DMARCReport, ReportRecord
 from app.models.mail_source import MailSource
+from app.models.report import DMARCReport, ReportRecord
 from app.models.setting import Setting
 from app.models.workspace import Workspace
 from app.services.account_milestone import (
@@ -23,9 +23,14 @@ from app.services.account_milestone import (
     _has_scope_token,
     build_account_milestone_readiness,
 )
-from app.services.api_tokens import PROVIDER_READ_SCOPE, SCIM_READ_SCOPE
 from app.services.alert_history import list_alert_config_audit, record_alert_config_change
+from app.services.api_tokens import PROVIDER_READ_SCOPE, SCIM_READ_SCOPE
 from app.services.notifications import NotificationResult, send_notification
+from app.services.report_persistence import delete_persisted_report
+from app.services.source_read_projection import (
+    backfill_source_projections,
+    materialize_source_projection,
+)
 from app.services.summary_notifications import send_due_scheduled_summaries
 
 
@@ -73,6 +78,16 @@ def _add_report_record(
             header_from=domain.name,
         )
     )
+    materialize_source_projection(
+        db_session,
+        {
+            "begin_timestamp": report.begin_date,
+            "end_timestamp": report.end_date,
+            "records": [{"source_ip": source_ip, "count": count, "dkim": dkim, "spf": spf}],
+        },
+        domain_id=domain.id,
+        db_report=report,
+    )
 
 
 class TestSettingModel:
@@ -553,7 +568,7 @@ class TestSettingsAPI:
                 self.messages.append({"title": title, "body": body})
                 return True
 
-        monkeypatch.setattr("app.services.notifications.apprise.Apprise", FakeApprise)
+        monkeypatch.setattr("apprise.Apprise", FakeApprise)
 
         authed_client.get("/api/v1/settings")
         authed_client.post(
@@ -596,7 +611,7 @@ class TestSettingsAPI:
                 self.messages.append({"title": title, "body": body})
                 return True
 
-        monkeypatch.setattr("app.services.notifications.apprise.Apprise", FakeApprise)
+        monkeypatch.setattr("apprise.Apprise", FakeApprise)
         db_session.add_all(
             [
                 Setting(
@@ -680,16 +695,16 @@ class TestSettingsAPI:
         )
         db_session.commit()
 
-        monkeypatch.setattr("app.services.notifications.apprise.Apprise", FalseApprise)
+        monkeypatch.setattr("apprise.Apprise", FalseApprise)
         invalid = send_notification(db_session, title="Invalid", body="Body")
         assert invalid.success is False
         assert invalid.invalid_targets == 1
 
-        monkeypatch.setattr("app.services.notifications.apprise.Apprise", RaisingApprise)
+        monkeypatch.setattr("apprise.Apprise", RaisingApprise)
         failed = send_notification(db_session, title="Raises", body="Body")
         assert failed.error == "delivery_failed"
 
-        monkeypatch.setattr("app.services.notifications.apprise.Apprise", NotDeliveredApprise)
+        monkeypatch.setattr("apprise.Apprise", NotDeliveredApprise)
         not_delivered = send_notification(db_session, title="No", body="Body")
         assert not_delivered.error == "not_delivered"
 
@@ -742,7 +757,7 @@ class TestSettingsAPI:
                 self.messages.append({"title": title, "body": body})
                 return True
 
-        monkeypatch.setattr("app.services.notifications.apprise.Apprise", FakeApprise)
+        monkeypatch.setattr("apprise.Apprise", FakeApprise)
         db_session.add_all(
             [
                 Setting(
@@ -821,6 +836,61 @@ class TestSettingsAPI:
         new_source = next(alert for alert in alerts if alert["rule"] == "new_sender_source")
         assert new_source["source_ip"] == "203.0.113.20"
 
+    def test_deleting_a_report_does_not_flag_known_senders_as_new(
+        self,
+        authed_client: TestClient,
+        db_session: Session,
+    ):
+        """Senders re-projected after a delete keep their original first-seen date."""
+        domain = _add_domain(db_session, "deleted.example")
+        for report_id, days_ago in (("known-1", 10), ("known-2", 9)):
+            _add_report_record(
+                db_session,
+                domain,
+                report_id=report_id,
+                days_ago=days_ago,
+                source_ip="203.0.113.10",
+                count=12,
+            )
+        db_session.commit()
+        assert delete_persisted_report(db_session, domain.name, "known-2")
+        db_session.commit()
+
+        _add_report_record(
+            db_session,
+            domain,
+            report_id="known-today",
+            days_ago=0,
+            source_ip="203.0.113.10",
+            count=5,
+        )
+        db_session.commit()
+
+        def new_sources():
+            res = authed_client.get("/api/v1/settings/notifications/alerts")
+            assert res.status_code == 200
+            return [
+                alert["source_ip"]
+                for alert in res.json()["alerts"]
+                if alert["rule"] == "new_sender_source" and alert["domain"] == domain.name
+            ]
+
+        assert new_sources() == []
+        assert backfill_source_projections(db_session) == 1
+        db_session.commit()
+        assert new_sources() == []
+
+        _add_report_record(
+            db_session,
+            domain,
+            report_id="new-today",
+            days_ago=0,
+            source_ip="203.0.113.20",
+            count=5,
+        )
+        db_session.commit()
+        assert new_sources() == ["203.0.113.20"]
+
     def test_notification_alert_rules_detect_missing_reports(
         self,
         authed_client: TestClient,
@@ -0,0 +1,51 @@
+"""Tests that optional integrations stay out of the API's startup import path."""
+
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def _load_script_module():
+    script_path = REPO_ROOT / "scripts" / "check_import_time.py"
+    spec = importlib.util.spec_from_file_location("check_import_time", script_path)
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_importing_the_app_does_not_load_optional_integrations():
+    module = _load_script_module()
+    probe = (
+        "import sys, app.main; "
+        f"print(','.join(name for name in {module.LAZY_MODULES!r} if name in sys.modules))"
+    )
+
+    completed = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=REPO_ROOT / "backend",
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert completed.stdout.strip() == ""
+
+
+def test_import_budget_check_reports_eager_integrations_and_slow_imports():
+    module = _load_script_module()
+    timings = module._parse_importtime(  # pylint: disable=protected-access
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:      1200 |       1200 |   boto3\n"
+        "import time:      5000 |    9100000 | app.main\n"
+    )
+
+    failures = module._check(timings, "app.main", 8000)  # pylint: disable=protected-access
+
+    assert failures == [
+        "boto3 is imported at startup; import it on first use instead",
+        "import app.main took 9100 ms (budget 8000 ms)",
+    ]
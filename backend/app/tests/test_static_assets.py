@@ -0,0 +1,94 @@
+"""Tests for fingerprinted, precompressed static asset serving."""
+
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.core.static_assets as static_assets
+from app.core.static_assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    PrecompressedStaticFiles,
+    build_static_assets,
+    static_url,
+)
+
+SCRIPT = b"window.dmarq = {" + b'"padding": "compressible", ' * 200 + b"};\n"
+
+
+@pytest.fixture()
+def built_static_dir(tmp_path):
+    (tmp_path / "js").mkdir()
+    (tmp_path / "js" / "page.js").write_bytes(SCRIPT)
+    (tmp_path / "img").mkdir()
+    (tmp_path / "img" / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n" + bytes(range(256)))
+    manifest = build_static_assets(tmp_path)
+    return tmp_path, manifest
+
+
+def _client(static_dir) -> TestClient:
+    application = FastAPI()
+    application.mount("/static", PrecompressedStaticFiles(directory=static_dir), name="static")
+    return TestClient(application)
+
+
+def test_build_fingerprints_assets_and_writes_compressed_siblings(built_static_dir):
+    static_dir, manifest = built_static_dir
+
+    hashed_script = manifest["js/page.js"]
+    assert hashed_script.startswith("dist/js/page.") and hashed_script.endswith(".js")
+    assert (static_dir / hashed_script).read_bytes() == SCRIPT
+    assert gzip.decompress((static_dir / f"{hashed_script}.gz").read_bytes()) == SCRIPT
+    assert not (static_dir / f"{manifest['img/logo.png']}.gz").exists()
+    assert json.loads((static_dir / "dist" / "manifest.json").read_text()) == manifest
+
+    (static_dir / "js" / "page.js").write_bytes(SCRIPT + b"// changed\n")
+    rebuilt = build_static_assets(static_dir)
+
+    assert rebuilt["js/page.js"] != hashed_script
+    assert not (static_dir / hashed_script).exists()
+
+
+def test_static_url_prefers_manifest_and_falls_back_to_source(monkeypatch):
+    monkeypatch.setattr(static_assets, "_manifest", {"js/page.js": "dist/js/page.abc123.js"})
+
+    assert static_url("js/page.js") == "/static/dist/js/page.abc123.js"
+    assert static_url("js/other.js") == "/static/js/other.js"
+
+
+def test_hashed_assets_are_immutable_and_served_precompressed(built_static_dir):
+    static_dir, manifest = built_static_dir
+    client = _client(static_dir)
+
+    response = client.get(f"/static/{manifest['js/page.js']}", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith(
+        ("application/javascript", "text/javascript")
+    )
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == SCRIPT
+
+
+def test_identity_and_unhashed_requests_revalidate(built_static_dir):
+    static_dir, manifest = built_static_dir
+    client = _client(static_dir)
+
+    identity = client.get(
+        f"/static/{manifest['js/page.js']}", headers={"Accept-Encoding": "gzip;q=0"}
+    )
+    source = client.get("/static/js/page.js", headers={"Accept-Encoding": "gzip"})
+    not_modified = client.get(
+        "/static/js/page.js", headers={"If-None-Match": source.headers["etag"]}
+    )
+
+    assert "content-encoding" not in identity.headers
+    assert identity.content == SCRIPT
+    assert source.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+    assert "content-encoding" not in source.headers
+    assert not_modified.status_code == 304
@@ -6,7 +6,7 @@ from fastapi.testclient import TestClient
 
 from app.api.api_v1.endpoints import tls_reports as tls_endpoint
 from app.models.domain import Domain
-from app.models.report import TLSReport, TLSReportFailure
+from app.models.report import TLSReport, TLSReportDailyRollup, TLSReportFailure
 from app.models.workspace import Workspace
 from app.services.tls_report_parser import TLSReportParser
 from app.services.tls_report_persistence import (
@@ -191,6 +191,32 @@ def test_tls_report_persistence_helpers(db_session):
     assert skipped["skipped"] == 1
 
 
+def test_save_tls_report_maintains_daily_rollup(db_session):
+    parsed = TLSReportParser.parse_file(sample_tls_report_bytes(), "tls-report.json")
+    second = dict(parsed, report_id="tls-report-20260520-b")
+
+    save_tls_report(db_session, parsed)
+    save_tls_report(db_session, second)
+    db_session.commit()
+
+    report = db_session.query(TLSReport).first()
+    assert report.observed_day == report.processed_at.date()
+    rollup = db_session.query(TLSReportDailyRollup).one()
+    assert rollup.report_day.isoformat() == "2026-05-20"
+    assert (rollup.report_count, rollup.successful_sessions, rollup.failed_sessions) == (
+        2,
+        250,
+        14,
+    )
+    summary = summarize_tls_reports(db_session, domain="example.com", days=7)
+    assert summary["totals"]["reports"] == 2
+    assert summary["trends"] == [
+        {"date": "2026-05-20", "reports": 2, "successful_sessions": 250, "failed_sessions": 14}
+    ]
+    assert summary["top_failures"][0]["report_count"] == 2
+    assert summary["affected_domains"][0]["top_failure"] == "certificate-expired"
+
+
 def test_upload_tls_report_rejects_invalid_file_type(authed_client):
     response = authed_client.post(
         "/api/v1/tls-reports/upload",
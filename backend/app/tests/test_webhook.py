@@ -13,6 +13,7 @@ from starlette.requests import Request
 
 from app.api.api_v1.endpoints import webhook
 from app.core.config import get_settings
+from app.models.ingestion_job import IngestedPayloadDigest
 from app.models.report import DMARCReport
 
 MINIMAL_DMARC_XML = b"""\
@@ -165,7 +166,10 @@ def test_webhook_imports_base64_email(client: TestClient, db_session, monkeypatc
     assert data["success"] is True
     assert data["reports_found"] == 1
     assert data["imported"] == 1
-    assert db_session.query(DMARCReport).count() == 1
+    report = db_session.query(DMARCReport).one()
+    digest_row = db_session.query(IngestedPayloadDigest).one()
+    assert digest_row.workspace_id is not None
+    assert digest_row.workspace_id == report.domain.workspace_id
 
 
 def test_webhook_rejects_oversized_base64_email(client: TestClient, monkeypatch):
@@ -335,7 +339,7 @@ def test_webhook_rolls_back_on_unhandled_processing_error(
     secret = _set_webhook_secret(monkeypatch)
 
     with patch(
-        "app.api.api_v1.endpoints.webhook.email.message_from_bytes",
+        "app.services.inbound_email.email.message_from_bytes",
         side_effect=RuntimeError("parse failed"),
     ):
         response = client.post(
@@ -352,7 +356,7 @@ def test_webhook_preserves_http_exceptions(client: TestClient, monkeypatch):
     secret = _set_webhook_secret(monkeypatch)
 
     with patch(
-        "app.api.api_v1.endpoints.webhook._process_email_attachments",
+        "app.services.inbound_email._process_email_attachments",
         side_effect=HTTPException(status_code=418, detail="teapot"),
     ):
         response = client.post(
@@ -31,6 +31,7 @@ from app.services.webhook_events import (
     deliver_webhook_delivery,
     endpoint_to_dict,
     enqueue_webhook_event,
+    enqueue_webhook_events,
     normalize_event_types,
     queue_test_webhook,
     sign_delivery,
@@ -171,6 +172,52 @@ def test_webhook_events_without_workspace_stay_in_default_workspace(db_session):
     assert [delivery.endpoint_id for delivery in deliveries] == [default_endpoint.id]
 
 
+def test_webhook_bulk_enqueue_fans_out_by_subscription_and_skips_duplicates(db_session):
+    """Bulk enqueue matches subscriptions in memory and ignores known idempotency keys."""
+    alerts_endpoint, _ = create_webhook_endpoint(
+        db_session,
+        name="alerts",
+        url="https://alerts.example/webhook",
+        event_types=[EVENT_ALERT_CREATED],
+    )
+    everything_endpoint, _ = create_webhook_endpoint(
+        db_session,
+        name="everything",
+        url="https://all.example/webhook",
+    )
+    create_webhook_endpoint(
+        db_session,
+        name="disabled",
+        url="https://disabled.example/webhook",
+        enabled=False,
+    )
+    events = [
+        (EVENT_ALERT_CREATED, {"domain": f"example-{index}.com"}, f"alert-{index}")
+        for index in range(3)
+    ]
+    events.append((EVENT_REPORTS_MISSING, {"domain": "example.com"}, "missing-example"))
+    events.append((EVENT_ALERT_CREATED, {"domain": "example-0.com"}, "alert-0"))
+
+    assert enqueue_webhook_events(db_session, events) == 7
+    assert enqueue_webhook_events(db_session, events) == 0
+    assert enqueue_webhook_events(db_session, []) == 0
+
+    rows = db_session.query(WebhookDelivery).all()
+    assert len(rows) == 7
+    assert {row.endpoint_id for row in rows if row.event_type == EVENT_REPORTS_MISSING} == {
+        everything_endpoint.id
+    }
+    assert sum(1 for row in rows if row.endpoint_id == alerts_endpoint.id) == 3
+    assert all(row.status == DELIVERY_PENDING and row.next_attempt_at for row in rows)
+
+    try:
+        enqueue_webhook_events(db_session, [("dmarq.unknown", {}, None)])
+    except ValueError as exc:
+        assert "Unsupported webhook event type" in str(exc)
+    else:  # pragma: no cover - defensive assertion branch
+        raise AssertionError("Expected unsupported event type to be rejected")
+
+
 def test_webhook_validation_update_and_abandoned_delivery(db_session):
     """Endpoint helpers validate input, update secrets, and abandon disabled endpoints."""
     assert normalize_event_types([]) == ["*"]
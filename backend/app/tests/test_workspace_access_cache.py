@@ -0,0 +1,107 @@
+"""Tests for cached workspace role resolution and per-request auth memoisation."""
+
+from types import SimpleNamespace
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import app.core.logto as logto_module
+import app.services.workspace_access as access_module
+from app.core.logto import SESSION_COOKIE, create_session_token, session_user_id_for_request
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.models.workspace_access import WorkspaceMembership
+from app.services.workspace_access import ROLE_ANALYST, ROLE_OPERATOR, role_for_workspace
+from app.services.workspace_access_cache import access_version, bump_workspace_access_version
+
+
+def _member(db_session: Session, role: str = ROLE_ANALYST):
+    workspace = Workspace(slug="cached-access", name="Cached Access", active=True)
+    user = User(email="cached-access@example.com", is_active=True, is_verified=True)
+    db_session.add_all([workspace, user])
+    db_session.flush()
+    membership = WorkspaceMembership(workspace_id=workspace.id, user_id=user.id, role=role)
+    db_session.add(membership)
+    db_session.commit()
+    return workspace, user, membership
+
+
+def _count_queries(db_session: Session, callback) -> int:
+    statements = []
+
+    def before_execute(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        callback()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+    return len(statements)
+
+
+def test_repeated_role_lookups_hit_the_cache(db_session: Session):
+    workspace, user, _membership = _member(db_session)
+    auth_context = {"auth_type": "session", "user_id": user.id}
+
+    assert role_for_workspace(db_session, auth_context, workspace) == ROLE_ANALYST
+    queries = _count_queries(
+        db_session, lambda: role_for_workspace(db_session, auth_context, workspace)
+    )
+
+    assert queries == 0
+
+
+def test_membership_change_invalidates_cached_role(db_session: Session):
+    workspace, user, membership = _member(db_session)
+    auth_context = {"auth_type": "session", "user_id": user.id}
+    assert role_for_workspace(db_session, auth_context, workspace) == ROLE_ANALYST
+    version = access_version()
+
+    membership.role = ROLE_OPERATOR
+    db_session.commit()
+
+    assert access_version() > version
+    assert role_for_workspace(db_session, auth_context, workspace) == ROLE_OPERATOR
+
+    membership.active = False
+    db_session.commit()
+
+    assert role_for_workspace(db_session, auth_context, workspace) == ""
+
+
+def test_roles_resolved_under_a_stale_version_are_not_cached(db_session: Session, monkeypatch):
+    workspace, user, _membership = _member(db_session)
+    auth_context = {"auth_type": "session", "user_id": user.id}
+    original = access_module._resolve_user_workspace_role
+
+    def resolve_during_change(*args):
+        role = original(*args)
+        bump_workspace_access_version()
+        return role
+
+    monkeypatch.setattr(access_module, "_resolve_user_workspace_role", resolve_during_change)
+    role_for_workspace(db_session, auth_context, workspace)
+    monkeypatch.setattr(access_module, "_resolve_user_workspace_role", original)
+
+    assert _count_queries(
+        db_session, lambda: role_for_workspace(db_session, auth_context, workspace)
+    )
+
+
+def test_session_cookie_is_decoded_once_per_request(monkeypatch):
+    token = create_session_token(7)
+    calls = []
+    original = logto_module.decode_session_token
+
+    def counting_decode(value):
+        calls.append(value)
+        return original(value)
+
+    monkeypatch.setattr(logto_module, "decode_session_token", counting_decode)
+    request = SimpleNamespace(cookies={SESSION_COOKIE: token}, state=SimpleNamespace())
+
+    assert session_user_id_for_request(request) == 7
+    assert session_user_id_for_request(request) == 7
+    assert calls == [token]
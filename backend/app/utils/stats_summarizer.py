@@ -745,9 +745,14 @@ class StatsSummarizer:
             )
             .join(ReportRecord, ReportRecord.report_id == DMARCReport.id)
             .filter(DMARCReport.begin_date >= cutoff_ts)
+            # Repeated on the record copy so partitioned record tables are pruned too.
+            .filter(ReportRecord.report_begin_date >= cutoff_ts)
         )
         if end_ts is not None:
-            query = query.filter(DMARCReport.begin_date < int(end_ts))
+            query = query.filter(
+                DMARCReport.begin_date < int(end_ts),
+                ReportRecord.report_begin_date < int(end_ts),
+            )
 
         if domain_db_id is not None:
             query = query.filter(DMARCReport.domain_id == domain_db_id)
@@ -6,7 +6,8 @@
 #   2. Ensure Alembic migration tracking is consistent (stamp existing
 #      databases that were created before Alembic was introduced).
 #   3. Apply all pending Alembic migrations (alembic upgrade head).
-#   4. Hand off to the real application process.
+#   4. Reset the multi-process metrics directory when one is configured.
+#   5. Hand off to the real application process.
 
 set -e
 
@@ -53,5 +54,12 @@ PYEOF
 alembic upgrade head
 echo "==> Migrations complete."
 
+# Per-worker metric files from a previous run would be summed into the new
+# process's counters, so the directory must start empty.
+if [ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 echo "==> Starting application …"
 exec uvicorn app.main:app --host 0.0.0.0 --port "${PORT:-8080}"
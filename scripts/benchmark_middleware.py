@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Measure in-process request throughput through the full DMARQ middleware stack.
+
+The benchmark drives the ASGI app directly (no sockets) so the numbers isolate
+framework and middleware overhead. Run it from a checkout before and after a
+middleware change to compare requests per second for the same routes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_PATHS = ("/api/v1/health", "/static/css/app.css")
+
+
+async def _measure(app, path: str, requests: int, concurrency: int) -> float:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get(path)
+        if response.status_code >= 400:
+            raise SystemExit(f"{path} returned HTTP {response.status_code}")
+
+        remaining = requests
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                await client.get(path)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return requests / elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=3000, help="requests per path")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients")
+    parser.add_argument("--rounds", type=int, default=3, help="report the best of N rounds")
+    parser.add_argument("paths", nargs="*", default=list(DEFAULT_PATHS))
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    os.environ.setdefault("AUTH_DISABLED", "true")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    sys.path.insert(0, str(ROOT / "backend"))
+    os.chdir(ROOT / "backend")
+
+    from app.main import create_app  # pylint: disable=import-outside-toplevel
+
+    app = create_app()
+    for path in args.paths:
+        best = max(
+            asyncio.run(_measure(app, path, args.requests, args.concurrency))
+            for _ in range(args.rounds)
+        )
+        print(f"{path:<28} {best:>10.0f} req/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Compare SQLite ingest and read throughput with and without the tuned profile.
+
+For each mode a new database file is created, then writer and reader
+processes (standing in for uvicorn workers and background loops) hit it at
+the same time through the application's ``SessionLocal``: writers persist
+synthetic aggregate reports with ``save_parsed_report`` while readers run a
+dashboard-style aggregate over report records. Each process also runs a few
+threads so in-process contention is covered as well.
+
+The "default" mode sets ``SQLITE_TUNING_ENABLED=false`` (one pool, rollback
+journal, no PRAGMAs); "tuned" uses WAL, the single writer connection and the
+read pool. Failed operations (typically ``database is locked``) are counted
+as errors rather than aborting the run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+MODES = ("default", "tuned")
+ROLES = ("setup", "writer", "reader")
+
+
+def _report(writer: int, sequence: int, records: int) -> dict:
+    return {
+        "domain": f"bench{writer % 4}.example",
+        "report_id": f"bench-{writer}-{sequence}",
+        "org_name": "Benchmark Reporter",
+        "begin_timestamp": 1_700_000_000 + sequence * 86400,
+        "end_timestamp": 1_700_086_399 + sequence * 86400,
+        "policy_published": {"p": "none"},
+        "records": [
+            {
+                "source_ip": f"192.0.2.{(sequence + index) % 250 + 1}",
+                "count": 1 + index,
+                "disposition": "none",
+                "dkim_result": "pass" if index % 3 else "fail",
+                "spf_result": "pass",
+                "header_from": f"bench{writer % 4}.example",
+            }
+            for index in range(records)
+        ],
+    }
+
+
+def _operations(args: argparse.Namespace):
+    os.chdir(ROOT / "backend")
+    sys.path.insert(0, str(ROOT / "backend"))
+    # pylint: disable=import-outside-toplevel
+    import app.main  # noqa: F401 - register every model
+    from sqlalchemy import func
+
+    from app.core.database import Base, SessionLocal, engine
+    from app.models.report import ReportRecord
+    from app.services.report_persistence import save_parsed_report
+
+    def write(writer: int, sequence: int) -> None:
+        db = SessionLocal()
+        try:
+            save_parsed_report(db, _report(writer, sequence, args.records))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def read() -> None:
+        db = SessionLocal()
+        try:
+            db.query(ReportRecord.source_ip, func.sum(ReportRecord.count)).group_by(
+                ReportRecord.source_ip
+            ).all()
+        finally:
+            db.close()
+
+    def setup() -> None:
+        Base.metadata.create_all(bind=engine)
+        # Creates the default workspace and domains before the timed run.
+        for writer in range(4):
+            write(writer, 0)
+
+    return setup, write, read
+
+
+def _wait_for_peers(args: argparse.Namespace) -> float:
+    """Block until every worker has imported the app, then return the common start."""
+    barrier = Path(args.barrier)
+    (barrier / f"{args.role}-{args.index}").touch()
+    while len(list(barrier.iterdir())) < args.parties:
+        time.sleep(0.05)
+    return max(path.stat().st_mtime for path in barrier.iterdir()) + 0.5
+
+
+def _run_role(args: argparse.Namespace) -> dict:
+    setup, write, read = _operations(args)
+    if args.role == "setup":
+        setup()
+        return {}
+
+    counts = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+    start_at = _wait_for_peers(args)
+
+    def loop(thread: int) -> None:
+        sequence = 0
+        writer = args.index * args.threads + thread
+        while time.time() < start_at + args.seconds:
+            sequence += 1
+            try:
+                if args.role == "writer":
+                    write(writer, sequence)
+                else:
+                    read()
+                key = "writes" if args.role == "writer" else "reads"
+            except Exception:  # pylint: disable=broad-exception-caught
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    threads = [threading.Thread(target=loop, args=(i,)) for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts
+
+
+def _spawn(env: dict, args: argparse.Namespace, role: str, index: int, barrier: str):
+    command = [
+        sys.executable,
+        __file__,
+        "--role",
+        role,
+        "--index",
+        str(index),
+        "--barrier",
+        barrier,
+        "--parties",
+        str(args.writers + args.readers),
+        "--seconds",
+        str(args.seconds),
+        "--threads",
+        str(args.threads),
+        "--records",
+        str(args.records),
+    ]
+    return subprocess.Popen(
+        command, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+
+
+def _collect(process: subprocess.Popen) -> dict:
+    stdout, stderr = process.communicate()
+    if process.returncode != 0:
+        raise SystemExit(f"benchmark worker failed:\n{stderr[-2000:]}")
+    return json.loads(stdout.strip().splitlines()[-1])
+
+
+def _run_mode(mode: str, args: argparse.Namespace) -> dict:
+    totals = {"writes": 0, "reads": 0, "errors": 0}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        env["SQLITE_TUNING_ENABLED"] = "true" if mode == "tuned" else "false"
+        env.setdefault("AUTH_DISABLED", "true")
+        barrier = os.path.join(tmp, "ready")
+        os.mkdir(barrier)
+        _collect(_spawn(env, args, "setup", 0, barrier))
+
+        processes = [_spawn(env, args, "writer", i, barrier) for i in range(args.writers)]
+        processes += [_spawn(env, args, "reader", i, barrier) for i in range(args.readers)]
+        for process in processes:
+            for key, value in _collect(process).items():
+                totals[key] += value
+    return {key: value / args.seconds for key, value in totals.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration per mode")
+    parser.add_argument("--writers", type=int, default=2, help="writer processes")
+    parser.add_argument("--readers", type=int, default=2, help="reader processes")
+    parser.add_argument("--threads", type=int, default=4, help="threads per process")
+    parser.add_argument("--records", type=int, default=20, help="records per report")
+    parser.add_argument("--role", choices=ROLES, help=argparse.SUPPRESS)
+    parser.add_argument("--index", type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument("--barrier", help=argparse.SUPPRESS)
+    parser.add_argument("--parties", type=int, default=1, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.role:
+        print(json.dumps(_run_role(args)))
+        return 0
+
+    print(f"{'mode':<10} {'writes/s':>10} {'reads/s':>10} {'errors/s':>10}")
+    for mode in MODES:
+        result = _run_mode(mode, args)
+        print(
+            f"{mode:<10} {result['writes']:>10.1f} {result['reads']:>10.1f} "
+            f"{result['errors']:>10.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Fail when importing the DMARQ API regresses its cold-start budget.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter,
+parses the per-module timings, and checks two things:
+
+- optional integrations (AWS, Google, Apprise, LiteLLM, Lexicon, Akamai) must
+  not be imported at startup; they are loaded on first use;
+- the cumulative import time of ``app.main`` must stay within the budget.
+
+The slowest top-level packages are printed so a regression can be traced to
+the import that caused it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_BUDGET_MS = 8000
+LAZY_MODULES = (
+    "akamai.edgegrid",
+    "apprise",
+    "boto3",
+    "google.auth.transport.requests",
+    "google.oauth2.credentials",
+    "googleapiclient.discovery",
+    "lexicon.client",
+    "litellm",
+)
+
+
+class ImportTiming(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+
+
+def _parse_importtime(output: str) -> List[ImportTiming]:
+    timings: List[ImportTiming] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        timings.append(
+            ImportTiming(fields[2].strip(), int(fields[0].strip()), int(fields[1].strip()))
+        )
+    return timings
+
+
+def _run_importtime(module: str) -> str:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT / "backend",
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise SystemExit(f"importing {module} failed:\n{completed.stderr[-2000:]}")
+    return completed.stderr
+
+
+def _top_level_packages(timings: List[ImportTiming]) -> Dict[str, int]:
+    packages: Dict[str, int] = {}
+    for timing in timings:
+        if "." not in timing.name:
+            packages[timing.name] = max(packages.get(timing.name, 0), timing.cumulative_us)
+    return packages
+
+
+def _check(timings: List[ImportTiming], module: str, budget_ms: int) -> List[str]:
+    failures: List[str] = []
+    imported = {timing.name for timing in timings}
+    for lazy in LAZY_MODULES:
+        if lazy in imported:
+            failures.append(f"{lazy} is imported at startup; import it on first use instead")
+    total_ms = next((t.cumulative_us for t in timings if t.name == module), 0) / 1000
+    if total_ms > budget_ms:
+        failures.append(f"import {module} took {total_ms:.0f} ms (budget {budget_ms} ms)")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="app.main", help="module to import")
+    parser.add_argument(
+        "--budget-ms",
+        type=int,
+        default=int(os.environ.get("DMARQ_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)),
+        help="maximum cumulative import time in milliseconds",
+    )
+    parser.add_argument("--top", type=int, default=15, help="number of packages to list")
+    args = parser.parse_args()
+
+    timings = _parse_importtime(_run_importtime(args.module))
+    packages = sorted(_top_level_packages(timings).items(), key=lambda item: -item[1])
+    for name, cumulative_us in packages[: args.top]:
+        print(f"{name:<32} {cumulative_us / 1000:>8.1f} ms")
+
+    failures = _check(timings, args.module, args.budget_ms)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())